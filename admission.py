@@ -0,0 +1,96 @@
+"""Admission control for expensive requests: per-client rate limits and coalescing.
+
+``RateLimiter`` gives every client a token bucket: ``rate`` tokens a second,
+holding at most ``burst``. A request that would do real work (a render, a
+parse) takes a token; a client with none left is told how long until it has
+one. Buckets live in process memory, bounded by ``max_clients`` (the least
+recently seen client is forgotten first, which at worst hands it a full
+bucket again), so with several server processes each enforces its own limit.
+
+``SingleFlight`` runs one call per key at a time: callers arriving while a
+call for their key is running wait for it and share its result (or its
+exception), so a class pressing Download on the same resume at once costs
+one render.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class RateLimiter:
+    def __init__(self, rate, burst, max_clients=10_000):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets = OrderedDict()  # client -> (tokens, time), least recently seen first
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.limited = 0
+
+    def take(self, client, cost=1):
+        """Take ``cost`` tokens from ``client``'s bucket: 0 if it had them, else
+        the seconds until it will (nothing is taken then)."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, then = self._buckets.pop(client, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - then) * self.rate)
+            if tokens >= cost:
+                tokens -= cost
+                wait = 0
+                self.allowed += 1
+            else:
+                wait = (cost - tokens) / self.rate
+                self.limited += 1
+            self._buckets[client] = (tokens, now)
+            while len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def stats(self):
+        with self._lock:
+            return {'clients': len(self._buckets), 'allowed': self.allowed, 'limited': self.limited}
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.shared = 0
+
+    def run(self, key, fn, *args):
+        """``fn(*args)``, or the result of the call for ``key`` already running."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+            else:
+                self.shared += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn(*args)
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self):
+        with self._lock:
+            return {'in_flight': len(self._calls), 'calls': self.calls, 'shared': self.shared}
@@ -1,477 +1,2028 @@
-from flask import Flask, render_template_string
-import json
-
-app = Flask(__name__)
-
-# We embed the HTML/JS template directly here for a single-file solution.
-# In a real project, this would be in a 'templates' folder.
-HTML_TEMPLATE = """
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Student Resume Builder</title>
-    
-    <!-- Tailwind CSS -->
-    <script src="https://cdn.tailwindcss.com"></script>
-    
-    <!-- Alpine.js (for reactive state management, similar to React but for HTML) -->
-    <script defer src="https://cdn.jsdelivr.net/npm/alpinejs@3.13.3/dist/cdn.min.js"></script>
-    
-    <!-- html2pdf.js (For direct PDF download) -->
-    <script defer src="https://cdnjs.cloudflare.com/ajax/libs/html2pdf.js/0.10.1/html2pdf.bundle.min.js"></script>
-
-    <!-- FontAwesome for Icons -->
-    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css">
-
-    <style>
-        /* Custom Scrollbar for Editor */
-        .custom-scrollbar::-webkit-scrollbar { width: 6px; }
-        .custom-scrollbar::-webkit-scrollbar-track { background: #f1f5f9; }
-        .custom-scrollbar::-webkit-scrollbar-thumb { background: #cbd5e1; border-radius: 4px; }
-        .custom-scrollbar::-webkit-scrollbar-thumb:hover { background: #94a3b8; }
-
-        /* PDF Generation Styles */
-        .resume-page {
-            width: 210mm;
-            min-height: 297mm;
-            background: white;
-            margin: 0 auto;
-            box-shadow: 0 10px 15px -3px rgb(0 0 0 / 0.1);
-        }
-        
-        @media print {
-            body * { visibility: hidden; }
-            #resume-preview, #resume-preview * { visibility: visible; }
-            #resume-preview { position: absolute; left: 0; top: 0; width: 100%; margin: 0; padding: 0; box-shadow: none; }
-        }
-    </style>
-</head>
-<body class="bg-slate-100 text-slate-800 h-screen flex flex-col md:flex-row overflow-hidden" 
-      x-data="resumeApp()">
-
-    <!-- LEFT SIDEBAR: EDITOR -->
-    <div class="w-full md:w-1/3 lg:w-96 bg-white border-r border-slate-200 h-full flex flex-col shadow-xl z-10">
-        
-        <!-- Header -->
-        <div class="p-4 border-b border-slate-200 bg-slate-50 flex items-center justify-between">
-            <h1 class="text-xl font-bold text-slate-800 flex items-center gap-2">
-                <i class="fa-solid fa-file-lines text-blue-600"></i> Builder
-            </h1>
-            <button @click="downloadPDF()" 
-                    class="bg-blue-600 hover:bg-blue-700 text-white px-4 py-2 rounded-md text-sm font-medium flex items-center gap-2 transition-colors shadow-sm">
-                <i class="fa-solid fa-download"></i> <span>Download PDF</span>
-            </button>
-        </div>
-
-        <!-- Tabs -->
-        <div class="flex bg-slate-100 p-1 space-x-1">
-            <template x-for="tab in tabs" :key="tab.id">
-                <button @click="activeTab = tab.id"
-                        :class="activeTab === tab.id ? 'bg-white text-blue-600 shadow-sm' : 'text-slate-500 hover:text-slate-700'"
-                        class="flex-1 py-2 px-1 rounded-md text-xs font-medium transition-all flex flex-col items-center">
-                    <i :class="tab.icon + ' mb-1 text-base'"></i>
-                    <span x-text="tab.label"></span>
-                </button>
-            </template>
-        </div>
-
-        <!-- Form Content -->
-        <div class="flex-1 overflow-y-auto p-4 custom-scrollbar">
-            
-            <!-- Template Selector -->
-            <div class="mb-6 bg-slate-50 p-3 rounded-lg border border-slate-200">
-                <label class="text-xs font-bold text-slate-500 uppercase tracking-wide mb-2 block">Template</label>
-                <div class="grid grid-cols-3 gap-2">
-                    <button @click="template = 'modern'" :class="template === 'modern' ? 'bg-blue-100 border-blue-400 text-blue-700' : 'bg-white border-slate-200'" class="py-1 px-2 rounded text-xs border font-medium">Modern</button>
-                    <button @click="template = 'minimal'" :class="template === 'minimal' ? 'bg-blue-100 border-blue-400 text-blue-700' : 'bg-white border-slate-200'" class="py-1 px-2 rounded text-xs border font-medium">Minimal</button>
-                    <button @click="template = 'creative'" :class="template === 'creative' ? 'bg-blue-100 border-blue-400 text-blue-700' : 'bg-white border-slate-200'" class="py-1 px-2 rounded text-xs border font-medium">Creative</button>
-                </div>
-            </div>
-
-            <!-- PERSONAL TAB -->
-            <div x-show="activeTab === 'personal'" class="space-y-3">
-                <div class="form-group">
-                    <label class="text-xs font-bold text-slate-600">Full Name</label>
-                    <input type="text" x-model="data.personal.fullName" class="w-full border rounded px-3 py-2 text-sm focus:ring-2 focus:ring-blue-500 outline-none">
-                </div>
-                <div class="form-group">
-                    <label class="text-xs font-bold text-slate-600">Email</label>
-                    <input type="text" x-model="data.personal.email" class="w-full border rounded px-3 py-2 text-sm focus:ring-2 focus:ring-blue-500 outline-none">
-                </div>
-                <div class="form-group">
-                    <label class="text-xs font-bold text-slate-600">Phone</label>
-                    <input type="text" x-model="data.personal.phone" class="w-full border rounded px-3 py-2 text-sm focus:ring-2 focus:ring-blue-500 outline-none">
-                </div>
-                <div class="form-group">
-                    <label class="text-xs font-bold text-slate-600">Location</label>
-                    <input type="text" x-model="data.personal.location" class="w-full border rounded px-3 py-2 text-sm focus:ring-2 focus:ring-blue-500 outline-none">
-                </div>
-                <div class="form-group">
-                    <label class="text-xs font-bold text-slate-600">LinkedIn</label>
-                    <input type="text" x-model="data.personal.linkedin" class="w-full border rounded px-3 py-2 text-sm focus:ring-2 focus:ring-blue-500 outline-none">
-                </div>
-                 <div class="form-group">
-                    <label class="text-xs font-bold text-slate-600">Summary</label>
-                    <textarea x-model="data.personal.summary" rows="4" class="w-full border rounded px-3 py-2 text-sm focus:ring-2 focus:ring-blue-500 outline-none"></textarea>
-                </div>
-            </div>
-
-            <!-- EDUCATION TAB -->
-            <div x-show="activeTab === 'education'" class="space-y-4">
-                <template x-for="(edu, index) in data.education" :key="edu.id">
-                    <div class="bg-slate-50 p-3 rounded border border-slate-200 relative group">
-                        <button @click="removeItem('education', edu.id)" class="absolute top-2 right-2 text-slate-400 hover:text-red-500 transition-colors"><i class="fa-solid fa-trash"></i></button>
-                        <h3 class="text-xs font-bold text-slate-400 uppercase mb-2">Education <span x-text="index + 1"></span></h3>
-                        <input type="text" x-model="edu.school" placeholder="School" class="w-full border rounded px-2 py-1 text-sm mb-2">
-                        <input type="text" x-model="edu.degree" placeholder="Degree" class="w-full border rounded px-2 py-1 text-sm mb-2">
-                        <div class="flex gap-2 mb-2">
-                            <input type="text" x-model="edu.date" placeholder="Year" class="w-1/2 border rounded px-2 py-1 text-sm">
-                            <input type="text" x-model="edu.gpa" placeholder="GPA" class="w-1/2 border rounded px-2 py-1 text-sm">
-                        </div>
-                        <textarea x-model="edu.details" placeholder="Details" class="w-full border rounded px-2 py-1 text-sm"></textarea>
-                    </div>
-                </template>
-                <button @click="addItem('education')" class="w-full py-2 border-2 border-dashed border-slate-300 rounded text-slate-500 hover:border-blue-500 hover:text-blue-500 text-sm font-medium transition-colors">
-                    <i class="fa-solid fa-plus mr-1"></i> Add Education
-                </button>
-            </div>
-
-            <!-- EXPERIENCE TAB -->
-            <div x-show="activeTab === 'experience'" class="space-y-4">
-                 <template x-for="(exp, index) in data.experience" :key="exp.id">
-                    <div class="bg-slate-50 p-3 rounded border border-slate-200 relative group">
-                        <button @click="removeItem('experience', exp.id)" class="absolute top-2 right-2 text-slate-400 hover:text-red-500 transition-colors"><i class="fa-solid fa-trash"></i></button>
-                        <h3 class="text-xs font-bold text-slate-400 uppercase mb-2">Job <span x-text="index + 1"></span></h3>
-                        <input type="text" x-model="exp.company" placeholder="Company" class="w-full border rounded px-2 py-1 text-sm mb-2">
-                        <input type="text" x-model="exp.role" placeholder="Role" class="w-full border rounded px-2 py-1 text-sm mb-2">
-                        <div class="flex gap-2 mb-2">
-                            <input type="text" x-model="exp.location" placeholder="Location" class="w-1/2 border rounded px-2 py-1 text-sm">
-                            <input type="text" x-model="exp.date" placeholder="Date" class="w-1/2 border rounded px-2 py-1 text-sm">
-                        </div>
-                        <textarea x-model="exp.details" placeholder="Responsibilities" rows="3" class="w-full border rounded px-2 py-1 text-sm"></textarea>
-                    </div>
-                </template>
-                <button @click="addItem('experience')" class="w-full py-2 border-2 border-dashed border-slate-300 rounded text-slate-500 hover:border-blue-500 hover:text-blue-500 text-sm font-medium transition-colors">
-                    <i class="fa-solid fa-plus mr-1"></i> Add Experience
-                </button>
-            </div>
-
-            <!-- PROJECTS TAB -->
-            <div x-show="activeTab === 'projects'" class="space-y-4">
-                 <template x-for="(proj, index) in data.projects" :key="proj.id">
-                    <div class="bg-slate-50 p-3 rounded border border-slate-200 relative group">
-                        <button @click="removeItem('projects', proj.id)" class="absolute top-2 right-2 text-slate-400 hover:text-red-500 transition-colors"><i class="fa-solid fa-trash"></i></button>
-                        <h3 class="text-xs font-bold text-slate-400 uppercase mb-2">Project <span x-text="index + 1"></span></h3>
-                        <input type="text" x-model="proj.name" placeholder="Project Name" class="w-full border rounded px-2 py-1 text-sm mb-2">
-                        <input type="text" x-model="proj.technologies" placeholder="Tech Stack" class="w-full border rounded px-2 py-1 text-sm mb-2">
-                        <input type="text" x-model="proj.link" placeholder="Link" class="w-full border rounded px-2 py-1 text-sm mb-2">
-                        <textarea x-model="proj.details" placeholder="Description" rows="2" class="w-full border rounded px-2 py-1 text-sm"></textarea>
-                    </div>
-                </template>
-                <button @click="addItem('projects')" class="w-full py-2 border-2 border-dashed border-slate-300 rounded text-slate-500 hover:border-blue-500 hover:text-blue-500 text-sm font-medium transition-colors">
-                    <i class="fa-solid fa-plus mr-1"></i> Add Project
-                </button>
-            </div>
-
-            <!-- SKILLS TAB -->
-             <div x-show="activeTab === 'skills'" class="space-y-2">
-                <template x-for="(skill, index) in data.skills" :key="index">
-                    <div class="flex gap-2">
-                        <input type="text" x-model="data.skills[index]" class="flex-1 border rounded px-2 py-2 text-sm">
-                        <button @click="removeSkill(index)" class="text-slate-400 hover:text-red-500"><i class="fa-solid fa-trash"></i></button>
-                    </div>
-                </template>
-                <button @click="addSkill()" class="w-full py-2 mt-2 border-2 border-dashed border-slate-300 rounded text-slate-500 hover:border-blue-500 hover:text-blue-500 text-sm font-medium transition-colors">
-                    <i class="fa-solid fa-plus mr-1"></i> Add Skill
-                </button>
-            </div>
-
-        </div>
-    </div>
-
-    <!-- RIGHT SIDEBAR: PREVIEW -->
-    <div class="flex-1 bg-slate-200 p-8 overflow-y-auto flex justify-center">
-        
-        <!-- RESUME CONTAINER (This is what gets printed) -->
-        <div id="resume-preview" class="resume-page p-8 transition-all duration-300 ease-in-out">
-            
-            <!-- --- MODERN TEMPLATE --- -->
-            <div x-show="template === 'modern'" class="h-full w-full font-sans text-slate-800">
-                <header class="border-b-2 border-slate-800 pb-6 mb-6">
-                    <h1 class="text-4xl font-bold uppercase tracking-wide text-slate-900 mb-2" x-text="data.personal.fullName"></h1>
-                    <div class="flex flex-wrap gap-4 text-sm text-slate-600">
-                        <span x-show="data.personal.email" class="flex items-center gap-1"><i class="fa-solid fa-envelope"></i> <span x-text="data.personal.email"></span></span>
-                        <span x-show="data.personal.phone" class="flex items-center gap-1"><i class="fa-solid fa-phone"></i> <span x-text="data.personal.phone"></span></span>
-                        <span x-show="data.personal.location" class="flex items-center gap-1"><i class="fa-solid fa-map-pin"></i> <span x-text="data.personal.location"></span></span>
-                        <span x-show="data.personal.linkedin" class="flex items-center gap-1"><i class="fa-brands fa-linkedin"></i> <span x-text="data.personal.linkedin"></span></span>
-                    </div>
-                </header>
-                <div class="grid grid-cols-3 gap-8">
-                    <div class="col-span-2 space-y-6">
-                        <section x-show="data.personal.summary">
-                            <h2 class="text-xl font-bold uppercase border-b border-slate-300 mb-3 pb-1">Summary</h2>
-                            <p class="text-sm leading-relaxed text-slate-700" x-text="data.personal.summary"></p>
-                        </section>
-                        <section>
-                            <h2 class="text-xl font-bold uppercase border-b border-slate-300 mb-3 pb-1">Education</h2>
-                            <template x-for="edu in data.education" :key="edu.id">
-                                <div class="mb-4">
-                                    <div class="flex justify-between items-baseline mb-1">
-                                        <h3 class="font-bold text-lg" x-text="edu.school"></h3>
-                                        <span class="text-sm italic" x-text="edu.date"></span>
-                                    </div>
-                                    <div class="flex justify-between items-baseline mb-1 text-slate-700">
-                                        <span class="font-medium" x-text="edu.degree"></span>
-                                        <span class="text-sm" x-text="edu.location"></span>
-                                    </div>
-                                    <p class="text-sm text-slate-600 mb-1">GPA: <span x-text="edu.gpa"></span></p>
-                                    <p class="text-sm text-slate-600" x-text="edu.details"></p>
-                                </div>
-                            </template>
-                        </section>
-                        <section>
-                            <h2 class="text-xl font-bold uppercase border-b border-slate-300 mb-3 pb-1">Experience</h2>
-                            <template x-for="exp in data.experience" :key="exp.id">
-                                <div class="mb-4">
-                                    <div class="flex justify-between items-baseline mb-1">
-                                        <h3 class="font-bold text-lg" x-text="exp.company"></h3>
-                                        <span class="text-sm italic" x-text="exp.date"></span>
-                                    </div>
-                                    <div class="text-sm text-slate-700 font-medium mb-1" x-text="exp.role"></div>
-                                    <div class="text-sm text-slate-600 whitespace-pre-line border-l-2 border-slate-200 pl-2" x-text="exp.details"></div>
-                                </div>
-                            </template>
-                        </section>
-                    </div>
-                    <div class="col-span-1 space-y-6">
-                        <section>
-                            <h2 class="text-xl font-bold uppercase border-b border-slate-300 mb-3 pb-1">Skills</h2>
-                            <div class="flex flex-wrap gap-2">
-                                <template x-for="skill in data.skills">
-                                    <span class="bg-slate-100 text-slate-800 px-2 py-1 rounded text-xs font-semibold" x-text="skill"></span>
-                                </template>
-                            </div>
-                        </section>
-                        <section>
-                            <h2 class="text-xl font-bold uppercase border-b border-slate-300 mb-3 pb-1">Projects</h2>
-                            <template x-for="proj in data.projects" :key="proj.id">
-                                <div class="mb-4">
-                                    <h3 class="font-bold text-md" x-text="proj.name"></h3>
-                                    <p class="text-xs text-blue-600 mb-1" x-text="proj.technologies"></p>
-                                    <p class="text-xs text-slate-600 leading-snug" x-text="proj.details"></p>
-                                </div>
-                            </template>
-                        </section>
-                    </div>
-                </div>
-            </div>
-
-            <!-- --- MINIMAL TEMPLATE --- -->
-            <div x-show="template === 'minimal'" class="h-full w-full font-serif text-gray-900">
-                <header class="text-center mb-8">
-                    <h1 class="text-3xl font-normal mb-2 tracking-widest uppercase" x-text="data.personal.fullName"></h1>
-                    <div class="text-sm text-gray-600 flex justify-center gap-4 flex-wrap">
-                        <span x-text="data.personal.email"></span> • <span x-text="data.personal.phone"></span>
-                    </div>
-                </header>
-                <div class="space-y-6">
-                    <section x-show="data.personal.summary">
-                        <p class="text-sm leading-relaxed text-center max-w-2xl mx-auto italic text-gray-700" x-text="data.personal.summary"></p>
-                    </section>
-                    <section>
-                        <h2 class="text-sm font-bold uppercase tracking-widest border-b border-gray-900 mb-4 pb-1">Education</h2>
-                        <template x-for="edu in data.education" :key="edu.id">
-                            <div class="mb-4 grid grid-cols-4 gap-4">
-                                <div class="col-span-1 text-sm text-gray-600" x-text="edu.date"></div>
-                                <div class="col-span-3">
-                                    <h3 class="font-bold" x-text="edu.school"></h3>
-                                    <div class="text-sm italic mb-1" x-text="edu.degree"></div>
-                                    <div class="text-sm text-gray-700" x-text="edu.details"></div>
-                                </div>
-                            </div>
-                        </template>
-                    </section>
-                     <section>
-                        <h2 class="text-sm font-bold uppercase tracking-widest border-b border-gray-900 mb-4 pb-1">Experience</h2>
-                        <template x-for="exp in data.experience" :key="exp.id">
-                            <div class="mb-4 grid grid-cols-4 gap-4">
-                                <div class="col-span-1 text-sm text-gray-600">
-                                    <div x-text="exp.date"></div>
-                                    <div class="italic" x-text="exp.location"></div>
-                                </div>
-                                <div class="col-span-3">
-                                    <h3 class="font-bold" x-text="exp.company"></h3>
-                                    <div class="text-sm italic mb-2 text-blue-900" x-text="exp.role"></div>
-                                    <div class="text-sm text-gray-700 whitespace-pre-line" x-text="exp.details"></div>
-                                </div>
-                            </div>
-                        </template>
-                    </section>
-                    <section>
-                         <h2 class="text-sm font-bold uppercase tracking-widest border-b border-gray-900 mb-4 pb-1">Projects & Skills</h2>
-                         <div class="text-sm text-gray-700 mb-4">
-                             <span class="font-bold text-gray-900">Skills: </span>
-                             <span x-text="data.skills.join(' • ')"></span>
-                         </div>
-                         <template x-for="proj in data.projects" :key="proj.id">
-                             <div class="mb-3">
-                                 <div class="text-sm font-bold text-gray-800" x-text="proj.name"></div>
-                                 <div class="text-sm italic text-gray-500 mb-1" x-text="proj.technologies"></div>
-                                 <div class="text-sm text-gray-700" x-text="proj.details"></div>
-                             </div>
-                         </template>
-                    </section>
-                </div>
-            </div>
-
-            <!-- --- CREATIVE TEMPLATE --- -->
-            <div x-show="template === 'creative'" class="h-full w-full flex text-slate-800 font-sans">
-                <div class="w-1/3 bg-slate-900 text-white p-6 flex flex-col gap-6">
-                    <div class="text-center">
-                        <div class="w-20 h-20 bg-blue-500 rounded-full mx-auto mb-3 flex items-center justify-center text-2xl font-bold" x-text="data.personal.fullName.charAt(0)"></div>
-                        <h1 class="text-xl font-bold leading-tight" x-text="data.personal.fullName"></h1>
-                        <p class="text-blue-300 text-xs mt-2" x-text="data.personal.email"></p>
-                    </div>
-                    <div>
-                        <h3 class="uppercase tracking-widest text-xs font-bold text-blue-400 border-b border-slate-700 pb-2 mb-2">Skills</h3>
-                        <div class="flex flex-wrap gap-2">
-                             <template x-for="skill in data.skills">
-                                <span class="text-xs bg-slate-800 px-2 py-1 rounded text-slate-300 border border-slate-700" x-text="skill"></span>
-                            </template>
-                        </div>
-                    </div>
-                     <div>
-                        <h3 class="uppercase tracking-widest text-xs font-bold text-blue-400 border-b border-slate-700 pb-2 mb-2">Education</h3>
-                         <template x-for="edu in data.education" :key="edu.id">
-                            <div class="text-sm mb-3">
-                                <div class="font-bold text-white" x-text="edu.school"></div>
-                                <div class="text-blue-300 text-xs" x-text="edu.degree"></div>
-                                <div class="text-slate-500 text-xs">GPA: <span x-text="edu.gpa"></span></div>
-                            </div>
-                        </template>
-                    </div>
-                </div>
-                <div class="w-2/3 p-6 bg-slate-50">
-                    <div class="mb-6">
-                        <h2 class="text-xl font-bold text-slate-800 mb-3 flex items-center gap-2">
-                            <i class="fa-solid fa-user text-blue-600"></i> Profile
-                        </h2>
-                        <p class="text-sm text-slate-600" x-text="data.personal.summary"></p>
-                    </div>
-                    <div class="mb-6">
-                        <h2 class="text-xl font-bold text-slate-800 mb-3 flex items-center gap-2">
-                            <i class="fa-solid fa-briefcase text-blue-600"></i> Experience
-                        </h2>
-                        <template x-for="exp in data.experience" :key="exp.id">
-                            <div class="mb-4 relative pl-4 border-l-2 border-blue-200">
-                                <div class="font-bold text-slate-800" x-text="exp.role"></div>
-                                <div class="text-xs text-blue-600 font-medium mb-1"><span x-text="exp.company"></span> | <span x-text="exp.date"></span></div>
-                                <div class="text-sm text-slate-600 whitespace-pre-line" x-text="exp.details"></div>
-                            </div>
-                        </template>
-                    </div>
-                     <div>
-                        <h2 class="text-xl font-bold text-slate-800 mb-3 flex items-center gap-2">
-                            <i class="fa-solid fa-code text-blue-600"></i> Projects
-                        </h2>
-                        <div class="space-y-3">
-                             <template x-for="proj in data.projects" :key="proj.id">
-                                <div class="bg-white p-3 rounded shadow-sm border border-slate-100">
-                                    <div class="font-bold text-slate-800" x-text="proj.name"></div>
-                                    <div class="text-xs text-blue-500 font-semibold mb-1" x-text="proj.technologies"></div>
-                                    <div class="text-sm text-slate-600" x-text="proj.details"></div>
-                                </div>
-                            </template>
-                        </div>
-                    </div>
-                </div>
-            </div>
-
-        </div>
-    </div>
-
-    <!-- Application Logic -->
-    <script>
-        document.addEventListener('alpine:init', () => {
-            Alpine.data('resumeApp', () => ({
-                activeTab: 'personal',
-                template: 'modern',
-                tabs: [
-                    { id: 'personal', icon: 'fa-solid fa-user', label: 'Bio' },
-                    { id: 'education', icon: 'fa-solid fa-graduation-cap', label: 'Edu' },
-                    { id: 'experience', icon: 'fa-solid fa-briefcase', label: 'Exp' },
-                    { id: 'projects', icon: 'fa-solid fa-code', label: 'Proj' },
-                    { id: 'skills', icon: 'fa-solid fa-award', label: 'Skill' },
-                ],
-                data: {
-                    personal: {
-                        fullName: "Alex Chen",
-                        email: "alex.chen@univ.edu",
-                        phone: "(555) 123-4567",
-                        location: "San Francisco, CA",
-                        linkedin: "linkedin.com/in/alex",
-                        summary: "CS Senior seeking full stack roles. Passionate about React, Python, and scalable systems."
-                    },
-                    education: [
-                        { id: 1, school: "Tech University", degree: "B.S. Computer Science", date: "2025", gpa: "3.8", details: "Data Structures, Algorithms" }
-                    ],
-                    experience: [
-                        { id: 1, company: "StartUp Inc", role: "Intern", location: "Remote", date: "Summer 2024", details: "Built React dashboard. Optimized API calls." }
-                    ],
-                    projects: [
-                        { id: 1, name: "Task App", technologies: "React, Firebase", link: "github.com", details: "Real-time task manager with drag and drop." }
-                    ],
-                    skills: ["Python", "JavaScript", "React", "Flask", "SQL"]
-                },
-                
-                addItem(section) {
-                    const id = Date.now();
-                    const items = {
-                        education: { id, school: "New School", degree: "", date: "", gpa: "", details: "" },
-                        experience: { id, company: "New Company", role: "", location: "", date: "", details: "" },
-                        projects: { id, name: "New Project", technologies: "", link: "", details: "" }
-                    };
-                    this.data[section].push(items[section]);
-                },
-                
-                removeItem(section, id) {
-                    this.data[section] = this.data[section].filter(i => i.id !== id);
-                },
-
-                addSkill() {
-                    this.data.skills.push("New Skill");
-                },
-
-                removeSkill(index) {
-                    this.data.skills = this.data.skills.filter((_, i) => i !== index);
-                },
-
-                downloadPDF() {
-                    const element = document.getElementById('resume-preview');
-                    const opt = {
-                        margin: 0,
-                        filename: 'Resume.pdf',
-                        image: { type: 'jpeg', quality: 0.98 },
-                        html2canvas: { scale: 2 },
-                        jsPDF: { unit: 'mm', format: 'a4', orientation: 'portrait' }
-                    };
-                    
-                    // Show loading state could be added here
-                    html2pdf().set(opt).from(element).save();
-                }
-            }));
-        });
-    </script>
-</body>
-</html>
-"""
-
-@app.route('/')
-def home():
-    return render_template_string(HTML_TEMPLATE)
-
-if __name__ == '__main__':
-    app.run(debug=True)
-
+from flask import Flask, Response, abort, jsonify, render_template_string, request, stream_with_context
+from jinja2 import TemplateError
+from markupsafe import Markup
+from werkzeug.middleware.proxy_fix import ProxyFix
+import atexit
+import gzip
+import hashlib
+import hmac
+import json
+import math
+import os
+import re
+import sys
+import threading
+import uuid
+import zlib
+from collections import OrderedDict
+
+import assets
+import batch
+import collab
+import importer
+import schema
+import search
+import server
+from admission import RateLimiter, SingleFlight
+from layouts import LayoutRegistry
+from metrics import Registry, RequestMetrics, SlowRequestProfiler
+from json_patch import PatchError, apply_patch
+from pdf import UnsupportedText
+from pdf_layouts import LAYOUTS, RENDER_VERSION, render_pdf
+from render_cache import RenderCache, is_key, render_key
+from storage import VersionConflict, WriteBehindQueue, open_store
+from workers import JobTimeout, Overloaded, WorkerPool
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+app = Flask(__name__)
+app.config['RESUME_STORE'] = os.environ.get(
+    'RESUME_STORE', 'sqlite:///' + os.path.join(app.instance_path, 'resumes.db'))
+# Server worker processes (see server.py); process pools are split between them.
+app.config['WEB_WORKERS'] = int(os.environ.get('WEB_CONCURRENCY', 1))
+CPUS_PER_WORKER = max(1, (os.cpu_count() or 2) // app.config['WEB_WORKERS'])
+# Write-behind keeps pending writes in memory, which only one process may do.
+app.config['RESUME_WRITE_BEHIND'] = os.environ.get(
+    'RESUME_WRITE_BEHIND', '1' if app.config['WEB_WORKERS'] == 1 else '0') == '1'
+app.config['PDF_WORKERS'] = int(os.environ.get('PDF_WORKERS', CPUS_PER_WORKER))
+app.config['PDF_QUEUE'] = int(os.environ.get('PDF_QUEUE', 4 * app.config['PDF_WORKERS']))
+app.config['PDF_TIMEOUT'] = float(os.environ.get('PDF_TIMEOUT', 10))
+app.config['PDF_MAX_WAIT'] = float(os.environ.get('PDF_MAX_WAIT', 2))
+app.config['RENDER_CACHE_DIR'] = os.environ.get(
+    'RENDER_CACHE_DIR', os.path.join(app.instance_path, 'render-cache'))
+app.config['RENDER_CACHE_MEMORY_MB'] = int(os.environ.get('RENDER_CACHE_MEMORY_MB', 32))
+app.config['RENDER_CACHE_DISK_MB'] = int(os.environ.get('RENDER_CACHE_DISK_MB', 512))
+app.config['BATCH_WORKERS'] = int(os.environ.get('BATCH_WORKERS', max(1, CPUS_PER_WORKER // 2)))
+app.config['BATCH_CONCURRENCY'] = int(os.environ.get('BATCH_CONCURRENCY', 2))
+app.config['IMPORT_WORKERS'] = int(os.environ.get('IMPORT_WORKERS', max(1, CPUS_PER_WORKER // 2)))
+app.config['IMPORT_QUEUE'] = int(os.environ.get('IMPORT_QUEUE', 4 * app.config['IMPORT_WORKERS']))
+app.config['IMPORT_TIMEOUT'] = float(os.environ.get('IMPORT_TIMEOUT', 10))
+app.config['IMPORT_MAX_WAIT'] = float(os.environ.get('IMPORT_MAX_WAIT', 5))
+app.config['IMPORT_MAX_MB'] = float(os.environ.get('IMPORT_MAX_MB', 5))
+app.config['IMPORT_CACHE_DIR'] = os.environ.get(
+    'IMPORT_CACHE_DIR', os.path.join(app.instance_path, 'import-cache'))
+# Renders, imports and batches a client may start per minute, and at once.
+app.config['RATE_LIMIT'] = float(os.environ.get('RATE_LIMIT', 60))
+app.config['RATE_BURST'] = int(os.environ.get('RATE_BURST', 20))
+# Proxies in front of the app whose X-Forwarded-For names the client.
+app.config['TRUSTED_PROXIES'] = int(os.environ.get('TRUSTED_PROXIES', 0))
+# Threads per server worker (see server.py); every live editor's event stream holds one.
+app.config['WEB_THREADS'] = int(os.environ.get('WEB_THREADS', 8))
+# Live sessions live in process memory, so all editors of a resume must reach
+# the same process: with several workers live editing is off.
+app.config['LIVE_EDITING'] = app.config['WEB_WORKERS'] == 1
+# Event streams open at once; half the threads stay free for other requests,
+# the editors' own edits included.
+app.config['LIVE_MAX_STREAMS'] = int(os.environ.get(
+    'LIVE_MAX_STREAMS', max(1, app.config['WEB_THREADS'] // 2)))
+app.config['LIVE_MAX_PEERS'] = int(os.environ.get('LIVE_MAX_PEERS', 16))
+app.config['LIVE_PERSIST_SECONDS'] = float(os.environ.get('LIVE_PERSIST_SECONDS', 2))
+# The search index is a SQLite file next to the store; with an in-memory
+# store it is kept in memory as well.
+app.config['SEARCH_INDEX'] = os.environ.get(
+    'SEARCH_INDEX',
+    ':memory:' if app.config['RESUME_STORE'].startswith('memory:') else os.path.join(app.instance_path, 'search.db'))
+# Search lists every stored resume, so it is off unless a token is set;
+# recruiters send it as "Authorization: Bearer <token>".
+app.config['SEARCH_TOKEN'] = os.environ.get('SEARCH_TOKEN') or None
+# Where server workers share metric snapshots (set by gunicorn.conf.py).
+app.config['METRICS_DIR'] = os.environ.get('METRICS_DIR')
+# Dump stack samples of requests slower than this many ms (off when unset).
+app.config['PROFILE_SLOW_MS'] = float(os.environ.get('PROFILE_SLOW_MS', 0)) or None
+app.config['PROFILE_DIR'] = os.environ.get('PROFILE_DIR', os.path.join(app.instance_path, 'profiles'))
+# Resume layouts (see layouts.py); edits there are picked up while running.
+app.config['LAYOUT_DIR'] = os.environ.get('LAYOUT_DIR', os.path.join(app.root_path, 'templates', 'layouts'))
+app.config['LAYOUT_CACHE_DIR'] = os.environ.get('LAYOUT_CACHE_DIR', os.path.join(app.instance_path, 'jinja-cache'))
+# 'bundled' serves the output of `flask build-assets`, 'cdn' the original CDN links.
+app.config['ASSET_MODE'] = os.environ.get('ASSET_MODE', 'bundled')
+
+# We embed the HTML/JS template directly here for a single-file solution.
+# In a real project, this would be in a 'templates' folder.
+HTML_TEMPLATE = """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Student Resume Builder</title>
+    
+    <!-- Self-hosted bundles come from `flask build-assets`; anything not built loads from its CDN. -->
+    <!-- The page is streamed in parts (see StreamedPage): only what the editor needs
+         to paint is up here; the preview and the scripts follow in later chunks. -->
+    <!-- Tailwind CSS: just the rules the editor form uses are inlined; the
+         whole bundle is linked before the preview, so it never blocks the form -->
+    {% if assets['app.css'] %}
+    <style>{{ critical_css }}</style>
+    {% else %}
+    <script src="https://cdn.tailwindcss.com"></script>
+    {% endif %}
+
+    <style>
+        /* Custom Scrollbar for Editor */
+        .custom-scrollbar::-webkit-scrollbar { width: 6px; }
+        .custom-scrollbar::-webkit-scrollbar-track { background: #f1f5f9; }
+        .custom-scrollbar::-webkit-scrollbar-thumb { background: #cbd5e1; border-radius: 4px; }
+        .custom-scrollbar::-webkit-scrollbar-thumb:hover { background: #94a3b8; }
+
+        /* PDF Generation Styles */
+        .resume-page {
+            width: 210mm;
+            min-height: 297mm;
+            background: white;
+            margin: 0 auto;
+            box-shadow: 0 10px 15px -3px rgb(0 0 0 / 0.1);
+        }
+        
+        .page-break {
+            position: absolute; left: 0; right: 0; height: 0;
+            border-top: 2px dashed #94a3b8;
+            pointer-events: none;
+        }
+
+        @page { size: A4; margin: 0; }
+
+        @media print {
+            .page-break { display: none; }
+            body * { visibility: hidden; }
+            #resume-preview, #resume-preview * { visibility: visible; }
+            #resume-preview { position: absolute; left: 0; top: 0; width: 100%; margin: 0; padding: 0; box-shadow: none; }
+        }
+    </style>
+</head>
+<body class="bg-slate-100 text-slate-800 h-screen flex flex-col md:flex-row overflow-hidden" 
+      x-data="resumeApp()">
+
+    <!-- LEFT SIDEBAR: EDITOR -->
+    <div class="w-full md:w-1/3 lg:w-96 bg-white border-r border-slate-200 h-full flex flex-col shadow-xl z-10">
+        
+        <!-- Header -->
+        <div class="p-4 border-b border-slate-200 bg-slate-50 flex items-center justify-between">
+            <h1 class="text-xl font-bold text-slate-800 flex items-center gap-2">
+                <i class="fa-solid fa-file-lines text-blue-600"></i> Builder
+                <span class="text-xs font-normal text-slate-400" x-text="saveStatus"></span>
+            </h1>
+            <div class="flex items-center gap-2">
+                <label title="Import a PDF or DOCX resume"
+                       class="cursor-pointer bg-white hover:bg-slate-100 border border-slate-300 text-slate-600 px-3 py-2 rounded-md text-sm font-medium flex items-center gap-2 transition-colors shadow-sm">
+                    <i class="fa-solid fa-file-import"></i>
+                    <input type="file" accept=".pdf,.docx,application/pdf,application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+                           class="hidden" @change="importFile($event)">
+                </label>
+                {% if live_editing %}
+                <button @click="live ? stopLive() : startLive()"
+                        :title="live ? 'Stop editing live' : 'Edit live with others (copies a link to share)'"
+                        :class="live ? 'bg-green-50 border-green-400 text-green-700' : 'bg-white hover:bg-slate-100 border-slate-300 text-slate-600'"
+                        class="border px-3 py-2 rounded-md text-sm font-medium flex items-center gap-2 transition-colors shadow-sm">
+                    <i class="fa-solid fa-users"></i>
+                </button>
+                {% endif %}
+                <button @click="downloadPDF()" 
+                        class="bg-blue-600 hover:bg-blue-700 text-white px-4 py-2 rounded-md text-sm font-medium flex items-center gap-2 transition-colors shadow-sm">
+                    <i class="fa-solid fa-download"></i> <span>Download PDF</span>
+                </button>
+            </div>
+        </div>
+
+        <!-- Tabs -->
+        <div class="flex bg-slate-100 p-1 space-x-1">
+            <template x-for="tab in tabs" :key="tab.id">
+                <button @click="activeTab = tab.id"
+                        :class="activeTab === tab.id ? 'bg-white text-blue-600 shadow-sm' : 'text-slate-500 hover:text-slate-700'"
+                        class="flex-1 py-2 px-1 rounded-md text-xs font-medium transition-all flex flex-col items-center">
+                    <i :class="tab.icon + ' mb-1 text-base'"></i>
+                    <span x-text="tab.label"></span>
+                </button>
+            </template>
+        </div>
+
+        <!-- Form Content -->
+        <div class="flex-1 overflow-y-auto p-4 custom-scrollbar">
+            
+            <!-- Template Selector -->
+            <div class="mb-6 bg-slate-50 p-3 rounded-lg border border-slate-200">
+                <label class="text-xs font-bold text-slate-500 uppercase tracking-wide mb-2 block">Template</label>
+                <div class="grid grid-cols-3 gap-2">
+                    {% for layout in layouts %}
+                    <button @click="template = '{{ layout.name }}'" :class="template === '{{ layout.name }}' ? 'bg-blue-100 border-blue-400 text-blue-700' : 'bg-white border-slate-200'" class="py-1 px-2 rounded text-xs border font-medium">{{ layout.label }}</button>
+                    {% endfor %}
+                </div>
+            </div>
+
+            <!-- PERSONAL TAB -->
+            <div x-show="activeTab === 'personal'" class="space-y-3">
+                <div>
+                    <label class="text-xs font-bold text-slate-600">Full Name</label>
+                    <input type="text" x-model="data.personal.fullName" class="w-full border rounded px-3 py-2 text-sm focus:ring-2 focus:ring-blue-500 outline-none">
+                </div>
+                <div>
+                    <label class="text-xs font-bold text-slate-600">Email</label>
+                    <input type="text" x-model="data.personal.email" class="w-full border rounded px-3 py-2 text-sm focus:ring-2 focus:ring-blue-500 outline-none">
+                </div>
+                <div>
+                    <label class="text-xs font-bold text-slate-600">Phone</label>
+                    <input type="text" x-model="data.personal.phone" class="w-full border rounded px-3 py-2 text-sm focus:ring-2 focus:ring-blue-500 outline-none">
+                </div>
+                <div>
+                    <label class="text-xs font-bold text-slate-600">Location</label>
+                    <input type="text" x-model="data.personal.location" class="w-full border rounded px-3 py-2 text-sm focus:ring-2 focus:ring-blue-500 outline-none">
+                </div>
+                <div>
+                    <label class="text-xs font-bold text-slate-600">LinkedIn</label>
+                    <input type="text" x-model="data.personal.linkedin" class="w-full border rounded px-3 py-2 text-sm focus:ring-2 focus:ring-blue-500 outline-none">
+                </div>
+                 <div>
+                    <label class="text-xs font-bold text-slate-600">Summary</label>
+                    <textarea x-model="data.personal.summary" rows="4" class="w-full border rounded px-3 py-2 text-sm focus:ring-2 focus:ring-blue-500 outline-none"></textarea>
+                </div>
+            </div>
+
+            <!-- EDUCATION TAB -->
+            <div x-show="activeTab === 'education'" class="space-y-4">
+                <template x-for="(edu, index) in data.education" :key="edu.id">
+                    <div class="bg-slate-50 p-3 rounded border border-slate-200 relative">
+                        <button @click="removeItem('education', edu.id)" class="absolute top-2 right-2 text-slate-400 hover:text-red-500 transition-colors"><i class="fa-solid fa-trash"></i></button>
+                        <h3 class="text-xs font-bold text-slate-400 uppercase mb-2">Education <span x-text="index + 1"></span></h3>
+                        <input type="text" x-model="edu.school" placeholder="School" class="w-full border rounded px-2 py-1 text-sm mb-2">
+                        <input type="text" x-model="edu.degree" placeholder="Degree" class="w-full border rounded px-2 py-1 text-sm mb-2">
+                        <div class="flex gap-2 mb-2">
+                            <input type="text" x-model="edu.date" placeholder="Year" class="w-1/2 border rounded px-2 py-1 text-sm">
+                            <input type="text" x-model="edu.gpa" placeholder="GPA" class="w-1/2 border rounded px-2 py-1 text-sm">
+                        </div>
+                        <textarea x-model="edu.details" placeholder="Details" class="w-full border rounded px-2 py-1 text-sm"></textarea>
+                    </div>
+                </template>
+                <button @click="addItem('education')" class="w-full py-2 border-2 border-dashed border-slate-300 rounded text-slate-500 hover:border-blue-500 hover:text-blue-500 text-sm font-medium transition-colors">
+                    <i class="fa-solid fa-plus mr-1"></i> Add Education
+                </button>
+            </div>
+
+            <!-- EXPERIENCE TAB -->
+            <div x-show="activeTab === 'experience'" class="space-y-4">
+                 <template x-for="(exp, index) in data.experience" :key="exp.id">
+                    <div class="bg-slate-50 p-3 rounded border border-slate-200 relative">
+                        <button @click="removeItem('experience', exp.id)" class="absolute top-2 right-2 text-slate-400 hover:text-red-500 transition-colors"><i class="fa-solid fa-trash"></i></button>
+                        <h3 class="text-xs font-bold text-slate-400 uppercase mb-2">Job <span x-text="index + 1"></span></h3>
+                        <input type="text" x-model="exp.company" placeholder="Company" class="w-full border rounded px-2 py-1 text-sm mb-2">
+                        <input type="text" x-model="exp.role" placeholder="Role" class="w-full border rounded px-2 py-1 text-sm mb-2">
+                        <div class="flex gap-2 mb-2">
+                            <input type="text" x-model="exp.location" placeholder="Location" class="w-1/2 border rounded px-2 py-1 text-sm">
+                            <input type="text" x-model="exp.date" placeholder="Date" class="w-1/2 border rounded px-2 py-1 text-sm">
+                        </div>
+                        <textarea x-model="exp.details" placeholder="Responsibilities" rows="3" class="w-full border rounded px-2 py-1 text-sm"></textarea>
+                    </div>
+                </template>
+                <button @click="addItem('experience')" class="w-full py-2 border-2 border-dashed border-slate-300 rounded text-slate-500 hover:border-blue-500 hover:text-blue-500 text-sm font-medium transition-colors">
+                    <i class="fa-solid fa-plus mr-1"></i> Add Experience
+                </button>
+            </div>
+
+            <!-- PROJECTS TAB -->
+            <div x-show="activeTab === 'projects'" class="space-y-4">
+                 <template x-for="(proj, index) in data.projects" :key="proj.id">
+                    <div class="bg-slate-50 p-3 rounded border border-slate-200 relative">
+                        <button @click="removeItem('projects', proj.id)" class="absolute top-2 right-2 text-slate-400 hover:text-red-500 transition-colors"><i class="fa-solid fa-trash"></i></button>
+                        <h3 class="text-xs font-bold text-slate-400 uppercase mb-2">Project <span x-text="index + 1"></span></h3>
+                        <input type="text" x-model="proj.name" placeholder="Project Name" class="w-full border rounded px-2 py-1 text-sm mb-2">
+                        <input type="text" x-model="proj.technologies" placeholder="Tech Stack" class="w-full border rounded px-2 py-1 text-sm mb-2">
+                        <input type="text" x-model="proj.link" placeholder="Link" class="w-full border rounded px-2 py-1 text-sm mb-2">
+                        <textarea x-model="proj.details" placeholder="Description" rows="2" class="w-full border rounded px-2 py-1 text-sm"></textarea>
+                    </div>
+                </template>
+                <button @click="addItem('projects')" class="w-full py-2 border-2 border-dashed border-slate-300 rounded text-slate-500 hover:border-blue-500 hover:text-blue-500 text-sm font-medium transition-colors">
+                    <i class="fa-solid fa-plus mr-1"></i> Add Project
+                </button>
+            </div>
+
+            <!-- SKILLS TAB -->
+             <div x-show="activeTab === 'skills'" class="space-y-2">
+                <template x-for="(skill, index) in data.skills" :key="index">
+                    <div class="flex gap-2">
+                        <input type="text" x-model="data.skills[index]" class="flex-1 border rounded px-2 py-2 text-sm">
+                        <button @click="removeSkill(index)" class="text-slate-400 hover:text-red-500"><i class="fa-solid fa-trash"></i></button>
+                    </div>
+                </template>
+                <button @click="addSkill()" class="w-full py-2 mt-2 border-2 border-dashed border-slate-300 rounded text-slate-500 hover:border-blue-500 hover:text-blue-500 text-sm font-medium transition-colors">
+                    <i class="fa-solid fa-plus mr-1"></i> Add Skill
+                </button>
+            </div>
+
+        </div>
+    </div>
+
+    <!-- flush -->
+    {% if assets['app.css'] %}
+    <link rel="stylesheet" href="{{ assets['app.css'] }}">
+    {% endif %}
+    <!-- RIGHT SIDEBAR: PREVIEW -->
+    <div class="flex-1 bg-slate-200 p-8 overflow-y-auto flex justify-center">
+        
+        <!-- RESUME CONTAINER (This is what gets printed) -->
+        <!-- Only the active layout is mounted (x-if), so edits re-render one layout, not all.
+             Layouts come from templates/layouts (see layouts.py) and read `preview`,
+             a copy of `data` updated at most once per animation frame. -->
+        <div id="resume-preview" class="resume-page relative p-8" :style="{ height: pages * 297 + 'mm' }">
+            <!-- Page boundaries, for the eye only; the paginator keeps blocks off them. -->
+            <template x-for="n in pages - 1" :key="n">
+                <div class="page-break" data-html2canvas-ignore :style="{ top: n * 297 + 'mm' }"></div>
+            </template>
+
+            {% for layout in layouts %}
+            <!-- --- {{ layout.label | upper }} TEMPLATE --- -->
+            <template x-if="template === '{{ layout.name }}'">
+                {{ layout.preview | indent(16) }}
+            </template>
+
+            {% endfor %}
+        </div>
+    </div>
+
+    <!-- flush -->
+    <!-- FontAwesome for Icons (not render-blocking: icons fill in when it arrives) -->
+    <link rel="stylesheet" href="{{ assets['icons.css'] or 'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css' }}" media="print" onload="this.media='all'">
+
+    <!-- Alpine.js (for reactive state management, similar to React but for HTML) -->
+    <script defer src="{{ assets['alpine.js'] or 'https://cdn.jsdelivr.net/npm/alpinejs@3.13.3/dist/cdn.min.js' }}"></script>
+
+    <!-- html2pdf.js (offline fallback for PDF download) -->
+    <script defer id="html2pdf-script" src="{{ assets['html2pdf.js'] or 'https://cdnjs.cloudflare.com/ajax/libs/html2pdf.js/0.10.1/html2pdf.bundle.min.js' }}"></script>
+
+    <!-- Application Logic -->
+    <script>
+        // Builds an RFC 6902 patch that turns `before` into `after`.
+        function escapePointer(key) {
+            return String(key).split('~').join('~0').split('/').join('~1');
+        }
+
+        function diffPatch(before, after, path = '', ops = []) {
+            if (before === after) return ops;
+            const isObject = v => v !== null && typeof v === 'object' && !Array.isArray(v);
+            if (Array.isArray(before) && Array.isArray(after)) {
+                const common = Math.min(before.length, after.length);
+                for (let i = 0; i < common; i++) diffPatch(before[i], after[i], `${path}/${i}`, ops);
+                for (let i = common; i < after.length; i++) ops.push({ op: 'add', path: `${path}/${i}`, value: after[i] });
+                for (let i = before.length - 1; i >= common; i--) ops.push({ op: 'remove', path: `${path}/${i}` });
+            } else if (isObject(before) && isObject(after)) {
+                for (const key of Object.keys(before)) {
+                    if (!(key in after)) ops.push({ op: 'remove', path: `${path}/${escapePointer(key)}` });
+                }
+                for (const key of Object.keys(after)) {
+                    const child = `${path}/${escapePointer(key)}`;
+                    if (key in before) diffPatch(before[key], after[key], child, ops);
+                    else ops.push({ op: 'add', path: child, value: after[key] });
+                }
+            } else {
+                ops.push({ op: 'replace', path, value: after });
+            }
+            return ops;
+        }
+
+        // Applies a patch from diffPatch in place, so only the changed paths notify watchers.
+        function applyPatch(doc, ops) {
+            const copy = value => value === undefined ? value : JSON.parse(JSON.stringify(value));
+            for (const { op, path, value } of ops) {
+                const keys = path.split('/').slice(1).map(k => k.split('~1').join('/').split('~0').join('~'));
+                const last = keys.pop();
+                const parent = keys.reduce((node, key) => node[key], doc);
+                if (op === 'remove') {
+                    if (Array.isArray(parent)) parent.splice(Number(last), 1);
+                    else delete parent[last];
+                } else if (op === 'add' && Array.isArray(parent)) {
+                    parent.splice(Number(last), 0, copy(value));
+                } else {
+                    parent[last] = copy(value);
+                }
+            }
+        }
+
+        // Server-rendered PDFs, cached in IndexedDB under the render key the
+        // server sent with them (X-Render-Key), so a new layout version or a
+        // different template never reuses an old file.
+        const renderCache = {
+            limit: 20,
+            db: null,
+
+            open() {
+                if (!this.db) {
+                    this.db = new Promise((resolve, reject) => {
+                        const req = indexedDB.open('resume-renders', 1);
+                        req.onupgradeneeded = () => {
+                            req.result.createObjectStore('renders', { keyPath: 'key' }).createIndex('at', 'at');
+                        };
+                        req.onsuccess = () => resolve(req.result);
+                        req.onerror = () => reject(req.error);
+                    });
+                }
+                return this.db;
+            },
+
+            // The render key of the last PDF downloaded for a resume and template.
+            latest(resumeId, template) {
+                return localStorage.getItem(`render:${resumeId}:${template}`);
+            },
+
+            remember(resumeId, template, key) {
+                localStorage.setItem(`render:${resumeId}:${template}`, key);
+            },
+
+            async get(key) {
+                const db = await this.open();
+                return new Promise(resolve => {
+                    const req = db.transaction('renders').objectStore('renders').get(key);
+                    req.onsuccess = () => resolve(req.result ? req.result.blob : null);
+                    req.onerror = () => resolve(null);
+                });
+            },
+
+            async put(key, blob) {
+                const db = await this.open();
+                const store = db.transaction('renders', 'readwrite').objectStore('renders');
+                store.put({ key, blob, at: Date.now() });
+                // Keep only the most recent renders.
+                const count = store.count();
+                count.onsuccess = () => {
+                    let excess = count.result - this.limit;
+                    if (excess <= 0) return;
+                    store.index('at').openCursor().onsuccess = e => {
+                        const cursor = e.target.result;
+                        if (cursor && excess-- > 0) { cursor.delete(); cursor.continue(); }
+                    };
+                };
+            }
+        };
+
+        // The resume as last edited on this device, so it survives reloads and
+        // going offline. `saved` is the JSON the server last acknowledged; the
+        // service worker (/sw.js) syncs drafts whose data differs from it.
+        const drafts = {
+            db: null,
+
+            open() {
+                if (!this.db) {
+                    this.db = new Promise((resolve, reject) => {
+                        const req = indexedDB.open('resume-drafts', 1);
+                        req.onupgradeneeded = () => req.result.createObjectStore('drafts', { keyPath: 'id' });
+                        req.onsuccess = () => resolve(req.result);
+                        req.onerror = () => reject(req.error);
+                    });
+                }
+                return this.db;
+            },
+
+            async get(id) {
+                const db = await this.open();
+                return new Promise(resolve => {
+                    const req = db.transaction('drafts').objectStore('drafts').get(id);
+                    req.onsuccess = () => resolve(req.result || null);
+                    req.onerror = () => resolve(null);
+                });
+            },
+
+            async put(draft) {
+                const db = await this.open();
+                db.transaction('drafts', 'readwrite').objectStore('drafts').put(draft);
+            }
+        };
+
+        // Ask the service worker to push unsynced drafts once the network is back.
+        async function requestSync() {
+            if (!('serviceWorker' in navigator)) return;
+            const registration = await navigator.serviceWorker.ready;
+            if (registration.sync) await registration.sync.register('resume-sync');
+        }
+
+        // Live editing (see collab.py). `liveApply` is collab.apply: every editor
+        // applies the server's operations in the server's order, so all copies
+        // converge. `confirmed` is the state the server has sequenced; the editor
+        // shows it plus this editor's operations not yet seen back in the stream.
+        const LIVE_SECTIONS = ['education', 'experience', 'projects'];
+
+        function liveApply(state, op) {
+            const [section, key, field] = op.path;
+            if (section === 'personal') { state.personal[key] = op.value; return; }
+            const records = state[section];
+            const index = records.findIndex(record => record[0] === key);
+            if (op.op === 'set') {
+                if (index < 0) return;
+                if (section === 'skills') records[index][1] = op.value;
+                else records[index][1][field] = op.value;
+            } else if (op.op === 'del') {
+                if (index >= 0) records.splice(index, 1);
+            } else if (index < 0) {
+                let at = 0;
+                if (op.after !== null) {
+                    at = records.findIndex(record => record[0] === op.after);
+                    at = at >= 0 ? at + 1 : records.length;  // unknown anchor: at the end
+                }
+                records.splice(at, 0, [key, JSON.parse(JSON.stringify(op.value))]);
+            }
+        }
+
+        function liveDoc(state) {
+            const doc = { schemaVersion: {{ schema_version }}, personal: Object.assign({}, state.personal) };
+            for (const section of [...LIVE_SECTIONS, 'skills']) doc[section] = state[section].map(record => record[1]);
+            return JSON.parse(JSON.stringify(doc));
+        }
+
+        // The operations that turn `state` into `doc` (the editor's data).
+        function liveDiff(state, doc, newKey) {
+            const ops = [];
+            for (const [field, value] of Object.entries(doc.personal)) {
+                if (state.personal[field] !== value) ops.push({ op: 'set', path: ['personal', field], value });
+            }
+            for (const section of LIVE_SECTIONS) {
+                const before = new Map(state[section]);
+                const keys = new Set(doc[section].map(item => String(item.id)));
+                for (const [key] of state[section]) {
+                    if (!keys.has(key)) ops.push({ op: 'del', path: [section, key] });
+                }
+                let after = null;
+                for (const item of doc[section]) {
+                    const key = String(item.id), old = before.get(key);
+                    if (!old) {
+                        ops.push({ op: 'ins', path: [section, key], after, value: JSON.parse(JSON.stringify(item)) });
+                    } else {
+                        for (const [field, value] of Object.entries(item)) {
+                            if (field !== 'id' && old[field] !== value) ops.push({ op: 'set', path: [section, key, field], value });
+                        }
+                    }
+                    after = key;
+                }
+            }
+            // Skills have no ids: keep the unchanged ends and pair up the middle.
+            const records = state.skills, skills = doc.skills;
+            let start = 0, end = 0;
+            while (start < records.length && start < skills.length && records[start][1] === skills[start]) start++;
+            while (end < records.length - start && end < skills.length - start
+                   && records[records.length - 1 - end][1] === skills[skills.length - 1 - end]) end++;
+            const removed = records.slice(start, records.length - end), added = skills.slice(start, skills.length - end);
+            let after = start ? records[start - 1][0] : null;
+            for (let i = 0; i < Math.max(removed.length, added.length); i++) {
+                if (i < removed.length && i < added.length) {
+                    ops.push({ op: 'set', path: ['skills', removed[i][0]], value: added[i] });
+                    after = removed[i][0];
+                } else if (i < removed.length) {
+                    ops.push({ op: 'del', path: ['skills', removed[i][0]] });
+                } else {
+                    const key = newKey();
+                    ops.push({ op: 'ins', path: ['skills', key], after, value: added[i] });
+                    after = key;
+                }
+            }
+            return ops;
+        }
+
+        const liveSession = {
+            site: Math.random().toString(36).slice(2, 10),  // this editor, in operations
+            source: null,
+            resumeId: null,
+            view: null,         // {read, write, status} callbacks into the editor
+            epoch: null,        // the server session the state came from
+            confirmed: null,
+            visible: null,      // confirmed + pending + outbox
+            pending: [],        // [{batch, ops, acked, seq}] sent or being sent, oldest first
+            outbox: [],         // operations not in a batch yet
+            batch: 0,
+            counter: 0,
+            posting: false,
+
+            get active() { return this.source !== null; },
+
+            uniqueId() {
+                return `${this.site}-${++this.counter}`;
+            },
+
+            start(resumeId, view) {
+                this.resumeId = resumeId;
+                this.view = view;
+                const source = this.source = new EventSource(`/api/resume/${resumeId}/live`);
+                source.addEventListener('snapshot', e => {
+                    const body = JSON.parse(e.data);
+                    const epoch = e.lastEventId.split('-')[0];
+                    this.push(view.read());
+                    // A new session on the server loaded what earlier ones wrote back.
+                    this.pending = this.pending.filter(b => !b.acked || (epoch === this.epoch && b.seq > body.seq));
+                    this.epoch = epoch;
+                    this.confirmed = body.state;
+                    this.rebuild(body.peers);
+                });
+                source.addEventListener('ops', e => {
+                    const body = JSON.parse(e.data);
+                    this.push(view.read());
+                    for (const [, site, batch, ops] of body.batches) {
+                        ops.forEach(op => liveApply(this.confirmed, op));
+                        if (site === this.site) this.pending = this.pending.filter(b => b.batch > batch);
+                    }
+                    this.pending = this.pending.filter(b => !b.acked || b.seq > body.seq);
+                    this.rebuild(body.peers);
+                });
+                source.addEventListener('peers', e => view.status(JSON.parse(e.data).peers));
+                // EventSource reconnects by itself, unless the server refused the stream.
+                source.onerror = () => view.status(source.readyState === EventSource.CLOSED ? null : 0);
+            },
+
+            stop() {
+                if (this.source) this.source.close();
+                this.source = this.confirmed = this.visible = null;
+                this.pending = [];
+                this.outbox = [];
+            },
+
+            // Local edits: whatever `doc` changed since the state shown, as operations.
+            push(doc) {
+                if (!this.visible) return;
+                const ops = liveDiff(this.visible, doc, () => this.uniqueId());
+                if (!ops.length) return;
+                ops.forEach(op => liveApply(this.visible, op));
+                this.outbox.push(...ops);
+                this.flush();
+            },
+
+            rebuild(peers) {
+                this.visible = JSON.parse(JSON.stringify(this.confirmed));
+                for (const b of this.pending) b.ops.forEach(op => liveApply(this.visible, op));
+                this.outbox.forEach(op => liveApply(this.visible, op));
+                this.view.write(liveDoc(this.visible));
+                this.view.status(peers);
+            },
+
+            // One POST in flight at a time; a retry resends the same batch number,
+            // which the server applies only once.
+            async flush() {
+                if (this.posting || !this.active) return;
+                let next = this.pending.find(b => !b.acked);
+                if (!next) {
+                    if (!this.outbox.length) return;
+                    next = { batch: ++this.batch, ops: this.outbox.splice(0, 500) };
+                    this.pending.push(next);
+                }
+                this.posting = true;
+                let retry = false;
+                try {
+                    const res = await fetch(`/api/resume/${this.resumeId}/live`, {
+                        method: 'POST',
+                        headers: { 'Content-Type': 'application/json' },
+                        body: JSON.stringify({ site: this.site, batch: next.batch, ops: next.ops })
+                    });
+                    if (res.ok) {
+                        next.acked = true;
+                        next.seq = (await res.json()).seq;
+                    } else if (res.status === 400) {
+                        this.pending = this.pending.filter(b => b !== next);  // rejected: undo it
+                        if (this.confirmed) this.rebuild();
+                    } else {
+                        retry = true;  // 409 until the stream has reconnected
+                    }
+                } catch (e) {
+                    retry = true;
+                } finally {
+                    this.posting = false;
+                }
+                if (retry) setTimeout(() => this.flush(), 1000);
+                else this.flush();
+            }
+        };
+
+        // Splits the preview into A4 pages. Layouts mark what must not be split with
+        // data-block (data-block="keep" for headings that stay with what follows);
+        // a block that would cross a page's bottom margin gets a margin-top that
+        // moves it to the top of the next page. A ResizeObserver reports which
+        // blocks changed size, and only blocks from the first of those on are
+        // placed again, so an edit costs a few reads, not a pass over the resume.
+        const PAGE_HEIGHT = 297 * 96 / 25.4;  // A4, in CSS px
+        const PAGE_MARGIN = 32;               // p-8 on #resume-preview
+
+        const paginator = {
+            root: null,
+            blocks: [],
+            index: new Map(),      // block -> position in `blocks`
+            state: new WeakMap(),  // block -> { base, shift, bottom }
+            dirty: null,           // first block to place again
+            observer: null,
+            onLayout: null,
+
+            attach(root, onLayout) {
+                this.root = root;
+                this.onLayout = onLayout;
+                this.observer = new ResizeObserver(entries => {
+                    for (const entry of entries) this.invalidate(this.index.get(entry.target));
+                    this.layout();
+                });
+            },
+
+            invalidate(i) {
+                if (i !== undefined && (this.dirty === null || i < this.dirty)) this.dirty = i;
+            },
+
+            // Pick up blocks added or removed by the last render.
+            scan() {
+                const blocks = Array.from(this.root.querySelectorAll('[data-block]'));
+                let first = 0;
+                while (first < blocks.length && blocks[first] === this.blocks[first]) first++;
+                if (first === blocks.length && blocks.length === this.blocks.length) return;
+                const current = new Set(blocks);
+                for (const el of this.blocks) if (!current.has(el)) this.observer.unobserve(el);
+                this.index = new Map(blocks.map((el, i) => [el, i]));
+                for (const el of blocks) {
+                    if (this.state.has(el)) continue;
+                    this.state.set(el, { base: parseFloat(getComputedStyle(el).marginTop) || 0, shift: 0, bottom: 0 });
+                    this.observer.observe(el);
+                }
+                this.blocks = blocks;
+                this.invalidate(first);
+                this.layout();
+            },
+
+            // Where a block whose top would be at `top` should go instead.
+            target(top, height) {
+                const page = Math.floor(top / PAGE_HEIGHT);
+                const start = page * PAGE_HEIGHT + (page ? PAGE_MARGIN : 0);
+                if (top < start) return start;  // in the top margin of a page
+                const fits = top + height <= (page + 1) * PAGE_HEIGHT - PAGE_MARGIN;
+                // Taller than a whole page: let it run over rather than push it forever.
+                if (fits || height > PAGE_HEIGHT - 2 * PAGE_MARGIN) return top;
+                return (page + 1) * PAGE_HEIGHT + PAGE_MARGIN;
+            },
+
+            move(el, state, top, to, origin) {
+                const shift = to - top;
+                if (Math.abs(shift - state.shift) < 0.5) return;
+                el.style.marginTop = shift ? `${state.base + shift}px` : '';
+                // Margins may collapse with the parent's; measure what the move really was.
+                state.shift = el.getBoundingClientRect().top - origin - top;
+                if (shift && Math.abs(state.shift - shift) >= 0.5) {
+                    el.style.marginTop = `${state.base + 2 * shift - state.shift}px`;
+                    state.shift = el.getBoundingClientRect().top - origin - top;
+                }
+            },
+
+            layout() {
+                if (this.dirty === null) return;
+                const started = performance.now();
+                const origin = this.root.getBoundingClientRect().top;
+                const forced = new Set();
+                let placed = 0;
+                for (let i = this.dirty; i < this.blocks.length; i++) {
+                    const el = this.blocks[i], state = this.state.get(el);
+                    const rect = el.getBoundingClientRect();
+                    placed++;
+                    if (!rect.height && !rect.width) {  // hidden (x-show)
+                        state.bottom = 0;
+                        continue;
+                    }
+                    const top = rect.top - origin - state.shift;
+                    let to = this.target(top, rect.height);
+                    const prev = this.blocks[i - 1];
+                    if (to !== top && prev && prev.dataset.block === 'keep' && !forced.has(i - 1)) {
+                        // Take the heading along when it sits right above.
+                        const above = prev.getBoundingClientRect();
+                        if (above.height && top - (above.bottom - origin) < 24 && above.top - origin < top) {
+                            forced.add(i - 1);
+                            const prevState = this.state.get(prev);
+                            const prevTop = above.top - origin - prevState.shift;
+                            this.move(prev, prevState, prevTop, to, origin);
+                            prevState.bottom = to + above.height;
+                            i -= 1;  // and place this block again, after it
+                            continue;
+                        }
+                    }
+                    this.move(el, state, top, to, origin);
+                    state.bottom = to + rect.height;
+                }
+                this.dirty = null;
+                let bottom = 0;
+                for (const el of this.blocks) bottom = Math.max(bottom, this.state.get(el).bottom);
+                const pages = Math.max(1, Math.ceil((bottom + PAGE_MARGIN) / PAGE_HEIGHT));
+                this.onLayout(pages, placed, performance.now() - started);
+            }
+        };
+
+        // html2pdf.js loads deferred; if it is not there yet (or failed on a bad
+        // connection), fetch it again, from the service worker's cache if it can.
+        function loadHtml2pdf() {
+            if (typeof html2pdf !== 'undefined') return Promise.resolve();
+            return new Promise((resolve, reject) => {
+                const script = document.createElement('script');
+                script.src = document.getElementById('html2pdf-script').src;
+                script.onload = resolve;
+                script.onerror = reject;
+                document.head.appendChild(script);
+            });
+        }
+
+        // Rasterises the paginated preview one page at a time: a page-sized window
+        // onto a copy of it is moved down a page for each, so only one page's
+        // canvas exists at once, however long the resume is.
+        function exportPages(element, pages) {
+            const sheet = document.createElement('div');
+            sheet.setAttribute('x-ignore', '');  // a static copy; keep Alpine off it
+            // A hair under A4, so rounding never spills a sliver onto an extra PDF page.
+            sheet.style.cssText = 'width: 210mm; height: 296.5mm; overflow: hidden; background: white;';
+            const copy = element.cloneNode(true);
+            copy.removeAttribute('id');
+            copy.style.margin = '0';
+            copy.style.boxShadow = 'none';
+            copy.querySelectorAll('.page-break').forEach(el => el.remove());
+            sheet.appendChild(copy);
+            const opt = {
+                margin: 0,
+                filename: 'Resume.pdf',
+                image: { type: 'jpeg', quality: 0.98 },
+                html2canvas: { scale: 2 },
+                jsPDF: { unit: 'mm', format: 'a4', orientation: 'portrait' }
+            };
+            let worker = html2pdf().set(opt).from(sheet).toContainer().toCanvas().toPdf();
+            for (let n = 1; n < pages; n++) {
+                worker = worker.get('pdf').then(pdf => {
+                    pdf.addPage();
+                    copy.style.marginTop = `-${n * 297}mm`;
+                }).from(sheet).toContainer().toCanvas().toPdf();
+            }
+            return worker.outputPdf('blob');
+        }
+
+        // Real-user timings, beaconed to the server in batches (see /metrics).
+        const clientMetrics = {
+            pending: { pdf: [], preview: [] },
+
+            record(kind, sample) {
+                if (this.pending[kind].length < 500) this.pending[kind].push(sample);
+            },
+
+            flush() {
+                if (!this.pending.pdf.length && !this.pending.preview.length) return;
+                const body = JSON.stringify(this.pending);
+                this.pending = { pdf: [], preview: [] };
+                if (navigator.sendBeacon && navigator.sendBeacon('/api/metrics/client', body)) return;
+                fetch('/api/metrics/client', { method: 'POST', body, keepalive: true }).catch(() => {});
+            }
+        };
+        setInterval(() => clientMetrics.flush(), 30000);
+        document.addEventListener('visibilitychange', () => {
+            if (document.visibilityState === 'hidden') clientMetrics.flush();
+        });
+
+        document.addEventListener('alpine:init', () => {
+            Alpine.data('resumeApp', () => ({
+                activeTab: 'personal',
+                template: 'modern',
+                resumeId: null,
+                version: 0,
+                saved: null,        // JSON of the last document the server acknowledged
+                saving: false,
+                saveQueued: false,
+                saveStatus: '',
+                live: false,        // editing with others through liveSession
+                preview: null,      // what the layouts render; trails `data` by at most one frame
+                framePending: false,
+                pages: 1,           // A4 pages the preview spans (see paginator)
+                metrics: { edits: 0, commits: 0, coalesced: 0, dropped: 0, lastFrameMs: 0, maxFrameMs: 0, totalFrameMs: 0,
+                           layouts: 0, blocksPlaced: 0, lastLayoutMs: 0 },
+                tabs: [
+                    { id: 'personal', icon: 'fa-solid fa-user', label: 'Bio' },
+                    { id: 'education', icon: 'fa-solid fa-graduation-cap', label: 'Edu' },
+                    { id: 'experience', icon: 'fa-solid fa-briefcase', label: 'Exp' },
+                    { id: 'projects', icon: 'fa-solid fa-code', label: 'Proj' },
+                    { id: 'skills', icon: 'fa-solid fa-award', label: 'Skill' },
+                ],
+                data: {
+                    schemaVersion: {{ schema_version }},   // see schema.py
+                    personal: {
+                        fullName: "Alex Chen",
+                        email: "alex.chen@univ.edu",
+                        phone: "(555) 123-4567",
+                        location: "San Francisco, CA",
+                        linkedin: "linkedin.com/in/alex",
+                        summary: "CS Senior seeking full stack roles. Passionate about React, Python, and scalable systems."
+                    },
+                    education: [
+                        { id: 1, school: "Tech University", degree: "B.S. Computer Science", date: "2025", gpa: "3.8", details: "Data Structures, Algorithms" }
+                    ],
+                    experience: [
+                        { id: 1, company: "StartUp Inc", role: "Intern", location: "Remote", date: "Summer 2024", details: "Built React dashboard. Optimized API calls." }
+                    ],
+                    projects: [
+                        { id: 1, name: "Task App", technologies: "React, Firebase", link: "github.com", details: "Real-time task manager with drag and drop." }
+                    ],
+                    skills: ["Python", "JavaScript", "React", "Flask", "SQL"]
+                },
+
+                init() {
+                    const params = new URLSearchParams(location.search);
+                    this.resumeId = params.get('id') || localStorage.getItem('resumeId')
+                        || Date.now().toString(36) + Math.random().toString(36).slice(2, 10);
+                    localStorage.setItem('resumeId', this.resumeId);
+                    this.preview = JSON.parse(JSON.stringify(this.data));
+                    window.previewMetrics = () => Object.assign({}, Alpine.raw(this.metrics));
+                    paginator.attach(document.getElementById('resume-preview'), (pages, placed, ms) => {
+                        this.pages = pages;
+                        this.metrics.layouts++;
+                        this.metrics.blocksPlaced += placed;
+                        this.metrics.lastLayoutMs = ms;
+                    });
+                    this.$nextTick(() => paginator.scan());
+                    this.$watch('template', () => this.$nextTick(() => paginator.scan()));
+                    this.load().then(() => {
+                        if ({{ live_editing|tojson }} && params.get('live') === '1') this.startLive();
+                    });
+
+                    // Autosave: keep a local draft as you type; once typing pauses,
+                    // send the server only what changed. Live, edits go out as
+                    // operations almost at once instead.
+                    let timer = null, draftTimer = null, liveTimer = null;
+                    this.$watch('data', () => {
+                        this.schedulePreview();
+                        clearTimeout(draftTimer);
+                        draftTimer = setTimeout(() => this.persist(), 150);
+                        if (liveSession.active) {
+                            clearTimeout(liveTimer);
+                            liveTimer = setTimeout(() => liveSession.push(Alpine.raw(this.data)), 50);
+                            return;
+                        }
+                        clearTimeout(timer);
+                        timer = setTimeout(() => this.save(), 800);
+                    });
+
+                    // Browsers without Background Sync retry when the connection returns.
+                    window.addEventListener('online', () => this.save());
+                    if ('serviceWorker' in navigator) {
+                        navigator.serviceWorker.addEventListener('message', event => {
+                            const msg = event.data;
+                            if (msg.type !== 'synced' || msg.id !== this.resumeId) return;
+                            this.version = msg.version;
+                            this.saved = msg.saved;
+                            this.saveStatus = 'Saved';
+                            this.save();  // anything typed since the sync started
+                        });
+                    }
+                },
+
+                persist() {
+                    const draft = { id: this.resumeId, data: JSON.parse(JSON.stringify(this.data)),
+                                    saved: this.saved, version: this.version };
+                    return drafts.put(draft).catch(() => {});
+                },
+
+                // Edits land in `data` immediately (the inputs stay responsive); the
+                // preview catches up once per animation frame, however many edits came in.
+                schedulePreview() {
+                    this.metrics.edits++;
+                    if (this.framePending) {
+                        this.metrics.coalesced++;
+                        return;
+                    }
+                    this.framePending = true;
+                    requestAnimationFrame(() => this.commitPreview());
+                },
+
+                commitPreview() {
+                    this.framePending = false;
+                    const started = performance.now();
+                    const ops = diffPatch(Alpine.raw(this.preview), Alpine.raw(this.data));
+                    if (!ops.length) return;
+                    if (ops.some(op => op.path === '')) this.preview = JSON.parse(JSON.stringify(this.data));
+                    else applyPatch(this.preview, ops);
+                    Alpine.nextTick(() => {
+                        // Time to apply the patch and re-render the affected bindings.
+                        const m = this.metrics;
+                        const ms = performance.now() - started;
+                        m.commits++;
+                        m.lastFrameMs = ms;
+                        m.maxFrameMs = Math.max(m.maxFrameMs, ms);
+                        m.totalFrameMs += ms;
+                        if (ms > 16.7) m.dropped++;
+                        clientMetrics.record('preview', ms);
+                        paginator.scan();
+                    });
+                },
+
+                async load() {
+                    // Show the local draft straight away, then reconcile with the server.
+                    const draft = await drafts.get(this.resumeId).catch(() => null);
+                    const unsynced = draft && JSON.stringify(draft.data) !== draft.saved;
+                    if (draft) {
+                        this.version = draft.version;
+                        this.saved = draft.saved;
+                        this.data = draft.data;
+                        this.saveStatus = unsynced ? 'Not synced yet' : 'Saved';
+                    }
+                    try {
+                        const res = await fetch(`/api/resume/${this.resumeId}`);
+                        if (res.ok) {
+                            const body = await res.json();
+                            this.version = body.version;
+                            this.saved = JSON.stringify(body.data);
+                            if (!unsynced) this.data = body.data;
+                            this.saveStatus = 'Saved';
+                            if (unsynced) await this.save();
+                        } else if (res.status === 404) {
+                            this.saved = null;
+                            await this.save();
+                        }
+                    } catch (e) {
+                        this.saveStatus = 'Offline';
+                        if (unsynced) requestSync().catch(() => {});
+                    }
+                },
+
+                async save() {
+                    if (liveSession.active) return;  // the live session writes the resume back
+                    if (this.saving) { this.saveQueued = true; return; }
+                    const current = JSON.stringify(this.data);
+                    if (current === this.saved) return;
+
+                    this.saving = true;
+                    this.saveStatus = 'Saving...';
+                    const url = `/api/resume/${this.resumeId}`;
+                    const request = this.saved === null
+                        ? { method: 'PUT', headers: { 'Content-Type': 'application/json' }, body: current }
+                        : { method: 'PATCH',
+                            headers: { 'Content-Type': 'application/json-patch+json', 'If-Match': `"${this.version}"` },
+                            body: JSON.stringify(diffPatch(JSON.parse(this.saved), JSON.parse(current))) };
+                    try {
+                        const res = await fetch(url, request);
+                        if (res.ok) {
+                            this.version = (await res.json()).version;
+                            this.saved = current;
+                            this.saveStatus = 'Saved';
+                            this.persist();
+                        } else if (res.status === 409) {
+                            // A live session owns the resume; its editors' changes win.
+                            this.saveStatus = 'Being edited live';
+                        } else if (request.method === 'PATCH') {
+                            // Out of sync with the server (edited elsewhere, or lost): resend it whole.
+                            this.saved = null;
+                            this.saveQueued = true;
+                        } else {
+                            this.saveStatus = 'Save failed';
+                        }
+                    } catch (e) {
+                        // Kept on this device; synced when the connection returns.
+                        this.saveStatus = 'Offline';
+                        this.persist().then(requestSync).catch(() => {});
+                    } finally {
+                        this.saving = false;
+                        if (this.saveQueued) { this.saveQueued = false; this.save(); }
+                    }
+                },
+                
+                async startLive() {
+                    // The session starts from the stored resume, so store it first.
+                    while (this.saving) await new Promise(resolve => setTimeout(resolve, 100));
+                    await this.save();
+                    liveSession.start(this.resumeId, {
+                        read: () => Alpine.raw(this.data),
+                        write: doc => applyPatch(this.data, diffPatch(Alpine.raw(this.data), doc)),
+                        status: peers => {
+                            this.saveStatus = peers === null ? 'Live editing unavailable'
+                                : peers ? `Live: ${peers} editing` : 'Reconnecting...';
+                        }
+                    });
+                    this.live = true;
+                    const url = new URL(location.href);
+                    url.searchParams.set('id', this.resumeId);
+                    url.searchParams.set('live', '1');
+                    history.replaceState(null, '', url);
+                    if (navigator.clipboard) navigator.clipboard.writeText(url.href).catch(() => {});
+                },
+
+                stopLive() {
+                    liveSession.stop();
+                    this.live = false;
+                    const url = new URL(location.href);
+                    url.searchParams.delete('live');
+                    history.replaceState(null, '', url);
+                    this.save();
+                },
+
+                addItem(section) {
+                    const id = liveSession.active ? liveSession.uniqueId()
+                        : Math.max(0, ...this.data[section].map(item => Number(item.id) || 0)) + 1;
+                    const items = {
+                        education: { id, school: "New School", degree: "", date: "", gpa: "", details: "" },
+                        experience: { id, company: "New Company", role: "", location: "", date: "", details: "" },
+                        projects: { id, name: "New Project", technologies: "", link: "", details: "" }
+                    };
+                    this.data[section].push(items[section]);
+                },
+                
+                removeItem(section, id) {
+                    this.data[section] = this.data[section].filter(i => i.id !== id);
+                },
+
+                addSkill() {
+                    this.data.skills.push("New Skill");
+                },
+
+                removeSkill(index) {
+                    this.data.skills = this.data.skills.filter((_, i) => i !== index);
+                },
+
+                async importFile(event) {
+                    const file = event.target.files[0];
+                    event.target.value = '';  // choosing the same file again still fires
+                    if (!file) return;
+                    const status = this.saveStatus;
+                    this.saveStatus = 'Importing...';
+                    try {
+                        const form = new FormData();
+                        form.append('file', file);
+                        const res = await fetch('/api/import', { method: 'POST', body: form });
+                        const body = await res.json();
+                        if (!res.ok) throw new Error(body.error || res.statusText);
+                        if (!confirm('Replace the current resume with the imported one?')) {
+                            this.saveStatus = status;
+                            return;
+                        }
+                        this.data = body.data;
+                        this.saveStatus = 'Imported';
+                    } catch (e) {
+                        this.saveStatus = 'Import failed';
+                        alert(`Could not import ${file.name}: ${e.message}`);
+                    }
+                },
+
+                async downloadPDF() {
+                    const started = performance.now();
+                    let source = 'server';
+                    // Prefer the server's vector PDF; fall back to rasterising in the browser.
+                    let blob = null;
+                    try {
+                        while (this.saving) await new Promise(resolve => setTimeout(resolve, 100));
+                        await this.save();
+                        if (this.saved !== JSON.stringify(this.data)) throw new Error('not saved');
+                        // Revalidate the last render: if the server's key still matches,
+                        // it answers 304 and the cached file is reused.
+                        const last = renderCache.latest(this.resumeId, this.template);
+                        const cached = last && await renderCache.get(last).catch(() => null);
+                        const res = await fetch(`/api/resume/${this.resumeId}/pdf?template=${this.template}`,
+                                                cached ? { headers: { 'If-None-Match': `"${last}"` } } : {});
+                        if (cached && res.status === 304) {
+                            source = 'cache';
+                            blob = cached;
+                        } else {
+                            if (!res.ok) throw new Error(res.statusText);
+                            blob = await res.blob();
+                            const key = res.headers.get('X-Render-Key');
+                            if (key) {
+                                renderCache.remember(this.resumeId, this.template, key);
+                                renderCache.put(key, blob).catch(() => {});
+                            }
+                        }
+                    } catch (e) {
+                        try {
+                            await loadHtml2pdf();
+                        } catch (err) {
+                            this.saveStatus = 'PDF unavailable offline';
+                            return;
+                        }
+                        // A browser render is not what the server would produce, so it
+                        // is never cached under a render key.
+                        source = 'html2pdf';
+                        this.commitPreview();
+                        await Alpine.nextTick();
+                        await new Promise(resolve => requestAnimationFrame(resolve));  // let it paginate
+                        blob = await exportPages(document.getElementById('resume-preview'), this.pages);
+                    }
+                    clientMetrics.record('pdf', { ms: performance.now() - started, source });
+                    clientMetrics.flush();
+                    this.saveBlob(blob);
+                },
+
+                saveBlob(blob) {
+                    const link = document.createElement('a');
+                    link.href = URL.createObjectURL(blob);
+                    link.download = 'Resume.pdf';
+                    link.click();
+                    setTimeout(() => URL.revokeObjectURL(link.href), 1000);
+                }
+            }));
+        });
+
+        // Offline support: the service worker serves the page and its assets from cache.
+        if ('serviceWorker' in navigator) {
+            window.addEventListener('load', () => navigator.serviceWorker.register('/sw.js').catch(() => {}));
+        }
+    </script>
+</body>
+</html>
+"""
+
+
+class PrecompressedPage:
+    """A response body rendered once and kept in memory in every encoding we serve.
+
+    Each encoding gets its own strong ETag, since the bytes on the wire differ.
+    """
+
+    def __init__(self, body, mimetype='text/html', cache_control='no-cache', compressed=None):
+        self.mimetype = mimetype
+        self.cache_control = cache_control
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        if compressed is None:
+            compressed = {'gzip': gzip.compress(body, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                compressed['br'] = brotli.compress(body, quality=11)
+        self.variants = {'identity': (body, digest)}
+        for encoding, data in compressed.items():
+            self.variants[encoding] = (data, f'{digest}-{encoding[:2]}')
+
+    @classmethod
+    def from_file(cls, path, mimetype, cache_control):
+        """Load a file and the .gz / .br siblings written next to it at build time."""
+        with open(path, 'rb') as f:
+            body = f.read()
+        compressed = {}
+        for encoding, ext in (('gzip', '.gz'), ('br', '.br')):
+            if os.path.exists(path + ext):
+                with open(path + ext, 'rb') as f:
+                    compressed[encoding] = f.read()
+        return cls(body, mimetype, cache_control, compressed)
+
+    def choose_encoding(self, accept_encodings):
+        candidates = [c for c in ('br', 'gzip') if c in self.variants and accept_encodings[c] > 0]
+        if not candidates:
+            return 'identity'
+        return max(candidates, key=lambda c: (accept_encodings[c], c == 'br'))
+
+    def body(self, encoding):
+        return self.variants[encoding][0]
+
+    def respond(self):
+        encoding = self.choose_encoding(request.accept_encodings)
+        etag = self.variants[encoding][1]
+
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+        else:
+            response = Response(self.body(encoding), mimetype=self.mimetype)
+            if encoding != 'identity':
+                response.headers['Content-Encoding'] = encoding
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = self.cache_control
+        response.vary.add('Accept-Encoding')
+        return response
+
+
+class StreamedPage(PrecompressedPage):
+    """A precompressed page sent as a series of chunks.
+
+    Each chunk goes out as soon as it is written, so the browser can parse and
+    paint the first part before the rest arrives. Every encoding is a single
+    compressed stream, flushed at each chunk boundary.
+    """
+
+    def __init__(self, chunks, mimetype='text/html', cache_control='no-cache'):
+        self.chunks = {'identity': chunks}
+        deflate = zlib.compressobj(9, zlib.DEFLATED, 31)  # 31: gzip framing
+        self.chunks['gzip'] = [deflate.compress(c) + deflate.flush(zlib.Z_SYNC_FLUSH) for c in chunks]
+        self.chunks['gzip'][-1] += deflate.flush()
+        if brotli is not None:
+            compressor = brotli.Compressor(quality=11)
+            self.chunks['br'] = [compressor.process(c) + compressor.flush() for c in chunks]
+            self.chunks['br'][-1] += compressor.finish()
+        compressed = {encoding: b''.join(parts) for encoding, parts in self.chunks.items() if encoding != 'identity'}
+        super().__init__(b''.join(chunks), mimetype, cache_control, compressed)
+
+    def body(self, encoding):
+        # A generator, not a list, so the server sends it chunked as it goes.
+        yield from self.chunks[encoding]
+
+
+DIST_DIR = os.path.join(app.static_folder, 'dist')
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+
+def load_bundles(mode):
+    """The built assets as {logical name: url}, plus their preloaded responses."""
+    if mode != 'bundled':
+        return {}, {}
+    manifest = assets.load_manifest(app.static_folder)
+    urls, files = {}, {}
+    for name, filename in manifest.items():
+        mimetype = assets.MIMETYPES[os.path.splitext(filename)[1]]
+        files[filename] = PrecompressedPage.from_file(os.path.join(DIST_DIR, filename), mimetype, IMMUTABLE)
+        urls[name] = f'{app.static_url_path}/dist/{filename}'
+    return urls, files
+
+
+layouts = LayoutRegistry(app.config['LAYOUT_DIR'], app.config['LAYOUT_CACHE_DIR'])
+
+
+FLUSH = '<!-- flush -->'
+
+
+def render_home_page(mode=None, streamed=True):
+    # The editor page has no per-request state, so render it once at startup
+    # (and again when the layouts change).
+    urls, files = load_bundles(mode or app.config['ASSET_MODE'])
+
+    def render(critical_css):
+        with app.app_context():
+            return render_template_string(HTML_TEMPLATE, assets=urls, layouts=layouts, critical_css=critical_css,
+                                          schema_version=schema.SCHEMA_VERSION,
+                                          live_editing=app.config['LIVE_EDITING'])
+
+    html = render('')
+    if 'app.css' in urls:
+        # Inline the rules for the classes of the first chunk (head and editor
+        # form) only; the full bundle is linked at the top of the next one.
+        head = html.split(FLUSH, 1)[0]
+        html = render(Markup(assets.minify_css(assets.tailwind_css(assets.scan_classes(head)))))
+    chunks = [chunk.encode('utf-8') for chunk in html.split(FLUSH)]
+    if not streamed:
+        return PrecompressedPage(b''.join(chunks))
+    return StreamedPage(chunks)
+
+
+# The service worker precaches the editor page and everything it loads, so
+# repeat visits (and offline ones) need no network. Its cache is named after
+# the page's ETag: a new page means a new worker, which replaces the old cache.
+SERVICE_WORKER_TEMPLATE = """
+const CACHE = {{ cache|tojson }};
+const PRECACHE = {{ precache|tojson }};
+
+self.addEventListener('install', event => {
+    event.waitUntil(caches.open(CACHE).then(cache => Promise.all(PRECACHE.map(async url => {
+        const sameOrigin = new URL(url, location.href).origin === location.origin;
+        // CDN assets come back opaque (no CORS), which cache.add() refuses.
+        const res = await fetch(new Request(url, { cache: 'reload', mode: sameOrigin ? 'same-origin' : 'no-cors' }));
+        if (!res.ok && res.type !== 'opaque') throw new Error(`${url}: ${res.status}`);
+        await cache.put(url, res);
+    }))).then(() => self.skipWaiting()));
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil(caches.keys()
+        .then(keys => Promise.all(keys.filter(key => key.startsWith('resume-shell-') && key !== CACHE)
+                                      .map(key => caches.delete(key))))
+        .then(() => self.clients.claim()));
+});
+
+// Cache-first for the page and static assets; the API always goes to the network.
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    const url = new URL(request.url);
+    if (request.method !== 'GET') return;
+    if (request.mode === 'navigate') {
+        if (url.pathname !== '/') return;
+        event.respondWith(caches.match('/', { cacheName: CACHE }).then(hit => hit || fetch(request)));
+        return;
+    }
+    if (url.origin === location.origin && !url.pathname.startsWith('/static/')) return;
+    event.respondWith(caches.match(request).then(hit => hit || fetch(request).then(res => {
+        // Fonts and the like, requested by the precached stylesheets.
+        if (res.ok || res.type === 'opaque') {
+            const copy = res.clone();
+            caches.open(CACHE).then(cache => cache.put(request, copy));
+        }
+        return res;
+    })));
+});
+
+// Background Sync: push the drafts the editor could not save while offline.
+function openDrafts() {
+    return new Promise((resolve, reject) => {
+        const req = indexedDB.open('resume-drafts', 1);
+        req.onupgradeneeded = () => req.result.createObjectStore('drafts', { keyPath: 'id' });
+        req.onsuccess = () => resolve(req.result);
+        req.onerror = () => reject(req.error);
+    });
+}
+
+async function syncDrafts() {
+    const db = await openDrafts();
+    const all = await new Promise((resolve, reject) => {
+        const req = db.transaction('drafts').objectStore('drafts').getAll();
+        req.onsuccess = () => resolve(req.result);
+        req.onerror = () => reject(req.error);
+    });
+    for (const draft of all) {
+        const current = JSON.stringify(draft.data);
+        if (current === draft.saved) continue;
+        // Whole-document PUT, like the editor's own fallback when a patch no longer applies.
+        const res = await fetch(`/api/resume/${encodeURIComponent(draft.id)}`,
+            { method: 'PUT', headers: { 'Content-Type': 'application/json' }, body: current });
+        if (!res.ok) throw new Error(`sync ${draft.id}: ${res.status}`);  // retried later
+        const { version } = await res.json();
+        db.transaction('drafts', 'readwrite').objectStore('drafts')
+            .put(Object.assign(draft, { saved: current, version }));
+        const clients = await self.clients.matchAll({ type: 'window' });
+        clients.forEach(client => client.postMessage({ type: 'synced', id: draft.id, version, saved: current }));
+    }
+}
+
+self.addEventListener('sync', event => {
+    if (event.tag === 'resume-sync') event.waitUntil(syncDrafts());
+});
+"""
+
+SHELL_ASSET = re.compile(r'<(?:script[^>]*\ssrc|link[^>]*\shref)="([^"]+)"')
+
+
+def render_service_worker(page):
+    html = page.variants['identity'][0].decode('utf-8')
+    precache = ['/'] + list(dict.fromkeys(SHELL_ASSET.findall(html)))
+    with app.app_context():
+        script = render_template_string(SERVICE_WORKER_TEMPLATE, cache=f'resume-shell-{page.variants["identity"][1]}',
+                                        precache=precache)
+    return PrecompressedPage(script.lstrip().encode('utf-8'), 'text/javascript')
+
+
+BUNDLE_URLS, BUNDLES = load_bundles(app.config['ASSET_MODE'])
+HOME_PAGE = render_home_page()
+SERVICE_WORKER = render_service_worker(HOME_PAGE)
+
+
+def refresh_home_page():
+    global HOME_PAGE, SERVICE_WORKER
+    try:
+        if layouts.poll():
+            HOME_PAGE = render_home_page()
+            SERVICE_WORKER = render_service_worker(HOME_PAGE)
+    except TemplateError:
+        app.logger.exception('Could not reload the resume layouts; keeping the previous ones')
+
+
+@app.route('/')
+def home():
+    refresh_home_page()
+    return HOME_PAGE.respond()
+
+
+@app.route('/sw.js')
+def service_worker():
+    # Served from the root so it can control the whole site.
+    refresh_home_page()
+    return SERVICE_WORKER.respond()
+
+
+@app.route('/static/dist/<filename>')
+def bundle(filename):
+    # Content-hashed names, so these can be cached forever.
+    page = BUNDLES.get(filename)
+    if page is None:
+        abort(404)
+    return page.respond()
+
+
+@app.cli.command('build-assets')
+def build_assets():
+    """Build the self-hosted CSS/JS bundles into static/dist."""
+    # Scan the rendered page, so the classes of every layout are kept.
+    assets.build(render_home_page('cdn').variants['identity'][0].decode('utf-8'), app.static_folder)
+
+
+# --- Resume persistence API ---
+
+RESUME_ID = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+if app.config['RESUME_STORE'].startswith('sqlite:'):
+    os.makedirs(app.instance_path, exist_ok=True)
+resumes = open_store(app.config['RESUME_STORE'])
+if app.config['RESUME_WRITE_BEHIND']:
+    resumes = WriteBehindQueue(resumes)
+atexit.register(resumes.close)
+
+if app.config['SEARCH_INDEX'] != ':memory:':
+    os.makedirs(os.path.dirname(os.path.abspath(app.config['SEARCH_INDEX'])), exist_ok=True)
+search_index = search.SearchIndex(app.config['SEARCH_INDEX'])
+atexit.register(search_index.close)
+
+
+def save_resume(resume_id, change, expected_version=None):
+    """``resumes.update``, then queue the saved resume for the search index."""
+    doc, version = resumes.update(resume_id, change, expected_version)
+    search_index.add(resume_id, doc)
+    return doc, version
+
+
+def resume_response(resume_id, version, **extra):
+    response = jsonify(id=resume_id, version=version, **extra)
+    response.set_etag(str(version))
+    return response
+
+
+def expected_version():
+    # Clients send the version they last saw as If-Match to avoid lost updates.
+    if not request.if_match or request.if_match.star_tag:
+        return None
+    for tag in request.if_match.as_set():
+        if tag.isdigit():
+            return int(tag)
+    return None
+
+
+@app.route('/api/resume/<resume_id>', methods=['GET', 'PUT', 'PATCH'])
+def resume(resume_id):
+    if not RESUME_ID.match(resume_id):
+        abort(404)
+
+    if request.method == 'GET':
+        record = resumes.get(resume_id)
+        if record is None:
+            return jsonify(error='resume not found'), 404
+        doc, version = record
+        return resume_response(resume_id, version, data=doc)
+
+    if live.get(resume_id) is not None:
+        # The live session owns the resume and writes it back itself.
+        return jsonify(error='resume is being edited live'), 409
+    body = request.get_json(force=True, silent=True)
+    try:
+        if request.method == 'PUT':
+            doc = schema.validate(body)
+            _, version = save_resume(resume_id, lambda _: doc, expected_version())
+            return resume_response(resume_id, version)
+
+        def patch(doc):
+            if doc is None:
+                raise LookupError(resume_id)
+            return schema.validate(apply_patch(doc, body))
+
+        _, version = save_resume(resume_id, patch, expected_version())
+        return resume_response(resume_id, version)
+    except LookupError:
+        return jsonify(error='resume not found'), 404
+    except (PatchError, schema.SchemaError) as exc:
+        return jsonify(error=str(exc)), 400
+    except VersionConflict as exc:
+        response = jsonify(error=str(exc), version=exc.current)
+        response.status_code = 412
+        return response
+
+
+# --- Search ---
+
+@app.route('/api/search')
+def search_resumes():
+    # ?q=flask AND sql&skill=React&skill=SQL&gpa_min=3.5&sort=gpa&page=2
+    token = app.config['SEARCH_TOKEN']
+    if token is None:
+        abort(404)
+    auth = request.authorization
+    sent = (auth.token or '') if auth is not None and auth.type == 'bearer' else ''
+    if not hmac.compare_digest(sent.encode(), token.encode()):
+        response = jsonify(error='search needs a recruiter token')
+        response.status_code = 401
+        response.headers['WWW-Authenticate'] = 'Bearer'
+        return response
+    args = request.args
+    filters = [(field, value) for field in search.FACETS for value in args.getlist(field) if value.strip()]
+    try:
+        gpa_min = float(args['gpa_min']) if args.get('gpa_min') else None
+        page = int(args.get('page', 1))
+        per_page = int(args.get('per_page', 20))
+    except ValueError:
+        return jsonify(error='gpa_min, page and per_page must be numbers'), 400
+    try:
+        result = search_index.search(args.get('q', '').strip(), filters, gpa_min, args.get('sort') or None,
+                                     page, per_page)
+    except ValueError as exc:
+        return jsonify(error=str(exc)), 400
+    return jsonify(**result)
+
+
+# --- Server-side rendering ---
+
+# A resume on its own, rendered from the same layout templates as the preview.
+RESUME_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <title>{{ title }}</title>
+    {% if assets['app.css'] %}
+    <link rel="stylesheet" href="{{ assets['app.css'] }}">
+    {% else %}
+    <script src="https://cdn.tailwindcss.com"></script>
+    {% endif %}
+    <link rel="stylesheet" href="{{ assets['icons.css'] or 'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css' }}">
+    <style>
+        .resume-page { width: 210mm; min-height: 297mm; background: white; margin: 0 auto; }
+    </style>
+</head>
+<body>
+    <div class="resume-page p-8">
+        {{ body | indent(8) }}
+    </div>
+</body>
+</html>
+"""
+RESUME_PAGE = app.jinja_env.from_string(RESUME_TEMPLATE)
+
+
+@app.route('/api/resume/<resume_id>/html')
+def resume_html(resume_id):
+    template = request.args.get('template', 'modern')
+    if template not in layouts:
+        return jsonify(error=f'unknown template: {template}'), 400
+    record = resumes.get(resume_id) if RESUME_ID.match(resume_id) else None
+    if record is None:
+        return jsonify(error='resume not found'), 404
+    doc = record[0]
+    title = (doc.get('personal') or {}).get('fullName') or 'Resume'
+    html = RESUME_PAGE.render(title=title, assets=BUNDLE_URLS, body=layouts[template].render(doc))
+    return Response(html, mimetype='text/html')
+
+
+# --- Live editing ---
+
+EDITOR_ID = re.compile(r'^[A-Za-z0-9_-]{1,32}$')
+
+live = collab.Sessions(load=resumes.get,
+                       save=lambda resume_id, doc, version: save_resume(resume_id, lambda _: doc, version)[1],
+                       max_peers=min(app.config['LIVE_MAX_PEERS'], app.config['LIVE_MAX_STREAMS']),
+                       max_streams=app.config['LIVE_MAX_STREAMS'],
+                       persist_interval=app.config['LIVE_PERSIST_SECONDS'])
+atexit.register(live.close)
+
+
+@app.route('/api/resume/<resume_id>/live', methods=['GET', 'POST'])
+def resume_live(resume_id):
+    if not RESUME_ID.match(resume_id):
+        abort(404)
+    if not app.config['LIVE_EDITING']:
+        return jsonify(error='live editing needs a single server worker (WEB_CONCURRENCY=1)'), 501
+
+    if request.method == 'GET':
+        # The event stream; EventSource sends Last-Event-ID when it reconnects.
+        try:
+            session = live.open(resume_id)
+        except collab.Busy as exc:
+            response = jsonify(error=str(exc))
+            response.status_code = 503
+            response.headers['Retry-After'] = '5'
+            return response
+        if session is None:
+            return jsonify(error='resume not found'), 404
+        last_event_id = request.headers.get('Last-Event-ID') or request.args.get('since')
+        response = Response(session.stream(last_event_id), mimetype='text/event-stream')
+        # The stream's place is given back when the server closes the response,
+        # which it does even if the editor went away before it was read.
+        response.call_on_close(lambda: live.leave(session))
+        response.headers['Cache-Control'] = 'no-cache'
+        response.headers['X-Accel-Buffering'] = 'no'  # no proxy buffering
+        return response
+
+    # {"site", "batch", "ops"}: one editor's operations, numbered per editor.
+    body = request.get_json(force=True, silent=True)
+    if not isinstance(body, dict) or not EDITOR_ID.match(str(body.get('site', ''))):
+        return jsonify(error='expected {"site", "batch", "ops"}'), 400
+    session = live.get(resume_id)
+    if session is None:
+        return jsonify(error='no live session; open the event stream first'), 409
+    try:
+        seq = session.submit(body['site'], body.get('batch'), body.get('ops'))
+    except collab.OpError as exc:
+        return jsonify(error=str(exc)), 400
+    return jsonify(seq=seq)
+
+
+# --- Admission control ---
+
+# Rendering, importing and batches are the expensive requests. Each client
+# gets a token bucket for them, identical ones running at once share one job,
+# and a pool that is full, or too slow to join, turns work away: all of these
+# answer 429 with a Retry-After rather than leaving the request to time out.
+if app.config['TRUSTED_PROXIES']:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['TRUSTED_PROXIES'])
+rate_limiter = None
+if app.config['RATE_LIMIT']:
+    rate_limiter = RateLimiter(app.config['RATE_LIMIT'] / 60, app.config['RATE_BURST'])
+flights = SingleFlight()
+
+
+def too_busy(message, retry_after):
+    response = jsonify(error=message)
+    response.status_code = 429
+    response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+def rate_limited():
+    """A 429 response if this client is out of tokens, else None (a token is taken)."""
+    if rate_limiter is None:
+        return None
+    wait = rate_limiter.take(request.remote_addr or '')
+    return too_busy('too many requests, try again shortly', wait) if wait else None
+
+
+pdf_pool = WorkerPool(app.config['PDF_WORKERS'], app.config['PDF_QUEUE'], app.config['PDF_TIMEOUT'],
+                      app.config['PDF_MAX_WAIT'])
+atexit.register(pdf_pool.shutdown)
+
+# Renders are keyed by a hash of (resume data, template), so an unchanged
+# resume is never rendered twice.
+render_cache = RenderCache(app.config['RENDER_CACHE_DIR'],
+                           app.config['RENDER_CACHE_MEMORY_MB'] * 2**20,
+                           app.config['RENDER_CACHE_DISK_MB'] * 2**20)
+
+
+def pdf_response(pdf, key, cache_control):
+    if request.if_none_match.contains_weak(key):
+        response = Response(status=304)
+    else:
+        response = Response(pdf, mimetype='application/pdf')
+        response.headers['Content-Disposition'] = 'attachment; filename="Resume.pdf"'
+    response.set_etag(key)
+    response.headers['X-Render-Key'] = key
+    response.headers['Cache-Control'] = cache_control
+    return response
+
+
+@app.route('/api/resume/<resume_id>/pdf')
+def resume_pdf(resume_id):
+    template = request.args.get('template', 'modern')
+    if template not in LAYOUTS:
+        if template in layouts:
+            # A layout without a PDF counterpart in pdf_layouts.py; the
+            # browser exports those itself.
+            return jsonify(error=f'no server-side PDF for template: {template}'), 501
+        return jsonify(error=f'unknown template: {template}'), 400
+    record = resumes.get(resume_id) if RESUME_ID.match(resume_id) else None
+    if record is None:
+        return jsonify(error='resume not found'), 404
+
+    key = render_key(record[0], template, RENDER_VERSION)
+    pdf = render_cache.get(key)
+    if pdf is not None:
+        return pdf_response(pdf, key, 'private, no-cache')
+
+    limited = rate_limited()
+    if limited is not None:
+        return limited
+    try:
+        pdf = flights.run(key, render_to_cache, key, record[0], template)
+    except Overloaded as exc:
+        return too_busy('PDF renderer is busy, try again shortly', exc.retry_after)
+    except JobTimeout:
+        return jsonify(error='PDF rendering timed out'), 504
+    except UnsupportedText as exc:
+        # The editor renders these in the browser instead.
+        return jsonify(error=str(exc)), 422
+    return pdf_response(pdf, key, 'private, no-cache')
+
+
+def render_to_cache(key, doc, template):
+    # Run once per key at a time; a render that finished just before this
+    # call's flight started is in the cache already. The request's own lookup
+    # was counted as a miss.
+    pdf = render_cache.get(key, count=False)
+    if pdf is None:
+        pdf = pdf_pool.run(render_pdf, doc, template)
+        render_cache.put(key, pdf)
+    return pdf
+
+
+@app.route('/api/render/<key>.pdf')
+def cached_render(key):
+    pdf = render_cache.get(key) if is_key(key) else None
+    if pdf is None:
+        return jsonify(error='render not found'), 404
+    # Content-addressed: the bytes behind a key never change.
+    return pdf_response(pdf, key, 'public, max-age=31536000, immutable')
+
+
+# --- Bulk rendering ---
+
+# Batches get their own pool so a cohort export cannot starve interactive
+# downloads, and only a few may run at once: each keeps its pool busy.
+batch_pool = WorkerPool(app.config['BATCH_WORKERS'], timeout=60)
+atexit.register(batch_pool.shutdown)
+batch_slots = threading.BoundedSemaphore(app.config['BATCH_CONCURRENCY'])
+batches = OrderedDict()  # batch id -> BatchProgress, most recent last
+
+
+@app.route('/api/batch', methods=['POST'])
+def create_batch():
+    template = request.args.get('template', 'modern')
+    if template not in LAYOUTS:
+        return jsonify(error=f'unknown template: {template}'), 400
+    upload = request.files.get('file')
+    name = upload.filename if upload else ''
+    fmt = request.args.get('format') or (
+        'csv' if name.endswith('.csv') or request.mimetype == 'text/csv' else 'jsonl')
+    if fmt not in ('csv', 'jsonl'):
+        return jsonify(error=f'unknown format: {fmt}'), 400
+    limited = rate_limited()
+    if limited is not None:
+        return limited
+    if not batch_slots.acquire(blocking=False):
+        return too_busy('too many batches running, try again shortly', 30)
+
+    try:
+        batch_id = uuid.uuid4().hex
+        progress = batches[batch_id] = batch.BatchProgress()
+        while len(batches) > 100:
+            batches.popitem(last=False)
+        records = batch.iter_records(upload.stream if upload else request.stream, fmt)
+        body = batch.render_batch(records, batch_pool, template, progress=progress)
+        response = Response(stream_with_context(body), mimetype='application/zip')
+    except BaseException:
+        batch_slots.release()
+        raise
+    # Released when the server closes the response, which it does even when
+    # the client went away before the body was read.
+    response.call_on_close(batch_slots.release)
+    response.headers['Content-Disposition'] = 'attachment; filename="resumes.zip"'
+    response.headers['X-Batch-Id'] = batch_id
+    return response
+
+
+@app.route('/api/batch/<batch_id>')
+def batch_status(batch_id):
+    progress = batches.get(batch_id)
+    if progress is None:
+        return jsonify(error='batch not found'), 404
+    return jsonify(id=batch_id, **progress.as_dict())
+
+
+# --- Importing existing resumes ---
+
+# Parsing is CPU-bound and a hostile PDF can take a long time, so it runs in
+# its own pool with a deadline. Results are cached by the file's hash: the
+# same file is often uploaded again (a retry, a second browser).
+import_pool = WorkerPool(app.config['IMPORT_WORKERS'], app.config['IMPORT_QUEUE'], app.config['IMPORT_TIMEOUT'],
+                         app.config['IMPORT_MAX_WAIT'])
+atexit.register(import_pool.shutdown)
+import_cache = RenderCache(app.config['IMPORT_CACHE_DIR'], 4 * 2**20, 64 * 2**20)
+
+
+def read_upload(stream, limit, chunk_size=65536):
+    """The upload's bytes and SHA-256, or None once it goes over ``limit`` bytes."""
+    digest, chunks, size = hashlib.sha256(), [], 0
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > limit:
+            return None, None
+        digest.update(chunk)
+        chunks.append(chunk)
+    return b''.join(chunks), digest.hexdigest()
+
+
+@app.route('/api/import', methods=['POST'])
+def import_resume():
+    limit = int(app.config['IMPORT_MAX_MB'] * 2**20)
+    # The multipart envelope gets some slack; the file itself is checked as it is read.
+    if request.content_length is None or request.content_length <= limit + 65536:
+        upload = request.files.get('file')
+        data, digest = read_upload(upload.stream if upload else request.stream, limit)
+    else:
+        data = None
+    if data is None:
+        return jsonify(error=f'file is larger than {app.config["IMPORT_MAX_MB"]:g} MB'), 413
+    if not data:
+        return jsonify(error='expected a PDF or DOCX file'), 400
+
+    key = importer.cache_key(digest)
+    cached = import_cache.get(key)
+    if cached is not None:
+        return jsonify(**json.loads(cached), cached=True)
+
+    limited = rate_limited()
+    if limited is not None:
+        return limited
+    try:
+        # The same file uploaded twice at once is parsed once.
+        fmt, document = flights.run(key, import_pool.run, importer.import_file, data)
+    except Overloaded as exc:
+        return too_busy('importer is busy, try again shortly', exc.retry_after)
+    except JobTimeout:
+        return jsonify(error='reading the file timed out'), 504
+    except importer.UnsupportedFile as exc:
+        return jsonify(error=str(exc)), 415
+    except (importer.UnreadableFile, schema.SchemaError) as exc:
+        return jsonify(error=str(exc)), 422
+    body = {'format': fmt, 'sha256': digest, 'data': document}
+    import_cache.put(key, json.dumps(body, separators=(',', ':')).encode('utf-8'))
+    return jsonify(**body, cached=False)
+
+
+# --- Health checks ---
+
+@app.route('/healthz')
+def healthz():
+    # Liveness: the worker is up and answering.
+    return jsonify(status='ok', pid=os.getpid())
+
+
+@app.route('/readyz')
+def readyz():
+    # Readiness: the resume store answers, so this worker can take traffic.
+    try:
+        resumes.get('readiness-probe')
+    except Exception as exc:
+        return jsonify(status='unavailable', error=f'{type(exc).__name__}: {exc}'), 503
+    return jsonify(status='ready', pid=os.getpid(), pdf_pool=pdf_pool.stats(),
+                   render_cache=render_cache.stats())
+
+
+# --- Metrics ---
+
+registry = Registry(app.config['METRICS_DIR'])
+profiler = None
+if app.config['PROFILE_SLOW_MS']:
+    profiler = SlowRequestProfiler(app.config['PROFILE_DIR'], app.config['PROFILE_SLOW_MS'] / 1000)
+RequestMetrics(app, registry, profiler)
+
+cache_lookups = registry.counter('render_cache_lookups_total', 'Render cache lookups by outcome.', ('result',))
+cache_bytes = registry.gauge('render_cache_memory_bytes', 'Bytes of renders held in memory.')
+pool_jobs = registry.counter('worker_pool_jobs_total', 'Jobs by pool and outcome.', ('pool', 'outcome'))
+pool_in_flight = registry.gauge('worker_pool_jobs_in_flight', 'Jobs queued or running.', ('pool',))
+registry.derive('render_cache_hit_ratio', 'Share of render cache lookups served from memory or disk.',
+                lambda value: (value('render_cache_lookups_total', result='memory')
+                               + value('render_cache_lookups_total', result='disk'))
+                / (value('render_cache_lookups_total') or 1))
+live_sessions = registry.gauge('live_sessions', 'Resumes being edited live.')
+live_peers = registry.gauge('live_editors', 'Editors connected to live sessions.')
+live_ops = registry.counter('live_operations_total', 'Operations applied in live sessions.')
+rate_limited_requests = registry.counter('rate_limited_requests_total',
+                                         'Renders, imports and batches refused by the per-client rate limit.')
+coalesced_requests = registry.counter('coalesced_requests_total',
+                                      'Renders and imports that shared a job already running.')
+search_indexed = registry.gauge('search_indexed_resumes', 'Resumes in the search index.')
+search_pending = registry.gauge('search_pending_resumes', 'Saved resumes waiting to be indexed.')
+client_pdf = registry.histogram('client_pdf_download_seconds', 'downloadPDF() time in the browser.',
+                                ('source',), (0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30))
+client_preview = registry.histogram('client_preview_commit_seconds', 'Preview update time in the browser.',
+                                    (), (0.001, 0.0025, 0.005, 0.01, 0.0167, 0.025, 0.05, 0.1, 0.25))
+
+
+@registry.collector
+def collect_stats():
+    stats = render_cache.stats()
+    for result, field in (('memory', 'memory_hits'), ('disk', 'disk_hits'), ('miss', 'misses')):
+        cache_lookups.set(stats[field], result=result)
+    cache_bytes.set(stats['memory_bytes'])
+    for name, pool in (('pdf', pdf_pool), ('batch', batch_pool), ('import', import_pool)):
+        stats = pool.stats()
+        pool_in_flight.set(stats['in_flight'], pool=name)
+        for outcome in ('completed', 'rejected', 'timed_out'):
+            pool_jobs.set(stats[outcome], pool=name, outcome=outcome)
+    stats = live.stats()
+    live_sessions.set(stats['sessions'])
+    live_peers.set(stats['peers'])
+    live_ops.set(stats['ops'])
+    if rate_limiter is not None:
+        rate_limited_requests.set(rate_limiter.stats()['limited'])
+    coalesced_requests.set(flights.stats()['shared'])
+    stats = search_index.stats()
+    search_indexed.set(stats['indexed'])
+    search_pending.set(stats['pending'])
+
+
+atexit.register(registry.save, force=True)
+
+
+@app.route('/metrics')
+def metrics():
+    return Response(registry.render(), mimetype='text/plain; version=0.0.4')
+
+
+CLIENT_PDF_SOURCES = {'cache', 'server', 'html2pdf'}
+
+
+@app.route('/api/metrics/client', methods=['POST'])
+def client_metrics():
+    # Timings beaconed by the editor: {"pdf": [{"ms", "source"}], "preview": [ms, ...]}.
+    body = request.get_json(force=True, silent=True)
+    if not isinstance(body, dict):
+        return jsonify(error='expected a JSON object'), 400
+
+    def seconds(value):
+        ok = isinstance(value, (int, float)) and 0 <= value < 600_000
+        return value / 1000 if ok else None
+
+    for sample in (body.get('pdf') or [])[:100]:
+        if isinstance(sample, dict) and sample.get('source') in CLIENT_PDF_SOURCES:
+            value = seconds(sample.get('ms'))
+            if value is not None:
+                client_pdf.observe(value, source=sample['source'])
+    for sample in (body.get('preview') or [])[:1000]:
+        value = seconds(sample)
+        if value is not None:
+            client_preview.observe(value)
+    return '', 204
+
+
+if __name__ == '__main__':
+    command, args = (sys.argv[1], sys.argv[2:]) if len(sys.argv) > 1 else ('serve', [])
+    if command == 'batch':
+        sys.exit(batch.main(args))
+    elif command == 'import':
+        sys.exit(importer.main(args))
+    elif command == 'reindex':
+        # Indexes every stored resume from scratch, e.g. after upgrading an existing store.
+        print(f'indexed {search_index.rebuild(resumes.scan())} resumes into {app.config["SEARCH_INDEX"]}')
+    elif command == 'dev':
+        app.run(os.environ.get('HOST'), int(os.environ.get('PORT', 5000)), debug=True)
+    elif command == 'serve':
+        server.serve(app, args)
+    else:
+        sys.exit('usage: python app.py [serve [gunicorn options] | dev | batch ... | import ... | reindex]')
+
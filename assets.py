@@ -0,0 +1,417 @@
+"""Build step for self-hosted static assets.
+
+Replaces the four CDN dependencies of the editor page:
+
+* Tailwind's in-browser JIT becomes a purged, minified stylesheet generated
+  from the classes the template actually uses.
+* Alpine.js and html2pdf.js are downloaded once into ``static/vendor`` and
+  copied into ``static/dist`` under content-hashed names.
+* Font Awesome becomes CSS masks for just the icons in use, so the markup
+  (``<i class="fa-solid fa-user">``) stays the same.
+
+Anything that cannot be fetched is left out of the manifest and the page keeps
+loading it from its CDN. Every output is written with ``.gz`` (and, if brotli
+is installed, ``.br``) siblings and listed in ``static/dist/manifest.json``.
+Run it with ``flask --app app build-assets``.
+"""
+import base64
+import gzip
+import hashlib
+import json
+import os
+import re
+import urllib.request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+VENDOR_SCRIPTS = {
+    'alpine.js': 'https://cdn.jsdelivr.net/npm/alpinejs@3.13.3/dist/cdn.min.js',
+    'html2pdf.js': 'https://cdnjs.cloudflare.com/ajax/libs/html2pdf.js/0.10.1/html2pdf.bundle.min.js',
+}
+ICON_URL = 'https://cdn.jsdelivr.net/npm/@fortawesome/fontawesome-free@6.4.0/svgs/{style}/{name}.svg'
+
+MIMETYPES = {'.css': 'text/css', '.js': 'text/javascript'}
+
+# --- Tailwind subset ---
+
+PALETTE = {
+    'slate': ['#f8fafc', '#f1f5f9', '#e2e8f0', '#cbd5e1', '#94a3b8',
+              '#64748b', '#475569', '#334155', '#1e293b', '#0f172a'],
+    'gray': ['#f9fafb', '#f3f4f6', '#e5e7eb', '#d1d5db', '#9ca3af',
+             '#6b7280', '#4b5563', '#374151', '#1f2937', '#111827'],
+    'blue': ['#eff6ff', '#dbeafe', '#bfdbfe', '#93c5fd', '#60a5fa',
+             '#3b82f6', '#2563eb', '#1d4ed8', '#1e40af', '#1e3a8a'],
+    'red': ['#fef2f2', '#fee2e2', '#fecaca', '#fca5a5', '#f87171',
+            '#ef4444', '#dc2626', '#b91c1c', '#991b1b', '#7f1d1d'],
+    'green': ['#f0fdf4', '#dcfce7', '#bbf7d0', '#86efac', '#4ade80',
+              '#22c55e', '#16a34a', '#15803d', '#166534', '#14532d'],
+}
+SHADES = ['50', '100', '200', '300', '400', '500', '600', '700', '800', '900']
+
+FONT_SIZES = {
+    'xs': ('.75rem', '1rem'), 'sm': ('.875rem', '1.25rem'), 'base': ('1rem', '1.5rem'),
+    'lg': ('1.125rem', '1.75rem'), 'xl': ('1.25rem', '1.75rem'), '2xl': ('1.5rem', '2rem'),
+    '3xl': ('1.875rem', '2.25rem'), '4xl': ('2.25rem', '2.5rem'),
+}
+FONT_FAMILIES = {
+    'sans': 'ui-sans-serif,system-ui,-apple-system,"Segoe UI",Roboto,"Helvetica Neue",Arial,sans-serif',
+    'serif': 'ui-serif,Georgia,Cambria,"Times New Roman",Times,serif',
+}
+
+STATIC_RULES = {
+    'block': 'display:block', 'inline-block': 'display:inline-block', 'flex': 'display:flex',
+    'grid': 'display:grid', 'hidden': 'display:none',
+    'flex-1': 'flex:1 1 0%', 'flex-col': 'flex-direction:column', 'flex-row': 'flex-direction:row',
+    'flex-wrap': 'flex-wrap:wrap',
+    'items-center': 'align-items:center', 'items-baseline': 'align-items:baseline',
+    'justify-between': 'justify-content:space-between', 'justify-center': 'justify-content:center',
+    'relative': 'position:relative', 'absolute': 'position:absolute',
+    'overflow-hidden': 'overflow:hidden', 'overflow-y-auto': 'overflow-y:auto',
+    'cursor-pointer': 'cursor:pointer',
+    'outline-none': 'outline:2px solid transparent;outline-offset:2px',
+    'whitespace-pre-line': 'white-space:pre-line',
+    'italic': 'font-style:italic', 'uppercase': 'text-transform:uppercase',
+    'text-center': 'text-align:center', 'text-left': 'text-align:left', 'text-right': 'text-align:right',
+    'font-normal': 'font-weight:400', 'font-medium': 'font-weight:500',
+    'font-semibold': 'font-weight:600', 'font-bold': 'font-weight:700',
+    'leading-tight': 'line-height:1.25', 'leading-snug': 'line-height:1.375',
+    'leading-relaxed': 'line-height:1.625',
+    'tracking-wide': 'letter-spacing:.025em', 'tracking-widest': 'letter-spacing:.1em',
+    'rounded': 'border-radius:.25rem', 'rounded-md': 'border-radius:.375rem',
+    'rounded-lg': 'border-radius:.5rem', 'rounded-full': 'border-radius:9999px',
+    'border-dashed': 'border-style:dashed',
+    'box-decoration-clone': '-webkit-box-decoration-break:clone;box-decoration-break:clone',
+    'shadow-sm': 'box-shadow:0 1px 2px 0 rgb(0 0 0/.05)',
+    'shadow-xl': 'box-shadow:0 20px 25px -5px rgb(0 0 0/.1),0 8px 10px -6px rgb(0 0 0/.1)',
+    'w-full': 'width:100%', 'h-full': 'height:100%', 'h-screen': 'height:100vh',
+    'mx-auto': 'margin-left:auto;margin-right:auto',
+    'max-w-2xl': 'max-width:42rem',
+    'transition-all': 'transition-property:all;transition-timing-function:cubic-bezier(.4,0,.2,1);'
+                      'transition-duration:150ms',
+    'transition-colors': 'transition-property:color,background-color,border-color,fill,stroke;'
+                         'transition-timing-function:cubic-bezier(.4,0,.2,1);transition-duration:150ms',
+    'ease-in-out': 'transition-timing-function:cubic-bezier(.4,0,.2,1)',
+}
+
+SPACING_PROPERTIES = {
+    'p': ['padding'], 'px': ['padding-left', 'padding-right'], 'py': ['padding-top', 'padding-bottom'],
+    'pt': ['padding-top'], 'pr': ['padding-right'], 'pb': ['padding-bottom'], 'pl': ['padding-left'],
+    'm': ['margin'], 'mx': ['margin-left', 'margin-right'], 'my': ['margin-top', 'margin-bottom'],
+    'mt': ['margin-top'], 'mr': ['margin-right'], 'mb': ['margin-bottom'], 'ml': ['margin-left'],
+    'gap': ['gap'], 'w': ['width'], 'h': ['height'],
+    'top': ['top'], 'right': ['right'], 'bottom': ['bottom'], 'left': ['left'],
+}
+BORDER_SIDES = {'': 'border-width', 't': 'border-top-width', 'r': 'border-right-width',
+                'b': 'border-bottom-width', 'l': 'border-left-width'}
+VARIANTS = {'hover': ':hover', 'focus': ':focus'}
+BREAKPOINTS = {'sm': '640px', 'md': '768px', 'lg': '1024px', 'xl': '1280px'}
+
+PREFLIGHT = (
+    '*,::before,::after{box-sizing:border-box;border:0 solid #e5e7eb}'
+    'html{line-height:1.5;-webkit-text-size-adjust:100%;tab-size:4;font-family:' + FONT_FAMILIES['sans'] + '}'
+    'body{margin:0;line-height:inherit}'
+    'h1,h2,h3,h4,h5,h6{font-size:inherit;font-weight:inherit}'
+    'h1,h2,h3,h4,h5,h6,p,blockquote,figure,pre{margin:0}'
+    'button,input,select,textarea{font-family:inherit;font-size:100%;font-weight:inherit;'
+    'line-height:inherit;color:inherit;margin:0;padding:0}'
+    'button{text-transform:none;background-color:transparent;background-image:none;cursor:pointer}'
+    'textarea{resize:vertical}'
+    'input::placeholder,textarea::placeholder{opacity:1;color:#9ca3af}'
+    'img,svg,video,canvas{display:block;vertical-align:middle;max-width:100%;height:auto}'
+    '[hidden]{display:none}'
+)
+
+
+def _spacing(value):
+    if value == 'auto':
+        return 'auto'
+    if value == 'px':
+        return '1px'
+    if '/' in value:
+        num, den = value.split('/', 1)
+        if num.isdigit() and den.isdigit() and int(den):
+            return f'{int(num) / int(den) * 100:.6g}%'
+        return None
+    try:
+        number = float(value)
+    except ValueError:
+        return None
+    return '0px' if number == 0 else f'{number / 4:g}rem'
+
+
+def _color(value):
+    if value in ('white', 'black', 'transparent'):
+        return {'white': '#fff', 'black': '#000', 'transparent': 'transparent'}[value]
+    family, _, shade = value.rpartition('-')
+    if family in PALETTE and shade in SHADES:
+        return PALETTE[family][SHADES.index(shade)]
+    return None
+
+
+def utility(name):
+    """CSS declarations for one Tailwind utility (without variants), or None."""
+    if name in STATIC_RULES:
+        return STATIC_RULES[name]
+    if name.startswith('text-'):
+        value = name[5:]
+        if value in FONT_SIZES:
+            size, height = FONT_SIZES[value]
+            return f'font-size:{size};line-height:{height}'
+        color = _color(value)
+        return f'color:{color}' if color else None
+    if name.startswith('bg-'):
+        color = _color(name[3:])
+        return f'background-color:{color}' if color else None
+    if name.startswith('font-') and name[5:] in FONT_FAMILIES:
+        return f'font-family:{FONT_FAMILIES[name[5:]]}'
+    if name == 'border' or name.startswith('border-'):
+        rest = name[7:]
+        parts = rest.split('-') if rest else []
+        side = parts[0] if parts and parts[0] in BORDER_SIDES else ''
+        width = parts[1:] if side else parts
+        if not width or (len(width) == 1 and width[0].isdigit()):
+            return f'{BORDER_SIDES[side]}:{width[0] if width else 1}px'
+        color = _color(rest)
+        return f'border-color:{color}' if color else None
+    if name.startswith('ring-'):
+        value = name[5:]
+        if value.isdigit():
+            return f'box-shadow:0 0 0 {value}px var(--tw-ring-color,rgb(59 130 246/.5))'
+        color = _color(value)
+        return f'--tw-ring-color:{color}' if color else None
+    if name.startswith('grid-cols-') and name[10:].isdigit():
+        return f'grid-template-columns:repeat({name[10:]},minmax(0,1fr))'
+    if name.startswith('col-span-') and name[9:].isdigit():
+        return f'grid-column:span {name[9:]}/span {name[9:]}'
+    if name.startswith('z-') and name[2:].isdigit():
+        return f'z-index:{name[2:]}'
+    if name.startswith('duration-') and name[9:].isdigit():
+        return f'transition-duration:{name[9:]}ms'
+    if name == 'w-96':
+        return 'width:24rem'
+    prefix, _, value = name.partition('-')
+    if prefix in SPACING_PROPERTIES and value:
+        amount = _spacing(value)
+        if amount is not None:
+            return ';'.join(f'{prop}:{amount}' for prop in SPACING_PROPERTIES[prefix])
+    return None
+
+
+def _escape(name):
+    return re.sub(r'([^a-zA-Z0-9_-])', r'\\\1', name)
+
+
+def _space_between(name):
+    # space-x-N / space-y-N put margins between children, not on the element.
+    match = re.fullmatch(r'space-([xy])-(\d+)', name)
+    if not match:
+        return None
+    side = 'left' if match.group(1) == 'x' else 'top'
+    return f' > :not([hidden]) ~ :not([hidden])', f'margin-{side}:{_spacing(match.group(2))}'
+
+
+def tailwind_css(classes):
+    """Generate minified CSS for the Tailwind utilities in ``classes``.
+
+    Names that are not utilities we know about are ignored, which is what
+    purging amounts to.
+    """
+    rules = {bp: [] for bp in [None, *BREAKPOINTS]}
+    for cls in sorted(classes):
+        *variants, name = cls.split(':')
+        breakpoint, pseudo = None, ''
+        if any(v not in VARIANTS and v not in BREAKPOINTS for v in variants):
+            continue
+        for variant in variants:
+            if variant in BREAKPOINTS:
+                breakpoint = variant
+            else:
+                pseudo += VARIANTS[variant]
+        selector = '.' + _escape(cls) + pseudo
+        spaced = _space_between(name)
+        if spaced:
+            suffix, declarations = spaced
+            selector += suffix
+        else:
+            declarations = utility(name)
+        if declarations:
+            rules[breakpoint].append(f'{selector}{{{declarations}}}')
+    css = PREFLIGHT + ''.join(rules.pop(None))
+    for breakpoint, body in rules.items():
+        if body:
+            css += f'@media (min-width:{BREAKPOINTS[breakpoint]}){{{"".join(body)}}}'
+    return css
+
+
+def scan_classes(html):
+    """Every token that could be a class: class attributes and JS string literals."""
+    tokens = set()
+    for match in re.finditer(r'\bclass="([^"]*)"', html):
+        tokens.update(match.group(1).split())
+    for match in re.finditer(r"'([^'\n]*)'", html):
+        tokens.update(match.group(1).split())
+    return tokens
+
+
+def class_names(html):
+    """The tokens ``html`` uses as classes.
+
+    Unlike scan_classes this only reads class attributes (either quote style,
+    which covers the layouts' ``el(..., class='...')``) and the string literals
+    of Alpine ``:class`` bindings, leaving out the values they are compared
+    against, so every token it returns is meant to be styled. Jinja
+    expressions inside an attribute are skipped; the rendered page has their
+    values.
+    """
+    names = set()
+    for match in re.finditer(r"""(?<![:\w-])class=(?:"([^"]*)"|'([^']*)')""", html):
+        value = re.sub(r'{{.*?}}', ' ', match.group(1) or match.group(2) or '')
+        names.update(value.split())
+    for match in re.finditer(r':class="([^"]*)"', html):
+        expression = re.sub(r"[=!]==?\s*'[^']*'", '', match.group(1))
+        for literal in re.findall(r"'([^']*)'", expression):
+            names.update(literal.split())
+    return names
+
+
+def unknown_classes(html):
+    """Classes in ``html`` that the build would emit no CSS for.
+
+    Icons (``fa-*``) and classes the page styles itself in a ``<style>``
+    block are known; anything else tailwind_css does not produce would
+    silently render unstyled.
+    """
+    styled = set()
+    for block in re.findall(r'<style[^>]*>(.*?)</style>', html, flags=re.S):
+        styled.update(re.findall(r'\.([A-Za-z_][\w-]*)', block))
+    unknown = set()
+    for cls in class_names(html):
+        if cls.startswith('fa-') or cls in styled:
+            continue
+        if tailwind_css({cls}) == PREFLIGHT:
+            unknown.add(cls)
+    return unknown
+
+
+def minify_css(css):
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};:,>])\s*', r'\1', css)
+    return css.replace(';}', '}').strip()
+
+
+# --- Icons ---
+
+def _icon_svg(name, vendor_dir):
+    for style in ('solid', 'brands', 'regular'):
+        path = os.path.join(vendor_dir, 'icons', style, name + '.svg')
+        if not os.path.exists(path):
+            try:
+                svg = _download(ICON_URL.format(style=style, name=name))
+            except OSError:
+                continue
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(svg)
+        with open(path, 'rb') as f:
+            return f.read()
+    return None
+
+
+def icon_css(classes, vendor_dir):
+    names = sorted(c[3:] for c in classes if c.startswith('fa-') and c not in ('fa-solid', 'fa-brands', 'fa-regular'))
+    css = ['.fa-solid,.fa-brands,.fa-regular{display:inline-block;width:1em;height:1em;'
+           'vertical-align:-.125em;background-color:currentColor;'
+           '-webkit-mask:var(--fa) no-repeat center/contain;mask:var(--fa) no-repeat center/contain}']
+    missing = []
+    for name in names:
+        svg = _icon_svg(name, vendor_dir)
+        if svg is None:
+            missing.append(name)
+            continue
+        uri = 'data:image/svg+xml;base64,' + base64.b64encode(svg).decode('ascii')
+        css.append(f'.fa-{name}{{--fa:url("{uri}")}}')
+    return ''.join(css), missing
+
+
+# --- Build ---
+
+def _download(url):
+    with urllib.request.urlopen(url, timeout=30) as response:
+        return response.read()
+
+
+def vendor_file(name, vendor_dir):
+    """The cached copy of a vendored script, downloading it on first use."""
+    path = os.path.join(vendor_dir, name)
+    if not os.path.exists(path):
+        data = _download(VENDOR_SCRIPTS[name])
+        os.makedirs(vendor_dir, exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _write_hashed(dist_dir, logical_name, data):
+    stem, ext = os.path.splitext(logical_name)
+    digest = hashlib.sha256(data).hexdigest()[:12]
+    filename = f'{stem}.{digest}{ext}'
+    path = os.path.join(dist_dir, filename)
+    with open(path, 'wb') as f:
+        f.write(data)
+    with open(path + '.gz', 'wb') as f:
+        f.write(gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        with open(path + '.br', 'wb') as f:
+            f.write(brotli.compress(data, quality=11))
+    return filename
+
+
+def build(html, static_dir, log=print):
+    """Build ``static_dir/dist`` for the page ``html`` and return the manifest."""
+    unknown = unknown_classes(html)
+    if unknown:
+        raise ValueError(f'no CSS for classes: {", ".join(sorted(unknown))} '
+                         f'(add them to the Tailwind subset in assets.py)')
+    vendor_dir = os.path.join(static_dir, 'vendor')
+    dist_dir = os.path.join(static_dir, 'dist')
+    os.makedirs(dist_dir, exist_ok=True)
+    for name in os.listdir(dist_dir):
+        os.remove(os.path.join(dist_dir, name))
+
+    classes = scan_classes(html)
+    css = minify_css(tailwind_css(classes))
+    manifest = {'app.css': _write_hashed(dist_dir, 'app.css', css.encode('utf-8'))}
+    log(f'app.css: {len(css)} bytes from {len(classes)} candidate classes')
+
+    icons, missing = icon_css(classes, vendor_dir)
+    if missing:
+        log(f'icons.css: not built, the page will keep using the CDN '
+            f'(missing from {vendor_dir}: {", ".join(missing)})')
+    else:
+        manifest['icons.css'] = _write_hashed(dist_dir, 'icons.css', icons.encode('utf-8'))
+        log(f'icons.css: {len(icons)} bytes')
+    for name in VENDOR_SCRIPTS:
+        try:
+            data = vendor_file(name, vendor_dir)
+        except OSError as exc:
+            log(f'{name}: not vendored, the page will keep using the CDN ({exc})')
+            continue
+        manifest[name] = _write_hashed(dist_dir, name, data)
+        log(f'{name}: {len(data)} bytes')
+
+    with open(os.path.join(dist_dir, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def load_manifest(static_dir):
+    try:
+        with open(os.path.join(static_dir, 'dist', 'manifest.json')) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
@@ -0,0 +1,265 @@
+"""Bulk resume generation: records in, a streamed ZIP of PDFs out.
+
+Records are shaped like ``resumeApp().data`` and come either as JSON Lines
+(one document per line) or as CSV with one row per student:
+
+    fullName,email,phone,location,linkedin,summary,skills,education,experience,projects
+    Alex Chen,alex@univ.edu,...,"Python;SQL","[{""school"": ...}]",[],[]
+
+``skills`` is ``;``-separated and the list sections are JSON arrays. An
+optional ``template`` field/column picks the layout per record, and an
+optional ``id`` names the PDF. Each record is checked against the resume
+schema (schema.py) before it is rendered; records that do not match are
+reported as errors.
+
+Everything is streamed: records are parsed lazily, at most ``window`` chunks
+are rendering at once (fewer while the shared pool is full, which never ends
+the archive early), and each PDF is written to the ZIP and handed to the
+caller as soon as it is ready. Memory stays flat however large the cohort
+(apart from the ZIP central directory, about 100 bytes per file).
+"""
+import argparse
+import csv
+import io
+import json
+import re
+import sys
+import time
+import zipfile
+from collections import deque
+from itertools import islice
+
+import schema
+from pdf_layouts import LAYOUTS, render_pdf
+from schema import LIST_SECTIONS, PERSONAL_FIELDS
+from workers import Overloaded, WorkerPool
+
+# Fields of a record that describe it rather than belong to the resume
+# (``source`` is the file ``app.py import`` read it from).
+RECORD_FIELDS = ('id', 'template', 'source')
+
+
+class RecordError(ValueError):
+    pass
+
+
+def _csv_record(row):
+    record = {'schemaVersion': schema.SCHEMA_VERSION, 'personal': {k: row.get(k) or '' for k in PERSONAL_FIELDS}}
+    record['skills'] = [s.strip() for s in (row.get('skills') or '').split(';') if s.strip()]
+    for section in LIST_SECTIONS:
+        try:
+            record[section] = json.loads(row.get(section) or '[]')
+        except ValueError:
+            raise RecordError(f'{section} is not a JSON array') from None
+    for key in ('id', 'template'):
+        if row.get(key):
+            record[key] = row[key]
+    return record
+
+
+def _validated(record):
+    fields = {key: record.pop(key) for key in RECORD_FIELDS if key in record}
+    return dict(schema.validate(record), **fields)
+
+
+def iter_records(stream, fmt):
+    """Yield ``(record, error)`` pairs from a binary stream, one at a time."""
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    if fmt == 'csv':
+        for row in csv.DictReader(text):
+            try:
+                yield _validated(_csv_record(row)), None
+            except ValueError as exc:  # RecordError, SchemaError
+                yield None, str(exc)
+    elif fmt == 'jsonl':
+        for line in text:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as exc:
+                yield None, f'invalid JSON: {exc}'
+                continue
+            if not isinstance(record, dict):
+                yield None, 'expected a JSON object'
+                continue
+            try:
+                record = _validated(record)
+            except schema.SchemaError as exc:
+                yield None, str(exc)
+                continue
+            yield record, None
+    else:
+        raise ValueError(f'unknown format: {fmt!r}')
+
+
+def _slug(value):
+    return re.sub(r'[^A-Za-z0-9]+', '-', str(value)).strip('-')[:60] or 'resume'
+
+
+def render_chunk(items, default_template):
+    """Worker entry point: render a list of ``(index, record)``."""
+    results = []
+    for index, record in items:
+        template = record.get('template') or default_template
+        if template not in LAYOUTS:
+            results.append((index, record, None, f'unknown template: {template}'))
+            continue
+        try:
+            results.append((index, record, render_pdf(record, template), None))
+        except Exception as exc:  # one bad record must not sink the batch
+            results.append((index, record, None, f'{type(exc).__name__}: {exc}'))
+    return results
+
+
+class BatchProgress:
+    def __init__(self):
+        self.started = time.monotonic()
+        self.rendered = 0
+        self.failed = 0
+        self.bytes = 0
+        self.done = False
+
+    def as_dict(self):
+        elapsed = time.monotonic() - self.started
+        return {
+            'rendered': self.rendered,
+            'failed': self.failed,
+            'bytes': self.bytes,
+            'elapsed': round(elapsed, 2),
+            'per_second': round(self.rendered / elapsed, 1) if elapsed else 0.0,
+            'done': self.done,
+        }
+
+
+class _ZipStream:
+    """A write-only file object whose contents are drained after each entry."""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def render_batch(records, pool, template='modern', chunk_size=16, window=None, progress=None, max_wait=60.0):
+    """Render ``records`` (from ``iter_records``) and yield ZIP archive bytes.
+
+    The archive holds one PDF per good record plus ``errors.csv`` listing the
+    records that could not be rendered, including those of a chunk that found
+    no room in ``pool`` for ``max_wait`` seconds.
+    """
+    progress = progress or BatchProgress()
+    window = window or pool.workers * 2
+    out = _ZipStream()
+    errors = []
+    pending = deque()
+    held = []  # a chunk the pool had no room for yet, and since when
+    numbered = enumerate(records, start=1)
+
+    def fill():
+        """Keep ``window`` chunks in flight; False once everything is consumed."""
+        while len(pending) < window:
+            if held:
+                chunk, since = held.pop()
+            else:
+                chunk, exhausted = [], True
+                for index, (record, error) in islice(numbered, chunk_size):
+                    exhausted = False
+                    if error:
+                        errors.append((index, error))
+                        progress.failed += 1
+                    else:
+                        chunk.append((index, record))
+                if exhausted:
+                    break
+                if not chunk:
+                    continue
+                since = time.monotonic()
+            try:
+                pending.append((pool.submit(render_chunk, chunk, template), chunk))
+            except Overloaded as exc:
+                # The pool is shared with other batches and the PDF route, and
+                # the response has already started: wait for room rather than
+                # cut the archive short.
+                if pending:
+                    held.append((chunk, since))  # retried once a chunk of ours is done
+                    break
+                if time.monotonic() - since < max_wait:
+                    time.sleep(exc.retry_after)
+                    held.append((chunk, since))
+                    continue
+                errors.extend((index, f'Overloaded: {exc}') for index, _ in chunk)
+                progress.failed += len(chunk)
+        return bool(pending)
+
+    with zipfile.ZipFile(out, 'w', compression=zipfile.ZIP_STORED) as archive:
+        while fill():
+            future, chunk = pending.popleft()
+            try:
+                results = future.result()
+            except Exception as exc:  # e.g. the chunk hit the job deadline
+                results = [(index, record, None, f'{type(exc).__name__}: {exc}') for index, record in chunk]
+            for index, record, pdf, error in results:
+                if error:
+                    errors.append((index, error))
+                    progress.failed += 1
+                    continue
+                name = record.get('id') or (record.get('personal') or {}).get('fullName')
+                archive.writestr(f'{index:06d}-{_slug(name)}.pdf', pdf)
+                progress.rendered += 1
+                progress.bytes += len(pdf)
+            yield out.drain()
+        if errors:
+            report = io.StringIO()
+            writer = csv.writer(report)
+            writer.writerow(['record', 'error'])
+            writer.writerows(sorted(errors))
+            archive.writestr('errors.csv', report.getvalue())
+    progress.done = True
+    yield out.drain()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='app.py batch', description='Render a cohort of resumes to a ZIP of PDFs.')
+    parser.add_argument('input', help='a .jsonl or .csv file, or - for stdin')
+    parser.add_argument('-o', '--output', default='resumes.zip')
+    parser.add_argument('-f', '--format', choices=('jsonl', 'csv'), help='defaults to the input extension')
+    parser.add_argument('-t', '--template', default='modern', choices=sorted(LAYOUTS))
+    parser.add_argument('-w', '--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ('csv' if args.input.endswith('.csv') else 'jsonl')
+    source = sys.stdin.buffer if args.input == '-' else open(args.input, 'rb')
+    pool = WorkerPool(args.workers, timeout=60)
+    progress = BatchProgress()
+    last_report = 0.0
+    try:
+        with source, open(args.output, 'wb') as out:
+            for data in render_batch(iter_records(source, fmt), pool, args.template, progress=progress):
+                out.write(data)
+                if time.monotonic() - last_report >= 1:
+                    last_report = time.monotonic()
+                    stats = progress.as_dict()
+                    print(f'\r{stats["rendered"]} rendered, {stats["failed"]} failed, '
+                          f'{stats["per_second"]}/s', end='', file=sys.stderr)
+    finally:
+        pool.shutdown()
+    stats = progress.as_dict()
+    print(f'\r{stats["rendered"]} rendered, {stats["failed"]} failed in {stats["elapsed"]}s '
+          f'({stats["per_second"]}/s) -> {args.output}', file=sys.stderr)
+    return 0
@@ -0,0 +1,67 @@
+"""Autosave throughput: one SQLite commit per edit vs the write-behind queue.
+
+Simulates many editors each sending a stream of small JSON patches.
+
+    python benchmarks/bench_autosave.py [--editors N] [--edits N]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from json_patch import apply_patch  # noqa: E402
+from sample_data import SAMPLE  # noqa: E402
+from storage import SQLiteStore, WriteBehindQueue  # noqa: E402
+
+
+def drive(write, editors, edits):
+    def editor(n):
+        for i in range(edits):
+            write(f'resume-{n}', [{'op': 'replace', 'path': '/personal/summary', 'value': 'x' * i}])
+
+    threads = [threading.Thread(target=editor, args=(n,)) for n in range(editors)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--editors', type=int, default=200)
+    parser.add_argument('--edits', type=int, default=50)
+    args = parser.parse_args()
+    total = args.editors * args.edits
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SQLiteStore(os.path.join(tmp, 'direct.db'))
+        store.put_many((f'resume-{n}', SAMPLE, 1) for n in range(args.editors))
+        lock = threading.Lock()
+
+        def direct(resume_id, patch):
+            with lock:
+                doc, version = store.get(resume_id)
+                store.put_many([(resume_id, apply_patch(doc, patch), version + 1)])
+
+        elapsed = drive(direct, args.editors, args.edits)
+        print(f'direct commit per edit  {total / elapsed:10.0f} edits/s  ({total} row writes)')
+
+        queued_store = SQLiteStore(os.path.join(tmp, 'queued.db'))
+        queued_store.put_many((f'resume-{n}', SAMPLE, 1) for n in range(args.editors))
+        queue = WriteBehindQueue(queued_store, flush_interval=0.2)
+        elapsed = drive(lambda rid, patch: queue.update(rid, lambda doc: apply_patch(doc, patch)),
+                        args.editors, args.edits)
+        queue.close()
+        stats = queue.stats()
+        print(f'write-behind queue      {total / elapsed:10.0f} edits/s  '
+              f'({stats["flushed"]} row writes in {stats["batches"]} transactions)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""Bulk rendering: resumes/sec and peak memory as the cohort grows.
+
+    python benchmarks/bench_batch.py [--sizes 100,1000,5000] [--workers N]
+
+Records are generated on the fly and the ZIP is discarded as it streams, so
+the reported peak RSS is what the batch itself holds; it should stay flat
+from one cohort size to the next.
+"""
+import argparse
+import os
+import resource
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import batch  # noqa: E402
+from sample_data import sample_resume  # noqa: E402
+from workers import WorkerPool  # noqa: E402
+
+
+def records(count, entries):
+    for n in range(count):
+        yield sample_resume(entries, n), None
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', default='100,1000,5000', help='comma-separated cohort sizes')
+    parser.add_argument('--entries', type=int, default=2, help='entries per resume section')
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    pool = WorkerPool(args.workers, timeout=60)
+    print(f'{args.workers} workers, {args.entries} entries per section')
+    for size in map(int, args.sizes.split(',')):
+        progress = batch.BatchProgress()
+        written = 0
+        started = time.perf_counter()
+        for data in batch.render_batch(records(size, args.entries), pool, progress=progress):
+            written += len(data)
+        elapsed = time.perf_counter() - started
+        print(f'{size:6} resumes  {size / elapsed:8.1f} /s   {written / 2**20:7.1f} MB zip   '
+              f'peak RSS {peak_rss_mb():6.1f} MB')
+    pool.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+"""Live editing: operations/sec per process and how fast peers see each edit.
+
+    python benchmarks/bench_collab.py [--sessions 10,50,100] [--seconds 5] [--ops 5] [--interval 0.05]
+
+First the session itself, in process: operations applied per second when
+editors send them one at a time and 20 to a batch. Then over HTTP, against
+the app on a threaded local server: for each count of sessions, two editors
+per resume, each holding the event stream open and POSTing a batch of
+``--ops`` edits every ``--interval`` seconds. Every edit carries the time it
+was made, so the other editor measures delivery latency when it arrives.
+Reports operations accepted and delivered per second, latency percentiles
+and failed requests.
+"""
+import argparse
+import http.client
+import json
+import os
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('RESUME_STORE', 'memory://')
+os.environ.setdefault('WEB_THREADS', '1000')  # the Werkzeug server here has a thread per connection
+
+import app as app_module  # noqa: E402
+import collab  # noqa: E402
+import schema  # noqa: E402
+from loadgen import percentile, serve  # noqa: E402
+from sample_data import sample_resume  # noqa: E402
+
+collab.KEEPALIVE = 1.0  # notice closed streams quickly between rounds
+
+
+def in_process(per_batch, seconds):
+    session = collab.Session('bench', schema.validate(sample_resume(3)), lambda *args: None, persist_interval=3600)
+    fields = schema.PERSONAL_FIELDS
+    applied, batch, started = 0, 0, time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        batch += 1
+        ops = [{'op': 'set', 'path': ['personal', fields[n % len(fields)]], 'value': f'{batch}.{n}'}
+               for n in range(per_batch)]
+        session.submit('a', batch, ops)
+        applied += per_batch
+    return applied / (time.perf_counter() - started)
+
+
+class Editor:
+    """One editor: an event stream reader and a writer of timestamped edits."""
+
+    def __init__(self, base, resume_id, site, stats):
+        self.address = urlsplit(base).netloc
+        self.path = f'/api/resume/{resume_id}/live'
+        self.site = site
+        self.stats = stats
+        self.stream = None
+
+    def read(self, ready):
+        conn = http.client.HTTPConnection(self.address, timeout=30)
+        conn.request('GET', self.path)
+        response = self.stream = conn.getresponse()
+        if response.status != 200:
+            self.stats.record(error=1)
+            ready.set()
+            return
+        ready.set()
+        try:
+            kind = None
+            while True:
+                line = response.readline()
+                if not line:
+                    return
+                line = line.decode().rstrip('\n')
+                if line.startswith('event: '):
+                    kind = line[7:]
+                elif line.startswith('data: ') and kind == 'ops':
+                    now = time.perf_counter()
+                    for _, site, _, ops in json.loads(line[6:])['batches']:
+                        if site != self.site:
+                            self.stats.record(delivered=[now - float(op['value']) for op in ops])
+        except (OSError, ValueError, AttributeError, http.client.HTTPException):
+            pass  # closed at the end of the round (http.client drops its file)
+
+    def write(self, stop, ops_per_batch, interval):
+        conn = http.client.HTTPConnection(self.address, timeout=30)
+        batch = 0
+        while not stop.is_set():
+            batch += 1
+            value = f'{time.perf_counter():.6f}'
+            ops = [{'op': 'set', 'path': ['personal', 'summary' if n % 2 else 'location'], 'value': value}
+                   for n in range(ops_per_batch)]
+            try:
+                conn.request('POST', self.path, json.dumps({'site': self.site, 'batch': batch, 'ops': ops}),
+                             {'Content-Type': 'application/json'})
+                response = conn.getresponse()
+                response.read()
+                self.stats.record(accepted=ops_per_batch if response.status == 200 else 0,
+                                  error=int(response.status != 200))
+            except (OSError, http.client.HTTPException):
+                self.stats.record(error=1)
+                conn = http.client.HTTPConnection(self.address, timeout=30)
+            stop.wait(interval)
+
+
+class Stats:
+    def __init__(self):
+        self.accepted = self.errors = 0
+        self.latencies = []
+        self._lock = threading.Lock()
+
+    def record(self, accepted=0, error=0, delivered=()):
+        with self._lock:
+            self.accepted += accepted
+            self.errors += error
+            self.latencies.extend(delivered)
+
+
+def over_http(base, sessions, seconds, ops_per_batch, interval, round_no):
+    client = app_module.app.test_client()
+    stats = Stats()
+    editors = []
+    for n in range(sessions):
+        resume_id = f'live-{round_no}-{n}'
+        assert client.put(f'/api/resume/{resume_id}', json=sample_resume(2, n)).status_code == 200
+        editors += [Editor(base, resume_id, f'e{round_no}x{n}x{side}', stats) for side in 'ab']
+
+    readers = []
+    for editor in editors:
+        ready = threading.Event()
+        thread = threading.Thread(target=editor.read, args=(ready,), daemon=True)
+        thread.start()
+        ready.wait(10)
+        readers.append(thread)
+    stop = threading.Event()
+    writers = [threading.Thread(target=e.write, args=(stop, ops_per_batch, interval), daemon=True) for e in editors]
+    started = time.perf_counter()
+    for thread in writers:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in writers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    time.sleep(0.5)  # the last batches reach the other editors
+    for editor in editors:
+        if editor.stream is not None:
+            editor.stream.close()
+    latencies = [ms * 1000 for ms in stats.latencies]
+    print(f'{sessions:8} {2 * sessions:7} {stats.accepted / elapsed:12,.0f} {len(latencies) / elapsed:12,.0f}'
+          f' {percentile(latencies, 50):8.1f} {percentile(latencies, 95):8.1f} {percentile(latencies, 99):8.1f}'
+          f' {stats.errors:7}')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sessions', default='10,50,100', help='comma-separated concurrent sessions')
+    parser.add_argument('--seconds', type=float, default=5.0, help='duration of each round')
+    parser.add_argument('--ops', type=int, default=5, help='operations per POST')
+    parser.add_argument('--interval', type=float, default=0.05, help='seconds between POSTs per editor')
+    args = parser.parse_args()
+
+    print('in process (operations/sec)')
+    for per_batch in (1, 20):
+        print(f'  {per_batch:2} per batch  {in_process(per_batch, 1.0):12,.0f}')
+
+    print(f'over HTTP, 2 editors per session, {args.ops} operations per POST every {args.interval * 1000:.0f} ms')
+    print(f'{"sessions":>8} {"editors":>7} {"accepted/s":>12} {"delivered/s":>12}'
+          f' {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"errors":>7}')
+    with serve(app_module.app) as base:
+        for round_no, sessions in enumerate(int(n) for n in args.sessions.split(',')):
+            over_http(base, sessions, args.seconds, args.ops, args.interval, round_no)
+    print(f'process totals: {app_module.live.stats()}')
+
+
+if __name__ == '__main__':
+    main()
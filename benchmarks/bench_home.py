@@ -0,0 +1,43 @@
+"""Requests/sec for ``/``: per-request render_template_string vs the precompressed page.
+
+    python benchmarks/bench_home.py [-c CONCURRENCY] [-d SECONDS]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, render_template_string  # noqa: E402
+
+from app import BUNDLE_URLS, HOME_PAGE, HTML_TEMPLATE, app  # noqa: E402
+from loadgen import run, serve  # noqa: E402
+
+
+def baseline_app():
+    # What home() used to do: look up / compile and render the template every hit.
+    baseline = Flask('baseline')
+    baseline.add_url_rule('/', 'home', lambda: render_template_string(HTML_TEMPLATE, assets=BUNDLE_URLS))
+    return baseline
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-c', '--concurrency', type=int, default=8)
+    parser.add_argument('-d', '--duration', type=float, default=5.0)
+    args = parser.parse_args()
+
+    etag = HOME_PAGE.variants['gzip'][1]
+    scenarios = [
+        ('before: render_template_string', baseline_app(), {'Accept-Encoding': 'gzip'}),
+        ('after: precompressed gzip', app, {'Accept-Encoding': 'gzip'}),
+        ('after: If-None-Match -> 304', app, {'Accept-Encoding': 'gzip', 'If-None-Match': f'"{etag}"'}),
+    ]
+    for label, wsgi_app, headers in scenarios:
+        with serve(wsgi_app) as base_url:
+            result = run(base_url + '/', args.concurrency, args.duration, headers=headers)
+        print(f'{label:34} {result.summary()}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+"""Resume import: files/sec and MB/s per format, and how much of a resume survives.
+
+    python benchmarks/bench_import.py [--copies 20] [--workers N]
+
+The corpus is generated: every server PDF layout at 1, 3 and 6 entries per
+section, and the same resumes written as DOCX files the way a word processor
+lays out a resume (a heading per section, list paragraphs for bullet points).
+``--copies`` repeats each file with a different name on it, so no two files
+hash the same. Each file is imported serially and then through a worker pool;
+accuracy is the share of the source resume's fields that came back with the
+same value. Finally the files go through ``/api/import`` twice, to compare a
+cold parse with an answer from the cache.
+"""
+import argparse
+import io
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import zipfile
+from xml.sax.saxutils import escape
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('RESUME_STORE', 'memory://')
+CACHE_DIR = tempfile.mkdtemp(prefix='import-cache-')
+os.environ.setdefault('IMPORT_CACHE_DIR', CACHE_DIR)
+
+import app as app_module  # noqa: E402
+import importer  # noqa: E402
+from pdf_layouts import LAYOUTS, render_pdf  # noqa: E402
+from sample_data import sample_resume  # noqa: E402
+from workers import WorkerPool  # noqa: E402
+
+CONTENT_TYPES = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/word/document.xml"
+ ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+</Types>'''
+RELS = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Target="word/document.xml"
+ Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>
+</Relationships>'''
+
+
+def paragraph(text, bullet=False, bold=False):
+    props = '<w:pPr><w:numPr><w:ilvl w:val="0"/><w:numId w:val="1"/></w:numPr></w:pPr>' if bullet else ''
+    run = '<w:rPr><w:b/></w:rPr>' if bold else ''
+    return f'<w:p>{props}<w:r>{run}<w:t xml:space="preserve">{escape(text)}</w:t></w:r></w:p>'
+
+
+def docx_file(data):
+    """``data`` as a DOCX file laid out like a typical resume."""
+    p = data['personal']
+    body = [paragraph(p['fullName'], bold=True),
+            paragraph(' | '.join(filter(None, (p['email'], p['phone'], p['location'], p['linkedin'])))),
+            paragraph('SUMMARY', bold=True), paragraph(p['summary']),
+            paragraph('EDUCATION', bold=True)]
+    for edu in data['education']:
+        body.append(paragraph(f"{edu['school']}, {edu['date']}", bold=True))
+        body.append(paragraph(f"{edu['degree']}, GPA: {edu['gpa']}"))
+        body.append(paragraph(f"Coursework: {edu['details']}"))
+    body.append(paragraph('EXPERIENCE', bold=True))
+    for exp in data['experience']:
+        body.append(paragraph(f"{exp['role']} | {exp['company']} | {exp['location']} | {exp['date']}", bold=True))
+        body.extend(paragraph(line.strip(), bullet=True) for line in exp['details'].split('. ') if line.strip())
+    body.append(paragraph('PROJECTS', bold=True))
+    for proj in data['projects']:
+        body.append(paragraph(f"{proj['name']} | {proj['technologies']} | {proj['link']}", bold=True))
+        body.append(paragraph(proj['details'], bullet=True))
+    body += [paragraph('SKILLS', bold=True), paragraph(', '.join(data['skills']))]
+    document = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                f'<w:body>{"".join(body)}</w:body></w:document>')
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', CONTENT_TYPES)
+        archive.writestr('_rels/.rels', RELS)
+        archive.writestr('word/document.xml', document)
+    return out.getvalue()
+
+
+def corpus(copies):
+    """``(format, label, source document, file bytes)`` for every file."""
+    files = []
+    for n in range(copies):
+        for entries in (1, 3, 6):
+            data = sample_resume(entries, n)
+            if importer.pypdf is not None:
+                for template in LAYOUTS:
+                    files.append(('pdf', template, data, render_pdf(data, template)))
+            files.append(('docx', 'docx', data, docx_file(data)))
+    return files
+
+
+def accuracy(source, parsed):
+    """Share of the source's non-empty fields that came back unchanged."""
+    pairs = [(value, parsed['personal'].get(field)) for field, value in source['personal'].items()]
+    for section in ('education', 'experience', 'projects'):
+        got = parsed[section]
+        for i, item in enumerate(source[section]):
+            pairs += [(value, got[i].get(field) if i < len(got) else None)
+                      for field, value in item.items() if field != 'id']
+    pairs.append((sorted(set(source['skills'])), sorted(set(parsed['skills']))))
+    pairs = [(want, got) for want, got in pairs if want]
+    return sum(want == got for want, got in pairs) / len(pairs)
+
+
+def report(label, files, elapsed):
+    size = sum(len(f[3]) for f in files)
+    print(f'  {label:24} {len(files) / elapsed:8.1f} files/s  {size / elapsed / 2**20:7.2f} MB/s')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--copies', type=int, default=20, help='copies of each layout and size')
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    files = corpus(args.copies)
+    if importer.pypdf is None:
+        print('(pypdf is not installed; DOCX files only)')
+    formats = sorted({f[0] for f in files})
+    print(f'{len(files)} files, {sum(len(f[3]) for f in files) / 2**20:.1f} MB')
+
+    print('serial')
+    scores = {}
+    for fmt in formats:
+        subset = [f for f in files if f[0] == fmt]
+        started = time.perf_counter()
+        for _, label, source, data in subset:
+            scores.setdefault(label, []).append(accuracy(source, importer.import_file(data)[1]))
+        report(fmt, subset, time.perf_counter() - started)
+
+    pool = WorkerPool(args.workers, max_queue=len(files), timeout=30)
+    try:
+        pool.run(importer.import_file, files[0][3])  # start the workers
+        print(f'worker pool ({args.workers} workers)')
+        started = time.perf_counter()
+        for future in [pool.submit(importer.import_file, f[3]) for f in files]:
+            future.result()
+        report('all formats', files, time.perf_counter() - started)
+    finally:
+        pool.shutdown()
+
+    print('fields recovered')
+    for label, values in scores.items():
+        print(f'  {label:24} {statistics.mean(values):7.1%}')
+
+    print('/api/import (median ms)')
+    client = app_module.app.test_client()
+    try:
+        for attempt in ('cold', 'cached'):
+            samples = []
+            for _, _, _, data in files:
+                started = time.perf_counter()
+                response = client.post('/api/import', data=data)
+                samples.append((time.perf_counter() - started) * 1000)
+                assert response.status_code == 200, response.get_json()
+                assert response.get_json()['cached'] == (attempt == 'cached')
+            print(f'  {attempt:24} {statistics.median(samples):8.2f} ms')
+    finally:
+        app_module.import_pool.shutdown()
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""Per-keystroke preview update time with large resumes, in headless Chromium.
+
+Compares the lazily mounted layouts (x-if, only the active one is live) with
+the old markup where all three layouts stayed in the DOM behind x-show.
+
+    pip install playwright && playwright install chromium
+    python benchmarks/bench_keystroke.py [--entries 50] [--keys 200]
+"""
+import argparse
+import os
+import re
+import statistics
+import sys
+
+os.environ.setdefault('RESUME_STORE', 'memory://')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as app_module  # noqa: E402
+from loadgen import percentile, serve  # noqa: E402
+
+try:
+    from playwright.sync_api import sync_playwright
+except ImportError:
+    sync_playwright = None
+
+# Fill every section, then type into a few fields. Each sample is the time from
+# the input event until the preview has committed (next animation frame),
+# Alpine has flushed its effects and layout is clean.
+MEASURE = '''async ([entries, keys]) => {
+    const app = Alpine.$data(document.body);
+    const make = (section, i) => {
+        const base = {
+            education: { school: 'School', degree: 'Degree', date: '2025', gpa: '3.8', details: 'Details' },
+            experience: { company: 'Company', role: 'Role', location: 'Remote', date: '2024', details: 'Did things.' },
+            projects: { name: 'Project', technologies: 'Python', link: '', details: 'Built it.' },
+        }[section];
+        return Object.assign({ id: i + 1 }, base);
+    };
+    for (const section of ['education', 'experience', 'projects']) {
+        app.data[section] = Array.from({ length: entries }, (_, i) => make(section, i));
+    }
+    app.data.skills = Array.from({ length: entries }, (_, i) => 'Skill ' + i);
+    await Alpine.nextTick();
+
+    app.activeTab = 'experience';
+    await Alpine.nextTick();
+    const fields = [
+        document.querySelector('textarea[x-model="data.personal.summary"]'),
+        document.querySelector('textarea[x-model="exp.details"]'),
+    ];
+    const samples = [];
+    for (let i = 0; i < keys; i++) {
+        const field = fields[i % fields.length];
+        const started = performance.now();
+        field.value += 'x';
+        field.dispatchEvent(new Event('input'));
+        await new Promise(resolve => requestAnimationFrame(resolve));
+        await Alpine.nextTick();
+        document.body.offsetHeight;  // force style + layout
+        samples.push(performance.now() - started);
+    }
+    return {
+        samples,
+        nodes: document.getElementById('resume-preview').getElementsByTagName('*').length,
+        scheduler: window.previewMetrics(),
+    };
+}'''
+
+
+def all_layouts_mounted(page):
+    """The pre-x-if markup: every layout in the DOM, toggled with x-show."""
+    html = page.variants['identity'][0].decode('utf-8')
+    html, opened = re.subn(r'<template x-if="(template === \'\w+\')">\s*<div', r'<div x-show="\1"', html)
+    html, closed = re.subn(r'(\n {16}</div>)\n {12}</template>\n', r'\1\n', html)
+    assert opened == closed == 3, (opened, closed)
+    return app_module.PrecompressedPage(html.encode('utf-8'))
+
+
+def measure(base_url, entries, keys):
+    with sync_playwright() as p:
+        browser = p.chromium.launch()
+        page = browser.new_page()
+        page.goto(base_url + '/', wait_until='load')
+        page.wait_for_function('window.Alpine !== undefined')
+        result = page.evaluate(MEASURE, [entries, keys])
+        browser.close()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--entries', type=int, default=50, help='entries per section')
+    parser.add_argument('--keys', type=int, default=200, help='keystrokes to simulate')
+    args = parser.parse_args()
+    if sync_playwright is None:
+        sys.exit('This benchmark drives a real browser: pip install playwright && playwright install chromium')
+
+    pages = {'x-show (all mounted)': all_layouts_mounted(app_module.HOME_PAGE), 'x-if (lazy)': app_module.HOME_PAGE}
+    with serve(app_module.app) as base_url:
+        for label, page in pages.items():
+            app_module.HOME_PAGE = page
+            result = measure(base_url, args.entries, args.keys)
+            samples = result['samples']
+            scheduler = result['scheduler']
+            print(f'{label:22} median {statistics.median(samples):6.2f} ms   '
+                  f'p95 {percentile(samples, 95):6.2f} ms   preview nodes {result["nodes"]}')
+            print(f'{"":22} preview commits {scheduler["commits"]}, coalesced edits {scheduler["coalesced"]}, '
+                  f'frames over 16.7 ms {scheduler["dropped"]}, max frame {scheduler["maxFrameMs"]:.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
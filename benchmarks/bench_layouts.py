@@ -0,0 +1,53 @@
+"""Layout templates: load time with and without the bytecode cache, and
+server-side HTML renders/sec per layout as resumes grow.
+
+    python benchmarks/bench_layouts.py [--entries 1,10,50] [--renders N]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from layouts import LayoutRegistry  # noqa: E402
+from sample_data import sample_resume  # noqa: E402
+
+LAYOUT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'templates', 'layouts')
+
+
+def load_time(cache_dir):
+    started = time.perf_counter()
+    LayoutRegistry(LAYOUT_DIR, cache_dir)
+    return (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--entries', default='1,10,50', help='comma-separated entries per section')
+    parser.add_argument('--renders', type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cold = load_time(cache_dir)  # compiles and fills the cache
+        warm = min(load_time(cache_dir) for _ in range(5))
+    print(f'load all layouts: {cold:.1f} ms compiling, {warm:.1f} ms from the bytecode cache')
+
+    registry = LayoutRegistry(LAYOUT_DIR)
+    sizes = [int(n) for n in args.entries.split(',')]
+    print(f'{"":10}' + ''.join(f'{f"{n} entries":>22}' for n in sizes))
+    for layout in registry:
+        cells = []
+        for entries in sizes:
+            data = sample_resume(entries)
+            started = time.perf_counter()
+            for _ in range(args.renders):
+                html = layout.render(data)
+            elapsed = time.perf_counter() - started
+            cells.append(f'{args.renders / elapsed:8.0f}/s {len(html) / 1024:6.1f} KB')
+        print(f'{layout.name:10}' + ''.join(f'{cell:>22}' for cell in cells))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+"""Cold vs warm loads of the editor with its service worker, and offline editing.
+
+    pip install playwright && playwright install chromium
+    python benchmarks/bench_offline.py [--kbps 1600] [--rtt 40] [--runs 5]
+
+The app is served through a simulated link (see ``loadgen.SlowLink``). Each
+run opens a fresh browser profile and loads the editor twice: cold, with
+nothing cached, and warm, once the service worker has taken over. For both it
+reports the load time and how many requests reached the server for the page
+and its assets (the resume itself is fetched from the API either way). It
+then goes offline, reloads, edits the resume, comes back online and times
+how long the queued save takes to reach the server.
+
+Without Playwright it prints the precache list a browser would store.
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as app_module  # noqa: E402
+from loadgen import SlowLink, serve  # noqa: E402
+
+try:
+    from playwright.sync_api import sync_playwright
+except ImportError:
+    sync_playwright = None
+
+LOAD_TIME = "() => performance.getEntriesByType('navigation')[0].loadEventEnd"
+# Set once the worker has precached the shell and claimed the page.
+CONTROLLED = '() => !!navigator.serviceWorker.controller'
+
+
+class RequestCounter:
+    """WSGI middleware counting requests per path."""
+
+    def __init__(self, app):
+        self.app = app
+        self.counts = Counter()
+        self._lock = threading.Lock()
+
+    def __call__(self, environ, start_response):
+        with self._lock:
+            self.counts[environ['PATH_INFO']] += 1
+        return self.app(environ, start_response)
+
+    def take(self):
+        """Requests for the page and its assets since the last call.
+
+        The API and the browser's background update checks of /sw.js do not count.
+        """
+        with self._lock:
+            shell = sum(n for path, n in self.counts.items()
+                        if not path.startswith('/api/') and path != '/sw.js')
+            self.counts.clear()
+        return shell
+
+
+def wait_for(predicate, timeout=30.0):
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        if predicate():
+            return (time.perf_counter() - started) * 1000
+        time.sleep(0.02)
+    return float('nan')
+
+
+def run_once(browser, base_url, counter):
+    context = browser.new_context()
+    page = context.new_page()
+    resume_id = f'offline-{time.monotonic_ns()}'
+    url = f'{base_url}/?id={resume_id}'
+
+    counter.take()
+    page.goto(url, wait_until='load')
+    cold = {'ms': page.evaluate(LOAD_TIME), 'requests': None}
+    page.wait_for_function(CONTROLLED)
+    page.wait_for_timeout(300)  # let the first autosave finish
+    cold['requests'] = counter.take()
+
+    page.reload(wait_until='load')
+    warm = {'ms': page.evaluate(LOAD_TIME), 'requests': counter.take()}
+
+    context.set_offline(True)
+    page.reload(wait_until='load')
+    editable = page.locator('input[x-model="data.personal.fullName"]')
+    offline_ok = editable.count() == 1
+    editable.fill('Offline Edit')
+    page.wait_for_timeout(1000)  # past the autosave delay, so the save fails and is queued
+    context.set_offline(False)
+    page.evaluate("() => window.dispatchEvent(new Event('online'))")
+
+    def synced():
+        record = app_module.resumes.get(resume_id)
+        return record is not None and record[0]['personal']['fullName'] == 'Offline Edit'
+
+    sync_ms = wait_for(synced)
+    context.close()
+    return cold, warm, offline_ok, sync_ms
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--kbps', type=float, default=1600, help='simulated bandwidth')
+    parser.add_argument('--rtt', type=float, default=40, help='simulated round trip, ms')
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    sw = app_module.SERVICE_WORKER.variants['identity'][0].decode('utf-8')
+    precache = sw.split('const PRECACHE = ', 1)[1].split(';', 1)[0]
+    print(f'service worker precaches: {precache}')
+    if sync_playwright is None:
+        print('(install playwright to measure cold vs warm loads in Chromium)')
+        return
+
+    counter = RequestCounter(SlowLink(app_module.app.wsgi_app, args.kbps, args.rtt))
+    app_module.app.wsgi_app = counter
+    results = []
+    with serve(app_module.app) as base_url, sync_playwright() as p:
+        browser = p.chromium.launch()
+        for _ in range(args.runs):
+            results.append(run_once(browser, base_url, counter))
+        browser.close()
+
+    print(f'link: {args.kbps:.0f} kbit/s, {args.rtt:.0f} ms RTT; median of {args.runs}')
+    for label, index in (('cold', 0), ('warm', 1)):
+        ms = statistics.median(r[index]['ms'] for r in results)
+        requests = statistics.median(r[index]['requests'] for r in results)
+        print(f'{label:6} load {ms:7.0f} ms   {requests:3.0f} page/asset requests to the server')
+    offline = sum(r[2] for r in results)
+    print(f'offline reload rendered the editor in {offline}/{args.runs} runs; '
+          f'queued edit reached the server {statistics.median(r[3] for r in results):.0f} ms after reconnecting')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+"""PDF downloads under overload: tail latency with and without admission control.
+
+    python benchmarks/bench_overload.py [--workers 2] [--render-ms 200] [--seconds 5] [--loads 1,10]
+
+Renders are made to take ``--render-ms`` (a sleep before the real render), so
+the pool's capacity is known: ``workers / render time`` PDFs a second. Requests
+then arrive open-loop (on a fixed schedule, whether or not earlier ones have
+been answered, as a class clicking Download would) at each multiple of that
+capacity in ``--loads``, each for a resume not rendered before, from 200
+clients (``X-Forwarded-For``) or from one. Latency is measured from when each
+request was due. Compared:
+
+* unbounded queue: every request waits for a worker, up to the job timeout;
+* admission control: the app's defaults, a bounded queue that sheds when full
+  or slower than ``PDF_MAX_WAIT``, and the per-client rate limit.
+
+Then a class of ``--class-size`` students downloads the same resume at once,
+with and without single-flight coalescing, counting the renders it took.
+"""
+import argparse
+import http.client
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from functools import partial
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('RESUME_STORE', 'memory://')
+os.environ.setdefault('RENDER_CACHE_DIR', tempfile.mkdtemp(prefix='render-cache-'))
+os.environ['TRUSTED_PROXIES'] = '1'  # clients are told apart by X-Forwarded-For
+
+import app as app_module  # noqa: E402
+from admission import RateLimiter  # noqa: E402
+from loadgen import percentile, serve  # noqa: E402
+from pdf_layouts import render_pdf  # noqa: E402
+from sample_data import sample_resume  # noqa: E402
+from workers import WorkerPool  # noqa: E402
+
+
+def slow_render(seconds, doc, template):
+    time.sleep(seconds)
+    return render_pdf(doc, template)
+
+
+class NoCoalescing:
+    def run(self, key, fn, *args):
+        return fn(*args)
+
+
+def configure(workers, render_seconds, admission):
+    config = app_module.app.config
+    old = app_module.pdf_pool
+    if admission:
+        app_module.pdf_pool = WorkerPool(workers, 4 * workers, config['PDF_TIMEOUT'], config['PDF_MAX_WAIT'])
+        app_module.rate_limiter = RateLimiter(config['RATE_LIMIT'] / 60, config['RATE_BURST'])
+    else:
+        app_module.pdf_pool = WorkerPool(workers, 1_000_000, config['PDF_TIMEOUT'])
+        app_module.rate_limiter = None
+    old.shutdown()
+    app_module.render_pdf = partial(slow_render, render_seconds)
+    # Start the worker processes before the clock does.
+    for future in [app_module.pdf_pool.submit(time.sleep, 0) for _ in range(workers)]:
+        future.result()
+
+
+def request(base, path, client):
+    parts = urlsplit(base)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=120)
+    try:
+        conn.request('GET', path, headers={'X-Forwarded-For': client, 'Connection': 'close'})
+        response = conn.getresponse()
+        response.read()
+        return response.status
+    except (OSError, http.client.HTTPException):
+        return 'error'
+    finally:
+        conn.close()
+
+
+def open_loop(base, paths, rate, clients):
+    """Send a request for each of ``paths`` at ``rate`` a second; (status, seconds) for each."""
+    results = []
+    lock = threading.Lock()
+
+    def send(path, client, due):
+        status = request(base, path, client)
+        with lock:
+            results.append((status, time.perf_counter() - due))
+
+    threads = []
+    started = time.perf_counter()
+    for n, path in enumerate(paths):
+        due = started + n / rate
+        time.sleep(max(0.0, due - time.perf_counter()))
+        thread = threading.Thread(target=send, args=(path, f'10.0.{n % clients // 250}.{n % clients % 250}', due))
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def resumes(prefix, count):
+    client = app_module.app.test_client()
+    for n in range(count):
+        doc = sample_resume(1, n + 1)
+        doc['personal']['fullName'] = f'{prefix} {n}'  # never rendered (and cached) before
+        assert client.put(f'/api/resume/{prefix}-{n}', json=doc).status_code == 200
+    return [f'/api/resume/{prefix}-{n}/pdf' for n in range(count)]
+
+
+def overload(base, args, capacity):
+    print(f'open-loop arrivals for {args.seconds:g} s; capacity {capacity:g} PDFs/s '
+          f'({args.workers} workers x {args.render_ms:g} ms)')
+    print(f'  {"setup":17} {"clients":>7} {"load":>5} {"offered/s":>9} {"ok/s":>6} {"429":>5} {"504":>5}'
+          f' {"other":>5} {"ok p50":>8} {"ok p99":>8} {"all p99":>8} {"max":>8}')
+    for admission in (False, True):
+        for load in (float(n) for n in args.loads.split(',')):
+            for clients in ((200, 1) if admission else (200,)):
+                configure(args.workers, args.render_ms / 1000, admission)
+                rate = capacity * load
+                paths = resumes(f'load-{admission:d}-{load:g}-{clients}', int(rate * args.seconds))
+                started = time.perf_counter()
+                results = open_loop(base, paths, rate, clients)
+                elapsed = time.perf_counter() - started
+                statuses = Counter(status for status, _ in results)
+                ok = [seconds * 1000 for status, seconds in results if status == 200]
+                every = [seconds * 1000 for _, seconds in results]
+                other = len(results) - statuses[200] - statuses[429] - statuses[504]
+                label = 'admission control' if admission else 'unbounded queue'
+                print(f'  {label:17} {clients:7} {load:4g}x {rate:9.0f} {len(ok) / elapsed:6.1f}'
+                      f' {statuses[429]:5} {statuses[504]:5} {other:5} {percentile(ok, 50):8.0f}'
+                      f' {percentile(ok, 99):8.0f} {percentile(every, 99):8.0f} {max(every):8.0f}')
+
+
+def coalescing(base, args):
+    print(f'a class of {args.class_size} downloading the same resume at once')
+    print(f'  {"setup":17} {"renders":>7} {"ok":>5} {"p50 ms":>8} {"max ms":>8}')
+    for single_flight in (False, True):
+        configure(args.workers, args.render_ms / 1000, admission=True)
+        app_module.rate_limiter = None
+        flights, app_module.flights = app_module.flights, (app_module.flights if single_flight else NoCoalescing())
+        path, = resumes(f'class-{single_flight:d}', 1)
+        before = app_module.pdf_pool.stats()['completed']
+        results = open_loop(base, [path] * args.class_size, 1000, args.class_size)
+        renders = app_module.pdf_pool.stats()['completed'] - before
+        app_module.flights = flights
+        ms = [seconds * 1000 for _, seconds in results]
+        ok = sum(status == 200 for status, _ in results)
+        label = 'single-flight' if single_flight else 'no coalescing'
+        print(f'  {label:17} {renders:7} {ok:5} {percentile(ms, 50):8.0f} {max(ms):8.0f}')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, default=2, help='PDF worker processes')
+    parser.add_argument('--render-ms', type=float, default=200, help='time each render takes')
+    parser.add_argument('--seconds', type=float, default=5, help='duration of each open-loop run')
+    parser.add_argument('--loads', default='1,10', help='comma-separated multiples of capacity')
+    parser.add_argument('--class-size', type=int, default=30)
+    args = parser.parse_args()
+
+    capacity = args.workers / (args.render_ms / 1000)
+    with serve(app_module.app) as base:
+        overload(base, args, capacity)
+        coalescing(base, args)
+    app_module.pdf_pool.shutdown()
+
+
+if __name__ == '__main__':
+    main()
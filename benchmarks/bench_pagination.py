@@ -0,0 +1,158 @@
+"""Paginated preview and PDF export for 1-, 3- and 10-page resumes.
+
+    python benchmarks/bench_pagination.py [--pages 1,3,10] [--keys 50]
+
+For each length, a resume that fills that many pages (as the server lays it
+out) is rendered by the server's PDF engine: time and peak Python memory.
+
+With Playwright (``pip install playwright && playwright install chromium``)
+the same resume is loaded into the editor in headless Chromium, which reports
+the pages the preview was split into, how long placing every block took, and
+per keystroke (typing into the first experience entry, the worst case: every
+block after it may move) the layout time and how many blocks were placed
+again. It then exports the PDF both ways and reports the largest canvas
+either needed: html2pdf.js on the whole preview, as before, and page by page.
+The browser export needs html2pdf.js, from its CDN or `flask build-assets`.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault('RESUME_STORE', 'memory://')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as app_module  # noqa: E402
+from loadgen import serve  # noqa: E402
+from pdf_layouts import render_pdf  # noqa: E402
+from sample_data import sample_resume  # noqa: E402
+
+try:
+    from playwright.sync_api import sync_playwright
+except ImportError:
+    sync_playwright = None
+
+# Tracks the largest canvas html2canvas allocates (width x height x 4 bytes).
+CANVAS_PROBE = '''() => {
+    window.maxCanvas = 0;
+    const getContext = HTMLCanvasElement.prototype.getContext;
+    HTMLCanvasElement.prototype.getContext = function (...args) {
+        window.maxCanvas = Math.max(window.maxCanvas, this.width * this.height * 4);
+        return getContext.apply(this, args);
+    };
+}'''
+
+LOAD = '''async (data) => {
+    const app = Alpine.$data(document.body);
+    const before = window.previewMetrics();
+    app.data = data;
+    await new Promise(resolve => requestAnimationFrame(resolve));
+    await Alpine.nextTick();
+    await new Promise(resolve => requestAnimationFrame(resolve));
+    const after = window.previewMetrics();
+    return { pages: app.pages, ms: after.lastLayoutMs, blocks: after.blocksPlaced - before.blocksPlaced };
+}'''
+
+TYPE = '''async (keys) => {
+    const app = Alpine.$data(document.body);
+    app.activeTab = 'experience';
+    await Alpine.nextTick();
+    const field = document.querySelector('textarea[x-model="exp.details"]');
+    const samples = [], placed = [];
+    for (let i = 0; i < keys; i++) {
+        const before = window.previewMetrics();
+        // A new line every few keys, so the entry grows and what follows moves.
+        field.value += i % 8 === 7 ? '\\n' : 'x';
+        field.dispatchEvent(new Event('input'));
+        await new Promise(resolve => requestAnimationFrame(resolve));
+        await Alpine.nextTick();
+        await new Promise(resolve => requestAnimationFrame(resolve));
+        const after = window.previewMetrics();
+        if (after.layouts > before.layouts) {
+            samples.push(after.lastLayoutMs);
+            placed.push(after.blocksPlaced - before.blocksPlaced);
+        }
+    }
+    return { samples, placed, pages: app.pages };
+}'''
+
+EXPORT = '''async (paged) => {
+    window.maxCanvas = 0;
+    const element = document.getElementById('resume-preview');
+    const app = Alpine.$data(document.body);
+    const started = performance.now();
+    const blob = paged
+        ? await exportPages(element, app.pages)
+        : await html2pdf().set({ margin: 0, image: { type: 'jpeg', quality: 0.98 }, html2canvas: { scale: 2 },
+                                 jsPDF: { unit: 'mm', format: 'a4', orientation: 'portrait' } })
+                          .from(element).outputPdf('blob');
+    return { ms: performance.now() - started, canvas: window.maxCanvas, size: blob.size };
+}'''
+
+
+def entries_for(pages, template='modern'):
+    """Entries per section for a resume the server lays out on ``pages`` pages."""
+    entries = 1
+    while render_pdf(sample_resume(entries), template).count(b'/Type /Page ') < pages:
+        entries += 1
+    return entries
+
+
+def server_report(sizes):
+    print('server PDF engine (modern layout)')
+    for pages, entries in sizes.items():
+        data = sample_resume(entries)
+        tracemalloc.start()
+        started = time.perf_counter()
+        pdf = render_pdf(data)
+        elapsed = (time.perf_counter() - started) * 1000
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f'  {pages:3} pages ({entries:2} entries/section)  {elapsed:7.1f} ms  '
+              f'peak {peak / 1024:6.0f} KB  {len(pdf) / 1024:6.1f} KB PDF')
+
+
+def browser_report(base_url, sizes, keys):
+    print('editor preview (Chromium)')
+    with sync_playwright() as p:
+        browser = p.chromium.launch()
+        for pages, entries in sizes.items():
+            page = browser.new_page()
+            page.goto(base_url + '/', wait_until='load')
+            page.wait_for_function('window.Alpine !== undefined')
+            page.evaluate(CANVAS_PROBE)
+            loaded = page.evaluate(LOAD, sample_resume(entries))
+            typed = page.evaluate(TYPE, keys)
+            print(f'  {pages:3} pages -> preview {loaded["pages"]:2} pages, first layout {loaded["ms"]:6.1f} ms '
+                  f'({loaded["blocks"]} blocks); per keystroke median {statistics.median(typed["samples"] or [0]):5.2f} ms, '
+                  f'{statistics.median(typed["placed"] or [0]):.0f} blocks placed again')
+            if page.evaluate("typeof html2pdf !== 'undefined'"):
+                for label, paged in (('whole preview', False), ('page at a time', True)):
+                    result = page.evaluate(EXPORT, paged)
+                    print(f'        export {label:15} {result["ms"]:7.0f} ms  '
+                          f'largest canvas {result["canvas"] / 2**20:7.1f} MB  {result["size"] / 1024:7.0f} KB PDF')
+            else:
+                print('        (html2pdf.js did not load; no export numbers)')
+            page.close()
+        browser.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pages', default='1,3,10', help='comma-separated resume lengths, in pages')
+    parser.add_argument('--keys', type=int, default=50, help='keystrokes to simulate')
+    args = parser.parse_args()
+
+    sizes = {pages: entries_for(pages) for pages in map(int, args.pages.split(','))}
+    server_report(sizes)
+    if sync_playwright is None:
+        print('(install playwright for the editor preview and browser export numbers)')
+        return
+    with serve(app_module.app) as base_url:
+        browser_report(base_url, sizes, args.keys)
+
+
+if __name__ == '__main__':
+    main()
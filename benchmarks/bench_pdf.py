@@ -0,0 +1,73 @@
+"""Server-side PDF rendering: PDFs/sec, p95 latency and output size per layout.
+
+    python benchmarks/bench_pdf.py [--jobs N] [--entries N] [--html2pdf Resume.pdf]
+
+Pass a PDF exported with the browser's html2pdf path (Download PDF with the
+server unavailable) as --html2pdf to compare output sizes.
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loadgen import percentile  # noqa: E402
+from pdf_layouts import LAYOUTS, render_pdf  # noqa: E402
+from sample_data import sample_resume  # noqa: E402
+from workers import WorkerPool  # noqa: E402
+
+
+def bench(pool, data, template, jobs, concurrency):
+    latencies, sizes = [], []
+    lock = threading.Lock()
+    remaining = [jobs]
+
+    def client():
+        while True:
+            with lock:
+                if remaining[0] <= 0:
+                    return
+                remaining[0] -= 1
+            started = time.perf_counter()
+            pdf = pool.run(render_pdf, data, template)
+            with lock:
+                latencies.append(time.perf_counter() - started)
+                sizes.append(len(pdf))
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return jobs / elapsed, percentile(latencies, 95) * 1000, sum(sizes) / len(sizes)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--jobs', type=int, default=500)
+    parser.add_argument('--entries', type=int, default=3, help='entries per resume section')
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--html2pdf', help='a PDF exported by the client-side html2pdf path')
+    args = parser.parse_args()
+
+    pool = WorkerPool(args.workers, max_queue=args.workers * 4)
+    data = sample_resume(args.entries)
+    pool.run(render_pdf, data, 'modern')  # start the workers
+
+    print(f'{args.workers} workers, {args.jobs} jobs per layout, {args.entries} entries per section')
+    for template in LAYOUTS:
+        rate, p95, size = bench(pool, data, template, args.jobs, args.workers * 2)
+        print(f'{template:10} {rate:8.1f} PDFs/s   p95 {p95:7.2f} ms   {size / 1024:6.1f} KB')
+    pool.shutdown()
+
+    if args.html2pdf:
+        size = os.path.getsize(args.html2pdf)
+        print(f'{"html2pdf":10} {"":8}          {"":7}      {size / 1024:6.1f} KB  ({args.html2pdf})')
+
+
+if __name__ == '__main__':
+    main()
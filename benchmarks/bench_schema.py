@@ -0,0 +1,102 @@
+"""Resume schema: validate + serialize ops/sec, encoded sizes and memory.
+
+    python benchmarks/bench_schema.py [--entries 1,3,10] [--seconds 1]
+
+For resumes with 1, 3 and 10 entries per section, reports operations per
+second for validating a document, encoding it canonically, both together
+(what every save does), decoding a stored document, and upgrading an
+unversioned (version 1) document. For comparison, ``json.dumps`` as stores
+used to call it, with no validation at all. Then the size of one document in
+each available codec (MessagePack and CBOR need ``msgpack``/``cbor2``) and
+the memory held by 1,000 decoded documents, as decoded and once validated
+(validation interns the short strings they repeat: dates, schools, skills).
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import schema  # noqa: E402
+from sample_data import sample_resume  # noqa: E402
+
+
+def rate(fn, arg, seconds):
+    """Calls per second of ``fn(arg)`` over about ``seconds``."""
+    calls, started = 0, time.perf_counter()
+    deadline = started + seconds
+    while True:
+        for _ in range(100):
+            fn(arg)
+        calls += 100
+        now = time.perf_counter()
+        if now >= deadline:
+            return calls / (now - started)
+
+
+def legacy(doc):
+    """``doc`` as the editor saved it before documents were versioned."""
+    doc = json.loads(json.dumps(doc))
+    doc.pop('schemaVersion', None)
+    for section in schema.LIST_SECTIONS:
+        for n, item in enumerate(doc[section]):
+            item['id'] = 1_700_000_000_000 + n  # Date.now()
+    return doc
+
+
+def held(make, count=1000):
+    """Bytes still allocated after building ``count`` documents with ``make``."""
+    gc.collect()
+    tracemalloc.start()
+    docs = [make(n) for n in range(count)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del docs
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--entries', default='1,3,10', help='comma-separated entries per section')
+    parser.add_argument('--seconds', type=float, default=1.0, help='time per measurement')
+    args = parser.parse_args()
+
+    sizes = [int(n) for n in args.entries.split(',')]
+    print(f'ops/sec; codecs available: {", ".join(schema.CODECS)}')
+    print(f'{"entries":>7} {"validate":>10} {"dumps":>10} {"both":>10} {"loads":>10} {"upgrade v1":>10}'
+          f' {"old dumps":>10}')
+    for entries in sizes:
+        doc = schema.validate(sample_resume(entries))
+        stored = schema.dumps(doc)
+        old = legacy(doc)
+        row = [
+            rate(schema.validate, doc, args.seconds),
+            rate(schema.dumps, doc, args.seconds),
+            rate(lambda d: schema.dumps(schema.validate(d)), doc, args.seconds),
+            rate(schema.loads, stored, args.seconds),
+            rate(schema.validate, old, args.seconds),
+            rate(json.dumps, doc, args.seconds),
+        ]
+        print(f'{entries:7}' + ''.join(f' {value:10,.0f}' for value in row))
+
+    print('encoded size (bytes)')
+    for entries in sizes:
+        doc = schema.validate(sample_resume(entries))
+        encoded = {'json (old)': json.dumps(doc)}
+        encoded.update((name, schema.pack(doc, name)) for name in schema.CODECS)
+        print(f'  {entries:3} entries  ' + '  '.join(f'{name} {len(data):6,}' for name, data in encoded.items()))
+
+    entries = sizes[-1]
+    stored = [json.dumps(sample_resume(entries, n)) for n in range(1000)]
+    raw = held(lambda n: json.loads(stored[n]))
+    validated = held(lambda n: schema.validate(json.loads(stored[n])))
+    print(f'1,000 documents with {entries} entries held in memory: decoded {raw / 2**20:.1f} MB, '
+          f'validated {validated / 2**20:.1f} MB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""Resume search: index build time, saves indexed/sec and query latency at scale.
+
+    python benchmarks/bench_search.py [--resumes 100000] [--repeat 20] [--index PATH]
+
+Generates a cohort of varied resumes (skills, degrees, GPAs and technologies
+drawn from fixed lists with a seeded RNG), indexes them from scratch with
+``rebuild``, then measures re-indexing saved resumes a batch at a time and
+the latency of typical recruiter queries, each returning one page of results
+and the facet counts.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import schema  # noqa: E402
+from sample_data import sample_resume  # noqa: E402
+from search import SearchIndex  # noqa: E402
+
+SKILLS = ('Python', 'JavaScript', 'React', 'Flask', 'SQL', 'Java', 'C++', 'Go', 'Rust', 'Docker',
+          'Kubernetes', 'AWS', 'TypeScript', 'Node.js', 'Django', 'PostgreSQL', 'MongoDB', 'Git',
+          'Linux', 'TensorFlow', 'PyTorch', 'Pandas', 'Spark', 'Figma', 'C#', 'Swift', 'Kotlin')
+DEGREES = ('B.S. Computer Science', 'B.Tech Computer Science', 'B.E. Electronics', 'M.S. Data Science',
+           'B.S. Mathematics', 'B.Tech Information Technology', 'M.Tech Computer Science', 'B.A. Economics')
+SCHOOLS = tuple(f'{name} University' for name in ('Tech', 'State', 'Northern', 'Coastal', 'Central', 'Valley'))
+COMPANIES = ('StartUp Inc', 'Acme Corp', 'Globex', 'Initech', 'Umbrella Labs', 'Hooli', 'Stark Industries')
+TOPICS = ('dashboard', 'compiler', 'chat app', 'recommendation engine', 'scheduler', 'search engine',
+          'image classifier', 'payment gateway', 'game', 'static site generator')
+
+QUERIES = [
+    ('all resumes, facets only', {}),
+    ('text: react', {'query': 'react'}),
+    ('text: flask AND sql', {'query': 'flask AND sql'}),
+    ('text: "search engine"', {'query': '"search engine"'}),
+    ('text: pyth* (prefix)', {'query': 'pyth*'}),
+    ('skill=Flask & skill=SQL', {'filters': [('skill', 'Flask'), ('skill', 'SQL')]}),
+    ('... and gpa >= 3.5', {'filters': [('skill', 'Flask'), ('skill', 'SQL')], 'gpa_min': 3.5}),
+    ('... sorted by gpa', {'filters': [('skill', 'Flask'), ('skill', 'SQL')], 'gpa_min': 3.5, 'sort': 'gpa'}),
+    ('degree + technology', {'filters': [('degree', 'B.Tech Computer Science'), ('technology', 'Docker')]}),
+    ('text + filters, page 50', {'query': 'python', 'filters': [('skill', 'AWS')], 'page': 50}),
+    ('rare: rust AND kotlin', {'query': 'skills:rust AND skills:kotlin', 'gpa_min': 3.9}),
+]
+
+
+def cohort(count, seed=7):
+    rng = random.Random(seed)
+    template = schema.validate(sample_resume(1))
+    for n in range(count):
+        doc = schema.validate(sample_resume(1, n + 1))
+        doc['skills'] = rng.sample(SKILLS, rng.randint(4, 10))
+        doc['education'] = [dict(template['education'][0], id=1, degree=rng.choice(DEGREES),
+                                 school=rng.choice(SCHOOLS), gpa=f'{rng.uniform(2.5, 4.0):.2f}')]
+        doc['experience'] = [dict(template['experience'][0], id=i + 1, company=rng.choice(COMPANIES))
+                             for i in range(rng.randint(0, 2))]
+        doc['projects'] = [dict(template['projects'][0], id=i + 1, name=f'{rng.choice(TOPICS).title()} {i}',
+                                technologies=', '.join(rng.sample(SKILLS, 3)),
+                                details=f'Built a {rng.choice(TOPICS)} for {rng.choice(TOPICS)}s.')
+                           for i in range(rng.randint(1, 3))]
+        yield f'resume-{n}', doc
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--resumes', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=20, help='runs of each query')
+    parser.add_argument('--index', help='index file (default: a temporary one)')
+    args = parser.parse_args()
+
+    path = args.index or os.path.join(tempfile.mkdtemp(prefix='search-'), 'search.db')
+    index = SearchIndex(path)
+    started = time.perf_counter()
+    count = index.rebuild(cohort(args.resumes))
+    elapsed = time.perf_counter() - started
+    print(f'indexed {count:,} resumes in {elapsed:.1f} s ({count / elapsed:,.0f}/s), '
+          f'{os.path.getsize(path) / 2**20:.0f} MB on disk')
+
+    # Saves arrive one resume at a time and are written in batches.
+    saves = list(cohort(2000, seed=8))
+    for batch_size in (1, 50, 500):
+        started = time.perf_counter()
+        for i in range(0, len(saves), batch_size):
+            for resume_id, doc in saves[i:i + batch_size]:
+                index.add(resume_id, doc)
+            index.flush()
+        print(f'  re-indexing saves, {batch_size:3} per transaction: '
+              f'{len(saves) / (time.perf_counter() - started):8,.0f} saves/s')
+
+    started = time.perf_counter()
+    index.search()
+    print(f'first search (loads the in-memory mirror): {(time.perf_counter() - started) * 1000:,.0f} ms')
+    samples = []
+    for resume_id, doc in saves[:args.repeat]:
+        started = time.perf_counter()
+        index.add(resume_id, doc)
+        index.search(filters=[('skill', doc['skills'][0])])
+        samples.append((time.perf_counter() - started) * 1000)
+    print(f'search right after a save (indexes it first): {statistics.median(samples):.1f} ms median')
+
+    print(f'query latency over {args.resumes:,} resumes (ms)')
+    print(f'  {"query":28} {"hits":>8} {"p50":>8} {"p95":>8}')
+    for label, kwargs in QUERIES:
+        samples = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            result = index.search(**kwargs)
+            samples.append((time.perf_counter() - started) * 1000)
+        samples.sort()
+        p95 = samples[min(len(samples) - 1, int(0.95 * len(samples)))]
+        print(f'  {label:28} {result["total"]:8,} {statistics.median(samples):8.1f} {p95:8.1f}')
+    index.close()
+
+
+if __name__ == '__main__':
+    main()
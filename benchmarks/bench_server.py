@@ -0,0 +1,99 @@
+"""Throughput and tail latency per route: debug server vs the production server.
+
+    python benchmarks/bench_server.py [-c CONCURRENCY] [-d SECONDS] [--servers dev,serve]
+
+Each server is started as ``python app.py <mode>`` on a free port with a fresh
+SQLite store and render cache in a temporary directory, so runs are
+reproducible. Tune the production server with the usual environment variables
+(WEB_CONCURRENCY, WEB_THREADS, ...), which are passed through.
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loadgen import run  # noqa: E402
+from sample_data import SAMPLE  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESUME = json.dumps(SAMPLE).encode('utf-8')
+PATCH = json.dumps([{'op': 'replace', 'path': '/personal/summary', 'value': 'Updated.'}]).encode('utf-8')
+SCENARIOS = [
+    # label, method, path, body
+    ('GET /', 'GET', '/', None),
+    ('GET /healthz', 'GET', '/healthz', None),
+    ('GET /api/resume/<id>', 'GET', '/api/resume/bench', None),
+    ('PATCH /api/resume/<id>', 'PATCH', '/api/resume/bench', PATCH),
+    ('GET /api/resume/<id>/pdf', 'GET', '/api/resume/bench/pdf', None),
+]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start(mode, workdir):
+    port = free_port()
+    env = dict(os.environ, PORT=str(port),
+               RESUME_STORE='sqlite:///' + os.path.join(workdir, f'{mode}.db'),
+               RENDER_CACHE_DIR=os.path.join(workdir, f'{mode}-cache'))
+    process = subprocess.Popen([sys.executable, 'app.py', mode], cwd=ROOT, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                               start_new_session=True)
+    base_url = f'http://127.0.0.1:{port}'
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(base_url + '/readyz', timeout=1):
+                return process, base_url
+        except OSError:
+            time.sleep(0.2)
+    stop(process)
+    raise RuntimeError(f'python app.py {mode} did not become ready')
+
+
+def stop(process):
+    # The debug server's reloader and gunicorn both have children.
+    os.killpg(process.pid, signal.SIGTERM)
+    process.wait(timeout=60)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-c', '--concurrency', type=int, default=32)
+    parser.add_argument('-d', '--duration', type=float, default=5.0)
+    parser.add_argument('--servers', default='dev,serve', help='comma-separated python app.py modes')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for mode in args.servers.split(','):
+            process, base_url = start(mode, workdir)
+            try:
+                request = urllib.request.Request(base_url + '/api/resume/bench', RESUME, method='PUT')
+                urllib.request.urlopen(request).close()
+                print(f'python app.py {mode}  ({args.concurrency} connections, {args.duration:g}s per route)')
+                for label, method, path, body in SCENARIOS:
+                    headers = {'Accept-Encoding': 'gzip'}
+                    if body is not None:
+                        headers['Content-Type'] = 'application/json'
+                    result = run(base_url + path, args.concurrency, args.duration, method, body, headers)
+                    summary = result.summary()
+                    print(f'  {label:26} {summary["rps"]:8.1f} req/s   p50 {summary["p50_ms"]:7.2f} ms   '
+                          f'p99 {summary["p99_ms"]:7.2f} ms   max {summary["max_ms"]:7.2f} ms   '
+                          f'errors {summary["errors"]}   {summary["statuses"]}')
+            finally:
+                stop(process)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""Editor page delivery: one response with linked stylesheets vs the streamed,
+critical-path-first page.
+
+    flask --app app build-assets            # inlining needs the CSS bundle
+    python benchmarks/bench_streaming.py [--kbps 1600] [--rtt 40] [--runs 5]
+
+Both pages are served through a simulated link (``--kbps`` bandwidth,
+``--rtt`` ms before each response starts). For each, the script reports time
+to first byte, when the editor form has arrived, when everything has, and an
+estimate of first paint: the browser paints once the editor markup and every
+stylesheet linked from ``<head>`` (fetched in parallel as soon as the head is
+parsed) are in. With Playwright installed the pages are also loaded in
+headless Chromium and its first-contentful-paint is reported.
+
+The page is rendered at startup either way, so there is no server think time
+for streaming to hide; the gain comes from what the head asks for before the
+browser may paint.
+"""
+import argparse
+import http.client
+import os
+import re
+import statistics
+import sys
+import time
+import zlib
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as app_module  # noqa: E402
+from loadgen import SlowLink, serve  # noqa: E402
+
+try:
+    from playwright.sync_api import sync_playwright
+except ImportError:
+    sync_playwright = None
+
+EDITOR_END = b'<!-- RIGHT SIDEBAR: PREVIEW -->'
+FCP = "() => (performance.getEntriesByName('first-contentful-paint')[0] || {}).startTime"
+
+
+def single_shot_page():
+    """The page as it was: stylesheets linked (and blocking) from the head, sent in one piece."""
+    urls, _ = app_module.load_bundles(app_module.app.config['ASSET_MODE'])
+    with app_module.app.app_context():
+        html = app_module.render_template_string(
+            app_module.HTML_TEMPLATE, assets=urls, layouts=app_module.layouts, critical_css=None,
+            schema_version=app_module.schema.SCHEMA_VERSION)
+    icons = re.search(r'<link rel="stylesheet"[^>]*media="print"[^>]*>', html).group(0)
+    html = html.replace(icons, '').replace('</head>', icons.replace(' media="print" onload="this.media=\'all\'"', '') + '\n</head>')
+    return app_module.PrecompressedPage(html.replace(app_module.FLUSH, '').encode('utf-8'))
+
+
+def fetch(base_url, path, marks=()):
+    """Time to first byte, to each marker in the decoded body and to the end, in ms."""
+    parts = urlsplit(base_url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=60)
+    started = time.perf_counter()
+    conn.request('GET', path, headers={'Accept-Encoding': 'gzip'})
+    response = conn.getresponse()
+    decoder = zlib.decompressobj(31) if response.getheader('Content-Encoding') == 'gzip' else None
+    seen, body, ttfb = {}, b'', None
+    while True:
+        data = response.read1(65536)
+        if not data:
+            break
+        if ttfb is None:
+            ttfb = (time.perf_counter() - started) * 1000
+        body += decoder.decompress(data) if decoder else data
+        for mark in marks:
+            if mark not in seen and mark in body:
+                seen[mark] = (time.perf_counter() - started) * 1000
+    conn.close()
+    return ttfb, seen, (time.perf_counter() - started) * 1000, body
+
+
+def blocking_stylesheets(head):
+    return [url for tag, url in re.findall(r'(<link[^>]*rel="stylesheet"[^>]*href="([^"]+)"[^>]*>)', head)
+            if 'media="print"' not in tag]
+
+
+def measure(base_url):
+    ttfb, seen, total, body = fetch(base_url, '/', (b'</head>', EDITOR_END))
+    head = body.split(b'</head>', 1)[0].decode('utf-8')
+    paint = seen[EDITOR_END]
+    styles = blocking_stylesheets(head)
+    for url in styles:
+        if url.startswith('/'):
+            paint = max(paint, seen[b'</head>'] + fetch(base_url, url)[2])
+        else:
+            paint = float('nan')  # a CDN stylesheet; not measurable here
+    return {'ttfb': ttfb, 'editor': seen[EDITOR_END], 'paint': paint, 'total': total, 'blocking': len(styles)}
+
+
+def browser_fcp(base_url, runs):
+    samples = []
+    with sync_playwright() as p:
+        browser = p.chromium.launch()
+        for _ in range(runs):
+            context = browser.new_context()
+            page = context.new_page()
+            page.goto(base_url + '/', wait_until='load')
+            value = page.evaluate(FCP)
+            if value is not None:
+                samples.append(value)
+            context.close()
+        browser.close()
+    return statistics.median(samples) if samples else float('nan')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--kbps', type=float, default=1600, help='simulated bandwidth')
+    parser.add_argument('--rtt', type=float, default=40, help='simulated round trip, ms')
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    if not app_module.BUNDLE_URLS:
+        print('No bundles found; run `flask --app app build-assets` first (the CSS is inlined from the bundle).')
+
+    pages = {'single-shot': single_shot_page(), 'streamed': app_module.render_home_page()}
+    app_module.app.wsgi_app = SlowLink(app_module.app.wsgi_app, args.kbps, args.rtt)
+    print(f'link: {args.kbps:.0f} kbit/s, {args.rtt:.0f} ms RTT; median of {args.runs} (ms)')
+    print(f'{"":12} {"TTFB":>7} {"editor":>7} {"paint~":>7} {"total":>7}  blocking CSS' +
+          ('      FCP' if sync_playwright else ''))
+    with serve(app_module.app) as base_url:
+        for label, page in pages.items():
+            app_module.HOME_PAGE = page
+            runs = [measure(base_url) for _ in range(args.runs)]
+            row = {key: statistics.median(r[key] for r in runs) for key in runs[0]}
+            line = (f'{label:12} {row["ttfb"]:7.0f} {row["editor"]:7.0f} {row["paint"]:7.0f} '
+                    f'{row["total"]:7.0f}  {row["blocking"]:12.0f}')
+            if sync_playwright is not None:
+                line += f' {browser_fcp(base_url, args.runs):8.0f}'
+            print(line)
+    print('(paint~ is nan when the head blocks on a CDN stylesheet, which is not timed here)')
+    if sync_playwright is None:
+        print('(install playwright for first-contentful-paint in Chromium)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""Startup / first paint of the editor page: CDN assets vs self-hosted bundles.
+
+    flask --app app build-assets            # build the bundles first
+    python benchmarks/first_paint.py [--runs N]
+
+With Playwright installed (``pip install playwright && playwright install
+chromium``) each mode is loaded in headless Chromium and first-contentful-paint,
+DOMContentLoaded and load are reported. Without it, the script reports what
+can be measured from Python: how many requests and bytes the browser must
+fetch, and from how many third-party origins, before it can paint.
+"""
+import argparse
+import os
+import re
+import statistics
+import sys
+import time
+import urllib.request
+from urllib.parse import urljoin, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as app_module  # noqa: E402
+from loadgen import serve  # noqa: E402
+
+try:
+    from playwright.sync_api import sync_playwright
+except ImportError:
+    sync_playwright = None
+
+PAINT_METRICS = '''() => {
+    const paint = performance.getEntriesByName('first-contentful-paint')[0];
+    const nav = performance.getEntriesByType('navigation')[0];
+    return {fcp: paint ? paint.startTime : null,
+            dcl: nav.domContentLoadedEventEnd, load: nav.loadEventEnd};
+}'''
+
+
+def blocking_assets(html):
+    """Stylesheets and scripts the page loads, in document order."""
+    return re.findall(r'<(?:script[^>]*\ssrc|link[^>]*\shref)="([^"]+)"', html)
+
+
+def fetch_size(url):
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=15) as response:
+            size = len(response.read())
+    except OSError:
+        return None, None
+    return size, (time.perf_counter() - started) * 1000
+
+
+def static_report(base_url, label, html):
+    urls = [urljoin(base_url + '/', u) for u in blocking_assets(html)]
+    origins = {urlsplit(u).netloc for u in urls} - {urlsplit(base_url).netloc}
+    total, slowest, unreachable = len(html.encode('utf-8')), 0.0, 0
+    for url in urls:
+        size, ms = fetch_size(url)
+        if size is None:
+            unreachable += 1
+            continue
+        total += size
+        slowest = max(slowest, ms)
+    print(f'{label:8} {len(urls) + 1} requests, {len(origins)} third-party origins, '
+          f'{total / 1024:.1f} KB uncompressed, slowest asset {slowest:.0f} ms'
+          + (f', {unreachable} unreachable (page breaks offline)' if unreachable else ''))
+
+
+def browser_report(base_url, label, runs):
+    samples = {'fcp': [], 'dcl': [], 'load': []}
+    with sync_playwright() as p:
+        browser = p.chromium.launch()
+        for _ in range(runs):
+            context = browser.new_context()  # cold cache every run
+            page = context.new_page()
+            page.goto(base_url + '/', wait_until='load')
+            for key, value in page.evaluate(PAINT_METRICS).items():
+                if value is not None:
+                    samples[key].append(value)
+            context.close()
+        browser.close()
+    medians = {k: statistics.median(v) if v else float('nan') for k, v in samples.items()}
+    print(f'{label:8} FCP {medians["fcp"]:7.0f} ms   DOMContentLoaded {medians["dcl"]:7.0f} ms   '
+          f'load {medians["load"]:7.0f} ms   (median of {runs})')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    if not app_module.BUNDLE_URLS:
+        print('No bundles found; run `flask --app app build-assets` first.')
+
+    pages = {'cdn': app_module.render_home_page('cdn'), 'bundled': app_module.render_home_page('bundled')}
+    with serve(app_module.app) as base_url:
+        for label, page in pages.items():
+            app_module.HOME_PAGE = page
+            if sync_playwright is not None:
+                browser_report(base_url, label, args.runs)
+            else:
+                static_report(base_url, label, page.variants['identity'][0].decode('utf-8'))
+    if sync_playwright is None:
+        print('(install playwright for real first-contentful-paint numbers)')
+
+
+if __name__ == '__main__':
+    main()
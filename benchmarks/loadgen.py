@@ -0,0 +1,175 @@
+"""A small threaded HTTP load generator shared by the benchmark scripts.
+
+It can drive an in-process WSGI app (see ``serve``) or any running server:
+
+    python benchmarks/loadgen.py http://127.0.0.1:5000/ -c 16 -d 10
+"""
+import argparse
+import http.client
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+
+class QuietHandler(WSGIRequestHandler):
+    # Keep the access log from drowning out the numbers, and speak HTTP/1.1 so
+    # the load generator can reuse its connections.
+    protocol_version = 'HTTP/1.1'
+
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+@contextmanager
+def serve(wsgi_app, host='127.0.0.1'):
+    """Run ``wsgi_app`` on a threaded Werkzeug server on a free port."""
+    server = make_server(host, 0, wsgi_app, threaded=True, request_handler=QuietHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f'http://{host}:{server.server_port}'
+    finally:
+        server.shutdown()
+        thread.join()
+
+
+class SlowLink:
+    """WSGI middleware delaying each response by ``rtt`` and pacing its body at ``kbps``."""
+
+    def __init__(self, app, kbps, rtt):
+        self.app = app
+        self.bytes_per_second = kbps * 1000 / 8
+        self.rtt = rtt / 1000
+
+    def __call__(self, environ, start_response):
+        time.sleep(self.rtt)
+        body = self.app(environ, start_response)
+        try:
+            for chunk in body:
+                for i in range(0, len(chunk), 4096):
+                    segment = chunk[i:i + 4096]
+                    time.sleep(len(segment) / self.bytes_per_second)
+                    yield segment
+        finally:
+            if hasattr(body, 'close'):
+                body.close()
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class Result:
+    def __init__(self, duration):
+        self.duration = duration
+        self.latencies = []
+        self.statuses = Counter()
+        self.errors = 0
+        self.bytes = 0
+
+    @property
+    def requests(self):
+        return len(self.latencies)
+
+    @property
+    def rps(self):
+        return self.requests / self.duration if self.duration else 0.0
+
+    def summary(self):
+        ms = [v * 1000 for v in self.latencies]
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'rps': round(self.rps, 1),
+            'p50_ms': round(percentile(ms, 50), 2),
+            'p95_ms': round(percentile(ms, 95), 2),
+            'p99_ms': round(percentile(ms, 99), 2),
+            'max_ms': round(max(ms), 2) if ms else 0.0,
+            'bytes': self.bytes,
+            'statuses': dict(self.statuses),
+        }
+
+
+def run(url, concurrency=8, duration=5.0, method='GET', body=None, headers=None, requests=None):
+    """Hammer ``url`` from ``concurrency`` threads for ``duration`` seconds.
+
+    If ``requests`` is given, stop after that many requests in total instead.
+    """
+    parts = urlsplit(url)
+    path = parts.path or '/'
+    if parts.query:
+        path += '?' + parts.query
+    headers = dict(headers or {})
+    result = Result(duration)
+    lock = threading.Lock()
+    budget = [requests]
+    deadline = time.perf_counter() + duration
+
+    def take():
+        if budget[0] is None:
+            return time.perf_counter() < deadline
+        with lock:
+            if budget[0] <= 0:
+                return False
+            budget[0] -= 1
+            return True
+
+    def worker():
+        conn = None
+        while take():
+            if conn is None:
+                conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=60)
+            started = time.perf_counter()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                payload = response.read()
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = None
+                with lock:
+                    result.errors += 1
+                continue
+            elapsed = time.perf_counter() - started
+            with lock:
+                result.latencies.append(elapsed)
+                result.statuses[response.status] += 1
+                result.bytes += len(payload)
+            if response.will_close:
+                conn.close()
+                conn = None
+        if conn is not None:
+            conn.close()
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    result.duration = time.perf_counter() - started
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('url')
+    parser.add_argument('-c', '--concurrency', type=int, default=8)
+    parser.add_argument('-d', '--duration', type=float, default=5.0)
+    parser.add_argument('-H', '--header', action='append', default=[], help='"Name: value"')
+    args = parser.parse_args()
+    headers = dict(h.split(':', 1) for h in args.header)
+    headers = {k.strip(): v.strip() for k, v in headers.items()}
+    print(run(args.url, args.concurrency, args.duration, headers=headers).summary())
+
+
+if __name__ == '__main__':
+    main()
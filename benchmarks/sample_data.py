@@ -0,0 +1,37 @@
+"""Sample resume documents shaped like resumeApp().data, for the benchmarks."""
+import copy
+
+SAMPLE = {
+    'personal': {
+        'fullName': 'Alex Chen',
+        'email': 'alex.chen@univ.edu',
+        'phone': '(555) 123-4567',
+        'location': 'San Francisco, CA',
+        'linkedin': 'linkedin.com/in/alex',
+        'summary': 'CS Senior seeking full stack roles. Passionate about React, Python, and scalable systems.',
+    },
+    'education': [
+        {'id': 1, 'school': 'Tech University', 'degree': 'B.S. Computer Science', 'date': '2025',
+         'gpa': '3.8', 'details': 'Data Structures, Algorithms'},
+    ],
+    'experience': [
+        {'id': 1, 'company': 'StartUp Inc', 'role': 'Intern', 'location': 'Remote', 'date': 'Summer 2024',
+         'details': 'Built React dashboard. Optimized API calls.'},
+    ],
+    'projects': [
+        {'id': 1, 'name': 'Task App', 'technologies': 'React, Firebase', 'link': 'github.com',
+         'details': 'Real-time task manager with drag and drop.'},
+    ],
+    'skills': ['Python', 'JavaScript', 'React', 'Flask', 'SQL'],
+}
+
+
+def sample_resume(entries=1, n=0):
+    """The editor's default resume, with ``entries`` items in each list section."""
+    data = copy.deepcopy(SAMPLE)
+    data['personal']['fullName'] = f'Student {n}' if n else data['personal']['fullName']
+    for section in ('education', 'experience', 'projects'):
+        template = data[section][0]
+        data[section] = [dict(template, id=i + 1) for i in range(entries)]
+    data['skills'] = (data['skills'] * entries)[:max(5, entries)]
+    return data
@@ -0,0 +1,413 @@
+"""Live editing sessions: several editors on one resume, kept in sync by the server.
+
+Each editor sends what it changed as small operations (POST) and receives
+everyone's operations as a stream of Server-Sent Events. The document model
+is a CRDT ordered by the server, so operations made against a slightly stale
+copy still merge the way their author meant:
+
+* every text field is a last-writer-wins register (``set``);
+* list sections and skills are sequences of records ``[key, value]``. An
+  entry's key is its ``id``; skills get keys from the editor that added them.
+  ``ins`` places a record after the key it followed in its author's copy and
+  ``del`` removes one. An insert anchored on a record someone else deleted
+  goes where that record was (see ``Session.forward``), and edits to a
+  deleted record are dropped.
+
+The server applies operations in arrival order and broadcasts them as
+applied; every editor applies the same operations in the same order with
+``apply`` (mirrored in the editor's JavaScript), so all copies converge. An
+editor shows the confirmed state plus its own operations still in flight.
+
+Operations are broadcast in batches: each stream sends everything sequenced
+since it last wrote, as one event. The server keeps a short log so a
+reconnecting editor can catch up; anything older is covered by a snapshot
+(the whole state). The document is written back to the resume store at
+most every ``persist_interval`` seconds while it changes, and when the last
+editor leaves, each time against the version the session last loaded or
+wrote. If someone else wrote the resume in between, their write wins: the
+session reloads it and every editor gets a snapshot. Sessions live in the
+server process, so all editors of a resume must reach the same process
+(``WEB_CONCURRENCY=1``), and each open stream holds one server thread.
+"""
+import json
+import threading
+import uuid
+from collections import deque
+
+import schema
+from storage import VersionConflict
+
+SEQUENCES = schema.LIST_SECTIONS + ('skills',)
+MAX_OPS = 500          # operations in one POST
+MAX_KEY = 64           # characters in a record key or editor id
+LOG_BATCHES = 512      # batches kept for editors catching up
+FORWARD_LIMIT = 10_000  # deleted keys remembered per session
+KEEPALIVE = 15.0       # seconds between comments on an idle stream
+
+
+class OpError(ValueError):
+    """An operation that is malformed or does not fit the schema."""
+
+
+class Busy(Exception):
+    """No room for another editor, on this resume or in this process."""
+
+
+def _key(value):
+    if not isinstance(value, str) or not 0 < len(value) <= MAX_KEY:
+        raise OpError(f'expected a key of 1 to {MAX_KEY} characters')
+    return value
+
+
+def check_op(op):
+    """``op`` with its value normalized through the schema. Raises ``OpError``."""
+    if not isinstance(op, dict) or not isinstance(op.get('path'), list) or not op['path']:
+        raise OpError('expected {"op", "path", ...}')
+    kind, path = op.get('op'), op['path']
+    section = path[0]
+    try:
+        if kind == 'set' and section == 'personal' and len(path) == 2:
+            if path[1] not in schema.PERSONAL_FIELDS:
+                raise OpError(f'unknown field {path[1]!r}')
+            return {'op': 'set', 'path': path, 'value': schema.validate_text(op.get('value'))}
+        if section not in SEQUENCES or len(path) < 2:
+            raise OpError(f'unknown path {path!r}')
+        key = _key(path[1])
+        if kind == 'set' and section == 'skills' and len(path) == 2:
+            return {'op': 'set', 'path': path, 'value': schema.validate_text(op.get('value'))}
+        if kind == 'set' and len(path) == 3 and path[2] != 'id':
+            entry = schema.validate_entry(section, {'id': key, path[2]: op.get('value')})
+            return {'op': 'set', 'path': path, 'value': entry[path[2]]}
+        if kind == 'ins' and len(path) == 2:
+            after = op.get('after')
+            if after is not None:
+                _key(after)
+            if section == 'skills':
+                value = schema.validate_text(op.get('value'))
+            else:
+                value = schema.validate_entry(section, op.get('value'))
+                if str(value['id']) != key:
+                    raise OpError('entry id does not match its key')
+            return {'op': 'ins', 'path': path, 'after': after, 'value': value}
+        if kind == 'del' and len(path) == 2:
+            return {'op': 'del', 'path': path}
+    except schema.SchemaError as exc:
+        raise OpError(str(exc)) from None
+    raise OpError(f'unsupported operation {kind!r} on {path!r}')
+
+
+def from_doc(doc):
+    """The session state for a (validated) resume document."""
+    state = {'personal': dict(doc['personal'])}
+    for section in schema.LIST_SECTIONS:
+        records, seen = [], set()
+        for entry in doc[section]:
+            key = str(entry['id'])
+            while key in seen:  # ids must be unique to serve as keys
+                key += '~'
+            seen.add(key)
+            records.append([key, dict(entry, id=entry['id'] if key == str(entry['id']) else key)])
+        state[section] = records
+    state['skills'] = [[f's{n}', skill] for n, skill in enumerate(doc['skills'])]
+    return state
+
+
+def to_doc(state):
+    """The resume document a session state shows."""
+    doc = {'schemaVersion': schema.SCHEMA_VERSION, 'personal': dict(state['personal'])}
+    for section in SEQUENCES:
+        doc[section] = [value for _, value in state[section]]
+    return doc
+
+
+def _find(records, key):
+    for index, record in enumerate(records):
+        if record[0] == key:
+            return index
+    return -1
+
+
+def apply(state, op):
+    """Apply one checked operation to ``state``; False if it changed nothing."""
+    path = op['path']
+    section = path[0]
+    if section == 'personal':
+        state['personal'][path[1]] = op['value']
+        return True
+    records = state[section]
+    index = _find(records, path[1])
+    if op['op'] == 'set':
+        if index < 0:
+            return False
+        if section == 'skills':
+            records[index][1] = op['value']
+        else:
+            records[index][1][path[2]] = op['value']
+    elif op['op'] == 'del':
+        if index < 0:
+            return False
+        del records[index]
+    else:  # ins
+        if index >= 0:
+            return False
+        if op['after'] is None:
+            at = 0
+        else:
+            at = _find(records, op['after'])
+            at = at + 1 if at >= 0 else len(records)  # unknown anchor: at the end
+        records.insert(at, [path[1], op['value']])
+    return True
+
+
+def _event(kind, event_id, data):
+    return f'event: {kind}\nid: {event_id}\ndata: {data}\n\n'
+
+
+class Session:
+    """One resume being edited live: its state, log and connected editors."""
+
+    def __init__(self, resume_id, doc, version, load, save, persist_interval=2.0):
+        self.resume_id = resume_id
+        # Event ids are "<epoch>-<seq>", so an editor reconnecting to a newer
+        # session for the same resume gets a snapshot rather than wrong ops.
+        self.epoch = uuid.uuid4().hex[:8]
+        self.state = from_doc(doc)
+        self.version = version  # of the stored resume the state was last loaded from or written to
+        self.load = load
+        self.save = save
+        self.persist_interval = persist_interval
+        self.seq = 0
+        self.log = deque(maxlen=LOG_BATCHES)  # (seq, encoded batch)
+        self.forward = {}  # deleted key -> the key before it when it was deleted
+        self.last_batch = {}  # editor id -> last batch number applied
+        self.peers = 0     # editors connected
+        self.reserved = 0  # streams opened through Sessions.open, connected or not yet
+        self.ops = 0
+        self.resets = 0
+        self.saved_seq = 0
+        self._timer = None
+        self._saving = threading.Lock()
+        self._cond = threading.Condition()
+
+    # --- Editing ---
+
+    def _resolve(self, records, after):
+        # Follow deleted anchors back to a record that still exists.
+        seen = 0
+        while after is not None and _find(records, after) < 0 and after in self.forward and seen < 100:
+            after = self.forward[after]
+            seen += 1
+        return after
+
+    def submit(self, site, batch, ops):
+        """Apply an editor's batch of operations; returns the sequence number.
+
+        ``batch`` numbers each editor's batches, so a retried POST is applied once.
+        """
+        _key(site)
+        if not isinstance(batch, int) or isinstance(batch, bool):
+            raise OpError('expected a batch number')
+        if not isinstance(ops, list) or len(ops) > MAX_OPS:
+            raise OpError(f'expected a list of at most {MAX_OPS} operations')
+        checked = [check_op(op) for op in ops]
+        inserts = {}
+        for op in checked:
+            if op['op'] == 'ins':
+                inserts[op['path'][0]] = inserts.get(op['path'][0], 0) + 1
+        with self._cond:
+            if batch <= self.last_batch.get(site, 0):
+                return self.seq
+            for section, count in inserts.items():
+                if len(self.state[section]) + count > schema.MAX_ENTRIES:
+                    raise OpError(f'{section}: more than {schema.MAX_ENTRIES} entries')
+            applied = []
+            for op in checked:
+                section = op['path'][0]
+                if op['op'] == 'ins':
+                    if op['path'][1] in self.forward:
+                        continue  # deleted by someone else; deletes win
+                    op['after'] = self._resolve(self.state[section], op['after'])
+                elif op['op'] == 'del':
+                    records = self.state[section]
+                    index = _find(records, op['path'][1])
+                    if index >= 0:
+                        if len(self.forward) >= FORWARD_LIMIT:
+                            self.forward.pop(next(iter(self.forward)))
+                        self.forward[op['path'][1]] = records[index - 1][0] if index else None
+                if apply(self.state, op):
+                    applied.append(op)
+            self.last_batch[site] = batch
+            if not applied:
+                return self.seq
+            self.seq += 1
+            self.ops += len(applied)
+            self.log.append((self.seq, json.dumps([self.seq, site, batch, applied], separators=(',', ':'))))
+            self._cond.notify_all()
+            if self._timer is None:
+                self._timer = threading.Timer(self.persist_interval, self.persist)
+                self._timer.daemon = True
+                self._timer.start()
+            return self.seq
+
+    def persist(self):
+        """Write the document back to the store if it changed since the last write.
+
+        A resume written by anyone else since the session loaded it is not
+        overwritten; the session starts over from that version instead.
+        """
+        with self._saving:  # one write at a time, so an older state never lands last
+            with self._cond:
+                self._timer = None
+                if self.saved_seq == self.seq:
+                    return
+                seq, doc = self.seq, schema.validate(to_doc(self.state))
+            try:
+                self.version = self.save(self.resume_id, doc, self.version)
+            except VersionConflict:
+                record = self.load(self.resume_id)
+                if record is not None:
+                    self.reset(*record)
+                return
+            self.saved_seq = seq
+
+    def reset(self, doc, version):
+        """Replace the state with stored version ``version`` of the resume.
+
+        The epoch changes and the log is cleared, so every editor is sent a
+        snapshot and drops its acknowledged operations.
+        """
+        with self._cond:
+            self.state = from_doc(doc)
+            self.version = version
+            self.epoch = uuid.uuid4().hex[:8]
+            self.log.clear()
+            self.forward.clear()
+            self.seq += 1
+            self.saved_seq = self.seq
+            self.resets += 1
+            self._cond.notify_all()
+
+    # --- Streaming ---
+
+    @property
+    def event_id(self):
+        return f'{self.epoch}-{self.seq}'
+
+    def _snapshot(self):
+        state = json.dumps({'seq': self.seq, 'peers': self.peers, 'state': self.state}, separators=(',', ':'))
+        return _event('snapshot', self.event_id, state)
+
+    def _since(self, cursor):
+        """Events bringing an editor at ``cursor`` up to date (call holding the lock)."""
+        if cursor == self.seq:
+            return None
+        if cursor > self.seq or not self.log or self.log[0][0] > cursor + 1:
+            return self._snapshot()  # too far behind the log
+        batches = [encoded for seq, encoded in self.log if seq > cursor]
+        data = f'{{"seq":{self.seq},"peers":{self.peers},"batches":[{",".join(batches)}]}}'
+        return _event('ops', self.event_id, data)
+
+    def stream(self, last_event_id=None):
+        """Server-Sent Events for one editor: a snapshot, or what it missed since
+        ``last_event_id`` when reconnecting, then operations as they come."""
+        epoch, _, seq = (last_event_id or '').partition('-')
+        cursor = int(seq) if epoch == self.epoch and seq.isdigit() else None
+        with self._cond:
+            self.peers += 1
+            self._cond.notify_all()
+        try:
+            yield 'retry: 1000\n\n'
+            with self._cond:
+                event = self._snapshot() if cursor is None else self._since(cursor)
+                cursor, peers = self.seq, self.peers
+            if event:
+                yield event
+            while True:
+                with self._cond:
+                    self._cond.wait_for(lambda: self.seq != cursor or self.peers != peers, KEEPALIVE)
+                    event = self._since(cursor)
+                    if event is None and self.peers != peers:
+                        event = _event('peers', self.event_id, f'{{"peers":{self.peers}}}')
+                    cursor, peers = self.seq, self.peers
+                yield event or ': keepalive\n\n'
+        finally:
+            with self._cond:
+                self.peers -= 1
+                self._cond.notify_all()
+
+
+class Sessions:
+    """The live sessions of this process, opened on demand and closed when empty.
+
+    Every event stream holds a server thread for as long as it is open, so at
+    most ``max_streams`` are open at once across all sessions. A stream's place
+    is taken by ``open`` and given back by ``leave``, both under one lock, so
+    editors arriving together cannot go over either limit.
+    """
+
+    def __init__(self, load, save, max_peers=16, persist_interval=2.0, max_streams=None):
+        self.load = load  # resume id -> (document, version) or None
+        self.save = save  # (resume id, document, expected version) -> new version
+        self.max_peers = max_peers
+        self.max_streams = max_streams
+        self.persist_interval = persist_interval
+        self.sessions = {}
+        self.streams = 0  # places taken by open() and not yet given back
+        self.closed_ops = 0  # operations applied by sessions since closed
+        self._lock = threading.Lock()
+
+    def get(self, resume_id):
+        with self._lock:
+            return self.sessions.get(resume_id)
+
+    def open(self, resume_id):
+        """Take a place for one editor's stream in the resume's session, started
+        if needed; None if there is no such resume.
+
+        Raises ``Busy`` when the process has ``max_streams`` streams or the
+        session ``max_peers`` editors. Every session returned must be given
+        back with ``leave`` once its stream is closed.
+        """
+        with self._lock:
+            if self.max_streams is not None and self.streams >= self.max_streams:
+                raise Busy('too many live editors on this server')
+            session = self.sessions.get(resume_id)
+            if session is None:
+                record = self.load(resume_id)
+                if record is None:
+                    return None
+                doc, version = record
+                session = self.sessions[resume_id] = Session(resume_id, doc, version, self.load, self.save,
+                                                             self.persist_interval)
+            elif session.reserved >= self.max_peers:
+                raise Busy('too many editors on this resume')
+            session.reserved += 1
+            self.streams += 1
+            return session
+
+    def leave(self, session):
+        """Give back a place taken by ``open``; the last editor out closes the session."""
+        with self._lock:
+            session.reserved -= 1
+            self.streams -= 1
+            if session.reserved > 0 or self.sessions.get(session.resume_id) is not session:
+                return
+            # Written back before the lock is released, so a session reopened
+            # for this resume loads the latest document.
+            del self.sessions[session.resume_id]
+            session.persist()
+            self.closed_ops += session.ops
+
+    def close(self):
+        """Write every open session back (at shutdown)."""
+        with self._lock:
+            sessions = list(self.sessions.values())
+        for session in sessions:
+            session.persist()
+
+    def stats(self):
+        with self._lock:
+            sessions = list(self.sessions.values())
+            closed = self.closed_ops
+        return {'sessions': len(sessions), 'peers': sum(s.peers for s in sessions),
+                'ops': closed + sum(s.ops for s in sessions)}
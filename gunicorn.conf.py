@@ -0,0 +1,19 @@
+"""Gunicorn configuration; every setting comes from the environment (see server.py)."""
+import os
+import shutil
+import tempfile
+
+from server import settings
+
+globals().update(settings())
+
+# Workers read this to size their PDF pools and choose how to write resumes.
+os.environ['WEB_CONCURRENCY'] = str(workers)  # noqa: F821
+# Workers merge their metrics through snapshot files; a fresh directory per
+# server run starts the counters from zero.
+os.environ.setdefault('METRICS_DIR', tempfile.mkdtemp(prefix='resume-metrics-'))
+
+
+def on_exit(server):
+    if os.path.basename(os.environ['METRICS_DIR']).startswith('resume-metrics-'):
+        shutil.rmtree(os.environ['METRICS_DIR'], ignore_errors=True)
@@ -0,0 +1,479 @@
+"""Resume import: an existing PDF or DOCX in, a ``resumeApp().data`` document out.
+
+Text is extracted locally with pure-Python tools: DOCX files are ZIPs of XML
+read with the standard library, PDFs go through the optional ``pypdf``
+package. The text is then split into sections by their headings (Education,
+Experience, ...) and each section into entries, using the layout habits of
+typical student resumes: one date per entry, bullet points or full sentences
+for details, school and job-title keywords. It is a best-effort starting
+point for the editor, not an exact reconstruction.
+
+Also usable in bulk; the output is JSON Lines, ready for ``app.py batch``:
+
+    python app.py import alumni/*.pdf alumni/*.docx -o alumni.jsonl
+"""
+import argparse
+import hashlib
+import io
+import json
+import re
+import sys
+import time
+import zipfile
+from collections import deque
+from xml.etree import ElementTree
+
+import schema
+from workers import WorkerPool
+
+try:
+    import pypdf
+except ImportError:  # DOCX import needs nothing beyond the standard library
+    pypdf = None
+
+# Bump whenever parsing changes so cached results are not reused.
+IMPORT_VERSION = 2
+
+MAX_PAGES = 10
+# A DOCX's text is a few hundred KB at most; anything that inflates past this
+# is a ZIP bomb, not a resume.
+MAX_DOCX_XML = 20 * 2**20
+
+# --- Text extraction ---
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+
+class UnsupportedFile(ValueError):
+    """Not a PDF or DOCX, or PDF support is not installed."""
+
+
+class UnreadableFile(ValueError):
+    """A PDF or DOCX that could not be opened."""
+
+
+def sniff(head):
+    """``'pdf'``, ``'docx'`` or None from the first bytes of a file."""
+    if head.startswith(b'%PDF-'):
+        return 'pdf'
+    if head.startswith(b'PK\x03\x04'):
+        return 'docx'  # checked for word/document.xml when opened
+    return None
+
+
+def _read_member(archive, name, limit, chunk_size=65536):
+    """A ZIP member's bytes, refusing it once it inflates past ``limit``."""
+    info = archive.getinfo(name)
+    if info.file_size > limit:
+        raise UnreadableFile(f'{name} is larger than {limit // 2**20} MB')
+    chunks, size = [], 0
+    # The size in the header can lie, so count what actually comes out.
+    with archive.open(info) as member:
+        while chunk := member.read(chunk_size):
+            size += len(chunk)
+            if size > limit:
+                raise UnreadableFile(f'{name} is larger than {limit // 2**20} MB')
+            chunks.append(chunk)
+    return b''.join(chunks)
+
+
+def docx_lines(data):
+    try:
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            root = ElementTree.fromstring(_read_member(archive, 'word/document.xml', MAX_DOCX_XML))
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError) as exc:
+        raise UnreadableFile(f'not a readable DOCX file: {exc}') from None
+    lines = []
+    for paragraph in root.iter(f'{W}p'):
+        parts = []
+        for node in paragraph.iter():
+            if node.tag == f'{W}t':
+                parts.append(node.text or '')
+            elif node.tag == f'{W}tab':
+                parts.append(' ')
+            elif node.tag in (f'{W}br', f'{W}cr'):
+                parts.append('\n')
+        text = ''.join(parts)
+        # List paragraphs carry their bullet in the numbering, not the text.
+        bullet = '• ' if paragraph.find(f'{W}pPr/{W}numPr') is not None else ''
+        for line in text.split('\n'):
+            lines.append(bullet + line if line.strip() else line)
+    return lines
+
+
+def pdf_lines(data):
+    if pypdf is None:
+        raise UnsupportedFile('PDF import needs the pypdf package')
+    try:
+        reader = pypdf.PdfReader(io.BytesIO(data))
+        lines = []
+        for page in reader.pages[:MAX_PAGES]:
+            lines.extend((page.extract_text() or '').splitlines())
+            lines.append('')
+    except (pypdf.errors.PyPdfError, KeyError, ValueError, RecursionError) as exc:
+        # Damaged or hostile files also surface as plain lookup, value and
+        # recursion errors from deep inside pypdf.
+        raise UnreadableFile(f'not a readable PDF file: {exc}') from None
+    return lines
+
+
+def extract_lines(data):
+    """The file's text as ``(format, lines)``."""
+    fmt = sniff(data[:8])
+    if fmt == 'pdf':
+        return fmt, pdf_lines(data)
+    if fmt == 'docx':
+        return fmt, docx_lines(data)
+    raise UnsupportedFile('expected a PDF or DOCX file')
+
+
+# --- Parsing ---
+
+HEADINGS = {
+    'summary': ('summary', 'professional summary', 'profile', 'objective', 'career objective', 'about', 'about me'),
+    'education': ('education', 'academic background', 'academics', 'education and training'),
+    'experience': ('experience', 'work experience', 'professional experience', 'employment',
+                   'employment history', 'work history', 'internships', 'internship experience'),
+    'projects': ('projects', 'personal projects', 'academic projects', 'selected projects', 'projects & skills',
+                 'projects and skills'),
+    'skills': ('skills', 'technical skills', 'core skills', 'key skills', 'technologies', 'tools',
+               'skills & tools', 'competencies'),
+}
+HEADING_SECTIONS = {title: section for section, titles in HEADINGS.items() for title in titles}
+
+EMAIL = re.compile(r'[\w.+-]+@[\w-]+(?:\.[\w-]+)+')
+PHONE = re.compile(r'(?:\+\d{1,3}[\s.-]?)?(?:\(\d{2,4}\)\s?|\d{2,4}[\s.-])\d{3,4}[\s.-]?\d{3,4}\b')
+URL = re.compile(r'(?:https?://)?(?:www\.)?[\w-]+(?:\.[\w-]+)*\.(?:com|org|net|io|dev|edu|app|me|co)(?:/[^\s|,]*)?',
+                 re.I)
+LINKEDIN = re.compile(r'(?:https?://)?(?:www\.)?linkedin\.com/[^\s|,]+', re.I)
+MONTH = r'(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?'
+SEASON = r'(?:spring|summer|fall|autumn|winter)'
+YEAR = r'(?:19|20)\d{2}'
+DATE = re.compile(rf'(?:(?:{MONTH}|{SEASON})\s+)?{YEAR}'
+                  rf'(?:\s*(?:-|–|—|to)\s*(?:(?:{MONTH}|{SEASON})\s+)?(?:{YEAR}|present|current|now))?', re.I)
+GPA = re.compile(r'\b(?:c?gpa|grade)\s*[:\-]?\s*(\d(?:\.\d+)?(?:\s*/\s*\d+(?:\.\d+)?)?)', re.I)
+LOCATION = re.compile(r"^(?:(?i:remote|hybrid|on-?site)|[A-Z][\w .'-]+,\s*[A-Z][\w .]+)$")
+BULLET = re.compile(r'^\s*[•●▪◦‣∙*\-–]\s+')
+SEPARATORS = re.compile(r'\s*(?:\||•|·|;|\s–\s|\s—\s|\s-\s)\s*')
+SKILL_SEPARATORS = re.compile(r'\s*(?:,|;|\||•|·|/)\s*')
+
+SCHOOL_WORDS = re.compile(r'\b(?:university|college|institute|school|academy|polytechnic|iit|nit)\b', re.I)
+DEGREE_WORDS = re.compile(
+    r'\b(?:bachelor|master|doctor|ph\.?\s?d|b\.?\s?(?:s|a|sc|tech|e|eng|com)\b|m\.?\s?(?:s|a|sc|tech|e|eng|ba)\b'
+    r'|mba|associate|diploma|degree|certificate|major|minor|high school)', re.I)
+ROLE_WORDS = re.compile(
+    r'\b(?:intern|engineer|developer|manager|analyst|assistant|lead|designer|consultant|researcher|scientist'
+    r'|associate|director|officer|specialist|coordinator|teacher|tutor|volunteer|president|architect'
+    r'|administrator|technician|fellow|trainee|representative|founder|member|head)\b', re.I)
+
+
+def _clean(text):
+    return re.sub(r'\s+', ' ', text).strip(' \t|•·,-–—')
+
+
+def _heading(line):
+    key = re.sub(r'[:\s]+$', '', line.strip()).lower()
+    key = re.sub(r'\s+', ' ', key)
+    if key in HEADING_SECTIONS:
+        return HEADING_SECTIONS[key]
+    # Unknown headings (Awards, Certifications, ...) still end the section before.
+    words = line.split()
+    if line.isupper() and 0 < len(words) <= 4 and not re.search(r'\d', line):
+        return 'other'
+    return None
+
+
+def _name_case(text):
+    return text.title() if text.isupper() else text
+
+
+def _is_detail(line):
+    """A sentence or bullet point, as opposed to a header line (title, date, place)."""
+    text = line.strip()
+    if BULLET.match(text) or text.endswith('.'):
+        return True
+    words = [word for word in text.split() if re.search(r'\w', word)]  # not separators
+    return len(words) >= 7 and not DATE.search(text)
+
+
+def _details(lines):
+    """Join wrapped lines back into sentences; bullet points stay one per line."""
+    out = []
+    for line in lines:
+        text = line.strip()
+        if not text:
+            continue
+        if BULLET.match(text) or not out or out[-1].endswith(('.', '!', '?', ':')) and text[:1].isupper():
+            out.append(BULLET.sub('', text))
+        else:
+            out[-1] += ' ' + text
+    return '\n'.join(out)
+
+
+def _entries(lines, starts):
+    """Split ``lines`` into entries; ``starts(line, entry)`` says when one begins."""
+    entries, current = [], None
+    for line in lines:
+        if not line.strip():
+            continue
+        if current is None or starts(line, current):
+            current = {'lines': [], 'date': None, 'details': False}
+            entries.append(current)
+        current['lines'].append(line)
+        if _is_detail(line):
+            current['details'] = True
+        elif current['date'] is None and DATE.search(line):
+            current['date'] = line
+    return [entry['lines'] for entry in entries]
+
+
+def _header_parts(lines, header=None):
+    """The short lines of an entry, split at separators, with the date taken out.
+
+    ``header(line)`` keeps long lines that are still part of the header.
+    """
+    date, parts, details = '', [], []
+    for line in lines:
+        if _is_detail(line) and not (header and header(line) and not BULLET.match(line)):
+            details.append(line)
+            continue
+        match = DATE.search(line) if not date else None
+        if match:
+            date = match.group(0)
+            line = line[:match.start()] + ' | ' + line[match.end():]
+        parts.extend(p for p in (_clean(p) for p in SEPARATORS.split(line)) if p)
+    return date, parts, details
+
+
+def _starts_entry(line, entry):
+    # A new entry starts with a header line after the details of the previous
+    # one, or with a second date.
+    if _is_detail(line):
+        return False
+    has_date = DATE.search(line) is not None
+    return entry['details'] or (has_date and entry['date'] is not None)
+
+
+def parse_education(lines):
+    # Degree lines run long ("Bachelor of Science in ..., GPA: 3.7/4.0") and
+    # coursework follows them, so only a second school or date starts an entry.
+    def starts(line, entry):
+        if _is_detail(line):
+            return False
+        if SCHOOL_WORDS.search(line):
+            return any(SCHOOL_WORDS.search(l) for l in entry['lines'])
+        return DATE.search(line) is not None and entry['date'] is not None
+
+    def header(line):
+        return DEGREE_WORDS.search(line) or GPA.search(line)
+
+    result = []
+    for entry in _entries(lines, starts):
+        date, parts, details = _header_parts(entry, header)
+        item = {'id': len(result) + 1, 'school': '', 'degree': '', 'date': date, 'gpa': '', 'details': ''}
+        rest = []
+        for part in parts:
+            gpa = GPA.search(part)
+            if gpa and not item['gpa']:
+                item['gpa'] = gpa.group(1).replace(' ', '')
+                part = _clean(part[:gpa.start()] + part[gpa.end():])
+                if not part:
+                    continue
+            if SCHOOL_WORDS.search(part) and not item['school']:
+                item['school'] = part
+            elif DEGREE_WORDS.search(part) and not item['degree']:
+                item['degree'] = part
+            else:
+                rest.append(part)
+        if not item['school'] and rest:
+            item['school'] = rest.pop(0)
+        item['details'] = _details(rest + details) if rest else _details(details)
+        result.append(item)
+    return result
+
+
+def parse_experience(lines):
+    result = []
+    for entry in _entries(lines, _starts_entry):
+        date, parts, details = _header_parts(entry)
+        item = {'id': len(result) + 1, 'company': '', 'role': '', 'location': '', 'date': date, 'details': ''}
+        rest = []
+        for part in parts:
+            if ROLE_WORDS.search(part) and not item['role']:
+                # "Teaching Assistant, UT Austin"
+                role, _, other = part.partition(', ')
+                item['role'] = role
+                if other:
+                    rest.append(other)
+            elif LOCATION.match(part) and not item['location']:
+                item['location'] = part
+            else:
+                rest.append(part)
+        if rest and not item['company']:
+            # "Acme Corp, Dallas, TX"
+            company, _, place = rest.pop(0).partition(', ')
+            item['company'] = company
+            if place and LOCATION.match(place) and not item['location']:
+                item['location'] = place
+            elif place:
+                item['company'] += ', ' + place
+        if rest and not item['role']:
+            item['role'] = rest.pop(0)
+        item['details'] = _details(rest + details)
+        result.append(item)
+    return result
+
+
+def _looks_like_tech(part):
+    return ',' in part and all(len(t.split()) <= 3 for t in part.split(','))
+
+
+def parse_projects(lines):
+    result = []
+    for entry in _entries(lines, _starts_entry):
+        date, parts, details = _header_parts(entry)
+        item = {'id': len(result) + 1, 'name': '', 'technologies': '', 'link': '', 'details': ''}
+        rest = []
+        for part in parts:
+            link = URL.search(part)
+            if link and not item['link'] and not EMAIL.search(part):
+                item['link'] = link.group(0)
+                part = _clean(part.replace(link.group(0), ''))
+                if not part:
+                    continue
+            if not item['name']:
+                item['name'] = part
+            elif re.match(r'(?i)(?:tech(?:nologies|nology|s)?|stack|tools|built with)\s*:', part):
+                item['technologies'] = part.split(':', 1)[1].strip()
+            elif _looks_like_tech(part) and not item['technologies']:
+                item['technologies'] = part
+            else:
+                rest.append(part)
+        item['details'] = _details(rest + details)
+        result.append(item)
+    return result
+
+
+def parse_skills(lines):
+    skills = []
+    for line in lines:
+        text = BULLET.sub('', line.strip())
+        if ':' in text:
+            text = text.split(':', 1)[1]  # "Languages: Python, Java"
+        if SKILL_SEPARATORS.search(text):
+            items = SKILL_SEPARATORS.split(text)
+        else:
+            items = text.split()  # chips extracted from a PDF come out space-separated
+        for item in items:
+            item = _clean(item)
+            if item and len(item) <= 40 and item.lower() not in (s.lower() for s in skills):
+                skills.append(item)
+    return skills
+
+
+def parse_personal(lines):
+    personal = {'fullName': '', 'email': '', 'phone': '', 'location': '', 'linkedin': '', 'summary': ''}
+    summary = []
+    for line in lines:
+        text = line.strip()
+        if not text:
+            continue
+        rest = text
+        for field, pattern in (('linkedin', LINKEDIN), ('email', EMAIL), ('phone', PHONE)):
+            match = pattern.search(rest)
+            if match:
+                personal[field] = personal[field] or match.group(0).strip()
+                rest = rest.replace(match.group(0), ' | ')
+        if rest != text:
+            for part in (_clean(p) for p in SEPARATORS.split(rest)):
+                if part and LOCATION.match(part) and not personal['location']:
+                    personal['location'] = part
+            continue
+        if not personal['fullName'] and len(text) > 1 and len(text.split()) <= 5 and not re.search(r'\d', text):
+            personal['fullName'] = _name_case(text)
+        elif _is_detail(text):
+            summary.append(text)
+        elif LOCATION.match(text) and not personal['location']:
+            personal['location'] = text
+    personal['summary'] = _details(summary)
+    return personal
+
+
+def parse_resume(lines):
+    """Turn extracted text lines into a resume document (see schema.py)."""
+    sections = {'header': []}
+    current = 'header'
+    for line in lines:
+        section = _heading(line) if line.strip() and (current != 'header' or sections['header']) else None
+        if section:
+            current = section
+            sections.setdefault(current, [])
+            continue
+        sections[current].append(line)
+        # "Skills: Python, SQL" outside a skills section still counts.
+        if current != 'skills' and re.match(r'(?i)^\s*(?:technical\s+)?skills\s*:', line):
+            sections.setdefault('skills', []).append(sections[current].pop())
+
+    data = {'schemaVersion': schema.SCHEMA_VERSION, 'personal': parse_personal(sections['header'])}
+    summary = _details(sections.get('summary', []))
+    if summary:
+        data['personal']['summary'] = summary
+    data['education'] = parse_education(sections.get('education', []))
+    data['experience'] = parse_experience(sections.get('experience', []))
+    data['projects'] = parse_projects(sections.get('projects', []))
+    data['skills'] = parse_skills(sections.get('skills', []))
+    return data
+
+
+def import_file(data):
+    """Worker entry point: the resume in a PDF or DOCX file, as ``(format, document)``."""
+    fmt, lines = extract_lines(data)
+    # A long CV can have more skills or entries than a resume may hold; keep
+    # the first ones rather than refusing the file.
+    return fmt, schema.repair(parse_resume(lines))
+
+
+def cache_key(digest):
+    """Cache key for the import of a file with SHA-256 ``digest``."""
+    return hashlib.sha256(f'import\0{IMPORT_VERSION}\0{digest}'.encode()).hexdigest()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='app.py import', description='Import PDF/DOCX resumes as JSON Lines.')
+    parser.add_argument('files', nargs='+')
+    parser.add_argument('-o', '--output', default='-', help='a .jsonl file, or - for stdout (the default)')
+    parser.add_argument('-w', '--workers', type=int, default=None)
+    parser.add_argument('--timeout', type=float, default=30)
+    args = parser.parse_args(argv)
+
+    pool = WorkerPool(args.workers, timeout=args.timeout)
+    window = pool.workers * 2  # files read and in flight at once
+    started, failed = time.monotonic(), 0
+    out = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+
+    def finish(path, future):
+        try:
+            _, document = future.result()
+        except Exception as exc:
+            print(f'{path}: {type(exc).__name__}: {exc}', file=sys.stderr)
+            return False
+        out.write(json.dumps(dict(document, source=path), ensure_ascii=False) + '\n')
+        return True
+
+    try:
+        pending = deque()
+        for path in args.files:
+            if len(pending) >= window:
+                failed += not finish(*pending.popleft())
+            with open(path, 'rb') as f:
+                pending.append((path, pool.submit(import_file, f.read())))
+        while pending:
+            failed += not finish(*pending.popleft())
+    finally:
+        pool.shutdown()
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.monotonic() - started
+    print(f'{len(args.files) - failed} imported, {failed} failed in {elapsed:.1f}s '
+          f'({len(args.files) / elapsed:.1f}/s)', file=sys.stderr)
+    return 1 if failed == len(args.files) else 0
@@ -0,0 +1,111 @@
+"""A minimal RFC 6902 JSON Patch implementation.
+
+The editor only ever produces ``add``, ``remove`` and ``replace`` operations, but
+``move``, ``copy`` and ``test`` are supported too so any standard client works.
+"""
+import copy
+
+
+class PatchError(ValueError):
+    pass
+
+
+def _parse_pointer(pointer):
+    if pointer == '':
+        return []
+    if not pointer.startswith('/'):
+        raise PatchError(f'invalid JSON pointer: {pointer!r}')
+    return [token.replace('~1', '/').replace('~0', '~') for token in pointer[1:].split('/')]
+
+
+def _index(container, token, allow_end=False):
+    if token == '-' and allow_end:
+        return len(container)
+    if not token.isdigit() or (len(token) > 1 and token.startswith('0')):
+        raise PatchError(f'invalid array index: {token!r}')
+    index = int(token)
+    limit = len(container) if allow_end else len(container) - 1
+    if index > limit:
+        raise PatchError(f'array index out of range: {index}')
+    return index
+
+
+def _resolve(doc, tokens):
+    for token in tokens:
+        if isinstance(doc, list):
+            doc = doc[_index(doc, token)]
+        elif isinstance(doc, dict):
+            if token not in doc:
+                raise PatchError(f'path not found: {token!r}')
+            doc = doc[token]
+        else:
+            raise PatchError(f'cannot descend into {type(doc).__name__}')
+    return doc
+
+
+def _get(doc, path):
+    return _resolve(doc, _parse_pointer(path))
+
+
+def _add(doc, path, value):
+    tokens = _parse_pointer(path)
+    if not tokens:
+        return value
+    parent = _resolve(doc, tokens[:-1])
+    if isinstance(parent, list):
+        parent.insert(_index(parent, tokens[-1], allow_end=True), value)
+    elif isinstance(parent, dict):
+        parent[tokens[-1]] = value
+    else:
+        raise PatchError(f'cannot add to {type(parent).__name__}')
+    return doc
+
+
+def _remove(doc, path):
+    tokens = _parse_pointer(path)
+    if not tokens:
+        raise PatchError('cannot remove the document root')
+    parent = _resolve(doc, tokens[:-1])
+    if isinstance(parent, list):
+        return parent.pop(_index(parent, tokens[-1]))
+    if isinstance(parent, dict) and tokens[-1] in parent:
+        return parent.pop(tokens[-1])
+    raise PatchError(f'path not found: {path!r}')
+
+
+def apply_patch(doc, operations):
+    """Return a patched copy of ``doc``; the original is never modified.
+
+    Raises ``PatchError`` if any operation is malformed or does not apply, in
+    which case none of the operations take effect.
+    """
+    if not isinstance(operations, list):
+        raise PatchError('a JSON patch must be a list of operations')
+    doc = copy.deepcopy(doc)
+    for operation in operations:
+        if not isinstance(operation, dict) or not isinstance(operation.get('path'), str):
+            raise PatchError(f'malformed operation: {operation!r}')
+        op, path = operation.get('op'), operation['path']
+        if op in ('add', 'replace', 'test') and 'value' not in operation:
+            raise PatchError(f'{op!r} requires a value')
+        if op in ('move', 'copy') and not isinstance(operation.get('from'), str):
+            raise PatchError(f'{op!r} requires a from pointer')
+        if op == 'add':
+            doc = _add(doc, path, copy.deepcopy(operation['value']))
+        elif op == 'remove':
+            _remove(doc, path)
+        elif op == 'replace':
+            if _parse_pointer(path):
+                _remove(doc, path)
+            doc = _add(doc, path, copy.deepcopy(operation['value']))
+        elif op == 'move':
+            value = _remove(doc, operation['from'])
+            doc = _add(doc, path, value)
+        elif op == 'copy':
+            doc = _add(doc, path, copy.deepcopy(_get(doc, operation['from'])))
+        elif op == 'test':
+            if _get(doc, path) != operation['value']:
+                raise PatchError(f'test failed at {path!r}')
+        else:
+            raise PatchError(f'unknown operation: {op!r}')
+    return doc
@@ -0,0 +1,170 @@
+"""Resume layouts as Jinja templates, compiled once and shared by client and server.
+
+Every ``<name>.html`` in the layout directory is a layout; files starting with
+``_`` are partials the layouts import. A layout is written once and rendered
+two ways:
+
+* for the editor's live preview, with ``preview`` bound to a JavaScript
+  expression, it produces Alpine.js markup (``x-text``, ``x-for``, ...);
+* on the server, with ``preview`` bound to a resume document, it produces
+  plain HTML with the values filled in.
+
+Layouts write ``{{ el('h3', edu.school, class='...') }}`` for an element
+showing a value, ``{{ show(value) }}`` inside a tag to hide it when empty and
+``{% call(edu) each(preview.education, 'edu') %}...{% endcall %}`` to repeat
+markup per entry. Top-level ``{% set label = ... %}`` and ``{% set order = ... %}``
+name the layout and place it in the template picker.
+
+The editor paginates the preview onto A4 pages without splitting elements
+marked ``data-block``: entries, short sections, headers. A heading marked
+``data-block="keep"`` moves to the next page along with the block after it.
+Content outside any block is not tracked, so mark everything in a layout.
+
+Compiled templates are cached as bytecode on disk, so server workers start
+without recompiling, and the directory is polled so layouts can be added or
+edited while the server runs.
+"""
+import os
+import time
+from functools import lru_cache
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from markupsafe import Markup, escape
+
+
+class Expr:
+    """A JavaScript expression standing in for resume data in client renders."""
+
+    def __init__(self, js):
+        self.js = js
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return Expr(f'{self.js}.{name}')
+
+
+def _js_string(value):
+    return "'" + value.replace('\\', '\\\\').replace("'", "\\'") + "'"
+
+
+def _text(value):
+    return '' if value is None else str(value)
+
+
+@lru_cache(maxsize=1024)
+def _attributes(items):
+    # Layouts pass the same few class strings over and over.
+    return ''.join(f' {name}="{escape(value)}"' for name, value in items)
+
+
+def el(tag, value, **attrs):
+    """``<tag attrs>value</tag>``, bound with x-text for client renders."""
+    attributes = _attributes(tuple(attrs.items())) if attrs else ''
+    if isinstance(value, Expr):
+        return Markup(f'<{tag}{attributes} x-text="{escape(value.js)}"></{tag}>')
+    return Markup(f'<{tag}{attributes}>{escape(_text(value))}</{tag}>')
+
+
+def show(value):
+    """Attribute hiding an element while ``value`` is empty."""
+    if isinstance(value, Expr):
+        return Markup(f'x-show="{escape(value.js)}"')
+    return Markup('') if value else Markup('style="display: none;"')
+
+
+def each(items, name, caller, key='id'):
+    """Repeat the call block per item; an Alpine ``x-for`` in client renders."""
+    if isinstance(items, Expr):
+        keyed = f' :key="{name}.{key}"' if key else ''
+        return Markup(f'<template x-for="{name} in {escape(items.js)}"{keyed}>\n{caller(Expr(name))}</template>\n')
+    return Markup(''.join(caller(item) for item in items or ()))
+
+
+def joined(value, separator):
+    if isinstance(value, Expr):
+        return Expr(f'{value.js}.join({_js_string(separator)})')
+    return separator.join(_text(item) for item in value or ())
+
+
+def present(values):
+    """The non-empty ``values``, for ``joined``: a separator only between fields that are there."""
+    if any(isinstance(value, Expr) for value in values):
+        items = ', '.join(v.js if isinstance(v, Expr) else _js_string(_text(v)) for v in values)
+        return Expr(f'[{items}].filter(Boolean)')
+    return [value for value in values if value]
+
+
+def initial(value):
+    if isinstance(value, Expr):
+        return Expr(f'{value.js}.charAt(0)')
+    return _text(value)[:1]
+
+
+class Layout:
+    def __init__(self, name, template):
+        self.name = name
+        self.template = template
+        module = template.make_module({'preview': Expr('preview')})
+        self.label = getattr(module, 'label', name.title())
+        self.order = getattr(module, 'order', 100)
+        # The client-side markup, rendered once per (re)load.
+        self.preview = Markup(str(module).strip())
+
+    def render(self, data):
+        """Server-side HTML for the resume document ``data``."""
+        return Markup(self.template.render(preview=data).strip())
+
+
+class LayoutRegistry:
+    def __init__(self, directory, cache_dir=None, poll_interval=1.0):
+        self.directory = directory
+        self.poll_interval = poll_interval
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        self.env = Environment(
+            loader=FileSystemLoader(directory),
+            bytecode_cache=FileSystemBytecodeCache(cache_dir) if cache_dir else None,
+            autoescape=True,
+            auto_reload=True,
+            trim_blocks=True,
+        )
+        self.env.globals.update(el=el, show=show, each=each)
+        self.env.filters.update(joined=joined, present=present, initial=initial)
+        self.layouts = {}
+        self._signature = None
+        self._checked = 0.0
+        self.reload()
+
+    def _scan(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.html'):
+                entries.append((name, os.stat(os.path.join(self.directory, name)).st_mtime_ns))
+        return sorted(entries)
+
+    def reload(self):
+        self._signature = self._scan()
+        layouts = [Layout(name[:-5], self.env.get_template(name))
+                   for name, _ in self._signature if not name.startswith('_')]
+        self.layouts = {layout.name: layout for layout in sorted(layouts, key=lambda l: (l.order, l.name))}
+
+    def poll(self):
+        """Reload if the directory changed (checked at most once per interval); True if it did."""
+        now = time.monotonic()
+        if now - self._checked < self.poll_interval:
+            return False
+        self._checked = now
+        if self._scan() == self._signature:
+            return False
+        self.reload()
+        return True
+
+    def __contains__(self, name):
+        return name in self.layouts
+
+    def __getitem__(self, name):
+        return self.layouts[name]
+
+    def __iter__(self):
+        return iter(self.layouts.values())
@@ -0,0 +1,377 @@
+"""Request metrics in the Prometheus text format, and an opt-in slow-request profiler.
+
+Metrics live in process memory. When several server processes share the load
+each one also writes a snapshot to a shared directory, and ``render`` merges
+them: counters and histograms are summed over every process that has written
+one, gauges over the processes still running.
+"""
+import glob
+import json
+import math
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Metric:
+    def __init__(self, name, help, kind, labels=(), buckets=None):
+        self.name = name
+        self.help = help
+        self.kind = kind
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets) if buckets else None
+        self.values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self.values[key] = value
+
+    def observe(self, value, **labels):
+        """Histograms: count ``value`` in its bucket. Stored as per-bucket counts plus the sum."""
+        key = self._key(labels)
+        with self._lock:
+            counts = self.values.get(key)
+            if counts is None:
+                counts = self.values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            counts[bisect_left(self.buckets, value)] += 1
+            counts[-1] += value
+
+    def samples(self):
+        with self._lock:
+            return [[list(key), list(value) if isinstance(value, list) else value]
+                    for key, value in self.values.items()]
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values, extra=()):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in list(zip(names, values)) + list(extra)]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value):
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Registry:
+    def __init__(self, directory=None):
+        self.directory = directory
+        self.metrics = {}
+        self._collectors = []
+        self._derived = []
+        self._dirty = False
+        self._thread = None
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _add(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help, labels=()):
+        return self._add(Metric(name, help, 'counter', labels))
+
+    def gauge(self, name, help, labels=()):
+        return self._add(Metric(name, help, 'gauge', labels))
+
+    def histogram(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        return self._add(Metric(name, help, 'histogram', labels, buckets))
+
+    def collector(self, fn):
+        """Register ``fn()`` to refresh metrics mirrored from elsewhere before each snapshot."""
+        self._collectors.append(fn)
+        return fn
+
+    def derive(self, name, help, fn):
+        """A gauge computed after merging: ``fn(value)``, where ``value(metric, **labels)``
+        sums the matching samples across processes."""
+        self._derived.append((name, help, fn))
+
+    def snapshot(self):
+        for fn in self._collectors:
+            fn()
+        return {name: {'kind': m.kind, 'help': m.help, 'labels': list(m.labels),
+                       'buckets': m.buckets, 'samples': m.samples()}
+                for name, m in self.metrics.items()}
+
+    def save(self, force=False):
+        """Write this process's snapshot now if ``force``d, else within a second."""
+        if not self.directory:
+            return
+        if not force:
+            self._dirty = True
+            self._ensure_writer()
+            return
+        self._dirty = False
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp, os.path.join(self.directory, f'{os.getpid()}.json'))
+
+    def _ensure_writer(self):
+        # Started lazily so forking servers do not inherit a running thread.
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, name='metrics-writer', daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(1)
+            if self._dirty:
+                self.save(force=True)
+
+    def _merged(self):
+        if not self.directory:
+            return self.snapshot()
+        self.save(force=True)
+        merged = {}
+        for path in glob.glob(os.path.join(self.directory, '*.json')):
+            pid = int(os.path.basename(path)[:-5])
+            alive = pid == os.getpid() or _alive(pid)
+            try:
+                with open(path) as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue  # being replaced right now
+            for name, metric in snapshot.items():
+                if metric['kind'] == 'gauge' and not alive:
+                    continue
+                target = merged.setdefault(name, dict(metric, samples={}))
+                for key, value in metric['samples']:
+                    key = tuple(key)
+                    current = target['samples'].get(key)
+                    if current is None:
+                        target['samples'][key] = value
+                    elif isinstance(value, list):
+                        target['samples'][key] = [a + b for a, b in zip(current, value)]
+                    else:
+                        target['samples'][key] = current + value
+        for metric in merged.values():
+            metric['samples'] = [[list(k), v] for k, v in metric['samples'].items()]
+        return merged
+
+    def render(self):
+        merged = self._merged()
+        lines = []
+        for name, metric in sorted(merged.items()):
+            lines.append(f'# HELP {name} {metric["help"]}')
+            lines.append(f'# TYPE {name} {metric["kind"]}')
+            for key, value in sorted(metric['samples']):
+                if metric['kind'] != 'histogram':
+                    lines.append(f'{name}{_labels(metric["labels"], key)} {_number(value)}')
+                    continue
+                cumulative = 0
+                for bound, count in zip(list(metric['buckets']) + [math.inf], value):
+                    cumulative += count
+                    le = _labels(metric['labels'], key, [('le', _number(bound))])
+                    lines.append(f'{name}_bucket{le} {cumulative}')
+                lines.append(f'{name}_sum{_labels(metric["labels"], key)} {_number(value[-1])}')
+                lines.append(f'{name}_count{_labels(metric["labels"], key)} {cumulative}')
+
+        def value(metric_name, **labels):
+            metric = merged.get(metric_name)
+            if metric is None:
+                return 0
+            wanted = [(metric['labels'].index(k), str(v)) for k, v in labels.items()]
+            return sum(v for key, v in metric['samples'] if all(key[i] == want for i, want in wanted))
+
+        for name, help, fn in self._derived:
+            lines.append(f'# HELP {name} {help}')
+            lines.append(f'# TYPE {name} gauge')
+            lines.append(f'{name} {_number(float(fn(value)))}')
+        return '\n'.join(lines) + '\n'
+
+
+class _MeasuredBody:
+    """Passes a WSGI response body through, counting bytes; reports when closed."""
+
+    def __init__(self, body, done):
+        self._body = body
+        self._done = done
+        self.size = 0
+
+    def __iter__(self):
+        for chunk in self._body:
+            self.size += len(chunk)
+            yield chunk
+
+    def close(self):
+        try:
+            if hasattr(self._body, 'close'):
+                self._body.close()
+        finally:
+            self._done(self.size)
+
+
+class RequestMetrics:
+    """WSGI middleware for a Flask app: per-route latency, size and in-flight metrics.
+
+    A request is timed until its body has been sent, so streamed responses
+    count in full.
+    """
+
+    def __init__(self, app, registry, profiler=None):
+        self.wsgi_app = app.wsgi_app
+        self.registry = registry
+        self.profiler = profiler
+        self.requests = registry.counter(
+            'http_requests_total', 'Requests served.', ('route', 'method', 'status'))
+        self.latency = registry.histogram(
+            'http_request_duration_seconds', 'Time until the response was sent.', ('route', 'method'))
+        self.sizes = registry.histogram(
+            'http_response_size_bytes', 'Response body size.', ('route',), SIZE_BUCKETS)
+        self.in_flight = registry.gauge('http_requests_in_flight', 'Requests being served.', ('route',))
+        app.wsgi_app = self
+        app.before_request(self._route)
+
+    def _route(self):
+        from flask import request
+
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        request.environ['metrics.route'] = route
+        self.in_flight.inc(route=route)
+
+    def __call__(self, environ, start_response):
+        started = time.perf_counter()
+        token = self.profiler.start() if self.profiler else None
+        status = []
+
+        def capture(code, headers, exc_info=None):
+            status[:] = [code.split(' ', 1)[0]]
+            return start_response(code, headers, exc_info)
+
+        def done(size):
+            elapsed = time.perf_counter() - started
+            route = environ.get('metrics.route')
+            if route is not None:
+                self.in_flight.dec(route=route)
+            route = route or 'unmatched'
+            method = environ.get('REQUEST_METHOD', 'GET')
+            self.requests.inc(route=route, method=method, status=status[0] if status else '500')
+            self.latency.observe(elapsed, route=route, method=method)
+            self.sizes.observe(size, route=route)
+            if token is not None:
+                self.profiler.stop(token, elapsed, f'{method} {route}')
+            self.registry.save()
+
+        try:
+            body = self.wsgi_app(environ, capture)
+        except BaseException:
+            done(0)
+            raise
+        return _MeasuredBody(body, done)
+
+
+def _fold(frame):
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+        frame = frame.f_back
+    return ';'.join(reversed(stack))
+
+
+class SlowRequestProfiler:
+    """Samples the stacks of in-flight requests and keeps those of slow ones.
+
+    Every ``interval`` seconds a background thread records the stack of each
+    thread serving a request. Requests slower than ``threshold`` seconds are
+    written to ``directory`` as ``.folded`` files (``frame;frame;frame count``
+    per line), the input of flamegraph.pl and speedscope. Only the newest
+    ``keep`` files are kept.
+    """
+
+    def __init__(self, directory, threshold, interval=0.005, keep=200):
+        self.directory = directory
+        self.threshold = threshold
+        self.interval = interval
+        self.keep = keep
+        self._stacks = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        os.makedirs(directory, exist_ok=True)
+
+    def start(self):
+        ident = threading.get_ident()
+        with self._lock:
+            self._stacks[ident] = Counter()
+        self._ensure_sampler()
+        return ident
+
+    def stop(self, ident, elapsed, label):
+        with self._lock:
+            stacks = self._stacks.pop(ident, None)
+        if stacks and elapsed >= self.threshold:
+            self._write(stacks, elapsed, label)
+
+    def _ensure_sampler(self):
+        # Started lazily so forking servers do not inherit a running thread.
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, name='request-sampler', daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                idents = list(self._stacks)
+            if not idents:
+                continue
+            frames = sys._current_frames()
+            folded = {ident: _fold(frames[ident]) for ident in idents if ident in frames}
+            with self._lock:
+                for ident, stack in folded.items():
+                    if ident in self._stacks:
+                        self._stacks[ident][stack] += 1
+
+    def _write(self, stacks, elapsed, label):
+        slug = re.sub(r'[^A-Za-z0-9]+', '-', label).strip('-')
+        name = f'{time.strftime("%Y%m%d-%H%M%S")}-{os.getpid()}-{slug}-{elapsed * 1000:.0f}ms.folded'
+        with open(os.path.join(self.directory, name), 'w') as f:
+            f.writelines(f'{stack} {count}\n' for stack, count in stacks.most_common())
+        profiles = sorted(glob.glob(os.path.join(self.directory, '*.folded')), key=os.path.getmtime)
+        for path in profiles[:-self.keep]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
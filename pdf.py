@@ -0,0 +1,233 @@
+"""A small pure-Python vector PDF writer.
+
+Only what the resume layouts need: the standard Type 1 fonts (no embedding),
+filled rectangles, rules, circles and wrapped text. Text stays real text, so
+the output is selectable, searchable and a few KB in size. Those fonts only
+cover Windows-1252 (Western European); text outside it raises
+``UnsupportedText`` instead of coming out as question marks.
+
+Layouts work in CSS pixels with a top-left origin, like the HTML preview; the
+writer converts to PDF points.
+"""
+import zlib
+
+PX = 0.75  # PDF points per CSS pixel
+PAGE_WIDTH = 794  # A4 in CSS pixels (210mm)
+PAGE_HEIGHT = 1123  # A4 in CSS pixels (297mm)
+
+# Advance widths (per 1000 units of font size) for ASCII 32..126, from the
+# Adobe Core 14 AFM files.
+_ASCII_WIDTHS = {
+    'Helvetica': (
+        '278 278 355 556 556 889 667 191 333 333 389 584 278 333 278 278 556 556 556 556 '
+        '556 556 556 556 556 556 278 278 584 584 584 556 1015 667 667 722 722 667 611 778 '
+        '722 278 500 667 556 833 722 778 667 778 722 667 611 722 667 944 667 667 611 278 '
+        '278 278 469 556 333 556 556 500 556 556 278 556 556 222 222 500 222 833 556 556 '
+        '556 556 333 500 278 556 500 722 500 500 500 334 260 334 584'),
+    'Helvetica-Bold': (
+        '278 333 474 556 556 889 722 238 333 333 389 584 278 333 278 278 556 556 556 556 '
+        '556 556 556 556 556 556 333 333 584 584 584 611 975 722 722 722 722 667 611 778 '
+        '722 278 556 722 611 833 722 778 667 778 722 667 611 722 667 944 667 667 611 333 '
+        '278 333 584 556 333 556 611 556 611 556 333 611 611 278 278 556 278 889 611 611 '
+        '611 611 389 556 333 611 556 778 556 556 500 389 280 389 584'),
+    'Times-Roman': (
+        '250 333 408 500 500 833 778 180 333 333 500 564 250 333 250 278 500 500 500 500 '
+        '500 500 500 500 500 500 278 278 564 564 564 444 921 722 667 667 722 611 556 722 '
+        '722 333 389 722 611 889 722 722 556 722 667 556 611 722 722 944 722 722 611 333 '
+        '278 333 469 500 333 444 500 444 500 444 333 500 500 278 278 500 278 778 500 500 '
+        '500 500 333 389 278 500 500 722 500 500 444 480 200 480 541'),
+    'Times-Bold': (
+        '250 333 555 500 500 1000 833 278 333 333 500 570 250 333 250 278 500 500 500 500 '
+        '500 500 500 500 500 500 333 333 570 570 570 500 930 722 667 722 722 667 611 778 '
+        '778 389 500 778 667 944 722 778 611 778 722 556 667 722 722 1000 722 722 667 333 '
+        '278 333 581 500 333 500 556 444 556 444 333 500 556 278 333 556 278 833 556 500 '
+        '556 556 444 389 333 556 500 722 500 500 444 394 220 394 520'),
+    'Times-Italic': (
+        '250 333 420 500 500 833 778 214 333 333 500 675 250 333 250 278 500 500 500 500 '
+        '500 500 500 500 500 500 333 333 675 675 675 500 920 611 611 667 722 611 611 722 '
+        '722 333 444 667 556 833 667 722 611 722 611 500 556 722 611 833 611 556 556 389 '
+        '278 389 422 500 333 500 500 444 500 444 278 500 500 278 278 444 278 722 500 500 '
+        '500 500 389 389 278 500 444 667 444 444 389 400 275 400 541'),
+}
+_ASCII_WIDTHS['Helvetica-Oblique'] = _ASCII_WIDTHS['Helvetica']
+
+FONTS = tuple(_ASCII_WIDTHS)
+WIDTHS = {
+    name: {chr(32 + i): int(w) for i, w in enumerate(table.split())}
+    for name, table in _ASCII_WIDTHS.items()
+}
+for _table in WIDTHS.values():
+    _table['•'] = 350  # bullet
+    _table['–'] = _table['-'] + 167  # en dash
+    _table['—'] = 1000  # em dash
+
+_FONT_RESOURCES = {name: f'F{i + 1}' for i, name in enumerate(FONTS)}
+
+
+def text_width(text, font, size):
+    widths = WIDTHS[font]
+    return sum(widths.get(ch, 500) for ch in text) * size / 1000
+
+
+def wrap_text(text, font, size, width):
+    """Greedy word wrap. Newlines in ``text`` are kept (like whitespace-pre-line)."""
+    lines = []
+    space = text_width(' ', font, size)
+    for paragraph in str(text).split('\n'):
+        words = paragraph.split()
+        if not words:
+            lines.append('')
+            continue
+        line, line_width = [], 0.0
+        for word in words:
+            word_width = text_width(word, font, size)
+            while word_width > width and len(word) > 1:
+                # A single word wider than the box: break it by characters.
+                cut = len(word)
+                while cut > 1 and text_width(word[:cut], font, size) > width:
+                    cut -= 1
+                if line:
+                    lines.append(' '.join(line))
+                    line, line_width = [], 0.0
+                lines.append(word[:cut])
+                word = word[cut:]
+                word_width = text_width(word, font, size)
+            needed = word_width if not line else line_width + space + word_width
+            if line and needed > width:
+                lines.append(' '.join(line))
+                line, line_width = [word], word_width
+            else:
+                line.append(word)
+                line_width = needed
+        lines.append(' '.join(line))
+    return lines
+
+
+def hex_color(value):
+    value = value.lstrip('#')
+    return tuple(int(value[i:i + 2], 16) / 255 for i in (0, 2, 4))
+
+
+def _num(value):
+    return f'{value:.2f}'.rstrip('0').rstrip('.')
+
+
+class UnsupportedText(ValueError):
+    """Raised for text the standard fonts cannot show (e.g. Devanagari, CJK, Greek)."""
+
+
+def _pdf_string(text):
+    try:
+        raw = str(text).encode('cp1252')
+    except UnicodeEncodeError as exc:
+        raise UnsupportedText(f'the PDF fonts cannot show {exc.object[exc.start:exc.end]!r}') from None
+    return b'(' + raw.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)') + b')'
+
+
+class Page:
+    """Drawing operations for one page, in CSS pixels from the top-left corner."""
+
+    def __init__(self, number):
+        self.number = number
+        self._ops = []
+
+    def _y(self, y):
+        return (PAGE_HEIGHT - y) * PX
+
+    def _fill(self, color):
+        r, g, b = hex_color(color)
+        return f'{_num(r)} {_num(g)} {_num(b)} rg'
+
+    def _stroke(self, color):
+        r, g, b = hex_color(color)
+        return f'{_num(r)} {_num(g)} {_num(b)} RG'
+
+    def rect(self, x, y, width, height, color):
+        self._ops.append(
+            f'{self._fill(color)} {_num(x * PX)} {_num(self._y(y + height))} '
+            f'{_num(width * PX)} {_num(height * PX)} re f'.encode())
+
+    def line(self, x1, y1, x2, y2, color, width=1):
+        self._ops.append(
+            f'{self._stroke(color)} {_num(width * PX)} w {_num(x1 * PX)} {_num(self._y(y1))} m '
+            f'{_num(x2 * PX)} {_num(self._y(y2))} l S'.encode())
+
+    def circle(self, cx, cy, radius, color):
+        k = 0.5523 * radius  # Bezier control offset for a quarter circle
+        x, y, r = cx * PX, self._y(cy), radius * PX
+        k *= PX
+        self._ops.append((
+            f'{self._fill(color)} {_num(x + r)} {_num(y)} m '
+            f'{_num(x + r)} {_num(y + k)} {_num(x + k)} {_num(y + r)} {_num(x)} {_num(y + r)} c '
+            f'{_num(x - k)} {_num(y + r)} {_num(x - r)} {_num(y + k)} {_num(x - r)} {_num(y)} c '
+            f'{_num(x - r)} {_num(y - k)} {_num(x - k)} {_num(y - r)} {_num(x)} {_num(y - r)} c '
+            f'{_num(x + k)} {_num(y - r)} {_num(x + r)} {_num(y - k)} {_num(x + r)} {_num(y)} c f'
+        ).encode())
+
+    def text(self, x, y, text, font, size, color):
+        """Draw ``text`` with its baseline at ``y``."""
+        if not text:
+            return
+        self._ops.append(
+            f'BT /{_FONT_RESOURCES[font]} {_num(size * PX)} Tf {self._fill(color)} '
+            f'{_num(x * PX)} {_num(self._y(y))} Td '.encode() + _pdf_string(text) + b' Tj ET')
+
+    def content(self):
+        return b'\n'.join(self._ops)
+
+
+class PDFWriter:
+    """Writes a PDF to a binary file object one page at a time.
+
+    Page content is compressed and written as soon as ``add_page`` is called,
+    so memory use does not grow with the number of pages.
+    """
+
+    def __init__(self, out, title='Resume'):
+        self.out = out
+        self.title = title
+        self._offsets = {}
+        self._page_ids = []
+        self._written = 0
+        self._next_id = 3  # 1 is the catalog, 2 the page tree
+        self._font_ids = {}
+        self._emit(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+        for name in FONTS:
+            self._font_ids[name] = self._object(
+                f'<< /Type /Font /Subtype /Type1 /BaseFont /{name} /Encoding /WinAnsiEncoding >>'.encode())
+
+    def _emit(self, data):
+        self.out.write(data)
+        self._written += len(data)
+
+    def _object(self, body, object_id=None):
+        if object_id is None:
+            object_id = self._next_id
+            self._next_id += 1
+        self._offsets[object_id] = self._written
+        self._emit(f'{object_id} 0 obj\n'.encode() + body + b'\nendobj\n')
+        return object_id
+
+    def add_page(self, page):
+        stream = zlib.compress(page.content(), 6)
+        content_id = self._object(
+            f'<< /Length {len(stream)} /Filter /FlateDecode >>\nstream\n'.encode() + stream + b'\nendstream')
+        fonts = ' '.join(f'/{_FONT_RESOURCES[name]} {oid} 0 R' for name, oid in self._font_ids.items())
+        page_id = self._object((
+            f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {_num(PAGE_WIDTH * PX)} {_num(PAGE_HEIGHT * PX)}] '
+            f'/Resources << /Font << {fonts} >> >> /Contents {content_id} 0 R >>').encode())
+        self._page_ids.append(page_id)
+
+    def close(self):
+        kids = ' '.join(f'{pid} 0 R' for pid in self._page_ids)
+        self._object(f'<< /Type /Pages /Kids [{kids}] /Count {len(self._page_ids)} >>'.encode(), 2)
+        self._object(b'<< /Type /Catalog /Pages 2 0 R >>', 1)
+        info_id = self._object(b'<< /Title ' + _pdf_string(self.title) + b' /Producer (CV Builder) >>')
+        xref_offset = self._written
+        size = self._next_id
+        lines = [f'xref\n0 {size}\n0000000000 65535 f \n']
+        for object_id in range(1, size):
+            lines.append(f'{self._offsets[object_id]:010d} 00000 n \n')
+        self._emit(''.join(lines).encode())
+        self._emit(
+            f'trailer\n<< /Size {size} /Root 1 0 R /Info {info_id} 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n'.encode())
@@ -0,0 +1,526 @@
+"""The modern, minimal and creative resume layouts, drawn with ``pdf``.
+
+Measurements mirror the Tailwind classes of the HTML preview (in CSS pixels),
+so a server-rendered PDF looks like what the student sees in the editor.
+"""
+import io
+
+from pdf import PAGE_HEIGHT, PAGE_WIDTH, Page, PDFWriter, text_width, wrap_text
+
+# Bump whenever a layout changes so cached renders are not reused.
+RENDER_VERSION = 2
+
+MARGIN = 32  # p-8 on #resume-preview
+
+# Tailwind font sizes: (font-size, line-height)
+XS, SM, BASE, LG, XL, X2L, X3L, X4L = (12, 16), (14, 20), (16, 24), (18, 28), (20, 28), (24, 32), (30, 36), (36, 40)
+
+COLORS = {
+    'white': '#ffffff',
+    'slate-50': '#f8fafc', 'slate-100': '#f1f5f9', 'slate-200': '#e2e8f0', 'slate-300': '#cbd5e1',
+    'slate-500': '#64748b', 'slate-600': '#475569', 'slate-700': '#334155', 'slate-800': '#1e293b',
+    'slate-900': '#0f172a',
+    'gray-500': '#6b7280', 'gray-600': '#4b5563', 'gray-700': '#374151', 'gray-800': '#1f2937',
+    'gray-900': '#111827',
+    'blue-200': '#bfdbfe', 'blue-300': '#93c5fd', 'blue-400': '#60a5fa', 'blue-500': '#3b82f6',
+    'blue-600': '#2563eb', 'blue-900': '#1e3a8a',
+}
+
+
+class Document:
+    """Pages created on demand, so several columns can flow independently.
+
+    With a ``writer``, ``flush`` hands finished pages to it and drops them, so
+    only the pages a column can still draw on are held in memory.
+    """
+
+    def __init__(self, decorate=None, writer=None):
+        self.pages = []  # None once written
+        self.decorate = decorate
+        self.writer = writer
+        self.written = 0
+
+    def page(self, index):
+        if index < self.written:
+            raise ValueError(f'page {index + 1} has been written already')
+        while len(self.pages) <= index:
+            page = Page(len(self.pages))
+            if self.decorate:
+                self.decorate(page)
+            self.pages.append(page)
+        return self.pages[index]
+
+    def flush(self, before=None):
+        """Write out the pages before index ``before`` (all of them by default)."""
+        if self.writer is None:
+            return
+        end = len(self.pages) if before is None else min(before, len(self.pages))
+        while self.written < end:
+            self.writer.add_page(self.pages[self.written])
+            self.pages[self.written] = None
+            self.written += 1
+
+
+class Column:
+    """A vertical flow of content that continues on the next page when full."""
+
+    def __init__(self, doc, x, width, y=MARGIN, page_index=0, top=MARGIN, bottom=PAGE_HEIGHT - MARGIN):
+        self.doc = doc
+        self.x = x
+        self.width = width
+        self.y = y
+        self.page_index = page_index
+        self.top = top
+        self.bottom = bottom
+
+    @property
+    def page(self):
+        return self.doc.page(self.page_index)
+
+    @property
+    def position(self):
+        return self.page_index, self.y
+
+    def ensure(self, height):
+        if self.y + height > self.bottom and self.y > self.top:
+            self.page_index += 1
+            self.y = self.top
+
+    def gap(self, height):
+        self.y += height
+
+    def child(self, x, width):
+        return Column(self.doc, x, width, self.y, self.page_index, self.top, self.bottom)
+
+    def advance_to(self, *columns):
+        self.page_index, self.y = max([self.position] + [c.position for c in columns])
+
+    def lines(self, text, font, size):
+        return wrap_text(text, font, size[0], self.width)
+
+    def text(self, text, font, size, color, align='left', lines=None):
+        font_size, line_height = size
+        if lines is None:
+            lines = self.lines(text, font, size)
+        for line in lines:
+            self.ensure(line_height)
+            x = self.x
+            if align != 'left':
+                free = self.width - text_width(line, font, font_size)
+                x += free / 2 if align == 'center' else free
+            baseline = self.y + (line_height - font_size) / 2 + font_size * 0.78
+            self.page.text(x, baseline, line, font, font_size, COLORS[color])
+            self.y += line_height
+
+    def rule(self, color, width=1):
+        self.page.line(self.x, self.y + width / 2, self.x + self.width, self.y + width / 2, COLORS[color], width)
+        self.y += width
+
+    def left_border(self, start, color, width=2):
+        """Draw a border-l from ``start`` (a position) down to the current position."""
+        page_index, y = start
+        while page_index < self.page_index:
+            self.doc.page(page_index).line(self.x + width / 2, y, self.x + width / 2, self.bottom, COLORS[color], width)
+            page_index, y = page_index + 1, self.top
+        self.page.line(self.x + width / 2, y, self.x + width / 2, self.y, COLORS[color], width)
+
+    def chips(self, items, font, size, text_color, fill, border=None):
+        """flex-wrap gap-2 of px-2 py-1 rounded badges."""
+        font_size, line_height = size
+        height, x = line_height + 8, self.x
+        self.ensure(height)
+        for item in items:
+            width = min(text_width(item, font, font_size) + 16, self.width)
+            if x > self.x and x + width > self.x + self.width:
+                x = self.x
+                self.y += height + 8
+                self.ensure(height)
+            if border:
+                self.page.rect(x - 1, self.y - 1, width + 2, height + 2, COLORS[border])
+            self.page.rect(x, self.y, width, height, COLORS[fill])
+            baseline = self.y + 4 + (line_height - font_size) / 2 + font_size * 0.78
+            self.page.text(x + 8, baseline, item, font, font_size, COLORS[text_color])
+            x += width + 8
+        if items:
+            self.y += height
+
+
+def _card(col, fill, padding, color, border):
+    """``fill(column)`` inside a box with a background, drawn on every page the box runs onto."""
+    # Laid out once on scratch pages first, to find where the box breaks:
+    # its background has to be drawn before the text that goes over it.
+    probe = Column(Document(), col.x + padding, col.width - 2 * padding, col.y, 0, col.top, col.bottom)
+    fill(probe)
+    for n in range(probe.page_index + 1):
+        top = col.y if n == 0 else col.top
+        bottom = probe.y if n == probe.page_index else col.bottom
+        page = col.doc.page(col.page_index + n)
+        page.rect(col.x - 1, top - 1, col.width + 2, bottom - top + 2, COLORS[border])
+        page.rect(col.x, top, col.width, bottom - top, COLORS[color])
+    inner = col.child(col.x + padding, col.width - 2 * padding)
+    fill(inner)
+    col.advance_to(inner)
+
+
+def _flow(doc, *flows):
+    """Lay out ``(column, steps)`` pairs side by side, one step at a time.
+
+    ``steps`` is a generator that draws on its column and yields between
+    entries. The flow furthest up the document goes next, and a page is
+    written out once every flow still running has moved past it.
+    """
+    flows = list(flows)
+    while flows:
+        flow = min(flows, key=lambda f: f[0].position)
+        try:
+            next(flow[1])
+        except StopIteration:
+            flows.remove(flow)
+        if flows:
+            doc.flush(min(col.page_index for col, _ in flows))
+
+
+def _text(value):
+    return '' if value is None else str(value)
+
+
+def _entries(data, section):
+    items = data.get(section) or []
+    return [item for item in items if isinstance(item, dict)]
+
+
+def _skills(data):
+    return [_text(s) for s in (data.get('skills') or []) if _text(s).strip()]
+
+
+def _split_row(col, left, right, gap=0):
+    """Two sub-columns side by side at the current position (a flex row)."""
+    return col.child(col.x, left), col.child(col.x + left + gap, right)
+
+
+# --- Modern ---
+
+def _modern_heading(col, title):
+    col.ensure(XL[1] + 20 + SM[1])
+    col.text(title.upper(), 'Helvetica-Bold', XL, 'slate-900')
+    col.gap(4)
+    col.rule('slate-300')
+    col.gap(12)
+
+
+def _spread(col, left, left_font, left_size, right, right_font, right_size, color):
+    """justify-between: ``left`` flows, ``right`` sits on the first line."""
+    right_width = text_width(right, right_font, right_size[0]) + 8 if right else 0
+    start = col.position
+    main = col.child(col.x, col.width - right_width)
+    main.text(left, left_font, left_size, color)
+    if right:
+        side = col.child(col.x + col.width - right_width, right_width)
+        side.page_index, side.y = start
+        side.ensure(left_size[1])
+        # Align the right-hand text to the left-hand baseline.
+        side.y += (left_size[1] - right_size[1]) / 2
+        side.text(right, right_font, right_size, color, align='right')
+    col.advance_to(main)
+
+
+def modern(doc, data):
+    personal = data.get('personal') or {}
+    col = Column(doc, MARGIN, PAGE_WIDTH - 2 * MARGIN)
+
+    col.text(_text(personal.get('fullName')).upper(), 'Helvetica-Bold', X4L, 'slate-900')
+    col.gap(8)
+    contacts = [_text(personal.get(k)) for k in ('email', 'phone', 'location', 'linkedin')]
+    col.text('    '.join(c for c in contacts if c), 'Helvetica', SM, 'slate-600')
+    col.gap(24)
+    col.rule('slate-800', 2)
+    col.gap(24)
+
+    third = (col.width - 64) / 3
+    main, side = _split_row(col, third * 2 + 32, third, gap=32)
+    _flow(doc, (main, _modern_main(main, data)), (side, _modern_side(side, data)))
+
+
+def _modern_main(main, data):
+    personal = data.get('personal') or {}
+    if _text(personal.get('summary')):
+        _modern_heading(main, 'Summary')
+        main.text(personal['summary'], 'Helvetica', (14, 22.75), 'slate-700')
+        main.gap(24)
+        yield
+
+    _modern_heading(main, 'Education')
+    for edu in _entries(data, 'education'):
+        main.ensure(LG[1] + BASE[1])
+        _spread(main, _text(edu.get('school')), 'Helvetica-Bold', LG,
+                _text(edu.get('date')), 'Helvetica-Oblique', SM, 'slate-800')
+        main.gap(4)
+        _spread(main, _text(edu.get('degree')), 'Helvetica', BASE,
+                _text(edu.get('location')), 'Helvetica', SM, 'slate-700')
+        main.gap(4)
+        main.text('GPA: ' + _text(edu.get('gpa')), 'Helvetica', SM, 'slate-600')
+        main.gap(4)
+        main.text(_text(edu.get('details')), 'Helvetica', SM, 'slate-600')
+        main.gap(16)
+        yield
+    main.gap(8)
+
+    _modern_heading(main, 'Experience')
+    for exp in _entries(data, 'experience'):
+        main.ensure(LG[1] + SM[1])
+        _spread(main, _text(exp.get('company')), 'Helvetica-Bold', LG,
+                _text(exp.get('date')), 'Helvetica-Oblique', SM, 'slate-800')
+        main.gap(4)
+        main.text(_text(exp.get('role')), 'Helvetica', SM, 'slate-700')
+        main.gap(4)
+        details = main.child(main.x + 10, main.width - 10)
+        start = details.position
+        details.text(_text(exp.get('details')), 'Helvetica', SM, 'slate-600')
+        border = main.child(main.x, 2)
+        border.advance_to(details)
+        border.left_border(start, 'slate-200')
+        main.advance_to(details)
+        main.gap(16)
+        yield
+
+
+def _modern_side(side, data):
+    _modern_heading(side, 'Skills')
+    side.chips(_skills(data), 'Helvetica-Bold', XS, 'slate-800', 'slate-100')
+    side.gap(24)
+    yield
+
+    _modern_heading(side, 'Projects')
+    for proj in _entries(data, 'projects'):
+        side.ensure(BASE[1] + XS[1])
+        side.text(_text(proj.get('name')), 'Helvetica-Bold', BASE, 'slate-800')
+        side.text(_text(proj.get('technologies')), 'Helvetica', XS, 'blue-600')
+        side.gap(4)
+        side.text(_text(proj.get('details')), 'Helvetica', (12, 16.5), 'slate-600')
+        side.gap(16)
+        yield
+
+
+# --- Minimal ---
+
+def _minimal_heading(col, title):
+    col.ensure(SM[1] + 24 + BASE[1])
+    col.text(title.upper(), 'Times-Bold', SM, 'gray-900')
+    col.gap(4)
+    col.rule('gray-900')
+    col.gap(16)
+
+
+def _dated_row(col):
+    quarter = (col.width - 48) / 4
+    return _split_row(col, quarter, col.width - quarter - 16, gap=16)
+
+
+def minimal(doc, data):
+    col = Column(doc, MARGIN, PAGE_WIDTH - 2 * MARGIN)
+    _flow(doc, (col, _minimal(col, data)))
+
+
+def _minimal(col, data):
+    personal = data.get('personal') or {}
+
+    col.text(_text(personal.get('fullName')).upper(), 'Times-Roman', X3L, 'gray-900', align='center')
+    col.gap(8)
+    contact = ' • '.join(c for c in (_text(personal.get(k)) for k in ('email', 'phone')) if c)
+    col.text(contact, 'Times-Roman', SM, 'gray-600', align='center')
+    col.gap(32)
+
+    if _text(personal.get('summary')):
+        summary = col.child(col.x + (col.width - 672) / 2, 672)
+        summary.text(personal['summary'], 'Times-Italic', (14, 22.75), 'gray-700', align='center')
+        col.advance_to(summary)
+        col.gap(24)
+    yield
+
+    _minimal_heading(col, 'Education')
+    for edu in _entries(data, 'education'):
+        col.ensure(BASE[1] + SM[1])
+        left, right = _dated_row(col)
+        left.text(_text(edu.get('date')), 'Times-Roman', SM, 'gray-600')
+        right.text(_text(edu.get('school')), 'Times-Bold', BASE, 'gray-900')
+        right.text(_text(edu.get('degree')), 'Times-Italic', SM, 'gray-900')
+        right.gap(4)
+        right.text(_text(edu.get('details')), 'Times-Roman', SM, 'gray-700')
+        col.advance_to(left, right)
+        col.gap(16)
+        yield
+    col.gap(8)
+
+    _minimal_heading(col, 'Experience')
+    for exp in _entries(data, 'experience'):
+        col.ensure(BASE[1] + SM[1])
+        left, right = _dated_row(col)
+        left.text(_text(exp.get('date')), 'Times-Roman', SM, 'gray-600')
+        left.text(_text(exp.get('location')), 'Times-Italic', SM, 'gray-600')
+        right.text(_text(exp.get('company')), 'Times-Bold', BASE, 'gray-900')
+        right.text(_text(exp.get('role')), 'Times-Italic', SM, 'blue-900')
+        right.gap(8)
+        right.text(_text(exp.get('details')), 'Times-Roman', SM, 'gray-700')
+        col.advance_to(left, right)
+        col.gap(16)
+        yield
+    col.gap(8)
+
+    _minimal_heading(col, 'Projects & Skills')
+    label = 'Skills: '
+    skills = ' • '.join(_skills(data))
+    lines = wrap_text(label + skills, 'Times-Roman', SM[0], col.width)
+    col.ensure(SM[1])
+    col.page.text(col.x, col.y + 3 + SM[0] * 0.78, label, 'Times-Bold', SM[0], COLORS['gray-900'])
+    first = col.child(col.x + text_width(label, 'Times-Bold', SM[0]), col.width)
+    first.text('', 'Times-Roman', SM, 'gray-700', lines=[lines[0][len(label):]])
+    col.advance_to(first)
+    col.text('', 'Times-Roman', SM, 'gray-700', lines=lines[1:])
+    col.gap(16)
+    yield
+    for proj in _entries(data, 'projects'):
+        col.ensure(SM[1] * 2)
+        col.text(_text(proj.get('name')), 'Times-Bold', SM, 'gray-800')
+        col.text(_text(proj.get('technologies')), 'Times-Italic', SM, 'gray-500')
+        col.gap(4)
+        col.text(_text(proj.get('details')), 'Times-Roman', SM, 'gray-700')
+        col.gap(12)
+        yield
+
+
+# --- Creative ---
+
+SIDEBAR_WIDTH = (PAGE_WIDTH - 2 * MARGIN) / 3
+
+
+def _creative_background(page):
+    page.rect(MARGIN, MARGIN, SIDEBAR_WIDTH, PAGE_HEIGHT - 2 * MARGIN, COLORS['slate-900'])
+    page.rect(MARGIN + SIDEBAR_WIDTH, MARGIN, PAGE_WIDTH - 2 * MARGIN - SIDEBAR_WIDTH,
+              PAGE_HEIGHT - 2 * MARGIN, COLORS['slate-50'])
+
+
+def _sidebar_heading(col, title):
+    col.ensure(XS[1] + 10 + SM[1])
+    col.text(title.upper(), 'Helvetica-Bold', XS, 'blue-400')
+    col.gap(8)
+    col.rule('slate-700')
+    col.gap(8)
+
+
+def _creative_heading(col, title):
+    col.ensure(XL[1] + 12 + SM[1])
+    col.text(title, 'Helvetica-Bold', XL, 'slate-800')
+    col.gap(12)
+
+
+def creative(doc, data):
+    personal = data.get('personal') or {}
+    inner_top, inner_bottom = MARGIN + 24, PAGE_HEIGHT - MARGIN - 24
+    side = Column(doc, MARGIN + 24, SIDEBAR_WIDTH - 48, inner_top, 0, inner_top, inner_bottom)
+    main_x = MARGIN + SIDEBAR_WIDTH + 24
+    main = Column(doc, main_x, PAGE_WIDTH - MARGIN - 24 - main_x, inner_top, 0, inner_top, inner_bottom)
+
+    name = _text(personal.get('fullName'))
+    centre = side.x + side.width / 2
+    side.page.circle(centre, side.y + 40, 40, '#3b82f6')
+    if name:
+        initial = name[0]
+        side.page.text(centre - text_width(initial, 'Helvetica-Bold', 24) / 2, side.y + 40 + 24 * 0.35,
+                       initial, 'Helvetica-Bold', 24, COLORS['white'])
+    side.gap(80 + 12)
+    side.text(name, 'Helvetica-Bold', (20, 25), 'white', align='center')
+    side.gap(8)
+    side.text(_text(personal.get('email')), 'Helvetica', XS, 'blue-300', align='center')
+    side.gap(24)
+    _flow(doc, (side, _creative_side(side, data)), (main, _creative_main(main, data)))
+
+
+def _creative_side(side, data):
+    _sidebar_heading(side, 'Skills')
+    side.chips(_skills(data), 'Helvetica', XS, 'slate-300', 'slate-800', border='slate-700')
+    side.gap(24)
+    yield
+
+    _sidebar_heading(side, 'Education')
+    for edu in _entries(data, 'education'):
+        side.ensure(SM[1] + XS[1])
+        side.text(_text(edu.get('school')), 'Helvetica-Bold', SM, 'white')
+        side.text(_text(edu.get('degree')), 'Helvetica', XS, 'blue-300')
+        side.text('GPA: ' + _text(edu.get('gpa')), 'Helvetica', XS, 'slate-500')
+        side.gap(12)
+        yield
+
+
+def _creative_main(main, data):
+    personal = data.get('personal') or {}
+    _creative_heading(main, 'Profile')
+    main.text(_text(personal.get('summary')), 'Helvetica', SM, 'slate-600')
+    main.gap(24)
+    yield
+
+    _creative_heading(main, 'Experience')
+    for exp in _entries(data, 'experience'):
+        main.ensure(BASE[1] + XS[1])
+        body = main.child(main.x + 18, main.width - 18)
+        start = body.position
+        body.text(_text(exp.get('role')), 'Helvetica-Bold', BASE, 'slate-800')
+        body.text(f"{_text(exp.get('company'))} | {_text(exp.get('date'))}", 'Helvetica', XS, 'blue-600')
+        body.gap(4)
+        body.text(_text(exp.get('details')), 'Helvetica', SM, 'slate-600')
+        main.advance_to(body)
+        main.left_border(start, 'blue-200')
+        main.gap(16)
+        yield
+    main.gap(8)
+
+    _creative_heading(main, 'Projects')
+    for proj in _entries(data, 'projects'):
+        inner = main.width - 24
+        lines = {
+            'name': wrap_text(_text(proj.get('name')), 'Helvetica-Bold', BASE[0], inner),
+            'tech': wrap_text(_text(proj.get('technologies')), 'Helvetica-Bold', XS[0], inner),
+            'details': wrap_text(_text(proj.get('details')), 'Helvetica', SM[0], inner),
+        }
+        height = (len(lines['name']) * BASE[1] + len(lines['tech']) * XS[1] + 4
+                  + len(lines['details']) * SM[1] + 24)
+        main.ensure(min(height, main.bottom - main.top))
+
+        def fill(card, lines=lines):
+            card.gap(12)
+            card.text('', 'Helvetica-Bold', BASE, 'slate-800', lines=lines['name'])
+            card.text('', 'Helvetica-Bold', XS, 'blue-500', lines=lines['tech'])
+            card.gap(4)
+            card.text('', 'Helvetica', SM, 'slate-600', lines=lines['details'])
+            card.gap(12)
+
+        _card(main, fill, 12, 'white', 'slate-100')
+        main.gap(12)
+        yield
+
+
+LAYOUTS = {
+    'modern': (modern, None),
+    'minimal': (minimal, None),
+    'creative': (creative, _creative_background),
+}
+
+
+def render_pdf_to(out, data, template='modern'):
+    """Render resume ``data`` with ``template`` into the binary file ``out``.
+
+    Each page is written to ``out`` as soon as the layout has moved past it.
+    """
+    draw, decorate = LAYOUTS[template]
+    personal = data.get('personal') or {}
+    writer = PDFWriter(out, title=_text(personal.get('fullName')) or 'Resume')
+    doc = Document(decorate, writer)
+    doc.page(0)
+    draw(doc, data)
+    doc.flush()
+    writer.close()
+
+
+def render_pdf(data, template='modern'):
+    out = io.BytesIO()
+    render_pdf_to(out, data, template)
+    return out.getvalue()
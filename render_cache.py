@@ -0,0 +1,153 @@
+"""A content-addressed cache for rendered artifacts (PDFs).
+
+Artifacts are keyed by a hash of the canonical resume JSON (``schema.dumps``)
+plus the template and renderer version, so the same resume never renders
+twice. There are two tiers: an in-memory LRU and a directory on disk, each
+bounded by total size.
+"""
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+import schema
+
+KEY_LENGTH = 64
+
+
+def render_key(data, template, version):
+    return schema.digest(data, str(version), template)
+
+
+def is_key(value):
+    return len(value) == KEY_LENGTH and all(c in '0123456789abcdef' for c in value)
+
+
+class _SizedLRU:
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.total = 0
+        self.items = OrderedDict()
+
+    def touch(self, key):
+        self.items.move_to_end(key)
+
+    def add(self, key, size):
+        if key in self.items:
+            self.total -= self.items.pop(key)
+        self.items[key] = size
+        self.total += size
+
+    def discard(self, key):
+        size = self.items.pop(key, None)
+        if size is not None:
+            self.total -= size
+
+    def overflow(self):
+        """Yield least recently used keys until the tier is within budget."""
+        while self.total > self.max_bytes and self.items:
+            key, size = self.items.popitem(last=False)
+            self.total -= size
+            yield key
+
+
+class RenderCache:
+    def __init__(self, directory=None, memory_bytes=32 * 2**20, disk_bytes=512 * 2**20):
+        self.directory = directory
+        self._memory = {}
+        self._memory_lru = _SizedLRU(memory_bytes)
+        self._disk_lru = _SizedLRU(disk_bytes)
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._scan()
+
+    def _scan(self):
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                key, ext = os.path.splitext(name)
+                if ext == '.bin' and is_key(key):
+                    stat = os.stat(os.path.join(root, name))
+                    entries.append((stat.st_mtime, key, stat.st_size))
+        for _, key, size in sorted(entries):
+            self._disk_lru.add(key, size)
+        self._evict_disk()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + '.bin')
+
+    def get(self, key, count=True):
+        """The cached bytes or None; ``count=False`` leaves the hit/miss counts alone."""
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory_lru.touch(key)
+                self.memory_hits += count
+                return data
+        # Look on disk even for keys this process has not seen: other server
+        # workers share the directory.
+        if self.directory:
+            try:
+                with open(self._path(key), 'rb') as f:
+                    data = f.read()
+            except FileNotFoundError:
+                # Never rendered, or evicted by another process.
+                with self._lock:
+                    self._disk_lru.discard(key)
+            else:
+                with self._lock:
+                    self.disk_hits += count
+                    if key in self._disk_lru.items:
+                        self._disk_lru.touch(key)
+                    else:
+                        self._disk_lru.add(key, len(data))
+                    self._remember(key, data)
+                return data
+        with self._lock:
+            self.misses += count
+        return None
+
+    def put(self, key, data):
+        with self._lock:
+            self._remember(key, data)
+        if self.directory:
+            path = self._path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+            with self._lock:
+                self._disk_lru.add(key, len(data))
+            self._evict_disk()
+
+    def _remember(self, key, data):
+        self._memory[key] = data
+        self._memory_lru.add(key, len(data))
+        for old in self._memory_lru.overflow():
+            del self._memory[old]
+
+    def _evict_disk(self):
+        with self._lock:
+            victims = list(self._disk_lru.overflow())
+        for key in victims:
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def stats(self):
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_ratio': (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                'memory_bytes': self._memory_lru.total,
+                'disk_bytes': self._disk_lru.total,
+            }
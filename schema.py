@@ -0,0 +1,368 @@
+"""The resume document: its schema, a canonical encoding and versioned migrations.
+
+A resume is the editor's ``resumeApp().data`` object::
+
+    {"schemaVersion": 2,
+     "personal": {"fullName", "email", "phone", "location", "linkedin", "summary"},
+     "education": [{"id", "school", "degree", "date", "gpa", "details"}],
+     "experience": [{"id", "company", "role", "location", "date", "details"}],
+     "projects": [{"id", "name", "technologies", "link", "details"}],
+     "skills": ["..."]}
+
+``validate(doc)`` checks a document and returns it normalized: text fields
+are strings ('' when missing or null, numbers converted), entry ids are
+filled in, unknown fields are rejected. The checks are compiled into nested
+closures once, at import, from ``SCHEMA``; validating a document walks it
+once with no per-call lookups of what a field should be.
+
+Validated documents have one encoding, ``dumps``: compact JSON with sorted
+keys, so equal resumes are equal byte strings and can be hashed (``digest``)
+for cache keys. Stores may keep the same document as MessagePack or CBOR
+instead (``pack``/``unpack``), when the optional ``msgpack``/``cbor2``
+packages are installed.
+
+Documents written before a schema change are upgraded when they are read
+(``loads`` and ``validate`` run the ``MIGRATIONS`` they are missing) and
+written back in the current version with the next save, so there is never a
+migration pass over the whole store. Stored documents predate validation, so
+``loads`` upgrades them leniently (``repair``): unknown fields are dropped and
+overlong text and lists are cut to the limits, rather than making a saved
+resume unreadable.
+"""
+import hashlib
+import json
+import sys
+
+try:
+    import msgpack
+except ImportError:  # JSON is always available; the binary codecs are optional
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
+
+SCHEMA_VERSION = 2
+
+PERSONAL_FIELDS = ('fullName', 'email', 'phone', 'location', 'linkedin', 'summary')
+SECTION_FIELDS = {
+    'education': ('school', 'degree', 'date', 'gpa', 'details'),
+    'experience': ('company', 'role', 'location', 'date', 'details'),
+    'projects': ('name', 'technologies', 'link', 'details'),
+}
+LIST_SECTIONS = tuple(SECTION_FIELDS)
+
+MAX_TEXT = 20_000   # characters in one field
+MAX_ENTRIES = 100   # entries in one section, skills in the list
+INTERN_LENGTH = 40  # shorter strings (dates, skills, schools) are interned
+
+# A field that is kept when present but not added when missing.
+OPTIONAL = object()
+
+
+class SchemaError(ValueError):
+    """A document that does not match the schema; ``path`` says where."""
+
+    def __init__(self, message, path=()):
+        self.message = message
+        self.path = list(path)
+        super().__init__(message)
+
+    def __str__(self):
+        where = '/'.join(str(p) for p in self.path)
+        return f'{where}: {self.message}' if where else self.message
+
+
+# --- Compiled validators ---
+
+TEXT, ID, VERSION = 'text', 'id', 'version'
+
+# Education entries may have a location (pdf_layouts shows it); it is
+# kept when present and not added when missing.
+SCHEMA = {
+    'schemaVersion': VERSION,
+    'personal': {field: TEXT for field in PERSONAL_FIELDS},
+    'education': [dict({'id': ID, 'location': (TEXT, OPTIONAL)}, **{f: TEXT for f in SECTION_FIELDS['education']})],
+    'experience': [dict({'id': ID}, **{f: TEXT for f in SECTION_FIELDS['experience']})],
+    'projects': [dict({'id': ID}, **{f: TEXT for f in SECTION_FIELDS['projects']})],
+    'skills': [TEXT],
+}
+
+
+def _text(value):
+    if isinstance(value, str):
+        if len(value) > MAX_TEXT:
+            raise SchemaError(f'longer than {MAX_TEXT} characters')
+        return sys.intern(value) if len(value) <= INTERN_LENGTH else value
+    if value is None:
+        return ''
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return _text(str(value))  # e.g. a GPA or year typed as a number in a CSV
+    raise SchemaError('expected a string')
+
+
+def _id(value):
+    if isinstance(value, int) and not isinstance(value, bool) and value >= 0:
+        return value
+    if isinstance(value, str) and 0 < len(value) <= 64:
+        return sys.intern(value)
+    raise SchemaError('expected a non-negative integer or a short string')
+
+
+def _version(value):
+    if value != SCHEMA_VERSION:
+        raise SchemaError(f'expected version {SCHEMA_VERSION}')
+    return value
+
+
+def _compile(spec):
+    """``(check, default)``: a function checking and normalizing values shaped
+    like ``spec``, and the value (or factory) used when the field is missing."""
+    if spec == TEXT:
+        return _text, ''
+    if spec == ID:
+        return _id, None
+    if spec == VERSION:
+        return _version, SCHEMA_VERSION
+    if isinstance(spec, tuple):
+        check, _ = _compile(spec[0])
+        return check, spec[1]
+    if isinstance(spec, list):
+        return _compile_list(_compile(spec[0])[0]), list
+    check = _compile_object(spec)
+    return check, lambda: check({})
+
+
+def _compile_object(spec):
+    # Sorted, so validated documents are built in canonical key order.
+    fields = tuple((sys.intern(key),) + _compile(spec[key]) for key in sorted(spec))
+    known = frozenset(spec)
+    has_id = 'id' in spec
+
+    def check(value):
+        if not isinstance(value, dict):
+            raise SchemaError('expected an object')
+        out = {}
+        for key, check_field, default in fields:
+            if key in value:
+                try:
+                    out[key] = check_field(value[key])
+                except SchemaError as exc:
+                    exc.path.insert(0, key)
+                    raise
+            elif default is not OPTIONAL:
+                out[key] = default() if callable(default) else default
+        if not known.issuperset(value):
+            unknown = sorted(str(key) for key in value if key not in known)
+            raise SchemaError(f'unknown field {unknown[0]!r}')
+        return out
+
+    check.has_id = has_id
+    return check
+
+
+def _compile_list(check_item):
+    number = getattr(check_item, 'has_id', False)
+
+    def check(value):
+        if not isinstance(value, list):
+            raise SchemaError('expected an array')
+        if len(value) > MAX_ENTRIES:
+            raise SchemaError(f'more than {MAX_ENTRIES} entries')
+        out = []
+        for index, item in enumerate(value):
+            try:
+                out.append(check_item(item))
+            except SchemaError as exc:
+                exc.path.insert(0, index)
+                raise
+        if number:
+            # Entries without an id (hand-written batch records) are numbered
+            # after the largest id in the section.
+            missing = [item for item in out if item['id'] is None]
+            if missing:
+                start = max((item['id'] for item in out if isinstance(item['id'], int)), default=0)
+                for offset, item in enumerate(missing, 1):
+                    item['id'] = start + offset
+        return out
+
+    return check
+
+
+_check_document = _compile_object(SCHEMA)
+_check_entry = {section: _compile(SCHEMA[section][0])[0] for section in LIST_SECTIONS}
+
+
+def validate_text(value):
+    """One text field (a personal detail, a skill), normalized. Raises ``SchemaError``."""
+    return _text(value)
+
+
+def validate_entry(section, entry):
+    """One entry of a list section, normalized. Raises ``SchemaError``."""
+    check = _check_entry.get(section)
+    if check is None:
+        raise SchemaError(f'unknown section {section!r}')
+    return check(entry)
+
+
+def validate(doc):
+    """``doc`` checked and normalized, upgraded first if it is an older version.
+
+    Raises ``SchemaError``.
+    """
+    if not isinstance(doc, dict):
+        raise SchemaError('expected a JSON object')
+    version = doc.get('schemaVersion', 1)
+    if version != SCHEMA_VERSION:
+        doc = upgrade(doc, version)
+    return _check_document(doc)
+
+
+# --- Migrations ---
+
+MIGRATIONS = {}
+
+
+def migration(version):
+    """Register ``fn(doc) -> doc`` upgrading a document from ``version`` to the next."""
+    def register(fn):
+        MIGRATIONS[version] = fn
+        return fn
+    return register
+
+
+def upgrade(doc, version=None):
+    """Run the migrations ``doc`` is missing, oldest first."""
+    version = doc.get('schemaVersion', 1) if version is None else version
+    if not isinstance(version, int) or isinstance(version, bool) or version > SCHEMA_VERSION or version < 1:
+        raise SchemaError(f'unsupported schema version {version!r}', ['schemaVersion'])
+    while version < SCHEMA_VERSION:
+        doc = MIGRATIONS[version](doc)
+        version += 1
+        doc['schemaVersion'] = version
+    return doc
+
+
+@migration(1)
+def _number_entries(doc):
+    # Version 1 is the unversioned document the editor used to save: entries
+    # added in the browser had Date.now() ids, skills could be a comma string
+    # and sections could be missing. Ids become 1, 2, 3... per section.
+    doc = dict(doc)
+    for section in LIST_SECTIONS:
+        items = doc.get(section)
+        if isinstance(items, list):
+            doc[section] = [dict(item, id=index) if isinstance(item, dict) else item
+                            for index, item in enumerate(items, 1)]
+    if isinstance(doc.get('skills'), str):
+        doc['skills'] = [s.strip() for s in doc['skills'].split(',') if s.strip()]
+    return doc
+
+
+# --- Encoding ---
+
+# json.dumps builds a new encoder per call whenever it gets options.
+_encode = json.JSONEncoder(sort_keys=True, separators=(',', ':'), ensure_ascii=False).encode
+
+
+def dumps(doc):
+    """The canonical JSON text of a document: compact, keys sorted."""
+    return _encode(doc)
+
+
+def digest(doc, *context):
+    """SHA-256 of the canonical encoding, and of any ``context`` strings before it."""
+    payload = '\0'.join((*context, dumps(doc)))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+CODECS = {'json': lambda doc: dumps(doc)}
+if msgpack is not None:
+    CODECS['msgpack'] = lambda doc: msgpack.packb(doc)
+if cbor2 is not None:
+    CODECS['cbor'] = lambda doc: cbor2.dumps(doc, canonical=True)
+
+
+def pack(doc, codec='json'):
+    """``doc`` encoded for storage: JSON text, or MessagePack/CBOR bytes."""
+    try:
+        return CODECS[codec](doc)
+    except KeyError:
+        raise ValueError(f'codec not available: {codec!r}') from None
+
+
+def unpack(data):
+    """Decode anything ``pack`` produced; the first byte tells the codecs apart."""
+    if isinstance(data, str):
+        return json.loads(data)
+    first = data[:1]
+    if first == b'{':
+        return json.loads(data)
+    if msgpack is not None and (b'\x80' <= first <= b'\x8f' or first in (b'\xde', b'\xdf')):
+        return msgpack.unpackb(data)
+    if cbor2 is not None and (b'\xa0' <= first <= b'\xbb' or first == b'\xbf'):
+        return cbor2.loads(data)
+    raise ValueError('not an encoded resume document')
+
+
+def loads(data):
+    """Decode a stored document, upgrading it if it was written by an older version.
+
+    Documents already at the current version were validated when they were
+    written and are returned as decoded; older ones are ``repair``ed.
+    """
+    doc = unpack(data)
+    if isinstance(doc, dict) and doc.get('schemaVersion') == SCHEMA_VERSION:
+        return doc
+    return repair(doc)
+
+
+# --- Lenient upgrades ---
+
+def _trim(spec, value):
+    # ``value`` cut down to something shaped like ``spec``; None when it cannot be.
+    if isinstance(spec, tuple):
+        spec = spec[0]
+    if spec == TEXT:
+        if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+            return None
+        return str(value)[:MAX_TEXT]
+    if spec == ID:
+        try:
+            return _id(value)
+        except SchemaError:
+            return None  # numbered by the validator
+    if spec == VERSION:
+        return SCHEMA_VERSION
+    if isinstance(spec, list):
+        if not isinstance(value, list):
+            return None
+        items = (_trim(spec[0], item) for item in value)
+        return [item for item in items if item is not None][:MAX_ENTRIES]
+    if not isinstance(value, dict):
+        return None
+    out = {}
+    for key in spec:
+        if key in value:
+            item = _trim(spec[key], value[key])
+            if item is not None or spec[key] == ID:
+                out[key] = item
+    return out
+
+
+def repair(doc):
+    """A stored (or parsed) document of any earlier version as a valid current one.
+
+    Unlike ``validate`` nothing is rejected: unknown fields and values of the
+    wrong type are dropped, text and lists are cut to ``MAX_TEXT`` and
+    ``MAX_ENTRIES``, and an unknown version is read as version 1.
+    """
+    if not isinstance(doc, dict):
+        doc = {}
+    version = doc.get('schemaVersion', 1)
+    if not isinstance(version, int) or isinstance(version, bool) or not 1 <= version <= SCHEMA_VERSION:
+        version = 1
+    doc = upgrade(dict(doc, schemaVersion=version), version)
+    return _check_document(_trim(SCHEMA, doc))
@@ -0,0 +1,504 @@
+"""Search across stored resumes: full text, facet filters and counts, a GPA floor.
+
+The index is a SQLite database of its own, next to the resume store:
+
+* ``text``, an FTS5 table with one row per resume and a column per part of
+  it (name, summary, skills, education, experience, projects), so queries
+  use FTS5 syntax: ``flask AND sql``, ``"machine learning"``,
+  ``skills:react OR projects:react``, ``pyth*``;
+* ``facet_values`` and ``facets``: skills, degrees, schools, project
+  technologies and companies, as typed but grouped without regard to case,
+  and which resumes have each;
+* ``docs``: each resume's id, name, GPA (the highest number written in its
+  education entries) and ``seq``, which grows with every write.
+
+Saves are queued (``add``) and written in batches, one transaction per batch,
+by a background thread, like the resume store's write-behind queue; a search
+writes what is queued first, so a resume is found as soon as it is saved.
+Every process writes to the same file, so with several workers each sees the
+others' saves. ``rebuild`` indexes a whole store from scratch.
+
+SQLite finds and ranks the text matches. Everything else is answered from
+memory: filtering and counting facets of tens of thousands of matches takes
+SQLite about a second, so each process mirrors the index tables
+(``IndexMirror``), catching up on rows with a newer ``seq`` before every
+search. Values shared by many resumes are bitmaps (Python ints, one bit per
+resume), so a filter is an ``&`` and a count a ``bit_count``; rare values
+stay sets and are only counted when they could still make the top of their
+facet. Results are paged by walking the chosen order (most recently saved,
+GPA, name, or BM25 relevance from FTS5) and keeping the matches.
+"""
+import bisect
+import heapq
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from itertools import chain, islice
+
+FACETS = ('skill', 'degree', 'school', 'technology', 'company')
+SORTS = ('relevance', 'recent', 'gpa', 'name')
+MAX_PER_PAGE = 100
+MAX_VALUE = 100      # characters in a facet value
+BITMAP_AT = 512      # resumes sharing a value before its postings become a bitmap
+FEW_MATCHES = 4096   # up to this many matches, count their facets one by one
+RANK_LIMIT = 20_000  # text matches ranked by relevance; beyond, by most recent
+
+GPA = re.compile(r'\d+(?:\.\d+)?')
+TECHNOLOGY_SEPARATORS = re.compile(r'[,;/|]')
+
+
+def _value(text):
+    return ' '.join(str(text).split())[:MAX_VALUE]
+
+
+def facet_values(doc):
+    """``(field, key, value)`` for the facet values of ``doc``, each once per field."""
+    pairs = [('skill', skill) for skill in doc.get('skills', ())]
+    for edu in doc.get('education', ()):
+        pairs += [('degree', edu.get('degree', '')), ('school', edu.get('school', ''))]
+    for proj in doc.get('projects', ()):
+        pairs += [('technology', tech) for tech in TECHNOLOGY_SEPARATORS.split(proj.get('technologies', ''))]
+    pairs += [('company', exp.get('company', '')) for exp in doc.get('experience', ())]
+    seen, out = set(), []
+    for field, value in pairs:
+        value = _value(value)
+        key = (field, value.casefold())
+        if value and key not in seen:
+            seen.add(key)
+            out.append((field, key[1], value))
+    return out
+
+
+def gpa(doc):
+    """The highest GPA written in ``doc``'s education entries, or None."""
+    values = []
+    for edu in doc.get('education', ()):
+        match = GPA.search(str(edu.get('gpa', '')))
+        if match:
+            values.append(float(match.group()))
+    return max(values, default=None)
+
+
+def text_columns(doc):
+    """``doc``'s text, in the order of the ``text`` table's columns."""
+    def join(items, fields):
+        return '\n'.join(' '.join(str(item.get(f, '')) for f in fields) for item in items)
+
+    personal = doc.get('personal', {})
+    return (personal.get('fullName', ''),
+            ' '.join((personal.get('summary', ''), personal.get('location', ''))),
+            ', '.join(doc.get('skills', ())),
+            join(doc.get('education', ()), ('school', 'degree', 'details')),
+            join(doc.get('experience', ()), ('company', 'role', 'location', 'details')),
+            join(doc.get('projects', ()), ('name', 'technologies', 'details')))
+
+
+def _bitmap(rowids):
+    rowids = list(rowids)
+    bits = bytearray(max(rowids, default=0) // 8 + 1)
+    for rowid in rowids:
+        bits[rowid >> 3] |= 1 << (rowid & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def _rowids(bitmap):
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, 'little')
+    return [index * 8 + bit for index, byte in enumerate(data) if byte for bit in range(8) if byte >> bit & 1]
+
+
+def _members(bitmap):
+    """A membership test for the rowids in ``bitmap``."""
+    member = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, 'little')
+    size = len(member)
+    return lambda rowid: (rowid >> 3) < size and member[rowid >> 3] >> (rowid & 7) & 1
+
+
+class IndexMirror:
+    """The index tables held in memory: facet postings, and each resume's id,
+    name, GPA and facet values, in the orders results are sorted by."""
+
+    def __init__(self):
+        self.generation = None
+        self.seq = 0
+        self.labels = {}     # value id -> (field, value as typed)
+        self.value_ids = {}  # (field, key) -> value id
+        self.postings = {}   # value id -> set of rowids, or a bitmap once common
+        self.sizes = {}      # value id -> resumes with the value
+        self.docs = {}       # rowid -> (resume id, name, gpa, value ids)
+        self.recent = OrderedDict()  # rowids, least recently written first
+        self.by_gpa = []     # (-gpa, rowid), best first
+        self.by_name = []    # (name folded, rowid)
+        self._order = None   # field -> value ids, most common first
+        self._lock = threading.Lock()
+
+    def sync(self, conn):
+        """Catch up with the index tables (everything, after a rebuild)."""
+        with self._lock:
+            conn.execute('BEGIN')  # read one snapshot of the tables
+            try:
+                generation = conn.execute('PRAGMA user_version').fetchone()[0]
+                if generation != self.generation:
+                    self.__init__()
+                    self.generation = generation
+                changed = conn.execute('SELECT rowid, id, name, gpa, seq FROM docs WHERE seq > ? ORDER BY seq',
+                                       (self.seq,)).fetchall()
+                if not changed:
+                    return
+                for value_id, field, key, value in conn.execute(
+                        'SELECT id, field, key, value FROM facet_values WHERE id > ?',
+                        (max(self.labels, default=0),)):
+                    self.labels[value_id] = (field, value)
+                    self.value_ids[field, key] = value_id
+                if not self.docs:
+                    self._load(conn, changed)
+                else:
+                    values = {row[0]: [] for row in changed}
+                    rowids = list(values)
+                    for i in range(0, len(rowids), 500):
+                        part = rowids[i:i + 500]
+                        for rowid, value_id in conn.execute(
+                                f'SELECT doc, value FROM facets WHERE doc IN ({",".join("?" * len(part))})', part):
+                            values[rowid].append(value_id)
+                    for rowid, resume_id, name, score, _ in changed:
+                        self._replace(rowid, (resume_id, name, score, tuple(values[rowid])))
+                self.seq = changed[-1][4]
+                self._order = None
+            finally:
+                conn.execute('COMMIT')
+
+    def _load(self, conn, rows):
+        # A cold start. Grouped in SQLite, so Python handles a string per
+        # resume and per value rather than a row per (value, resume).
+        values = {doc: tuple(map(int, ids.split(','))) for doc, ids in
+                  conn.execute('SELECT doc, group_concat(value) FROM facets GROUP BY doc')}
+        for rowid, resume_id, name, score, _ in rows:
+            self.docs[rowid] = (resume_id, name, score, values.get(rowid, ()))
+            self.recent[rowid] = None
+        for value_id, docs in conn.execute('SELECT value, group_concat(doc) FROM facets GROUP BY value'):
+            rowids = list(map(int, docs.split(',')))
+            self.sizes[value_id] = len(rowids)
+            self.postings[value_id] = _bitmap(rowids) if len(rowids) >= BITMAP_AT else set(rowids)
+        self.by_gpa = sorted((-score, rowid) for rowid, (_, _, score, _) in self.docs.items() if score is not None)
+        self.by_name = sorted((name.casefold(), rowid) for rowid, (_, name, _, _) in self.docs.items())
+
+    def _replace(self, rowid, doc):
+        old = self.docs.get(rowid)
+        if old is not None:
+            for value_id in old[3]:
+                postings = self.postings[value_id]
+                if isinstance(postings, set):
+                    postings.discard(rowid)
+                else:
+                    self.postings[value_id] = postings & ~(1 << rowid)
+                self.sizes[value_id] -= 1
+            if old[2] is not None:
+                del self.by_gpa[bisect.bisect_left(self.by_gpa, (-old[2], rowid))]
+            del self.by_name[bisect.bisect_left(self.by_name, (old[1].casefold(), rowid))]
+        self.docs[rowid] = doc
+        self.recent[rowid] = None
+        self.recent.move_to_end(rowid)
+        for value_id in doc[3]:
+            postings = self.postings.setdefault(value_id, set())
+            if isinstance(postings, set):
+                postings.add(rowid)
+                if len(postings) >= BITMAP_AT:
+                    self.postings[value_id] = _bitmap(postings)
+            else:
+                self.postings[value_id] = postings | (1 << rowid)
+            self.sizes[value_id] = self.sizes.get(value_id, 0) + 1
+        if doc[2] is not None:
+            bisect.insort(self.by_gpa, (-doc[2], rowid))
+        bisect.insort(self.by_name, (doc[1].casefold(), rowid))
+
+    # --- Queries (call holding the lock) ---
+
+    def matching(self, filters, gpa_min, texts=None):
+        """Bitmap of the resumes with every facet value in ``filters``, a GPA of
+        at least ``gpa_min`` and among ``texts`` (rowids); None when nothing
+        narrows it."""
+        matches = None
+        for field, key in filters:
+            postings = self.postings.get(self.value_ids.get((field, key)), 0)
+            bitmap = _bitmap(postings) if isinstance(postings, set) else postings
+            matches = bitmap if matches is None else matches & bitmap
+        if texts is not None:
+            found = _bitmap(rowid for rowid in texts if rowid in self.docs)
+            matches = found if matches is None else matches & found
+        if gpa_min is not None:
+            end = bisect.bisect_right(self.by_gpa, (-gpa_min, float('inf')))
+            if matches is not None and matches.bit_count() < end:
+                # Fewer matches so far than good GPAs: check theirs.
+                docs = self.docs
+                matches = _bitmap(rowid for rowid in _rowids(matches)
+                                  if rowid in docs and docs[rowid][2] is not None and docs[rowid][2] >= gpa_min)
+            else:
+                bitmap = _bitmap(rowid for _, rowid in self.by_gpa[:end])
+                matches = bitmap if matches is None else matches & bitmap
+        return matches
+
+    def ordered(self, sort):
+        """Every rowid, in the order of ``sort``."""
+        if sort == 'recent':
+            return reversed(self.recent)
+        if sort == 'name':
+            return (rowid for _, rowid in self.by_name)
+        # By GPA, then the resumes without one.
+        return chain((rowid for _, rowid in self.by_gpa),
+                     (rowid for rowid in reversed(self.recent) if self.docs[rowid][2] is None))
+
+    def result(self, rowid):
+        resume_id, name, score, ids = self.docs[rowid]
+        out = {'id': resume_id, 'name': name, 'gpa': score}
+        for value_id in ids:
+            field, value = self.labels[value_id]
+            out.setdefault(field, []).append(value)
+        return out
+
+    def count(self, matches, total, limit):
+        """``{field: [(value, count)]}``: the ``limit`` most common values of each
+        facet among ``matches`` (a bitmap; None for every resume)."""
+        if self._order is None:
+            self._order = {field: [] for field in FACETS}
+            for value_id, size in self.sizes.items():
+                if size:
+                    self._order[self.labels[value_id][0]].append(value_id)
+            for ids in self._order.values():
+                ids.sort(key=lambda value_id: -self.sizes[value_id])
+        label = self.labels
+        if matches is None:
+            return {field: [(label[value_id][1], self.sizes[value_id]) for value_id in ids[:limit]]
+                    for field, ids in self._order.items()}
+        top = {field: [] for field in FACETS}
+        if total <= FEW_MATCHES:
+            counts = Counter(chain.from_iterable(self.docs[rowid][3] for rowid in _rowids(matches)
+                                                 if rowid in self.docs))
+            for value_id, n in counts.items():
+                top[label[value_id][0]].append((n, value_id))
+            return {field: [(label[value_id][1], n) for n, value_id in heapq.nlargest(limit, pairs)]
+                    for field, pairs in top.items()}
+        member = _members(matches)
+        for field, ids in self._order.items():
+            best = []  # min-heap of (count, value id)
+            for value_id in ids:
+                if len(best) == limit and self.sizes[value_id] <= best[0][0]:
+                    break  # no value from here on can have more matches
+                postings = self.postings[value_id]
+                n = sum(map(member, postings)) if isinstance(postings, set) else (postings & matches).bit_count()
+                if n:
+                    if len(best) < limit:
+                        heapq.heappush(best, (n, value_id))
+                    elif (n, value_id) > best[0]:
+                        heapq.heapreplace(best, (n, value_id))
+            top[field] = [(label[value_id][1], n) for n, value_id in sorted(best, reverse=True)]
+        return top
+
+
+class SearchIndex:
+    """The search index in the SQLite database at ``path`` (``:memory:`` for one
+    kept in this process)."""
+
+    def __init__(self, path, flush_interval=1.0, max_batch=500):
+        if path == ':memory:':
+            # A named in-memory database, so every thread's connection sees it.
+            self.path, self._uri = f'file:search-{uuid.uuid4().hex}?mode=memory&cache=shared', True
+        else:
+            self.path, self._uri = path, False
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.mirror = IndexMirror()
+        self._local = threading.local()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._closed = False
+        self._keep = self._connect()  # keeps an in-memory database alive
+        with self._keep as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS docs ('
+                         ' rowid INTEGER PRIMARY KEY, id TEXT UNIQUE NOT NULL,'
+                         ' name TEXT NOT NULL, gpa REAL, seq INTEGER NOT NULL)')
+            conn.execute('CREATE INDEX IF NOT EXISTS docs_seq ON docs (seq)')
+            conn.execute('CREATE INDEX IF NOT EXISTS docs_gpa ON docs (gpa)')
+            conn.execute('CREATE TABLE IF NOT EXISTS facet_values ('
+                         ' id INTEGER PRIMARY KEY, field TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,'
+                         ' UNIQUE (field, key))')
+            conn.execute('CREATE TABLE IF NOT EXISTS facets ('
+                         ' value INTEGER NOT NULL, doc INTEGER NOT NULL, PRIMARY KEY (value, doc)) WITHOUT ROWID')
+            conn.execute('CREATE INDEX IF NOT EXISTS facets_doc ON facets (doc)')
+            conn.execute('CREATE VIRTUAL TABLE IF NOT EXISTS text USING fts5('
+                         'name, summary, skills, education, experience, projects,'
+                         " tokenize = \"unicode61 tokenchars '+#'\")")  # c++, c#
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, uri=self._uri)
+            if not self._uri:
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    # --- Writing ---
+
+    def add(self, resume_id, doc):
+        """Queue ``doc`` to be (re)indexed as ``resume_id``."""
+        with self._lock:
+            self._pending[resume_id] = doc
+            backlog = len(self._pending)
+        self._ensure_flusher()
+        if backlog >= self.max_batch:
+            self._wakeup.set()
+
+    def flush(self):
+        """Write what is queued, in one transaction; returns how many resumes."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+            try:
+                self._write(batch.items())
+            except Exception:
+                with self._lock:
+                    for resume_id, doc in batch.items():
+                        self._pending.setdefault(resume_id, doc)
+                raise
+            return len(batch)
+
+    def _write(self, records):
+        rows = [(resume_id, doc.get('personal', {}).get('fullName', ''), gpa(doc),
+                 text_columns(doc), facet_values(doc)) for resume_id, doc in records]
+        conn = self._connect()
+        with conn:
+            # Writers take turns here, so seq grows in commit order across processes.
+            conn.execute('BEGIN IMMEDIATE')
+            seq = conn.execute('SELECT COALESCE(MAX(seq), 0) + 1 FROM docs').fetchone()[0]
+            for resume_id, name, score, columns, facets in rows:
+                row = conn.execute('SELECT rowid FROM docs WHERE id = ?', (resume_id,)).fetchone()
+                if row is None:
+                    rowid = conn.execute('INSERT INTO docs (id, name, gpa, seq) VALUES (?, ?, ?, ?)',
+                                         (resume_id, name, score, seq)).lastrowid
+                else:
+                    rowid = row[0]
+                    conn.execute('UPDATE docs SET name = ?, gpa = ?, seq = ? WHERE rowid = ?',
+                                 (name, score, seq, rowid))
+                    conn.execute('DELETE FROM text WHERE rowid = ?', (rowid,))
+                    conn.execute('DELETE FROM facets WHERE doc = ?', (rowid,))
+                conn.execute('INSERT INTO text (rowid, name, summary, skills, education, experience, projects)'
+                             ' VALUES (?, ?, ?, ?, ?, ?, ?)', (rowid, *columns))
+                conn.executemany('INSERT OR IGNORE INTO facet_values (field, key, value) VALUES (?, ?, ?)', facets)
+                conn.executemany(
+                    'INSERT OR IGNORE INTO facets (value, doc)'
+                    ' SELECT id, ? FROM facet_values WHERE field = ? AND key = ?',
+                    [(rowid, field, key) for field, key, _ in facets])
+                seq += 1
+
+    def rebuild(self, records, batch_size=1000):
+        """Index every ``(resume_id, doc)`` in ``records`` from scratch; returns the count."""
+        conn = self._connect()
+        with self._flush_lock:
+            with conn:
+                for table in ('docs', 'facets', 'facet_values', 'text'):
+                    conn.execute(f'DELETE FROM {table}')
+                # Tells every process's IndexMirror to start over.
+                generation = conn.execute('PRAGMA user_version').fetchone()[0] + 1
+                conn.execute(f'PRAGMA user_version = {generation}')
+            count, batch = 0, []
+            for record in records:
+                batch.append(record)
+                if len(batch) >= batch_size:
+                    self._write(batch)
+                    count, batch = count + len(batch), []
+            self._write(batch)
+            with conn:
+                conn.execute("INSERT INTO text (text) VALUES ('optimize')")
+        return count + len(batch)
+
+    def _ensure_flusher(self):
+        # Started lazily so forking servers do not inherit a running thread.
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, name='search-indexer', daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                time.sleep(self.flush_interval)
+
+    # --- Searching ---
+
+    def search(self, query='', filters=(), gpa_min=None, sort=None, page=1, per_page=20, facet_limit=10):
+        """One page of the resumes matching everything given, and facet counts.
+
+        ``query`` is an FTS5 query over the text; ``filters`` are ``(field,
+        value)`` facet pairs, all required. Raises ``ValueError`` for a bad
+        query, filter or sort.
+        """
+        for field, _ in filters:
+            if field not in FACETS:
+                raise ValueError(f'unknown facet {field!r}')
+        sort = sort or ('relevance' if query else 'recent')
+        if sort not in SORTS:
+            raise ValueError(f'unknown sort {sort!r}')
+        if sort == 'relevance' and not query:
+            raise ValueError('sorting by relevance needs a query')
+        page, per_page = max(1, page), min(max(1, per_page), MAX_PER_PAGE)
+        offset = (page - 1) * per_page
+        self.flush()
+        conn = self._connect()
+        mirror = self.mirror
+        mirror.sync(conn)
+
+        texts = None
+        if query:
+            try:
+                texts = [rowid for rowid, in conn.execute('SELECT rowid FROM text WHERE text MATCH ?', (query,))]
+                if sort == 'relevance':
+                    # BM25 scores every match; for a term in most resumes that
+                    # costs more than the ranking tells, so those are by date.
+                    if len(texts) <= RANK_LIMIT:
+                        texts = [rowid for rowid, in conn.execute(
+                            'SELECT rowid FROM text WHERE text MATCH ? ORDER BY rank', (query,))]
+                    else:
+                        sort = 'recent'
+            except sqlite3.OperationalError as exc:
+                # FTS5 reports query syntax errors as OperationalError.
+                raise ValueError(f'bad query: {exc}') from None
+        with mirror._lock:
+            matches = mirror.matching([(field, _value(value).casefold()) for field, value in filters], gpa_min, texts)
+            total = len(mirror.docs) if matches is None else matches.bit_count()
+            if sort == 'relevance':
+                # Text rows written since the mirror synced are not in it yet;
+                # leave them out before paging so pages stay full.
+                ranked, narrowed = filter(mirror.docs.__contains__, texts), bool(filters) or gpa_min is not None
+            else:
+                ranked, narrowed = mirror.ordered(sort), matches is not None
+            if narrowed:
+                ranked = filter(_members(matches), ranked)
+            results = [mirror.result(rowid) for rowid in islice(ranked, offset, offset + per_page)]
+            counts = mirror.count(matches, total, facet_limit)
+        facets = {field: [{'value': value, 'count': n} for value, n in top] for field, top in counts.items()}
+        return {'total': total, 'page': page, 'per_page': per_page, 'sort': sort,
+                'results': results, 'facets': facets}
+
+    def stats(self):
+        with self._lock:
+            pending = len(self._pending)
+        indexed = self._connect().execute('SELECT COUNT(*) FROM docs').fetchone()[0]
+        return {'indexed': indexed, 'pending': pending}
+
+    def close(self):
+        self._closed = True
+        self._wakeup.set()
+        self.flush()
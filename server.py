@@ -0,0 +1,67 @@
+"""Production serving: prefork gunicorn workers configured from the environment.
+
+    python app.py                          # production server (this module)
+    python app.py dev                      # Flask's reloading debug server
+    gunicorn -c gunicorn.conf.py app:app   # the same settings via gunicorn's CLI
+
+Settings (environment variables):
+
+    HOST, PORT                 bind address (127.0.0.1:5000)
+    WEB_CONCURRENCY            worker processes (CPU count, at most 4)
+    WEB_THREADS                threads per worker (8)
+    WEB_TIMEOUT                seconds before a stuck worker is killed (30)
+    WEB_GRACEFUL_TIMEOUT       seconds a stopping worker gets to finish (30)
+    WEB_KEEPALIVE              idle keep-alive seconds (5)
+    WEB_MAX_REQUESTS           recycle a worker after this many requests (10000, 0 = never)
+    WEB_ACCESS_LOG             access log file, - for stdout (off)
+
+Each worker is a separate process with its own PDF pool, so the app divides
+``PDF_WORKERS`` and ``BATCH_WORKERS`` between them by default.
+"""
+import os
+import sys
+
+try:
+    import gunicorn
+except ImportError:  # gunicorn is POSIX-only; Windows falls back to Werkzeug
+    gunicorn = None
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def settings(environ=os.environ):
+    """Gunicorn settings, as accepted by a gunicorn config file."""
+    max_requests = int(environ.get('WEB_MAX_REQUESTS', 10000))
+    return {
+        'bind': f"{environ.get('HOST', '127.0.0.1')}:{environ.get('PORT', '5000')}",
+        'workers': int(environ.get('WEB_CONCURRENCY', min(4, os.cpu_count() or 1))),
+        'worker_class': 'gthread',
+        'threads': int(environ.get('WEB_THREADS', 8)),
+        'timeout': int(environ.get('WEB_TIMEOUT', 30)),
+        'graceful_timeout': int(environ.get('WEB_GRACEFUL_TIMEOUT', 30)),
+        'keepalive': int(environ.get('WEB_KEEPALIVE', 5)),
+        # Recycle workers now and then to cap slow leaks; the jitter keeps
+        # them from all restarting at once.
+        'max_requests': max_requests,
+        'max_requests_jitter': max_requests // 10,
+        'accesslog': environ.get('WEB_ACCESS_LOG') or None,
+        # Heartbeat files on tmpfs, so a slow disk cannot get workers killed.
+        'worker_tmp_dir': '/dev/shm' if os.path.isdir('/dev/shm') else None,
+    }
+
+
+def serve(app, argv=()):
+    """Run the production server; extra ``argv`` is passed on to gunicorn."""
+    if gunicorn is None:
+        from werkzeug.serving import run_simple
+
+        options = settings()
+        host, port = options['bind'].rsplit(':', 1)
+        print('gunicorn is not installed; serving with the threaded Werkzeug server', file=sys.stderr)
+        run_simple(host, int(port), app, threaded=True)
+        return
+    # Start gunicorn afresh rather than forking this process: the workers then
+    # import the app themselves and share nothing opened here.
+    args = [sys.executable, '-m', 'gunicorn', '--chdir', HERE,
+            '--config', os.path.join(HERE, 'gunicorn.conf.py'), *argv, 'app:app']
+    os.execv(sys.executable, args)
@@ -0,0 +1,287 @@
+"""Resume persistence: pluggable stores and a write-behind queue in front of them.
+
+A store needs ``get(resume_id)``, ``put_many(records)``, an atomic
+``update(resume_id, change, expected_version)`` and ``scan()``, which yields
+every ``(resume_id, doc)`` (to build the search index). Stores are picked by URL,
+e.g. ``sqlite:///instance/resumes.db`` or ``memory://``; ``?codec=msgpack``
+(or ``cbor``) stores documents in that encoding instead of canonical JSON
+(see schema.py). Documents from older schema versions are upgraded as they
+are read.
+
+The write-behind queue keeps pending writes in process memory, so it is only
+correct when one process serves all writes. Multi-process servers use the
+store's ``update`` directly, which is atomic across processes for SQLite.
+"""
+import copy
+import logging
+import sqlite3
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import schema
+
+log = logging.getLogger(__name__)
+
+
+def _decoded(records):
+    # (resume_id, doc) for each stored (resume_id, data); rows that cannot be
+    # decoded at all are logged and skipped so one bad row cannot stop a scan.
+    for resume_id, data in records:
+        try:
+            yield resume_id, schema.loads(data)
+        except ValueError as exc:
+            log.warning('skipping unreadable resume %r: %s', resume_id, exc)
+
+
+class MemoryStore:
+    """Keeps documents in a dict. Handy for development and benchmarks."""
+
+    def __init__(self, codec='json'):
+        self.codec = codec
+        self._docs = {}
+        self._lock = threading.Lock()
+
+    def get(self, resume_id):
+        with self._lock:
+            record = self._docs.get(resume_id)
+        if record is None:
+            return None
+        doc, version = record
+        return schema.loads(doc), version
+
+    def put_many(self, records):
+        with self._lock:
+            for resume_id, doc, version in records:
+                self._docs[resume_id] = (schema.pack(doc, self.codec), version)
+
+    def scan(self):
+        with self._lock:
+            records = list(self._docs.items())
+        yield from _decoded((resume_id, doc) for resume_id, (doc, _) in records)
+
+    def update(self, resume_id, change, expected_version=None):
+        with self._lock:
+            record = self._docs.get(resume_id)
+            doc, version = (schema.loads(record[0]), record[1]) if record else (None, 0)
+            if expected_version is not None and expected_version != version:
+                raise VersionConflict(version)
+            doc = change(doc)
+            self._docs[resume_id] = (schema.pack(doc, self.codec), version + 1)
+        return doc, version + 1
+
+    def close(self):
+        pass
+
+
+class SQLiteStore:
+    """Stores each resume as one JSON row in a WAL-mode SQLite database.
+
+    Every thread gets its own connection; WAL lets readers proceed while the
+    write-behind flusher commits a batch.
+    """
+
+    def __init__(self, path, codec='json'):
+        self.path = path
+        self.codec = codec
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS resumes ('
+                ' id TEXT PRIMARY KEY,'
+                ' doc TEXT NOT NULL,'
+                ' version INTEGER NOT NULL,'
+                ' updated_at REAL NOT NULL)'
+            )
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            # With WAL, NORMAL only syncs at checkpoints and is still crash-safe.
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, resume_id):
+        row = self._connect().execute(
+            'SELECT doc, version FROM resumes WHERE id = ?', (resume_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return schema.loads(row[0]), row[1]
+
+    def put_many(self, records):
+        now = time.time()
+        rows = [(resume_id, schema.pack(doc, self.codec), version, now)
+                for resume_id, doc, version in records]
+        with self._connect() as conn:
+            conn.executemany(
+                'INSERT INTO resumes (id, doc, version, updated_at) VALUES (?, ?, ?, ?)'
+                ' ON CONFLICT(id) DO UPDATE SET'
+                ' doc = excluded.doc, version = excluded.version, updated_at = excluded.updated_at',
+                rows,
+            )
+
+    def scan(self):
+        # A connection of its own, so the cursor survives other calls on this thread.
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            yield from _decoded(conn.execute('SELECT id, doc FROM resumes ORDER BY id'))
+        finally:
+            conn.close()
+
+    def update(self, resume_id, change, expected_version=None):
+        conn = self._connect()
+        with conn:
+            # Take the write lock before reading so concurrent processes
+            # serialise on the version check.
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute('SELECT doc, version FROM resumes WHERE id = ?', (resume_id,)).fetchone()
+            doc, version = (schema.loads(row[0]), row[1]) if row else (None, 0)
+            if expected_version is not None and expected_version != version:
+                raise VersionConflict(version)
+            doc = change(doc)
+            conn.execute(
+                'INSERT INTO resumes (id, doc, version, updated_at) VALUES (?, ?, ?, ?)'
+                ' ON CONFLICT(id) DO UPDATE SET'
+                ' doc = excluded.doc, version = excluded.version, updated_at = excluded.updated_at',
+                (resume_id, schema.pack(doc, self.codec), version + 1, time.time()),
+            )
+        return doc, version + 1
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+STORE_BACKENDS = {
+    'memory': lambda parts, codec: MemoryStore(codec),
+    'sqlite': lambda parts, codec: SQLiteStore(parts.path[1:] if parts.path.startswith('/') else parts.path, codec),
+}
+
+
+def open_store(url):
+    parts = urlsplit(url)
+    try:
+        factory = STORE_BACKENDS[parts.scheme]
+    except KeyError:
+        raise ValueError(f'unknown resume store: {url!r}') from None
+    codec = parse_qs(parts.query).get('codec', ['json'])[-1]
+    if codec not in schema.CODECS:
+        raise ValueError(f'resume codec not available: {codec!r}')
+    return factory(parts, codec)
+
+
+class VersionConflict(Exception):
+    def __init__(self, current):
+        super().__init__(f'resume is at version {current}')
+        self.current = current
+
+
+class WriteBehindQueue:
+    """Coalesces writes per resume and flushes them to ``store`` in batches.
+
+    Reads see pending writes immediately. Any number of updates to the same
+    resume between two flushes cost a single row write, and each flush is one
+    transaction however many resumes it covers.
+    """
+
+    def __init__(self, store, flush_interval=0.5, max_batch=500):
+        self.store = store
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._closed = False
+        self.coalesced = 0
+        self.flushed = 0
+        self.batches = 0
+
+    def get(self, resume_id):
+        with self._lock:
+            record = self._pending.get(resume_id)
+        if record is not None:
+            # A copy, as a store would decode: callers may change what they read.
+            return copy.deepcopy(record[0]), record[1]
+        return self.store.get(resume_id)
+
+    def update(self, resume_id, change, expected_version=None):
+        """Apply ``change(doc_or_None) -> doc`` atomically and queue the result.
+
+        Returns the new ``(doc, version)``. Raises ``VersionConflict`` if
+        ``expected_version`` is given and does not match.
+        """
+        with self._lock:
+            current = self._pending.get(resume_id)
+            if current is None:
+                current = self.store.get(resume_id)
+            doc, version = current if current is not None else (None, 0)
+            if expected_version is not None and expected_version != version:
+                raise VersionConflict(version)
+            record = (change(doc), version + 1)
+            if resume_id in self._pending:
+                self.coalesced += 1
+            self._pending[resume_id] = record
+            backlog = len(self._pending)
+        self._ensure_flusher()
+        if backlog >= self.max_batch:
+            self._wakeup.set()
+        return record
+
+    def scan(self):
+        self.flush()
+        return self.store.scan()
+
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+            try:
+                self.store.put_many((rid, doc, version) for rid, (doc, version) in batch.items())
+            except Exception:
+                # Put the batch back unless a newer write superseded an entry.
+                with self._lock:
+                    for rid, record in batch.items():
+                        self._pending.setdefault(rid, record)
+                raise
+            self.flushed += len(batch)
+            self.batches += 1
+            return len(batch)
+
+    def _ensure_flusher(self):
+        # Started lazily so forking servers do not inherit a running thread.
+        if self._thread is None or not self._thread.is_alive():
+            with self._flush_lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, name='resume-flusher', daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                time.sleep(self.flush_interval)
+
+    def stats(self):
+        with self._lock:
+            pending = len(self._pending)
+        return {'pending': pending, 'coalesced': self.coalesced,
+                'flushed': self.flushed, 'batches': self.batches}
+
+    def close(self):
+        self._closed = True
+        self._wakeup.set()
+        self.flush()
+        self.store.close()
@@ -0,0 +1,56 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The app reads its settings at import: keep tests off instance/.
+_scratch = tempfile.mkdtemp(prefix='resume-tests-')
+os.environ.setdefault('RESUME_STORE', 'memory://')
+for _name in ('RENDER_CACHE_DIR', 'IMPORT_CACHE_DIR', 'PROFILE_DIR', 'LAYOUT_CACHE_DIR'):
+    os.environ.setdefault(_name, os.path.join(_scratch, _name.lower()))
+
+# Just enough of the browser and Alpine for the editor's script to define its
+# component; ``components.resumeApp()`` then builds one.
+EDITOR_STUBS = '''
+globalThis.window = globalThis;
+globalThis.navigator = {};
+globalThis.addEventListener = () => {};
+const listeners = {};
+globalThis.document = { addEventListener: (name, fn) => { listeners[name] = fn; } };
+const components = {};
+globalThis.Alpine = { data: (name, factory) => { components[name] = factory; }, raw: value => value,
+                      nextTick: fn => { if (fn) fn(); return Promise.resolve(); } };
+const frames = [];
+globalThis.requestAnimationFrame = fn => frames.push(fn);
+globalThis.setInterval = () => 0;  // the metrics beacon would keep Node running
+'''
+
+
+@pytest.fixture(scope='session')
+def editor_script():
+    import app as app_module
+
+    page = app_module.app.test_client().get('/', headers={'Accept-Encoding': 'identity'}).get_data(as_text=True)
+    start = page.index('<script>', page.index('<!-- Application Logic -->')) + len('<script>')
+    return page[start:page.index('</script>', start)]
+
+
+@pytest.fixture
+def run_editor(editor_script):
+    """Run ``js`` after the editor's script in Node; returns what it prints, as JSON."""
+    if shutil.which('node') is None:
+        pytest.skip('needs Node.js')
+
+    def run(js):
+        source = EDITOR_STUBS + editor_script + "\nlisteners['alpine:init']();\n" + js
+        result = subprocess.run(['node', '-e', source], capture_output=True, text=True, timeout=30)
+        assert result.returncode == 0, result.stderr
+        return json.loads(result.stdout)
+
+    return run
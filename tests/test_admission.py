@@ -0,0 +1,144 @@
+import threading
+import time
+
+import pytest
+
+import admission
+from admission import RateLimiter, SingleFlight
+from workers import JobTimeout, Overloaded, WorkerPool
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_rate_limiter_bursts_then_refills(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(admission.time, 'monotonic', clock)
+    limiter = RateLimiter(rate=2, burst=3)
+    assert [limiter.take('a') for _ in range(3)] == [0, 0, 0]
+    assert limiter.take('a') == pytest.approx(0.5)
+    assert limiter.take('b') == 0  # buckets are per client
+    clock.now += 0.5
+    assert limiter.take('a') == 0
+    clock.now += 60
+    assert [limiter.take('a') for _ in range(4)][-1] > 0  # refills only up to the burst
+    assert limiter.stats() == {'clients': 2, 'allowed': 8, 'limited': 2}
+
+
+def test_rate_limiter_forgets_the_least_recent_client():
+    limiter = RateLimiter(rate=1, burst=1, max_clients=2)
+    for client in ('a', 'b', 'a', 'c'):
+        limiter.take(client)
+    assert list(limiter._buckets) == ['a', 'c']
+
+
+def test_single_flight_shares_one_call():
+    flights = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def render():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return b'pdf'
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flights.run('k', render)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(flights.run('k', render))) for _ in range(3)]
+    for thread in followers:
+        thread.start()
+    while flights.stats()['shared'] < 3:
+        time.sleep(0.001)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+    assert results == [b'pdf'] * 4 and calls == [1]
+    assert flights.stats() == {'in_flight': 0, 'calls': 1, 'shared': 3}
+    assert flights.run('k', lambda: b'again') == b'again'  # later calls run again
+
+
+def test_single_flight_shares_the_exception():
+    flights = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def fail():
+        started.set()
+        release.wait(5)
+        raise KeyError('boom')
+
+    errors = []
+
+    def call():
+        try:
+            flights.run('k', fail)
+        except KeyError as exc:
+            errors.append(exc)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=call)
+    follower.start()
+    while flights.stats()['shared'] < 1:
+        time.sleep(0.001)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+    assert len(errors) == 2 and errors[0] is errors[1]
+
+
+def settle(pool):
+    # A future's result is out before its done callback has counted it.
+    while pool.stats()['in_flight']:
+        time.sleep(0.001)
+
+
+@pytest.fixture
+def pool():
+    pool = WorkerPool(workers=1, max_queue=1, timeout=5, max_wait=0.5)
+    yield pool
+    pool.shutdown()
+
+
+def test_pool_sheds_when_the_queue_is_full(pool):
+    futures = [pool.submit(time.sleep, 0.3) for _ in range(2)]
+    with pytest.raises(Overloaded):
+        pool.submit(time.sleep, 0)
+    for future in futures:
+        future.result()
+    settle(pool)
+    assert pool.run(sum, (1, 2)) == 3
+    settle(pool)
+    stats = pool.stats()
+    assert (stats['rejected'], stats['completed'], stats['in_flight']) == (1, 3, 0)
+
+
+def test_pool_sheds_when_jobs_wait_longer_than_max_wait(pool):
+    pool.run(sum, ())
+    settle(pool)
+    pool.latency = 2.5  # recent jobs took this long from submit to done
+    busy = pool.submit(time.sleep, 0.3)
+    with pytest.raises(Overloaded) as exc:
+        pool.submit(sum, ())
+    assert exc.value.retry_after == 3
+    busy.result()
+    settle(pool)
+    pool.submit(sum, ()).result()  # an idle worker takes it however slow the last jobs were
+
+
+def test_pool_times_out_a_runaway_job():
+    pool = WorkerPool(workers=1, max_queue=0, timeout=0.2)
+    try:
+        with pytest.raises(JobTimeout):
+            pool.run(time.sleep, 5)
+        assert pool.stats()['timed_out'] == 1
+    finally:
+        pool.shutdown()
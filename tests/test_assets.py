@@ -0,0 +1,115 @@
+import os
+
+import pytest
+
+import assets
+
+
+@pytest.mark.parametrize('name, css', [
+    ('p-4', 'padding:1rem'),
+    ('mx-auto', 'margin-left:auto;margin-right:auto'),
+    ('w-1/2', 'width:50%'),
+    ('text-sm', 'font-size:.875rem;line-height:1.25rem'),
+    ('text-blue-600', 'color:#2563eb'),
+    ('bg-white', 'background-color:#fff'),
+    ('border', 'border-width:1px'),
+    ('border-b-2', 'border-bottom-width:2px'),
+    ('border-gray-200', 'border-color:#e5e7eb'),
+    ('grid-cols-3', 'grid-template-columns:repeat(3,minmax(0,1fr))'),
+    ('text-purple-600', None),
+    ('p-x', None),
+    ('resume-card', None),
+])
+def test_utility(name, css):
+    assert assets.utility(name) == css
+
+
+def test_variants_breakpoints_and_purging():
+    css = assets.tailwind_css({'p-4', 'md:w-1/2', 'hover:bg-blue-700', 'space-y-4', 'dark:p-4', 'resume-card'})
+    assert css.startswith(assets.PREFLIGHT)
+    assert '.p-4{padding:1rem}' in css
+    assert '.hover\\:bg-blue-700:hover{background-color:#1d4ed8}' in css
+    assert '.space-y-4 > :not([hidden]) ~ :not([hidden]){margin-top:1rem}' in css
+    assert css.endswith('@media (min-width:768px){.md\\:w-1\\/2{width:50%}}')
+    assert 'dark' not in css and 'resume-card' not in css
+
+
+def test_scan_classes_reads_attributes_and_script_strings():
+    html = '<div class="p-4  text-sm"></div><script>x = cond ? \'bg-white shadow-sm\' : "ignored";</script>'
+    assert assets.scan_classes(html) == {'p-4', 'text-sm', 'bg-white', 'shadow-sm'}
+
+
+def test_minify_css():
+    assert assets.minify_css('/* c */ a > b {\n  color : red ;\n}\n') == 'a>b{color:red}'
+
+
+def test_build_offline_keeps_the_cdn_for_what_it_cannot_fetch(tmp_path, monkeypatch):
+    def offline(url):
+        raise OSError('offline')
+
+    monkeypatch.setattr(assets, '_download', offline)
+    logged = []
+    manifest = assets.build('<p class="p-4 fa-solid fa-user"></p>', str(tmp_path), log=logged.append)
+    assert list(manifest) == ['app.css'] and assets.load_manifest(str(tmp_path)) == manifest
+    path = tmp_path / 'dist' / manifest['app.css']
+    assert b'.p-4{padding:1rem}' in path.read_bytes()
+    assert os.path.exists(f'{path}.gz')
+    assert any('icons.css: not built' in line for line in logged)
+
+
+def test_bundles_are_served_immutable(tmp_path, monkeypatch):
+    import app as app_module
+
+    monkeypatch.setattr(assets, '_download', lambda url: b'/* vendored */')
+    manifest = assets.build('<p class="p-4"></p>', str(tmp_path), log=lambda line: None)
+    monkeypatch.setattr(assets, 'load_manifest', lambda static_dir: manifest)
+    monkeypatch.setattr(app_module, 'DIST_DIR', str(tmp_path / 'dist'))
+    urls, files = app_module.load_bundles('bundled')
+    monkeypatch.setattr(app_module, 'BUNDLES', files)
+    client = app_module.app.test_client()
+    response = client.get(urls['app.css'], headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200 and response.headers['Content-Encoding'] == 'gzip'
+    assert response.headers['Cache-Control'] == 'public, max-age=31536000, immutable'
+    assert set(manifest) >= {'app.css', 'icons.css'}
+    assert client.get('/static/dist/app.000000000000.css').status_code == 404
+
+
+def page_css():
+    import app as app_module
+
+    html = app_module.render_home_page('cdn', streamed=False).variants['identity'][0].decode('utf-8')
+    return assets.tailwind_css(assets.scan_classes(html))
+
+
+def test_live_button_states_are_styled():
+    css = page_css()
+    for name in ('bg-green-50', 'border-green-400', 'text-green-700'):
+        assert f'.{name}{{' in css
+
+
+def test_import_label_keeps_its_pointer():
+    assert '.cursor-pointer{cursor:pointer}' in page_css()
+
+
+def test_class_names_skip_compared_values_and_unknown_classes_are_reported(tmp_path):
+    html = ('<style>.resume-page{width:210mm}</style>'
+            '<div class="resume-page p-4 text-md"><i class="fa-solid fa-user"></i>'
+            '<b :class="tab === \'modern\' ? \'bg-white\' : \'bg-teal-500\'"></b>'
+            "<h3 class='font-bold'></h3></div>")
+    assert assets.class_names(html) == {'resume-page', 'p-4', 'text-md', 'fa-solid', 'fa-user',
+                                        'bg-white', 'bg-teal-500', 'font-bold'}
+    assert assets.unknown_classes(html) == {'text-md', 'bg-teal-500'}
+    with pytest.raises(ValueError, match='bg-teal-500, text-md'):
+        assets.build(html, str(tmp_path), log=lambda line: None)
+    assert not os.path.exists(tmp_path / 'dist')
+
+
+def test_every_class_in_the_page_and_layouts_is_emitted():
+    import app as app_module
+
+    html = app_module.render_home_page('cdn', streamed=False).variants['identity'][0].decode('utf-8')
+    assert assets.unknown_classes(html) == set()
+    layout_dir = app_module.app.config['LAYOUT_DIR']
+    for name in sorted(os.listdir(layout_dir)):
+        with open(os.path.join(layout_dir, name)) as f:
+            assert assets.unknown_classes(f.read()) == set(), name
@@ -0,0 +1,147 @@
+import csv
+import io
+import json
+import zipfile
+from concurrent.futures import Future
+
+import pytest
+
+import batch
+import schema
+
+
+class InlinePool:
+    """Runs each chunk straight away, in this process."""
+
+    workers = 1
+
+    def __init__(self, fail=False):
+        self.fail = fail
+
+    def submit(self, fn, *args):
+        future = Future()
+        if self.fail:
+            future.set_exception(TimeoutError('job deadline'))
+        else:
+            future.set_result(fn(*args))
+        return future
+
+
+def jsonl(*records):
+    return io.BytesIO(''.join((r if isinstance(r, str) else json.dumps(r)) + '\n' for r in records).encode())
+
+
+def archive(chunks):
+    return zipfile.ZipFile(io.BytesIO(b''.join(chunks)))
+
+
+def test_csv_records():
+    data = ('fullName,email,skills,education,experience,projects,template\r\n'
+            'Alex Chen,alex@univ.edu,Python; SQL ;,"[{""school"": ""Tech""}]",,[],minimal\r\n'
+            'Bad Row,,,not json,,,\r\n').encode()
+    (record, error), (bad, message) = batch.iter_records(io.BytesIO(data), 'csv')
+    assert error is None and record['personal']['fullName'] == 'Alex Chen'
+    assert record['skills'] == ['Python', 'SQL'] and record['education'][0]['school'] == 'Tech'
+    assert record['template'] == 'minimal'
+    assert bad is None and message == 'education is not a JSON array'
+
+
+def test_jsonl_records():
+    pairs = list(batch.iter_records(jsonl({'personal': {}, 'id': 'a'}, '', '{oops', '[1]', {'theme': 'dark'}),
+                                    'jsonl'))
+    record, error = pairs[0]
+    assert error is None and record['id'] == 'a'
+    assert record['schemaVersion'] == schema.SCHEMA_VERSION and record['personal']['fullName'] == ''
+    errors = [error for _, error in pairs[1:]]
+    assert [error.split(':')[0] for error in errors[:2]] == ['invalid JSON', 'expected a JSON object']
+    assert errors[2] == "unknown field 'theme'"
+
+
+def test_batch_zip_holds_a_pdf_per_good_record_and_an_error_report():
+    progress = batch.BatchProgress()
+    records = batch.iter_records(jsonl(
+        {'id': 'alex', 'personal': {'fullName': 'Alex'}},
+        {'personal': {'fullName': 'Sam Lee'}, 'template': 'creative'},
+        {'personal': {}, 'template': 'fancy'},
+        'nope',
+    ), 'jsonl')
+    chunks = list(batch.render_batch(records, InlinePool(), chunk_size=1, progress=progress))
+    assert len(chunks) > 2  # streamed entry by entry
+    files = archive(chunks)
+    assert files.namelist() == ['000001-alex.pdf', '000002-Sam-Lee.pdf', 'errors.csv']
+    assert files.read('000001-alex.pdf').startswith(b'%PDF')
+    report = list(csv.reader(io.StringIO(files.read('errors.csv').decode())))
+    assert report[0] == ['record', 'error']
+    assert [row[0] for row in report[1:]] == ['3', '4'] and report[1][1] == 'unknown template: fancy'
+    stats = progress.as_dict()
+    assert (stats['rendered'], stats['failed'], stats['done']) == (2, 2, True)
+
+
+def test_failed_chunks_are_reported_not_fatal():
+    records = batch.iter_records(jsonl({'personal': {}}, {'personal': {}}), 'jsonl')
+    files = archive(batch.render_batch(records, InlinePool(fail=True)))
+    assert files.namelist() == ['errors.csv']
+    assert 'job deadline' in files.read('errors.csv').decode()
+
+
+@pytest.fixture
+def app_module():
+    import app as app_module
+
+    return app_module
+
+
+def test_batch_route_streams_a_zip(app_module):
+    client = app_module.app.test_client()
+    response = client.post('/api/batch?template=minimal', data=jsonl({'personal': {'fullName': 'Alex'}}).read())
+    assert response.status_code == 200 and response.mimetype == 'application/zip'
+    assert archive([response.data]).namelist() == ['000001-Alex.pdf']
+    status = client.get(f'/api/batch/{response.headers["X-Batch-Id"]}').get_json()
+    assert (status['rendered'], status['done']) == (1, True)
+    assert client.post('/api/batch?format=xml', data=b'').status_code == 400
+    assert client.post('/api/batch?template=fancy', data=b'').status_code == 400
+    assert client.get('/api/batch/unknown').status_code == 404
+
+
+def test_batch_slot_is_released_when_the_body_is_never_read(app_module):
+    body = json.dumps({'personal': {'fullName': 'Left Early'}}) + '\n'
+    for _ in range(app_module.app.config['BATCH_CONCURRENCY'] + 2):
+        with app_module.app.test_request_context('/api/batch?format=jsonl', method='POST', data=body):
+            response = app_module.app.make_response(app_module.create_batch())
+            assert response.status_code == 200
+            response.close()  # the client went away before the ZIP was started
+
+
+class BusyPool(InlinePool):
+    """Turns away the jobs ``busy(call)`` picks, counting calls from 0."""
+
+    def __init__(self, busy):
+        super().__init__()
+        self.busy = busy
+        self.calls = self.rejected = 0
+
+    def submit(self, fn, *args):
+        self.calls += 1
+        if self.busy(self.calls - 1):
+            self.rejected += 1
+            raise batch.Overloaded(0)
+        return super().submit(fn, *args)
+
+
+def test_a_full_pool_delays_the_archive_but_never_truncates_it():
+    records = batch.iter_records(jsonl(*({'personal': {'fullName': f'R{n}'}} for n in range(3))), 'jsonl')
+    # Chunks 2 and 3 are held back while an earlier one renders; chunk 3 is
+    # turned away again once nothing of this batch is in flight, and waits.
+    pool = BusyPool(lambda call: call in (1, 3, 4))
+    files = archive(batch.render_batch(records, pool, chunk_size=1, window=2))
+    assert pool.rejected == 3
+    assert files.namelist() == ['000001-R0.pdf', '000002-R1.pdf', '000003-R2.pdf']
+
+
+def test_chunks_that_never_find_room_are_reported():
+    progress = batch.BatchProgress()
+    records = batch.iter_records(jsonl({'personal': {}}, {'personal': {}}), 'jsonl')
+    files = archive(batch.render_batch(records, BusyPool(lambda call: True), max_wait=0, progress=progress))
+    assert files.namelist() == ['errors.csv']
+    report = files.read('errors.csv').decode()
+    assert report.count('Overloaded') == 2 and progress.as_dict()['failed'] == 2
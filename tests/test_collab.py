@@ -0,0 +1,191 @@
+import json
+
+import pytest
+
+import collab
+import schema
+from storage import VersionConflict
+
+
+def sessions(**options):
+    docs = {'r': (schema.validate({'personal': {'fullName': 'Asha'}}), 1),
+            's': (schema.validate({'personal': {'fullName': 'Sam'}}), 1)}
+    return collab.Sessions(load=docs.get, save=lambda resume_id, doc, version: version + 1, **options)
+
+
+def test_streams_are_capped_across_sessions():
+    live = sessions(max_peers=4, max_streams=2)
+    first = live.open('r')
+    assert live.open('s') is not None
+    # The place is taken by open(), before any stream has started.
+    with pytest.raises(collab.Busy, match='server'):
+        live.open('r')
+    assert first.peers == 0 and live.streams == 2
+    live.leave(first)
+    assert live.get('r') is None  # its only editor left
+    assert live.open('r') is not None
+
+
+def test_editors_are_capped_per_resume():
+    live = sessions(max_peers=2)
+    session = live.open('r')
+    assert live.open('r') is session
+    with pytest.raises(collab.Busy, match='resume'):
+        live.open('r')
+    live.leave(session)
+    assert live.open('r') is session and live.get('r') is session
+
+
+def test_unknown_resumes_take_no_place():
+    live = sessions(max_streams=1)
+    assert live.open('nope') is None
+    assert live.streams == 0 and live.open('r') is not None
+
+
+def test_live_route_is_off_with_several_workers(monkeypatch):
+    import app as app_module
+
+    client = app_module.app.test_client()
+    assert client.put('/api/resume/live-off', json={}).status_code == 200
+    monkeypatch.setitem(app_module.app.config, 'LIVE_EDITING', False)
+    assert client.get('/api/resume/live-off/live').status_code == 501
+    assert client.post('/api/resume/live-off/live', json={'site': 'a', 'batch': 1, 'ops': []}).status_code == 501
+    page = app_module.render_home_page(streamed=False).variants['identity'][0]
+    assert b'fa-users' not in page
+
+
+def session(**doc):
+    saved = []
+
+    def save(resume_id, doc, version):
+        saved.append(doc)
+        return version + 1
+
+    live = collab.Session('r', schema.validate({'schemaVersion': 2, **doc}), 1, load=lambda resume_id: None,
+                          save=save, persist_interval=60)
+    return live, saved
+
+
+def ins(section, key, after=None, value=None, **fields):
+    # A skill's value is its text; an entry's is the entry, keyed by its id.
+    return {'op': 'ins', 'path': [section, key], 'after': after,
+            'value': {'id': key, **fields} if value is None else value}
+
+
+def replay(doc, session):
+    # What an editor that saw every batch in the stream ends up with.
+    state = collab.from_doc(schema.validate({'schemaVersion': 2, **doc}))
+    for _, encoded in session.log:
+        for op in json.loads(encoded)[3]:
+            collab.apply(state, op)
+    return state
+
+
+def test_concurrent_edits_converge_in_server_order():
+    doc = {'projects': [{'id': 1, 'name': 'A'}]}
+    live, _ = session(**doc)
+    # Two editors both insert after A, from the same copy.
+    live.submit('x', 1, [ins('projects', 'x1', '1', name='From X')])
+    live.submit('y', 1, [ins('projects', 'y1', '1', name='From Y')])
+    live.submit('x', 2, [{'op': 'set', 'path': ['personal', 'fullName'], 'value': 'X'}])
+    live.submit('y', 2, [{'op': 'set', 'path': ['personal', 'fullName'], 'value': 'Y'}])
+    names = [entry['name'] for entry in collab.to_doc(live.state)['projects']]
+    assert names == ['A', 'From Y', 'From X']
+    assert live.state['personal']['fullName'] == 'Y'  # last writer wins
+    assert replay(doc, live) == live.state
+
+
+def test_inserts_follow_deleted_anchors_and_deletes_win():
+    doc = {'skills': ['a', 'b', 'c']}
+    live, _ = session(**doc)
+    live.submit('x', 1, [{'op': 'del', 'path': ['skills', 's1']}])
+    # Y still sees b: its insert after b goes where b was, its edit to b is dropped.
+    live.submit('y', 1, [ins('skills', 'y1', 's1', value='new'),
+                         {'op': 'set', 'path': ['skills', 's1'], 'value': 'B'}])
+    live.submit('z', 1, [ins('skills', 's1', 's0', value='back')])  # re-adding a deleted key
+    assert collab.to_doc(live.state)['skills'] == ['a', 'new', 'c']
+    assert replay(doc, live) == live.state
+
+
+def test_retried_batches_are_applied_once():
+    live, saved = session(skills=[])
+    seq = live.submit('x', 1, [ins('skills', 'x1', value='SQL')])
+    assert live.submit('x', 1, [ins('skills', 'x2', value='SQL')]) == seq
+    assert collab.to_doc(live.state)['skills'] == ['SQL']
+    live.persist()
+    live.persist()  # unchanged since: not written again
+    assert [doc['skills'] for doc in saved] == [['SQL']]
+
+
+@pytest.mark.parametrize('op', [
+    {'op': 'set', 'path': ['personal', 'nickname'], 'value': 'A'},
+    {'op': 'set', 'path': ['projects', '1', 'id'], 'value': 2},
+    {'op': 'set', 'path': ['skills', 's0'], 'value': 'x' * (schema.MAX_TEXT + 1)},
+    {'op': 'ins', 'path': ['projects', '2'], 'after': None, 'value': {'id': 3}},
+    {'op': 'ins', 'path': ['projects', '2'], 'after': None, 'value': {'id': 2, 'color': 'red'}},
+    {'op': 'move', 'path': ['skills', 's0']},
+    {'path': 'skills'},
+])
+def test_bad_operations_are_refused(op):
+    live, _ = session(skills=['a'], projects=[{'id': 1}])
+    with pytest.raises(collab.OpError):
+        live.submit('x', 1, [op])
+    assert live.seq == 0
+
+
+def test_sections_stay_within_the_schema_limit():
+    live, _ = session(skills=['s'] * (schema.MAX_ENTRIES - 1))
+    with pytest.raises(collab.OpError):
+        live.submit('x', 1, [ins('skills', 'x1', value='one'), ins('skills', 'x2', value='two')])
+    live.submit('x', 2, [ins('skills', 'x1', value='one')])
+    assert len(live.state['skills']) == schema.MAX_ENTRIES
+
+
+def test_persisting_expects_the_loaded_version():
+    live, _ = session(skills=[])
+    versions = []
+    live.save = lambda resume_id, doc, version: versions.append(version) or version + 1
+    live.submit('x', 1, [ins('skills', 'x1', value='SQL')])
+    live.persist()
+    live.submit('x', 2, [ins('skills', 'x2', value='Go')])
+    live.persist()
+    assert versions == [1, 2] and live.version == 3
+
+
+def test_a_newer_stored_resume_wins_and_editors_get_a_snapshot():
+    live, _ = session(skills=['a'])
+    newer = schema.validate({'skills': ['written elsewhere']})
+
+    def save(resume_id, doc, version):
+        raise VersionConflict(7)
+
+    live.save, live.load = save, lambda resume_id: (newer, 7)
+    stream = live.stream()
+    next(stream)  # retry
+    first = next(stream)
+    assert first.startswith('event: snapshot')
+    live.submit('x', 1, [ins('skills', 'x1', value='lost')])
+    assert next(stream).startswith('event: ops')
+    live.persist()
+    assert live.version == 7 and collab.to_doc(live.state)['skills'] == ['written elsewhere']
+    event = next(stream)
+    assert event.startswith('event: snapshot') and 'written elsewhere' in event
+    assert first.split('id: ')[1].split('-')[0] != live.epoch
+    live.persist()  # nothing new since the reset
+    assert live.resets == 1
+    stream.close()
+
+
+def test_rest_writes_wait_for_the_live_session(monkeypatch):
+    import app as app_module
+
+    monkeypatch.setitem(app_module.app.config, 'LIVE_EDITING', True)
+    client = app_module.app.test_client()
+    assert client.put('/api/resume/live-lock', json={}).status_code == 200
+    stream = client.get('/api/resume/live-lock/live')
+    assert stream.status_code == 200 and app_module.live.get('live-lock') is not None
+    assert client.put('/api/resume/live-lock', json={}).status_code == 409
+    assert client.patch('/api/resume/live-lock', json=[]).status_code == 409
+    stream.close()  # the last editor leaves: the session closes
+    assert app_module.live.get('live-lock') is None
+    assert client.put('/api/resume/live-lock', json={}).status_code == 200
@@ -0,0 +1,90 @@
+import gzip
+import zlib
+
+import pytest
+
+import app as app_module
+from app import StreamedPage
+
+
+@pytest.fixture
+def client():
+    return app_module.app.test_client()
+
+
+def test_page_is_served_in_each_encoding(client):
+    plain = client.get('/', headers={'Accept-Encoding': 'identity'})
+    assert plain.status_code == 200 and 'Content-Encoding' not in plain.headers
+    assert b'resumeApp' in plain.data
+    packed = client.get('/', headers={'Accept-Encoding': 'gzip'})
+    assert packed.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(packed.data) == plain.data
+    assert packed.headers['ETag'] != plain.headers['ETag']  # the bytes differ, so the tags do
+    assert packed.headers['Vary'] == 'Accept-Encoding'
+    assert packed.headers['Cache-Control'] == 'no-cache'
+
+
+@pytest.mark.parametrize('encoding', ['identity', 'gzip'])
+def test_matching_etag_is_answered_with_304(client, encoding):
+    first = client.get('/', headers={'Accept-Encoding': encoding})
+    again = client.get('/', headers={'Accept-Encoding': encoding, 'If-None-Match': first.headers['ETag']})
+    assert again.status_code == 304 and again.data == b''
+    assert again.headers['ETag'] == first.headers['ETag']
+
+
+def test_etag_of_another_encoding_is_not_a_match(client):
+    plain = client.get('/', headers={'Accept-Encoding': 'identity'})
+    packed = client.get('/', headers={'Accept-Encoding': 'gzip', 'If-None-Match': plain.headers['ETag']})
+    assert packed.status_code == 200 and packed.headers['Content-Encoding'] == 'gzip'
+
+
+def test_only_the_active_layout_is_mounted(client):
+    page = client.get('/', headers={'Accept-Encoding': 'identity'}).get_data(as_text=True)
+    for template in ('modern', 'minimal', 'creative'):
+        assert page.count(f'<template x-if="template === \'{template}\'">') == 1
+    assert 'x-show="template ===' not in page
+
+
+def test_streamed_page_flushes_each_chunk():
+    chunks = [b'<head>' * 50, b'<main>' * 50, b'<script></script>']
+    page = StreamedPage(chunks)
+    # Each compressed chunk decodes to its whole plain chunk on its own: the
+    # browser never waits for the next one to finish the previous.
+    inflate = zlib.decompressobj(31)
+    assert [inflate.decompress(part) for part in page.chunks['gzip']] == chunks
+    assert inflate.eof
+    assert gzip.decompress(page.variants['gzip'][0]) == b''.join(chunks)
+
+
+@pytest.mark.parametrize('encoding', ['identity', 'gzip'])
+def test_editor_page_is_sent_critical_path_first(encoding):
+    with app_module.app.test_request_context('/', headers={'Accept-Encoding': encoding}):
+        response = app_module.home()
+        assert response.is_streamed
+        parts = list(response.response)
+    if encoding == 'gzip':
+        inflate = zlib.decompressobj(31)
+        parts = [inflate.decompress(part) for part in parts]
+    head, preview, scripts = [part.decode('utf-8') for part in parts]
+    assert 'activeTab' in head and '<!-- Application Logic -->' not in head
+    assert "x-if=\"template === 'modern'\"" in preview
+    assert '<!-- Application Logic -->' in scripts and 'alpinejs' in scripts
+
+
+def test_only_the_editor_css_is_inlined(tmp_path, monkeypatch):
+    import assets
+
+    monkeypatch.setattr(assets, '_download', lambda url: b'/* vendored */')
+    page = app_module.render_home_page('cdn').chunks['identity'][0].decode('utf-8')
+    manifest = assets.build(page + '<p class="bg-slate-900 p-4"></p>', str(tmp_path), log=lambda line: None)
+    monkeypatch.setattr(assets, 'load_manifest', lambda static_dir: manifest)
+    monkeypatch.setattr(app_module, 'DIST_DIR', str(tmp_path / 'dist'))
+    head, preview, scripts = [chunk.decode('utf-8') for chunk in
+                              app_module.render_home_page('bundled').chunks['identity']]
+    link = f'<link rel="stylesheet" href="/static/dist/{manifest["app.css"]}">'
+    assert link not in head and preview.lstrip().startswith(link)
+    assert '.w-full{width:100%}' in head  # the editor's inputs
+    assert '.bg-slate-900{' not in head   # only used further down
+    bundle = (tmp_path / 'dist' / manifest['app.css']).read_text()
+    inlined = head[head.index('<style>') + 7:head.index('</style>')]
+    assert '.bg-slate-900{' in bundle and len(inlined) < len(bundle)
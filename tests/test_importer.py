@@ -0,0 +1,189 @@
+import io
+import json
+import zipfile
+from xml.sax.saxutils import escape
+
+import pytest
+
+import importer
+import schema
+from pdf_layouts import render_pdf
+
+DOCUMENT = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+            '<w:body>{}</w:body></w:document>')
+
+
+def docx(lines):
+    body = ''.join(f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>' for line in lines)
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, 'w') as archive:
+        archive.writestr('word/document.xml', DOCUMENT.format(body))
+    return out.getvalue()
+
+
+CV = docx(['Asha Rao', 'asha@example.com | +1 555 123 4567', '',
+           'EDUCATION', 'Tech University', 'BSc Computer Science', '2019 - 2023', '',
+           'EXPERIENCE', 'Software Intern', 'Acme Corp', 'Jun 2022 - Aug 2022',
+           '• Built an internal dashboard', '',
+           'SKILLS', 'Python, SQL, Go'])
+
+
+def test_docx_is_parsed_into_sections():
+    fmt, doc = importer.import_file(CV)
+    assert fmt == 'docx'
+    personal = doc['personal']
+    assert (personal['fullName'], personal['email']) == ('Asha Rao', 'asha@example.com')
+    assert personal['phone'] == '+1 555 123 4567'
+    [edu] = doc['education']
+    assert (edu['school'], edu['degree']) == ('Tech University', 'BSc Computer Science')
+    assert '2019' in edu['date']
+    [job] = doc['experience']
+    assert (job['role'], job['company']) == ('Software Intern', 'Acme Corp')
+    assert 'dashboard' in job['details']
+    assert doc['skills'] == ['Python', 'SQL', 'Go']
+
+
+@pytest.mark.skipif(importer.pypdf is None, reason='needs pypdf')
+def test_pdfs_from_the_server_renderer_import_back():
+    resume = {'personal': {'fullName': 'Asha Rao', 'email': 'asha@example.com'},
+              'education': [{'id': 1, 'school': 'Tech University', 'degree': 'BSc', 'date': '2019 - 2023'}],
+              'skills': ['Python', 'SQL']}
+    fmt, doc = importer.import_file(render_pdf(resume, 'minimal'))
+    assert fmt == 'pdf'
+    assert doc['personal']['email'] == 'asha@example.com'
+    assert doc['education'][0]['school'] == 'Tech University'
+
+
+@pytest.mark.parametrize('data, error', [
+    (b'plain text', importer.UnsupportedFile),
+    (b'PK\x03\x04 not really a zip', importer.UnreadableFile),
+    (b'%PDF-1.4 truncated', importer.UnreadableFile),
+])
+def test_files_that_cannot_be_read(data, error):
+    with pytest.raises(error):
+        importer.import_file(data)
+
+
+def test_docx_text_is_read_with_a_size_cap(monkeypatch):
+    monkeypatch.setattr(importer, 'MAX_DOCX_XML', 4096)
+    bomb = docx(['x' * 8192])
+    with pytest.raises(importer.UnreadableFile, match='larger than'):
+        importer.import_file(bomb)
+    assert importer.import_file(CV)[0] == 'docx'
+
+
+@pytest.mark.parametrize('error', [KeyError('/Root'), ValueError('bad xref'), RecursionError()])
+def test_pdf_parser_crashes_are_unreadable_files(monkeypatch, error):
+    if importer.pypdf is None:
+        pytest.skip('needs pypdf')
+
+    def reader(stream):
+        raise error
+
+    monkeypatch.setattr(importer.pypdf, 'PdfReader', reader)
+    with pytest.raises(importer.UnreadableFile):
+        importer.import_file(b'%PDF-1.4 hostile')
+
+
+@pytest.fixture
+def client():
+    import app as app_module
+
+    return app_module.app.test_client()
+
+
+def upload(client, data, name='cv.docx'):
+    return client.post('/api/import', data={'file': (io.BytesIO(data), name)})
+
+
+def test_import_route(client):
+    first = upload(client, CV)
+    assert first.status_code == 200
+    body = first.get_json()
+    assert body['format'] == 'docx' and body['cached'] is False
+    assert body['data']['personal']['fullName'] == 'Asha Rao'
+    again = client.post('/api/import', data=CV)  # a raw body works too
+    assert again.get_json()['cached'] is True
+    assert again.get_json()['data'] == body['data']
+
+    assert upload(client, b'plain text', 'cv.txt').status_code == 415
+    assert upload(client, b'PK\x03\x04 broken').status_code == 422
+    assert client.post('/api/import').status_code == 400
+
+
+def test_large_uploads_are_refused(client, monkeypatch):
+    import app as app_module
+
+    monkeypatch.setitem(app_module.app.config, 'IMPORT_MAX_MB', 0.01)
+    assert client.post('/api/import', data=CV + b'\0' * 20000).status_code == 413
+
+
+def test_main_writes_json_lines(tmp_path, capsys):
+    (tmp_path / 'asha.docx').write_bytes(CV)
+    (tmp_path / 'notes.txt').write_bytes(b'plain text')
+    output = tmp_path / 'out.jsonl'
+    assert importer.main([str(tmp_path / 'asha.docx'), str(tmp_path / 'notes.txt'),
+                          '-o', str(output), '-w', '1']) == 0
+    [line] = output.read_text().splitlines()
+    doc = json.loads(line)
+    assert doc['source'].endswith('asha.docx') and doc['personal']['fullName'] == 'Asha Rao'
+    assert 'notes.txt: UnsupportedFile' in capsys.readouterr().err
+
+
+def test_main_keeps_a_bounded_number_of_files_in_flight(tmp_path, monkeypatch):
+    from concurrent.futures import Future
+
+    paths = []
+    for n in range(7):
+        paths.append(str(tmp_path / f'{n}.docx'))
+        (tmp_path / f'{n}.docx').write_bytes(CV)
+    in_flight = []
+
+    class LazyPool:
+        workers = 1
+
+        def __init__(self, *args, **kwargs):
+            self.futures = []
+
+        def submit(self, fn, *args):
+            future = Future()
+            original = future.result
+
+            def result(timeout=None):
+                if not future.done():
+                    future.set_result(fn(*args))
+                return original(timeout)
+
+            future.result = result
+            self.futures.append(future)
+            in_flight.append(sum(not f.done() for f in self.futures))
+            return future
+
+        def shutdown(self):
+            pass
+
+    monkeypatch.setattr(importer, 'WorkerPool', LazyPool)
+    output = tmp_path / 'out.jsonl'
+    assert importer.main(paths + ['-o', str(output)]) == 0
+    sources = [json.loads(line)['source'] for line in output.read_text().splitlines()]
+    assert sources == paths  # in order
+    assert max(in_flight) == 2
+
+
+LONG_CV = docx(['Asha Rao', 'asha@example.com', 'SUMMARY', 'y' * (schema.MAX_TEXT + 500),
+                'SKILLS', ', '.join(f'Skill{n}' for n in range(250))])
+
+
+def test_a_long_cv_is_cut_to_the_schema_limits():
+    fmt, doc = importer.import_file(LONG_CV)
+    assert fmt == 'docx'
+    assert schema.validate(doc) == doc
+    assert doc['skills'][:2] == ['Skill0', 'Skill1'] and len(doc['skills']) == schema.MAX_ENTRIES
+    assert len(doc['personal']['summary']) == schema.MAX_TEXT
+
+
+def test_import_route_accepts_a_long_cv(client):
+    response = client.post('/api/import', data=LONG_CV)
+    assert response.status_code == 200
+    assert len(response.get_json()['data']['skills']) == schema.MAX_ENTRIES
@@ -0,0 +1,75 @@
+import pytest
+
+from json_patch import PatchError, apply_patch
+
+
+def escape(key):
+    return str(key).replace('~', '~0').replace('/', '~1')
+
+
+def diff_patch(before, after, path='', ops=None):
+    # diffPatch from the editor page, which is what autosave sends.
+    ops = [] if ops is None else ops
+    if before == after:
+        return ops
+    if isinstance(before, list) and isinstance(after, list):
+        common = min(len(before), len(after))
+        for i in range(common):
+            diff_patch(before[i], after[i], f'{path}/{i}', ops)
+        ops += [{'op': 'add', 'path': f'{path}/{i}', 'value': after[i]} for i in range(common, len(after))]
+        ops += [{'op': 'remove', 'path': f'{path}/{i}'} for i in range(len(before) - 1, common - 1, -1)]
+    elif isinstance(before, dict) and isinstance(after, dict):
+        ops += [{'op': 'remove', 'path': f'{path}/{escape(key)}'} for key in before if key not in after]
+        for key in after:
+            child = f'{path}/{escape(key)}'
+            if key in before:
+                diff_patch(before[key], after[key], child, ops)
+            else:
+                ops.append({'op': 'add', 'path': child, 'value': after[key]})
+    else:
+        ops.append({'op': 'replace', 'path': path, 'value': after})
+    return ops
+
+
+BEFORE = {'personal': {'fullName': 'Asha', 'email': 'a@x.org'},
+          'skills': ['Python', 'SQL', 'Go'],
+          'projects': [{'id': 1, 'name': 'A'}, {'id': 2, 'name': 'B'}]}
+
+
+@pytest.mark.parametrize('after', [
+    BEFORE,
+    {**BEFORE, 'personal': {'fullName': 'Asha Rao', 'email': 'a@x.org'}},
+    {**BEFORE, 'skills': ['Python']},
+    {**BEFORE, 'skills': ['Rust', 'Python', 'SQL', 'Go', 'C']},
+    {**BEFORE, 'projects': [{'id': 2, 'name': 'B', 'link': 'x'}]},
+    {'personal': {'full/name': 'odd ~ key'}, 'skills': 'not a list any more'},
+])
+def test_diff_round_trips(after):
+    patch = diff_patch(BEFORE, after)
+    assert apply_patch(BEFORE, patch) == after
+    assert BEFORE['skills'] == ['Python', 'SQL', 'Go']  # the original is left alone
+
+
+def test_move_copy_and_test():
+    doc = apply_patch(BEFORE, [
+        {'op': 'test', 'path': '/skills/0', 'value': 'Python'},
+        {'op': 'move', 'from': '/skills/0', 'path': '/skills/-'},
+        {'op': 'copy', 'from': '/personal/email', 'path': '/personal/backup'},
+    ])
+    assert doc['skills'] == ['SQL', 'Go', 'Python'] and doc['personal']['backup'] == 'a@x.org'
+
+
+@pytest.mark.parametrize('patch', [
+    {'op': 'add'},
+    [{'op': 'replace', 'path': '/skills/3', 'value': 'x'}],
+    [{'op': 'remove', 'path': '/skills/01'}],
+    [{'op': 'remove', 'path': ''}],
+    [{'op': 'add', 'path': 'skills', 'value': 1}],
+    [{'op': 'add', 'path': '/personal/fullName/x', 'value': 1}],
+    [{'op': 'test', 'path': '/skills/0', 'value': 'Go'}],
+    [{'op': 'move', 'path': '/skills/0'}],
+    [{'op': 'frobnicate', 'path': '/skills'}],
+])
+def test_bad_patches_change_nothing(patch):
+    with pytest.raises(PatchError):
+        apply_patch(BEFORE, patch)
@@ -0,0 +1,115 @@
+import re
+import shutil
+
+import pytest
+
+import app as app_module
+from layouts import LayoutRegistry
+
+LAYOUT_DIR = app_module.app.config['LAYOUT_DIR']
+
+DOC = {'personal': {'fullName': 'Asha <Rao>', 'email': 'asha@example.com', 'phone': '', 'summary': ''},
+       'education': [{'id': 1, 'school': 'Tech University', 'degree': 'BSc', 'date': '2020', 'details': ''}],
+       'experience': [], 'projects': [], 'skills': ['Python', 'SQL']}
+
+
+@pytest.fixture
+def registry(tmp_path):
+    directory = tmp_path / 'layouts'
+    shutil.copytree(LAYOUT_DIR, directory)
+    return LayoutRegistry(str(directory), str(tmp_path / 'cache'), poll_interval=0)
+
+
+def test_layouts_are_ordered_and_labelled(registry):
+    assert [(layout.name, layout.label) for layout in registry] == [
+        ('modern', 'Modern'), ('minimal', 'Minimal'), ('creative', 'Creative')]
+    assert '_partials' not in registry
+
+
+@pytest.mark.parametrize('name', ['modern', 'creative', 'minimal'])
+def test_one_template_renders_for_client_and_server(registry, name):
+    layout = registry[name]
+    assert 'x-text="preview.personal.fullName"' in layout.preview
+    assert 'x-for="edu in preview.education"' in layout.preview
+
+    html = layout.render(DOC)
+    assert 'Asha &lt;Rao&gt;' in html
+    assert 'Tech University' in html
+    assert 'x-text' not in html and 'x-for' not in html
+
+
+def test_layouts_are_reloaded_when_the_directory_changes(registry):
+    directory = registry.directory
+    assert registry.poll() is False
+
+    with open(f'{directory}/plain.html', 'w') as f:
+        f.write("{% set label = 'Plain' %}{% set order = 0 %}{{ el('h1', preview.personal.fullName) }}")
+    assert registry.poll() is True
+    assert next(iter(registry)).name == 'plain'
+    assert registry['plain'].render(DOC) == '<h1>Asha &lt;Rao&gt;</h1>'
+
+    with open(f'{directory}/plain.html', 'w') as f:
+        f.write("{% set label = 'Plainer' %}{{ el('h2', preview.personal.email) }}")
+    registry._signature = None  # mtimes may not have moved on a fast filesystem
+    assert registry.poll() is True
+    assert registry['plain'].label == 'Plainer'
+    assert registry['plain'].render(DOC) == '<h2>asha@example.com</h2>'
+    assert registry.poll() is False
+
+
+def test_poll_is_rate_limited(registry):
+    registry.poll_interval = 3600
+    registry._checked = 0
+    registry.poll()
+    with open(f'{registry.directory}/plain.html', 'w') as f:
+        f.write('<p></p>')
+    assert registry.poll() is False
+    assert 'plain' not in registry
+
+
+@pytest.fixture
+def client():
+    return app_module.app.test_client()
+
+
+def test_home_page_lists_new_layouts(client, registry, monkeypatch):
+    monkeypatch.setattr(app_module, 'layouts', registry)
+    monkeypatch.setattr(app_module, 'HOME_PAGE', app_module.HOME_PAGE)
+    monkeypatch.setattr(app_module, 'SERVICE_WORKER', app_module.SERVICE_WORKER)
+    with open(f'{registry.directory}/plain.html', 'w') as f:
+        f.write("{% set label = 'Plain Jane' %}<p></p>")
+    page = client.get('/', headers={'Accept-Encoding': 'identity'}).get_data(as_text=True)
+    assert 'Plain Jane' in page
+    assert '''x-if="template === 'plain'"''' in page
+
+    # Rendered in the browser only: pdf_layouts.py has no counterpart.
+    assert client.put('/api/resume/layout-r', json=DOC).status_code == 200
+    assert client.get('/api/resume/layout-r/pdf?template=plain').status_code == 501
+
+
+def test_resume_html_route(client):
+    assert client.put('/api/resume/html-r', json=DOC).status_code == 200
+    response = client.get('/api/resume/html-r/html?template=minimal')
+    assert response.status_code == 200 and response.mimetype == 'text/html'
+    page = response.get_data(as_text=True)
+    assert '<title>Asha &lt;Rao&gt;</title>' in page
+    assert 'Tech University' in page
+    assert client.get('/api/resume/html-r/html?template=fancy').status_code == 400
+    assert client.get('/api/resume/no-such/html').status_code == 404
+
+
+@pytest.mark.parametrize('name', ['modern', 'creative', 'minimal'])
+def test_entries_are_marked_for_the_paginator(registry, name):
+    doc = dict(DOC, education=[dict(DOC['education'][0], id=n) for n in range(3)])
+    html = registry[name].render(doc)
+    assert html.count('data-block="keep"') >= 3  # section headings
+    assert len(re.findall(r'data-block(?!=)', html)) >= 4  # the header and each entry
+
+
+def test_minimal_joins_only_the_contact_fields_present(registry):
+    layout = registry['minimal']
+    assert '<span>asha@example.com</span>' in layout.render(DOC)  # no phone, no bullet
+    both = dict(DOC, personal=dict(DOC['personal'], phone='555 1234'))
+    assert '<span>asha@example.com • 555 1234</span>' in layout.render(both)
+    assert ('x-text="[preview.personal.email, preview.personal.phone].filter(Boolean).join(&#39; • &#39;)"'
+            in layout.preview)
@@ -0,0 +1,123 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import app as app_module
+from metrics import Registry
+
+
+def dead_pid():
+    # A process that has exited and been reaped: its pid is free.
+    child = subprocess.Popen([sys.executable, '-c', 'pass'])
+    child.wait()
+    return child.pid
+
+
+def test_render_uses_the_text_format():
+    registry = Registry()
+    requests = registry.counter('requests_total', 'Requests.', ('route',))
+    in_flight = registry.gauge('in_flight', 'Busy.')
+    latency = registry.histogram('latency_seconds', 'Latency.', (), (0.1, 1))
+    requests.inc(route='/a')
+    requests.inc(2, route='/a')
+    requests.inc(route='say "hi"\n')
+    in_flight.inc()
+    in_flight.inc()
+    in_flight.dec()
+    for value in (0.05, 0.5, 0.5, 3):
+        latency.observe(value)
+
+    lines = registry.render().splitlines()
+    assert '# HELP requests_total Requests.' in lines
+    assert '# TYPE requests_total counter' in lines
+    assert 'requests_total{route="/a"} 3' in lines
+    assert 'requests_total{route="say \\"hi\\"\\n"} 1' in lines
+    assert 'in_flight 1' in lines
+    assert '# TYPE latency_seconds histogram' in lines
+    assert [line for line in lines if line.startswith('latency_seconds_')] == [
+        'latency_seconds_bucket{le="0.1"} 1',
+        'latency_seconds_bucket{le="1"} 3',
+        'latency_seconds_bucket{le="+Inf"} 4',
+        'latency_seconds_sum 4.05',
+        'latency_seconds_count 4',
+    ]
+
+
+def test_snapshots_of_other_processes_are_merged(tmp_path):
+    def registry():
+        r = Registry(str(tmp_path))
+        return r, r.counter('jobs_total', 'Jobs.', ('pool',)), r.gauge('busy', 'Busy.'), \
+            r.histogram('seconds', 'Time.', (), (1,))
+
+    # Two other workers: one still running (our parent), one gone.
+    for pid, jobs in ((os.getppid(), 5), (dead_pid(), 7)):
+        other, counter, gauge, histogram = registry()
+        counter.inc(jobs, pool='pdf')
+        gauge.set(10)
+        histogram.observe(2)
+        (tmp_path / f'{pid}.json').write_text(json.dumps(other.snapshot()))
+
+    ours, counter, gauge, histogram = registry()
+    counter.inc(pool='pdf')
+    counter.inc(pool='batch')
+    gauge.set(1)
+    histogram.observe(0.5)
+    ours.derive('pdf_share', 'Share of pdf jobs.',
+                lambda value: value('jobs_total', pool='pdf') / value('jobs_total'))
+
+    lines = ours.render().splitlines()
+    assert 'jobs_total{pool="pdf"} 13' in lines
+    assert 'jobs_total{pool="batch"} 1' in lines
+    assert 'busy 11' in lines                       # the exited worker's gauge is dropped
+    assert 'seconds_bucket{le="1"} 1' in lines
+    assert 'seconds_count 3' in lines
+    assert 'pdf_share 0.9285714285714286' in lines
+    assert (tmp_path / f'{os.getpid()}.json').exists()
+
+
+def test_collectors_run_before_each_snapshot():
+    registry = Registry()
+    size = registry.gauge('size', 'Size.')
+    sizes = iter([3, 4])
+    registry.collector(lambda: size.set(next(sizes)))
+    assert 'size 3' in registry.render().splitlines()
+    assert 'size 4' in registry.render().splitlines()
+
+
+@pytest.fixture
+def client():
+    return app_module.app.test_client()
+
+
+def test_requests_are_counted_by_route(client):
+    before = app_module.registry.metrics['http_requests_total'].values.get(('/healthz', 'GET', '200'), 0)
+    with client.get('/healthz') as response:  # counted once the body is closed
+        assert response.status_code == 200
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    text = response.get_data(as_text=True)
+    assert f'http_requests_total{{route="/healthz",method="GET",status="200"}} {before + 1}' in text
+    assert 'http_request_duration_seconds_bucket{route="/healthz",method="GET",le="+Inf"}' in text
+    assert '# TYPE render_cache_hit_ratio gauge' in text
+    assert 'worker_pool_jobs_in_flight{pool="pdf"}' in text
+
+
+def test_client_timings_are_recorded(client):
+    histogram = app_module.client_pdf
+    before = histogram.values.get(('server',), [0] * 10 + [0.0])
+    response = client.post('/api/metrics/client', data=json.dumps({
+        'pdf': [{'ms': 1500, 'source': 'server'}, {'ms': 10, 'source': 'elsewhere'}, {'ms': -1, 'source': 'cache'}],
+        'preview': [4, 'slow'],
+    }))
+    assert response.status_code == 204
+    after = histogram.values[('server',)]
+    assert sum(after[:-1]) == sum(before[:-1]) + 1          # one more sample
+    assert after[-1] == pytest.approx(before[-1] + 1.5)     # of 1.5 seconds
+    assert ('elsewhere',) not in histogram.values
+    assert ('cache',) not in histogram.values
+
+    assert client.post('/api/metrics/client', data='[]').status_code == 400
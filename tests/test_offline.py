@@ -0,0 +1,53 @@
+import json
+import re
+import shutil
+import subprocess
+
+import pytest
+
+import app as app_module
+
+
+@pytest.fixture
+def client():
+    return app_module.app.test_client()
+
+
+def settings(script):
+    cache = json.loads(re.search(r'^const CACHE = (.*);$', script, re.M).group(1))
+    precache = json.loads(re.search(r'^const PRECACHE = (.*);$', script, re.M).group(1))
+    return cache, precache
+
+
+def test_service_worker_precaches_the_page_and_its_assets(client):
+    page = client.get('/', headers={'Accept-Encoding': 'identity'})
+    response = client.get('/sw.js', headers={'Accept-Encoding': 'identity'})
+    assert response.status_code == 200
+    assert response.mimetype == 'text/javascript'
+    assert response.headers['Cache-Control'] == 'no-cache'
+
+    cache, precache = settings(response.get_data(as_text=True))
+    assert cache == f'resume-shell-{page.headers["ETag"].strip(chr(34))}'
+    assert precache[0] == '/'
+    html = page.get_data(as_text=True)
+    assert all(f'"{url}"' in html for url in precache[1:])
+    assert any('alpinejs' in url for url in precache)
+    assert any('font-awesome' in url for url in precache)
+
+
+def test_service_worker_is_valid_javascript(client, tmp_path):
+    if shutil.which('node') is None:
+        pytest.skip('needs Node.js')
+    path = tmp_path / 'sw.js'
+    path.write_bytes(client.get('/sw.js', headers={'Accept-Encoding': 'identity'}).data)
+    result = subprocess.run(['node', '--check', str(path)], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+
+def test_a_new_page_gets_a_new_worker(client, monkeypatch):
+    cache, _ = settings(client.get('/sw.js', headers={'Accept-Encoding': 'identity'}).get_data(as_text=True))
+    monkeypatch.setattr(app_module, 'HOME_PAGE', app_module.PrecompressedPage(b'<script src="/static/x.js"></script>'))
+    monkeypatch.setattr(app_module, 'SERVICE_WORKER', app_module.render_service_worker(app_module.HOME_PAGE))
+    changed, precache = settings(client.get('/sw.js', headers={'Accept-Encoding': 'identity'}).get_data(as_text=True))
+    assert changed != cache
+    assert precache == ['/', '/static/x.js']
@@ -0,0 +1,74 @@
+import pytest
+
+# Blocks stacked in normal flow: each one's top is the previous one's bottom
+# plus its own margin-top, which is what the paginator sets.
+FLOW = '''
+globalThis.getComputedStyle = () => ({ marginTop: '0px' });
+globalThis.ResizeObserver = class { observe() {} unobserve() {} };
+function flow(heights, kinds = {}) {
+    const blocks = heights.map((h, i) => ({
+        h, dataset: { block: kinds[i] || '' }, style: { marginTop: '' },
+        getBoundingClientRect() { return rect(this); },
+    }));
+    function rect(el) {
+        let top = 0;
+        for (const b of blocks) {
+            top += parseFloat(b.style.marginTop) || 0;
+            if (b === el) return { top, bottom: top + b.h, height: b.h, width: 100 };
+            top += b.h;
+        }
+    }
+    const root = { querySelectorAll: () => blocks, getBoundingClientRect: () => ({ top: 0 }) };
+    const layouts = [];
+    paginator.attach(root, (pages, placed) => layouts.push({ pages, placed }));
+    paginator.scan();
+    return { blocks, layouts, tops: () => blocks.map(b => rect(b).top) };
+}
+'''
+
+
+def run(run_editor, js):
+    return run_editor(FLOW + js + '\nconsole.log(JSON.stringify({ out, PAGE_HEIGHT, PAGE_MARGIN }));')
+
+
+def check_pages(tops, heights, page, margin):
+    for top, height in zip(tops, heights):
+        n = int(top // page)
+        assert top >= n * page + (margin if n else 0) - 0.5
+        assert top + height <= (n + 1) * page - margin + 0.5
+
+
+def test_blocks_never_cross_a_page_margin(run_editor):
+    heights = [300] * 12
+    result = run(run_editor, f'const f = flow({heights}); const out = {{ tops: f.tops(), layouts: f.layouts }};')
+    out, page, margin = result['out'], result['PAGE_HEIGHT'], result['PAGE_MARGIN']
+    check_pages(out['tops'], heights, page, margin)
+    assert out['tops'][3] == pytest.approx(page + margin)  # the fourth would have crossed
+    assert out['layouts'] == [{'pages': 4, 'placed': 12}]
+
+
+def test_headings_move_with_the_block_after_them(run_editor):
+    heights = [1000, 40, 200]
+    result = run(run_editor, f"const f = flow({heights}, {{ 1: 'keep' }}); const out = f.tops();")
+    heading, block = result['out'][1:]
+    assert heading == pytest.approx(result['PAGE_HEIGHT'] + result['PAGE_MARGIN'])
+    assert block == pytest.approx(heading + 40)
+
+
+def test_blocks_taller_than_a_page_are_left_to_run_over(run_editor):
+    result = run(run_editor, 'const f = flow([500, 2000]); const out = f.tops();')
+    assert result['out'] == [0, 500]
+
+
+def test_only_blocks_after_a_change_are_placed_again(run_editor):
+    heights = [300] * 12
+    result = run(run_editor, f'''
+        const f = flow({heights});
+        f.blocks[10].h = 600;
+        paginator.invalidate(10);
+        paginator.layout();
+        const out = {{ tops: f.tops(), layouts: f.layouts }};
+    ''')
+    out = result['out']
+    assert out['layouts'][-1] == {'pages': 5, 'placed': 2}
+    check_pages(out['tops'], heights[:10] + [600, 300], result['PAGE_HEIGHT'], result['PAGE_MARGIN'])
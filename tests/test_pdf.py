@@ -0,0 +1,135 @@
+import zlib
+
+import pytest
+
+import schema
+from pdf import UnsupportedText
+from pdf_layouts import LAYOUTS, Document, render_pdf
+from workers import Overloaded
+
+
+def resume(name='Asha Rao', entries=1):
+    details = 'Built things. ' * 20
+    return {'personal': {'fullName': name, 'email': 'asha@example.com'},
+            'education': [{'id': n, 'school': 'Tech University', 'degree': 'BSc', 'details': details}
+                          for n in range(1, entries + 1)],
+            'experience': [{'id': n, 'company': 'Acme', 'role': 'Intern', 'details': details}
+                           for n in range(1, entries + 1)],
+            'projects': [{'id': n, 'name': 'Compiler', 'details': details} for n in range(1, entries + 1)],
+            'skills': ['Python', 'SQL']}
+
+
+def pages(pdf):
+    return pdf.count(b'/Type /Page /Parent')
+
+
+def contents(pdf):
+    # Every content stream, inflated: one per page.
+    out, start = [], 0
+    while (start := pdf.find(b'>>\nstream\n', start)) >= 0:
+        end = pdf.index(b'\nendstream', start)
+        out.append(zlib.decompress(pdf[start + 10:end]))
+        start = end
+    return out
+
+
+def page_text(pdf):
+    return b'\n'.join(contents(pdf))
+
+
+@pytest.mark.parametrize('template', sorted(LAYOUTS))
+def test_layouts_render_text_as_text(template):
+    pdf = render_pdf(resume(), template)
+    assert pdf.startswith(b'%PDF-1.4') and pdf.rstrip().endswith(b'%%EOF')
+    assert pages(pdf) == 1
+    assert b'(Tech University) Tj' in page_text(pdf)
+
+
+@pytest.mark.parametrize('template', sorted(LAYOUTS))
+def test_western_european_text_renders(template):
+    pdf = render_pdf(resume('José Müller – Ångström'), template)
+    assert b'Jos\xe9 M\xfcller' in page_text(pdf) or b'JOS\xc9 M\xdcLLER' in page_text(pdf)
+
+
+@pytest.mark.parametrize('name', ['प्रभजोत सिंह', '李小龍', 'Ελένη', 'Иван'])
+def test_text_the_fonts_cannot_show_is_refused(name):
+    with pytest.raises(UnsupportedText):
+        render_pdf(schema.validate({'personal': {'fullName': name}}))
+
+
+@pytest.mark.parametrize('template', sorted(LAYOUTS))
+def test_long_resumes_flow_onto_more_pages(template):
+    assert pages(render_pdf(resume(entries=12), template)) > 1
+
+
+@pytest.mark.parametrize('template', sorted(LAYOUTS))
+def test_pages_are_written_as_the_layout_moves_past_them(template):
+    draw, decorate = LAYOUTS[template]
+    held = []
+
+    class Writer:
+        def add_page(self, page):
+            held.append(sum(page is not None for page in doc.pages))
+
+    doc = Document(decorate, Writer())
+    doc.page(0)
+    draw(doc, resume(entries=30))
+    assert len(held) == len(doc.pages) - 1  # all but the last, before the layout finished
+    assert max(held) <= 2
+    doc.flush()
+    assert len(held) == len(doc.pages) and not any(doc.pages)
+    with pytest.raises(ValueError):
+        doc.page(0)
+
+
+@pytest.fixture
+def client():
+    import app as app_module
+
+    return app_module.app.test_client()
+
+
+def test_pdf_route(client):
+    assert client.put('/api/resume/pdf-r', json=resume()).status_code == 200
+    response = client.get('/api/resume/pdf-r/pdf?template=minimal')
+    assert response.status_code == 200 and response.mimetype == 'application/pdf'
+    assert pages(response.data) == 1
+    assert client.get('/api/resume/pdf-r/pdf?template=fancy').status_code == 400
+    assert client.get('/api/resume/no-such/pdf').status_code == 404
+
+
+def test_pdf_route_sheds_load(client, monkeypatch):
+    import app as app_module
+
+    class Full:
+        def run(self, fn, *args):
+            raise Overloaded()
+
+    monkeypatch.setattr(app_module, 'pdf_pool', Full())
+    assert client.put('/api/resume/pdf-busy', json=resume()).status_code == 200
+    response = client.get('/api/resume/pdf-busy/pdf')
+    assert response.status_code == 429 and response.headers['Retry-After']
+
+
+def test_pdf_route_refuses_unsupported_text_so_the_browser_renders_it(client):
+    assert client.put('/api/resume/unicode-name', json={'personal': {'fullName': '李小龍'}}).status_code == 200
+    response = client.get('/api/resume/unicode-name/pdf')
+    assert response.status_code == 422
+    assert '李小龍' in response.get_json()['error']
+
+
+def test_minimal_joins_only_the_contact_fields_present():
+    doc = schema.validate({'personal': {'fullName': 'Asha', 'email': 'asha@example.com'}})
+    text = page_text(render_pdf(doc, 'minimal'))
+    assert b'(asha@example.com) Tj' in text and b'\x95' not in text  # no stray bullet
+    doc['personal']['phone'] = '555 1234'
+    assert b'(asha@example.com \x95 555 1234) Tj' in page_text(render_pdf(doc, 'minimal'))
+
+
+def test_creative_cards_have_a_background_on_every_page_they_run_onto():
+    doc = schema.validate({'projects': [{'name': 'Compiler', 'details': 'Built things. ' * 900}]})
+    pdf = render_pdf(doc, 'creative')
+    card_pages = [page for page in contents(pdf) if b'things.' in page]
+    assert len(card_pages) >= 3
+    for page in card_pages:
+        assert 0 <= page.find(b'1 1 1 rg') < page.find(b'things.')  # the card, under the text
@@ -0,0 +1,44 @@
+import json
+
+import pytest
+
+BEFORE = {'personal': {'fullName': 'Asha', 'email': 'a@x.org'},
+          'skills': ['Python', 'SQL', 'Go'],
+          'projects': [{'id': 1, 'name': 'A'}, {'id': 2, 'name': 'B'}]}
+
+
+@pytest.mark.parametrize('after', [
+    {**BEFORE, 'personal': {'fullName': 'Asha Rao'}},
+    {**BEFORE, 'skills': ['Python']},
+    {**BEFORE, 'skills': ['Rust', 'Python', 'SQL', 'Go', 'C']},
+    {**BEFORE, 'projects': [{'id': 2, 'name': 'B', 'link': 'x'}]},
+    {'personal': {'full/name': 'odd ~ key'}, 'skills': [], 'projects': []},
+])
+def test_patches_apply_in_place(run_editor, after):
+    out = run_editor(f'''
+        const preview = {json.dumps(BEFORE)};
+        const skills = preview.skills;
+        applyPatch(preview, diffPatch(JSON.parse(JSON.stringify(preview)), {json.dumps(after)}));
+        console.log(JSON.stringify({{preview, same: preview.skills === skills}}));
+    ''')
+    assert out['preview'] == after
+    assert out['same']  # patched in place, not replaced
+
+
+def test_edits_are_committed_once_per_frame(run_editor):
+    out = run_editor('''
+        const app = components.resumeApp();
+        app.preview = JSON.parse(JSON.stringify(app.data));
+        paginator.scan = () => {};  // no preview element to paginate here
+        for (const name of ['A', 'As', 'Ash', 'Asha']) {
+            app.data.personal.fullName = name;
+            app.schedulePreview();
+        }
+        const queued = frames.length, before = app.preview.personal.fullName;
+        frames.shift()();
+        console.log(JSON.stringify({queued, before, after: app.preview.personal.fullName, metrics: app.metrics}));
+    ''')
+    assert out['queued'] == 1
+    assert out['before'] != 'Asha' and out['after'] == 'Asha'
+    metrics = out['metrics']
+    assert (metrics['edits'], metrics['coalesced'], metrics['commits']) == (4, 3, 1)
@@ -0,0 +1,133 @@
+import os
+
+from render_cache import RenderCache, is_key, render_key
+
+
+def key(n):
+    return f'{n:064x}'
+
+
+def test_keys_depend_on_data_template_and_version():
+    doc = {'b': 1, 'a': [1, 2]}
+    same = render_key({'a': [1, 2], 'b': 1}, 'modern', 1)
+    assert render_key(doc, 'modern', 1) == same and is_key(same)
+    assert render_key(doc, 'minimal', 1) != same
+    assert render_key(doc, 'modern', 2) != same
+    assert not is_key('../' + same[3:]) and not is_key(same.upper())
+
+
+def test_memory_tier_is_a_bounded_lru():
+    cache = RenderCache(memory_bytes=10)
+    cache.put(key(1), b'aaaa')
+    cache.put(key(2), b'bbbb')
+    assert cache.get(key(1)) == b'aaaa'  # now the most recently used
+    cache.put(key(3), b'cccc')
+    assert cache.get(key(2)) is None
+    assert cache.get(key(3)) == b'cccc'
+    stats = cache.stats()
+    assert (stats['memory_hits'], stats['misses'], stats['memory_bytes']) == (2, 1, 8)
+
+
+def test_disk_tier_survives_a_restart_and_is_bounded(tmp_path):
+    cache = RenderCache(str(tmp_path), memory_bytes=0, disk_bytes=10)
+    for n in range(3):
+        cache.put(key(n), b'pdf!')
+    assert cache.get(key(0)) is None  # evicted from disk to stay within 10 bytes
+    assert sum(len(files) for _, _, files in os.walk(tmp_path)) == 2
+    again = RenderCache(str(tmp_path), memory_bytes=0)
+    assert again.get(key(2)) == b'pdf!'
+    assert again.stats()['disk_hits'] == 1
+
+
+def test_pdf_route_uses_the_cache():
+    import app as app_module
+
+    client = app_module.app.test_client()
+    assert client.put('/api/resume/cached', json={'personal': {'fullName': 'Cached'}}).status_code == 200
+    first = client.get('/api/resume/cached/pdf')
+    render_key = first.headers['X-Render-Key']
+    assert first.headers['ETag'] == f'"{render_key}"'
+    assert client.get('/api/resume/cached/pdf', headers={'If-None-Match': first.headers['ETag']}).status_code == 304
+    again = client.get('/api/resume/cached/pdf?template=modern')
+    assert again.data == first.data and again.headers['X-Render-Key'] == render_key
+    assert client.get('/api/resume/cached/pdf?template=minimal').headers['X-Render-Key'] != render_key
+
+    shared = client.get(f'/api/render/{render_key}.pdf')
+    assert shared.data == first.data and 'immutable' in shared.headers['Cache-Control']
+    assert client.get(f'/api/render/{"0" * 64}.pdf').status_code == 404
+    assert client.get('/api/render/not-a-key.pdf').status_code == 404
+
+
+def test_renders_from_other_processes_are_found_on_disk(tmp_path):
+    first, second = RenderCache(str(tmp_path)), RenderCache(str(tmp_path))
+    first.put(key(7), b'pdf')
+    assert second.get(key(7)) == b'pdf'
+    assert second.stats()['disk_hits'] == 1
+
+def test_lookups_are_counted_once_per_request():
+    import app as app_module
+
+    client = app_module.app.test_client()
+    assert client.put('/api/resume/counted', json={'personal': {'fullName': 'Counted Once'}}).status_code == 200
+    before = app_module.render_cache.stats()
+    for _ in range(3):
+        assert client.get('/api/resume/counted/pdf').status_code == 200
+    after = app_module.render_cache.stats()
+    assert after['misses'] - before['misses'] == 1
+    assert after['memory_hits'] - before['memory_hits'] == 2
+
+
+def test_uncounted_lookups(tmp_path):
+    cache = RenderCache(str(tmp_path))
+    assert cache.get('a' * 64, count=False) is None
+    cache.put('a' * 64, b'pdf')
+    assert cache.get('a' * 64, count=False) == b'pdf'
+    stats = cache.stats()
+    assert (stats['memory_hits'], stats['disk_hits'], stats['misses']) == (0, 0, 0)
+
+
+EDITOR_DOWNLOAD = '''
+    const stored = {}, cached = {}, requests = [], saved = [];
+    globalThis.localStorage = { getItem: k => stored[k] ?? null, setItem: (k, v) => { stored[k] = v; } };
+    renderCache.get = async key => cached[key] || null;
+    renderCache.put = async (key, blob) => { cached[key] = blob; };
+    globalThis.fetch = async (url, init = {}) => {
+        const etag = (init.headers || {})['If-None-Match'];
+        if (!url.endsWith('/pdf?template=modern')) return { ok: true };  // metrics
+        requests.push(etag || null);
+        if (server === 'down') throw new Error('offline');
+        if (etag === `"${server}"`) return { ok: false, status: 304, headers: { get: () => null } };
+        return { ok: true, status: 200, blob: async () => `pdf:${server}`, headers: { get: () => server } };
+    };
+    globalThis.loadHtml2pdf = async () => {};
+    globalThis.exportPages = async () => 'html2pdf';
+    document.getElementById = () => null;
+    const app = components.resumeApp();
+    Object.assign(app, { resumeId: 'r1', save: async () => {}, saveBlob: blob => saved.push(blob),
+                         commitPreview: () => {} });
+    app.saved = JSON.stringify(app.data);
+    let server = 'k1';
+'''
+
+
+def test_editor_caches_server_pdfs_under_the_server_render_key(run_editor):
+    out = run_editor(EDITOR_DOWNLOAD + '''
+        (async () => {
+            await app.downloadPDF();          // first download: cached as k1
+            await app.downloadPDF();          // unchanged: the server answers 304
+            server = 'k2';                    // e.g. a new RENDER_VERSION
+            await app.downloadPDF();
+            server = 'down';
+            frames.length = 0;
+            const offline = app.downloadPDF();
+            await new Promise(resolve => setTimeout(resolve, 0));
+            frames.forEach(fn => fn());
+            await offline;
+            console.log(JSON.stringify({requests, saved, cached: Object.keys(cached), stored}));
+        })();
+    ''')
+    assert out['saved'] == ['pdf:k1', 'pdf:k1', 'pdf:k2', 'html2pdf']
+    assert out['requests'] == [None, '"k1"', '"k1"', '"k2"']
+    # The browser fallback is never stored under a render key.
+    assert out['cached'] == ['k1', 'k2']
+    assert out['stored'] == {'render:r1:modern': 'k2'}
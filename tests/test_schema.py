@@ -0,0 +1,69 @@
+import pytest
+
+import schema
+
+
+def test_validate_fills_in_and_normalizes():
+    doc = schema.validate({'schemaVersion': 2, 'personal': {'fullName': 'Asha', 'phone': None},
+                           'education': [{'school': 'Tech', 'gpa': 3.9}, {'id': 7}],
+                           'skills': ['Python']})
+    assert doc['schemaVersion'] == schema.SCHEMA_VERSION
+    assert doc['personal'] == {'email': '', 'fullName': 'Asha', 'linkedin': '', 'location': '',
+                               'phone': '', 'summary': ''}
+    assert [edu['id'] for edu in doc['education']] == [8, 7]  # numbered after the largest id
+    assert doc['education'][0]['gpa'] == '3.9'
+    assert 'location' not in doc['education'][0]  # optional: kept, never added
+    assert doc['experience'] == [] and doc['projects'] == []
+    assert schema.validate(doc) == doc
+
+
+@pytest.mark.parametrize('doc, path', [
+    ({'personal': {'nickname': 'A'}}, []),
+    ({'personal': {'fullName': ['A']}}, ['personal', 'fullName']),
+    ({'skills': ['x' * (schema.MAX_TEXT + 1)]}, ['skills', 0]),
+    ({'projects': [{}] * (schema.MAX_ENTRIES + 1)}, ['projects']),
+    ({'schemaVersion': 2, 'education': [{'id': True}]}, ['education', 0, 'id']),
+    ({'schemaVersion': 99}, ['schemaVersion']),
+])
+def test_validate_rejects(doc, path):
+    with pytest.raises(schema.SchemaError) as exc:
+        schema.validate(doc)
+    if path:
+        assert exc.value.path == path
+
+
+def test_version_1_is_migrated():
+    doc = schema.validate({'skills': 'Python, SQL,', 'projects': [{'id': 1700000000000, 'name': 'A'},
+                                                                  {'id': 1700000000001, 'name': 'B'}]})
+    assert doc['skills'] == ['Python', 'SQL']
+    assert [p['id'] for p in doc['projects']] == [1, 2]
+
+
+def test_encoding_is_canonical():
+    a = schema.validate({'personal': {'fullName': 'Zoë'}, 'skills': ['C++']})
+    b = schema.validate({'skills': ['C++'], 'personal': {'fullName': 'Zoë'}})
+    assert schema.dumps(a) == schema.dumps(b)
+    assert 'Zoë' in schema.dumps(a) and ' ' not in schema.dumps(a)
+    assert schema.digest(a, 'modern') == schema.digest(b, 'modern') != schema.digest(a, 'classic')
+
+
+@pytest.mark.parametrize('codec', sorted(schema.CODECS))
+def test_codecs_round_trip(codec):
+    doc = schema.validate({'personal': {'fullName': 'Asha'}, 'skills': ['SQL']})
+    assert schema.loads(schema.pack(doc, codec)) == doc
+
+
+def test_unknown_codec_and_data():
+    with pytest.raises(ValueError):
+        schema.pack({}, 'yaml')
+    with pytest.raises(ValueError):
+        schema.unpack(b'\x00garbage')
+
+
+def test_repair_never_rejects():
+    doc = schema.repair({'schemaVersion': 'two', 'personal': 'Asha', 'skills': [1, None, 'SQL'] * 50,
+                         'experience': [{'company': 'Acme', 'extra': 1}, 'junk']})
+    assert schema.validate(doc) == doc
+    assert len(doc['skills']) == schema.MAX_ENTRIES and doc['skills'][:2] == ['1', 'SQL']
+    [entry] = doc['experience']
+    assert (entry['id'], entry['company']) == (1, 'Acme') and 'extra' not in entry
@@ -0,0 +1,131 @@
+import pytest
+
+import search
+from search import SearchIndex
+
+
+def resume(name, summary, **extra):
+    return {'personal': {'fullName': name, 'summary': summary}, **extra}
+
+
+CORPUS = [
+    ('ana', resume('Ana Diaz', 'Backend developer', skills=['Python', 'SQL'],
+                   education=[{'school': 'Tech U', 'degree': 'BSc', 'gpa': '3.9/4.0'}],
+                   experience=[{'company': 'Acme'}])),
+    ('ben', resume('Ben Ode', 'Data analyst', skills=['python', 'Excel'],
+                   education=[{'school': 'tech u', 'degree': 'MSc', 'gpa': '3.2'}],
+                   projects=[{'name': 'Dash', 'technologies': 'Python, Plotly'}])),
+    ('cho', resume('Cho Min', 'Frontend developer', skills=['React', 'C++'],
+                   education=[{'school': 'State College', 'degree': 'BSc'}])),
+]
+
+
+@pytest.fixture(params=['sets', 'bitmaps'])
+def index(request, monkeypatch):
+    if request.param == 'bitmaps':
+        # Small enough that every posting is a bitmap and every count walks them.
+        monkeypatch.setattr(search, 'BITMAP_AT', 1)
+        monkeypatch.setattr(search, 'FEW_MATCHES', 0)
+    index = SearchIndex(':memory:')
+    index.rebuild(CORPUS)
+    yield index
+    index.close()
+
+
+def ids(found):
+    return [result['id'] for result in found['results']]
+
+
+def test_facets_are_counted_without_regard_to_case(index):
+    found = index.search()
+    assert found['total'] == 3 and ids(found) == ['cho', 'ben', 'ana']  # most recent first
+    facets = found['facets']
+    assert facets['skill'][0] == {'value': 'Python', 'count': 2}
+    assert {'value': 'Tech U', 'count': 2} in facets['school']
+    assert facets['technology'] == [{'value': 'Python', 'count': 1}, {'value': 'Plotly', 'count': 1}]
+    assert index.search(facet_limit=1)['facets']['degree'] == [{'value': 'BSc', 'count': 2}]
+
+
+def test_filters_narrow_results_and_counts(index):
+    found = index.search(filters=[('skill', 'PYTHON'), ('degree', 'bsc')])
+    assert (found['total'], ids(found)) == (1, ['ana'])
+    assert found['facets']['company'] == [{'value': 'Acme', 'count': 1}]
+    assert index.search('developer', filters=[('school', 'tech u')])['total'] == 1
+    assert index.search(filters=[('skill', 'Rust')])['total'] == 0
+
+
+def test_gpa_floor_and_sorts(index):
+    assert ids(index.search(gpa_min=3.5)) == ['ana']
+    assert ids(index.search(sort='gpa')) == ['ana', 'ben', 'cho']  # resumes without a GPA last
+    assert ids(index.search(sort='name')) == ['ana', 'ben', 'cho']
+    assert ids(index.search('"c++"')) == ['cho']
+    assert index.search('developer')['sort'] == 'relevance'
+
+
+def test_pages(index):
+    pages = [index.search(sort='name', page=page, per_page=2) for page in (1, 2, 3)]
+    assert [ids(page) for page in pages] == [['ana', 'ben'], ['cho'], []]
+    assert {page['total'] for page in pages} == {3}
+
+
+@pytest.mark.parametrize('options', [
+    {'query': 'AND'}, {'filters': [('colour', 'red')]}, {'sort': 'size'}, {'sort': 'relevance'},
+])
+def test_bad_searches_are_refused(index, options):
+    with pytest.raises(ValueError):
+        index.search(**options)
+
+
+def test_saves_are_seen_by_every_process(tmp_path):
+    path = str(tmp_path / 'search.db')
+    first, second = SearchIndex(path), SearchIndex(path)
+    first.rebuild(CORPUS)
+    assert second.search()['total'] == 3
+    second.add('ana', resume('Ana Diaz', 'Rust developer', skills=['Rust']))
+    assert ids(second.search('rust')) == ['ana']  # a search writes what is queued first
+    assert ids(first.search('rust')) == ['ana']
+    assert first.search(filters=[('skill', 'python')])['total'] == 1  # the old version is gone
+    first.rebuild(CORPUS[1:])
+    assert ids(second.search(sort='name')) == ['ben', 'cho']
+    first.close()
+    second.close()
+
+
+def test_search_route(monkeypatch):
+    import app as app_module
+
+    client = app_module.app.test_client()
+    saved = client.put('/api/resume/search-r', json={'personal': {'fullName': 'Zed Quill', 'summary': 'Haskell'},
+                                                    'skills': ['Haskell']})
+    assert saved.status_code == 200
+    assert client.get('/api/search?q=haskell').status_code == 404  # off without a token
+    monkeypatch.setitem(app_module.app.config, 'SEARCH_TOKEN', 'recruiter')
+    refused = client.get('/api/search?q=haskell', headers={'Authorization': 'Bearer guess'})
+    assert refused.status_code == 401 and refused.headers['WWW-Authenticate'] == 'Bearer'
+    assert client.get('/api/search?q=haskell').status_code == 401
+
+    auth = {'Authorization': 'Bearer recruiter'}
+    found = client.get('/api/search?q=haskell&skill=haskell', headers=auth).get_json()
+    assert ids(found) == ['search-r'] and found['results'][0]['name'] == 'Zed Quill'
+    assert client.get('/api/search?page=two', headers=auth).status_code == 400
+    assert client.get('/api/search?sort=size', headers=auth).status_code == 400
+
+
+def test_pages_stay_full_when_text_rows_are_newer_than_the_mirror(tmp_path, monkeypatch):
+    path = str(tmp_path / 'search.db')
+    index = SearchIndex(path)
+    index.rebuild((f'r{n}', resume(f'Student {n}', 'python')) for n in range(3))
+    assert index.search('python', sort='relevance', per_page=2)['total'] == 3
+
+    # Another process saves between this one's mirror sync and its text query.
+    monkeypatch.setattr(index.mirror, 'sync', lambda conn: None)
+    other = SearchIndex(path)
+    for n in range(3):
+        other.add(f'new{n}', resume(f'Newcomer {n}', 'python python python python'))
+    other.flush()
+
+    found = index.search('python', sort='relevance', per_page=2)
+    assert found['total'] == 3
+    assert len(found['results']) == 2
+    assert {result['id'] for result in found['results']} <= {'r0', 'r1', 'r2'}
+    assert len(index.search('python', sort='relevance', page=2, per_page=2)['results']) == 1
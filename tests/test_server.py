@@ -0,0 +1,34 @@
+import server
+
+
+def test_settings_come_from_the_environment():
+    options = server.settings({'HOST': '0.0.0.0', 'PORT': '8000', 'WEB_CONCURRENCY': '3',
+                               'WEB_THREADS': '16', 'WEB_MAX_REQUESTS': '500', 'WEB_ACCESS_LOG': '-'})
+    assert options['bind'] == '0.0.0.0:8000'
+    assert (options['workers'], options['threads'], options['worker_class']) == (3, 16, 'gthread')
+    assert (options['max_requests'], options['max_requests_jitter']) == (500, 50)
+    assert options['accesslog'] == '-'
+
+
+def test_default_settings():
+    options = server.settings({})
+    assert options['bind'] == '127.0.0.1:5000'
+    assert 1 <= options['workers'] <= 4
+    assert options['accesslog'] is None and options['timeout'] == 30
+
+
+def test_health_checks(monkeypatch):
+    import app as app_module
+
+    client = app_module.app.test_client()
+    assert client.get('/healthz').get_json()['status'] == 'ok'
+    ready = client.get('/readyz')
+    assert ready.status_code == 200 and 'render_cache' in ready.get_json()
+
+    class Down:
+        def get(self, resume_id):
+            raise OSError('database is locked')
+
+    monkeypatch.setattr(app_module, 'resumes', Down())
+    down = client.get('/readyz')
+    assert down.status_code == 503 and 'database is locked' in down.get_json()['error']
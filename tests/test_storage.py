@@ -0,0 +1,201 @@
+import json
+import sqlite3
+
+import pytest
+
+import schema
+from search import SearchIndex
+from storage import MemoryStore, SQLiteStore, VersionConflict, WriteBehindQueue, open_store
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def store(request, tmp_path):
+    if request.param == 'memory':
+        return MemoryStore()
+    return SQLiteStore(str(tmp_path / 'resumes.db'))
+
+
+# What the API stored before documents were validated: no version, Date.now()
+# ids, a comma-separated skills string and a field the schema does not know.
+LEGACY = {
+    'personal': {'fullName': 'Asha Rao', 'email': 'asha@example.com', 'nickname': 'A'},
+    'education': [{'id': 1700000000000, 'school': 'Tech University', 'gpa': 3.9}],
+    'projects': [{'id': 1700000000001, 'name': 'Compiler', 'details': 'x' * (schema.MAX_TEXT + 10)}],
+    'skills': 'Python, SQL',
+    'theme': 'dark',
+}
+
+
+def put_legacy(store, resume_id='legacy'):
+    # Written straight into the backend, as the unvalidated API did.
+    if isinstance(store, MemoryStore):
+        store._docs[resume_id] = (json.dumps(LEGACY), 3)
+    else:
+        with sqlite3.connect(store.path) as conn:
+            conn.execute('INSERT INTO resumes (id, doc, version, updated_at) VALUES (?, ?, 3, 0)',
+                         (resume_id, json.dumps(LEGACY)))
+
+
+class FailingStore(MemoryStore):
+    def put_many(self, records):
+        list(records)
+        raise OSError('disk full')
+
+
+def resume(name, **fields):
+    return schema.validate(dict({'personal': {'fullName': name}}, **fields))
+
+
+def named(name):
+    return lambda _: resume(name)
+
+
+def test_open_store(tmp_path):
+    assert isinstance(open_store('memory://'), MemoryStore)
+    assert open_store(f'sqlite:///{tmp_path}/r.db').path == f'{tmp_path}/r.db'
+    with pytest.raises(ValueError):
+        open_store('redis://localhost')
+
+
+def test_store_updates_check_the_version(store):
+    assert store.update('r', named('A')) == (resume('A'), 1)
+    with pytest.raises(VersionConflict) as exc:
+        store.update('r', named('B'), expected_version=0)
+    assert exc.value.current == 1
+    assert store.update('r', lambda doc: dict(doc, skills=['SQL']), expected_version=1)[1] == 2
+    assert store.get('r') == (resume('A', skills=['SQL']), 2)
+
+
+def test_sqlite_updates_are_seen_by_other_processes(tmp_path):
+    first, second = (SQLiteStore(str(tmp_path / 'shared.db')) for _ in range(2))
+    first.update('r', named('A'))
+    second.update('r', named('B'), expected_version=1)
+    with pytest.raises(VersionConflict):
+        first.update('r', named('C'), expected_version=1)
+    assert first.get('r')[1] == 2
+
+
+def test_legacy_row_is_readable(store):
+    put_legacy(store)
+    doc, version = store.get('legacy')
+    assert version == 3
+    assert schema.validate(doc) == doc
+    assert 'theme' not in doc and 'nickname' not in doc['personal']
+    assert doc['skills'] == ['Python', 'SQL']
+    assert doc['education'][0]['id'] == 1 and doc['education'][0]['gpa'] == '3.9'
+    assert len(doc['projects'][0]['details']) == schema.MAX_TEXT
+
+
+def test_legacy_row_can_be_overwritten(store):
+    put_legacy(store)
+    doc = resume('Asha Rao')
+    assert store.update('legacy', lambda old: doc, expected_version=3) == (doc, 4)
+    assert store.get('legacy') == (doc, 4)
+
+
+def test_legacy_row_is_reindexed(store):
+    put_legacy(store)
+    store.update('new', named('Ben Ode'))
+    index = SearchIndex(':memory:')
+    assert index.rebuild(store.scan()) == 2
+    assert [r['id'] for r in index.search('asha')['results']] == ['legacy']
+    index.close()
+
+
+def test_scan_skips_undecodable_rows(store):
+    store.update('good', lambda _: schema.validate({}))
+    if isinstance(store, MemoryStore):
+        store._docs['bad'] = (b'\x00garbage', 1)
+    else:
+        with sqlite3.connect(store.path) as conn:
+            conn.execute("INSERT INTO resumes VALUES ('bad', 'not json', 1, 0)")
+    assert [resume_id for resume_id, _ in store.scan()] == ['good']
+
+
+def test_queue_reads_see_pending_writes(store):
+    queue = WriteBehindQueue(store, flush_interval=60)
+    doc, version = queue.update('r', named('Asha'))
+    assert version == 1
+    assert queue.get('r') == (doc, 1)
+    assert store.get('r') is None
+    assert queue.flush() == 1
+    assert store.get('r') == (doc, 1)
+    queue.close()
+
+
+def test_queue_reads_are_copies_of_pending_writes(store):
+    queue = WriteBehindQueue(store, flush_interval=60)
+    queue.update('r', named('Asha'))
+    doc, _ = queue.get('r')
+    doc['personal']['fullName'] = 'Changed'
+    doc['skills'].append('SQL')
+    assert queue.get('r')[0] == resume('Asha')
+    queue.flush()
+    assert store.get('r')[0] == resume('Asha')
+    queue.close()
+
+
+def test_queue_coalesces_updates_to_one_row_write(store):
+    queue = WriteBehindQueue(store, flush_interval=60)
+    for name in ('A', 'B', 'C'):
+        queue.update('r', named(name))
+    queue.update('other', named('D'))
+    with pytest.raises(VersionConflict) as exc:
+        queue.update('r', named('E'), expected_version=2)
+    assert exc.value.current == 3
+    assert queue.flush() == 2
+    assert queue.stats() == {'pending': 0, 'coalesced': 2, 'flushed': 2, 'batches': 1}
+    assert store.get('r') == (resume('C'), 3)
+    queue.close()
+
+
+def test_queue_keeps_a_batch_that_failed_to_flush():
+    queue = WriteBehindQueue(FailingStore(), flush_interval=60)
+    queue.update('r', named('A'))
+    with pytest.raises(OSError):
+        queue.flush()
+    assert queue.stats()['pending'] == 1
+    assert queue.get('r')[0]['personal']['fullName'] == 'A'
+    queue._closed = True  # close() would flush, and fail, again
+
+
+@pytest.fixture
+def client():
+    import app as app_module
+
+    return app_module.app.test_client()
+
+
+def test_api_saves_patches_and_checks_versions(client):
+    assert client.get('/api/resume/api-r').status_code == 404
+    saved = client.put('/api/resume/api-r', json={'personal': {'fullName': 'Asha'}, 'skills': []})
+    assert saved.status_code == 200 and saved.get_json()['version'] == 1
+    patched = client.patch('/api/resume/api-r', headers={'If-Match': saved.headers['ETag']},
+                           json=[{'op': 'add', 'path': '/skills/-', 'value': 'SQL'}])
+    assert patched.get_json()['version'] == 2
+    stale = client.patch('/api/resume/api-r', headers={'If-Match': saved.headers['ETag']},
+                         json=[{'op': 'add', 'path': '/skills/-', 'value': 'Go'}])
+    assert stale.status_code == 412 and stale.get_json()['version'] == 2
+    assert client.get('/api/resume/api-r').get_json()['data']['skills'] == ['SQL']
+    assert client.patch('/api/resume/api-r', json=[{'op': 'remove', 'path': '/nope'}]).status_code == 400
+    assert client.patch('/api/resume/missing', json=[]).status_code == 404
+    assert client.put('/api/resume/bad id!', json={}).status_code == 404
+
+
+def test_api_reads_and_overwrites_a_legacy_row(client):
+    import app as app_module
+
+    put_legacy(app_module.resumes.store if isinstance(app_module.resumes, WriteBehindQueue)
+               else app_module.resumes, 'legacy-api')
+    response = client.get('/api/resume/legacy-api')
+    assert response.status_code == 200
+    assert response.get_json()['data']['personal']['fullName'] == 'Asha Rao'
+    assert client.get('/api/resume/legacy-api/html').status_code == 200
+    assert client.put('/api/resume/legacy-api', json={'personal': {'fullName': 'Asha R.'}}).status_code == 200
+
+
+def test_api_rejects_documents_outside_the_schema(client):
+    response = client.put('/api/resume/api-bad', json={'personal': {'fullName': 'Asha'}, 'theme': 'dark'})
+    assert response.status_code == 400
+    assert 'theme' in response.get_json()['error']
+    assert client.put('/api/resume/api-bad', json={'skills': ['x' * (schema.MAX_TEXT + 1)]}).status_code == 400
@@ -0,0 +1,128 @@
+"""A bounded process pool for CPU-heavy jobs such as PDF rendering.
+
+At most ``workers + max_queue`` jobs are accepted at once; beyond that
+``submit`` raises ``Overloaded`` straight away, so callers can shed load
+instead of piling up requests. With ``max_wait``, jobs are also turned away
+while every worker is busy and recent jobs took longer than that from submit
+to done, so a queue of slow jobs sheds before its callers time out. Each job
+also gets a deadline that is enforced inside the worker process.
+"""
+import math
+import os
+import signal
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from functools import partial
+
+
+class Overloaded(Exception):
+    """Raised when the job queue is full; ``retry_after`` is a guess, in
+    seconds, at when there will be room."""
+
+    def __init__(self, retry_after=1):
+        self.retry_after = retry_after
+        super().__init__(f'retry after {retry_after} s')
+
+
+class JobTimeout(Exception):
+    """Raised when a job runs past its deadline."""
+
+
+def _alarm(signum, frame):
+    raise JobTimeout()
+
+
+def _run_with_deadline(timeout, fn, args):
+    # Pool workers run jobs on their main thread, so SIGALRM can interrupt
+    # a runaway render without killing the worker.
+    if hasattr(signal, 'setitimer'):
+        signal.signal(signal.SIGALRM, _alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return fn(*args)
+    finally:
+        if hasattr(signal, 'setitimer'):
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+class WorkerPool:
+    def __init__(self, workers=None, max_queue=None, timeout=10.0, max_wait=None):
+        self.workers = workers or os.cpu_count() or 2
+        self.max_queue = self.workers * 4 if max_queue is None else max_queue
+        self.timeout = timeout
+        self.max_wait = max_wait
+        self.latency = 0.0  # moving average of seconds from submit to done
+        self._slots = threading.BoundedSemaphore(self.workers + self.max_queue)
+        self._executor = None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    def _pool(self):
+        # Created lazily so forking servers do not inherit worker processes.
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def submit(self, fn, *args):
+        with self._lock:
+            # Busy and slow: a new job would wait longer than max_wait.
+            slow = (self.max_wait is not None and self.in_flight >= self.workers
+                    and self.latency > self.max_wait)
+        if slow or not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+                # About when the jobs ahead will be done.
+                retry_after = max(1, math.ceil(self.latency))
+            raise Overloaded(retry_after)
+        try:
+            future = self._pool().submit(_run_with_deadline, self.timeout, fn, args)
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self.in_flight += 1
+        future.add_done_callback(partial(self._done, time.monotonic()))
+        return future
+
+    def _done(self, submitted, future):
+        elapsed = time.monotonic() - submitted
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+            self.latency = elapsed if not self.latency else 0.8 * self.latency + 0.2 * elapsed
+        self._slots.release()
+
+    def run(self, fn, *args):
+        """Run ``fn(*args)`` in a worker and wait for the result.
+
+        Raises ``Overloaded`` if the queue is full (or, with ``max_wait``, too
+        slow to join) and ``JobTimeout`` if the job (including its time
+        waiting in the queue) takes too long.
+        """
+        future = self.submit(fn, *args)
+        try:
+            # Leave room for queueing; the worker enforces the job's own deadline.
+            return future.result(timeout=self.timeout * 2)
+        except (JobTimeout, FutureTimeout):
+            with self._lock:
+                self.timed_out += 1
+            future.cancel()
+            raise JobTimeout() from None
+
+    def stats(self):
+        with self._lock:
+            return {'workers': self.workers, 'max_queue': self.max_queue, 'in_flight': self.in_flight,
+                    'completed': self.completed, 'rejected': self.rejected, 'timed_out': self.timed_out,
+                    'latency': round(self.latency, 3)}
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)